@@ -0,0 +1,220 @@
+"""
+bench_chat_prefix.py — Follow-up chat prompt-caching benchmark (headless, no API calls).
+========================================================================================
+Plays a scripted follow-up conversation against a report-sized context and
+sends each turn two ways:
+
+    legacy    — the old request: one system string (context + report) and the
+                whole history, every turn
+    prefixed  — chat_context.build_request: the context as a cached prefix,
+                the newest turn as a second breakpoint, older turns folded
+                into a rolling summary
+
+to SimClient, a stand-in for the Anthropic client that models prompt caching
+the way the API bills it (at each cache_control breakpoint the longest
+prefix an earlier request wrote, looking back up to LOOKBACK_BLOCKS block
+boundaries, is read from the cache; everything up to the last breakpoint
+past that is written) and answers after a modelled time to first token:
+
+    ttft = --base-ms + --prefill-ms-per-1k × (uncached + written tokens) / 1000
+                     + cache reads at CACHE_READ_PREFILL of that rate
+
+Reports, per turn and in total, prompt tokens, tokens read from / written to
+the cache, the modelled TTFT, and input cost in uncached-token equivalents
+(cache writes 1.25×, reads 0.1×). Fold calls for the rolling summary go
+through a throwaway report_cache file and are counted too.
+
+Run:
+    python bench_chat_prefix.py                               # 12 turns, 20k-token context
+    python bench_chat_prefix.py --turns 30 --context-tokens 40000 --prefill-ms-per-1k 60
+
+Results are appended to bench_results/chat_prefix.json tagged with the git
+commit.
+"""
+
+import argparse
+import hashlib
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import chat_context
+import report_cache
+import upstream_sim
+from prompt_budget import estimate_tokens
+
+CACHE_WRITE_COST   = 1.25
+CACHE_READ_COST    = 0.1
+CACHE_READ_PREFILL = 0.1     # share of full prefill time a cached token still costs
+LOOKBACK_BLOCKS    = 20      # block boundaries checked before a breakpoint for an earlier write
+
+
+def _blocks(request: dict) -> list[tuple[str, bool]]:
+    """The request as (text, is_breakpoint) blocks in cache-prefix order."""
+    system = request.get("system", "")
+    out = ([(system, False)] if isinstance(system, str)
+           else [(b["text"], "cache_control" in b) for b in system])
+    for m in request["messages"]:
+        content = m["content"]
+        if isinstance(content, str):
+            out.append((f"{m['role']}:{content}", False))
+        else:
+            out.extend((f"{m['role']}:{b['text']}", "cache_control" in b) for b in content)
+    return out
+
+
+class SimClient:
+    """Just enough of anthropic.Anthropic for the chat helpers, with prompt
+    caching modelled on prefix hashes at each breakpoint."""
+
+    def __init__(self, base_ms: float, prefill_ms_per_1k: float):
+        self.base     = base_ms / 1000
+        self.prefill  = prefill_ms_per_1k / 1000 / 1000
+        self.prefixes: set[str] = set()
+        self.calls    = 0
+        self._lock    = threading.Lock()
+        self.messages = self
+
+    def _usage(self, request: dict) -> dict:
+        h, tokens, read, last_bp = hashlib.sha256(), 0, 0, 0
+        bounds, written = [], []                       # (prefix key, tokens so far) per block
+        for text, breakpoint in _blocks(request):
+            h.update(text.encode("utf-8"))
+            tokens += estimate_tokens(text)
+            bounds.append((h.hexdigest(), tokens))
+            if breakpoint:
+                last_bp = len(bounds)
+                hit = next((n for k, n in reversed(bounds[-LOOKBACK_BLOCKS:]) if k in self.prefixes), 0)
+                read = max(read, hit)
+                written.append(bounds[-1][0])
+        self.prefixes.update(written)
+        write = max(bounds[last_bp - 1][1] - read, 0) if last_bp else 0
+        return {"input_tokens": tokens - read - write, "cache_read_input_tokens": read,
+                "cache_creation_input_tokens": write}
+
+    def create(self, model, max_tokens, messages, system=""):
+        with self._lock:
+            self.calls += 1
+        text = "- " + " ".join(messages[0]["content"].split()[:120])
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+    def stream(self, **request):
+        usage = self._usage(request)
+        fresh = usage["input_tokens"] + usage["cache_creation_input_tokens"]
+        ttft  = self.base + self.prefill * (fresh + CACHE_READ_PREFILL * usage["cache_read_input_tokens"])
+        reply = "The report shows " + " ".join(upstream_sim._review_text(random.Random(self.calls), True)
+                                                for _ in range(8))
+        self.calls += 1
+        return _SimStream(ttft, reply, usage)
+
+
+class _SimStream:
+    def __init__(self, ttft: float, reply: str, usage: dict):
+        self.ttft, self.reply, self.usage = ttft, reply, usage
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        time.sleep(self.ttft)
+        for word in self.reply.split(" "):
+            yield word + " "
+
+    def get_final_message(self):
+        return SimpleNamespace(usage=SimpleNamespace(output_tokens=estimate_tokens(self.reply), **self.usage))
+
+
+def synthetic_context(tokens: int, rng: random.Random) -> str:
+    lines = ["You are a senior games market analyst. Answer follow-up questions concisely.", "", "## Report", ""]
+    while estimate_tokens("\n".join(lines)) < tokens:
+        lines.append(" ".join(upstream_sim._review_text(rng, rng.random() < 0.6) for _ in range(4)))
+    return "\n".join(lines)
+
+
+def legacy_request(model: str, system: str, history: list[dict]) -> dict:
+    return {"model": model, "max_tokens": 2048, "system": system,
+            "messages": [{"role": m["role"], "content": m["content"]} for m in history]}
+
+
+def play(mode: str, context: str, questions: list[str], args) -> dict:
+    client = SimClient(args.base_ms, args.prefill_ms_per_1k)
+    memory = chat_context.new_memory()
+    history, turns = [], []
+    for q in questions:
+        history.append({"role": "user", "content": q})
+        fold_calls = client.calls
+        request = (legacy_request("sim", context, history) if mode == "legacy"
+                   else chat_context.build_request(client, "sim", 2048, context, history, memory))
+        fold_calls = client.calls - fold_calls
+        reply, stats = chat_context.stream_reply(client, request)
+        history.append({"role": "assistant", "content": reply})
+        fresh = stats["prompt_tokens"] - stats["cache_read_tokens"] - stats["cache_write_tokens"]
+        turns.append({**stats, "fold_calls": fold_calls,
+                      "cost_tokens": round(fresh + CACHE_WRITE_COST * stats["cache_write_tokens"]
+                                           + CACHE_READ_COST * stats["cache_read_tokens"])})
+    return {
+        "turns":            turns,
+        "prompt_tokens":    sum(t["prompt_tokens"] for t in turns),
+        "cache_read":       sum(t["cache_read_tokens"] for t in turns),
+        "cost_tokens":      sum(t["cost_tokens"] for t in turns),
+        "mean_ttft_s":      round(sum(t["ttft_s"] for t in turns) / len(turns), 2),
+        "last_ttft_s":      turns[-1]["ttft_s"],
+        "last_prompt":      turns[-1]["prompt_tokens"],
+        "fold_calls":       sum(t["fold_calls"] for t in turns),
+        "summarised":       memory["folded"],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--turns", type=int, default=12)
+    ap.add_argument("--context-tokens", type=int, default=20_000)
+    ap.add_argument("--base-ms", type=float, default=250.0, help="modelled TTFT floor")
+    ap.add_argument("--prefill-ms-per-1k", type=float, default=40.0, help="modelled prefill per 1k uncached tokens")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", default=str(RESULTS_DIR / "chat_prefix.json"))
+    args = ap.parse_args()
+
+    report_cache.REPORT_CACHE_PATH = Path(tempfile.mkdtemp()) / "report_cache.sqlite"
+    rng       = random.Random(args.seed)
+    context   = synthetic_context(args.context_tokens, rng)
+    questions = [f"Question {i + 1}: what does the report say about "
+                 + " ".join(upstream_sim._review_text(rng, rng.random() < 0.5).split()[:12]) + "?"
+                 for i in range(args.turns)]
+
+    modes = {mode: play(mode, context, questions, args) for mode in ("legacy", "prefixed")}
+
+    print(f"\n{args.turns} turns, context ≈ {estimate_tokens(context):,} tokens")
+    print(f"  {'turn':>4}  {'legacy prompt':>13} {'ttft':>6}   {'prefixed prompt':>15} {'cached':>7} {'ttft':>6}")
+    for i, (a, b) in enumerate(zip(modes["legacy"]["turns"], modes["prefixed"]["turns"]), 1):
+        print(f"  {i:>4}  {a['prompt_tokens']:>13,} {a['ttft_s']:>5.2f}s   "
+              f"{b['prompt_tokens']:>15,} {b['cache_read_tokens']:>7,} {b['ttft_s']:>5.2f}s"
+              + (f"  (+{b['fold_calls']} fold)" if b["fold_calls"] else ""))
+    for mode, m in modes.items():
+        print(f"  {mode:<9} prompt {m['prompt_tokens']:>8,}  from cache {m['cache_read']:>8,}  "
+              f"cost-equivalent {m['cost_tokens']:>8,}  mean TTFT {m['mean_ttft_s']:.2f}s  "
+              f"fold calls {m['fold_calls']}  summarised {m['summarised']}")
+
+    append_result(Path(args.out), {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "args":      {k: v for k, v in vars(args).items() if k != "out"},
+        "modes":     modes,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+bench_forum_scrape.py — Steam forum scraping benchmark (headless).
+==================================================================
+Serves a local HTML fixture shaped like steamcommunity.com discussions
+(listing pages with div.forum_topic rows, thread pages with div.forum_op,
+plus the images / CSS / fonts a real page pulls in, all behind simulated
+latency), points steam_forums at it and compares:
+
+    legacy        — the old fetch_forum_threads: new Chromium per call, one
+                    page, listing then every opening post serially with
+                    0.5 s / 0.4 s sleeps, a query_selector per field
+    pooled_cold   — steam_forums.fetch_forum_threads(http_first=False), first
+                    call (includes launching the shared browser)
+    pooled_warm   — second call on the warm browser, listing cache disabled
+    pooled_cached — third call with the per-app listing cache
+    (with several --tabs values, later rounds report "first" instead of "cold")
+    http          — the default HTTP + BeautifulSoup path, listing cache disabled
+    http_cached   — the same with the listing cache
+    store_cold    — HTTP path with an empty forum_store (temp file): full scrape
+    store_refresh — the same store after --bump threads gained a reply and moved
+                    to the top: only the changed pages / opening posts are fetched
+
+Run:
+    python bench_forum_scrape.py                          # 100 threads, 80 ms latency
+    python bench_forum_scrape.py --threads 200 --tabs 4 8 --latency-ms 150
+    python bench_forum_scrape.py --skip-legacy
+    python bench_forum_scrape.py --http-only              # no Chromium needed
+    python bench_forum_scrape.py --js-listing             # listing rendered client-side →
+                                                          # http mode must fall back
+    python bench_forum_scrape.py --http-only --bump 10    # incremental refresh after 10 bumps
+
+Browser modes need playwright with Chromium (python -m playwright install
+chromium); without it only the HTTP modes run. Reports wall time,
+threads/minute, CPU seconds and peak RSS of this process plus every child
+(Chromium included, sampled from /proc), and fixture requests by kind
+(listing / thread / asset) per mode. Results are appended to
+bench_results/forum_scrape.json tagged with the git commit.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import forum_store
+import steam_forums
+
+APP_ID = 100001
+LEGACY_LISTING_SLEEP_S = 0.5
+LEGACY_POST_SLEEP_S    = 0.4
+
+_ASSET_BYTES = {"css": b"body{font-family:Motiva}" + b" " * 40_000,
+                "woff2": b"\0" * 60_000, "jpg": b"\xff\xd8" + b"\0" * 25_000}
+_ASSET_TYPES = {"css": "text/css", "woff2": "font/woff2", "jpg": "image/jpeg"}
+
+
+# ─────────────────────────────────────────────────────────────
+# FIXTURE SERVER
+# ─────────────────────────────────────────────────────────────
+
+def _head() -> str:
+    return ('<head><title>Discussions</title>'
+            '<link rel="stylesheet" href="/static/forum.css">'
+            '<link rel="preload" as="font" href="/static/motiva.woff2" crossorigin>'
+            '<style>@font-face{font-family:Motiva;src:url(/static/motiva.woff2)}</style></head>')
+
+
+class FixtureForum:
+    """Thread order, reply bumps and last activity of the fixture forum."""
+
+    def __init__(self, total: int):
+        self.order    = list(range(total))
+        self.bumped   = Counter()
+        self.activity = {i: 1_700_000_000 - i * 3600 for i in range(total)}
+
+    def bump(self, n: int, depth: int) -> None:
+        """Give the n threads ending at listing position `depth` a reply and move
+        them to the top, below the pinned ones — as Steam does on new activity."""
+        picked = self.order[max(2, depth - n):depth]
+        now    = max(self.activity.values())
+        for k, i in enumerate(reversed(picked), 1):
+            self.bumped[i] += 1
+            self.activity[i] = now + k * 60
+        self.order = self.order[:2] + picked + [i for i in self.order[2:] if i not in picked]
+
+
+def listing_html(base: str, app_id: int, fp: int, total: int, forum: FixtureForum | None = None) -> str:
+    forum = forum or FixtureForum(total)
+    rows = []
+    for pos in range(fp, min(fp + steam_forums.TOPICS_PER_PAGE, total)):
+        i   = forum.order[pos]
+        url = f"{base}/app/{app_id}/discussions/0/{900000 + i}/"
+        rows.append(
+            f'<div class="forum_topic"><a class="forum_topic_overlay" href="{url}"></a>'
+            f'<img src="/static/avatar_{i}.jpg">'
+            f'<div class="forum_topic_name">{"<span class=forum_topic_pinned>Pinned</span>" if i < 2 else ""}'
+            f'<a href="{url}">Thread {i}: performance after the latest patch</a></div>'
+            f'<div class="forum_topic_op"><a class="forum_topic_author">player{i}</a></div>'
+            f'<div class="forum_topic_reply_count">{(i * 37) % 400 + forum.bumped[i]:,}</div>'
+            f'<span data-timestamp="{forum.activity[i]}">{pos} hours ago</span>'
+            f'{"<span class=forum_topic_developer>Dev</span>" if i % 25 == 0 else ""}</div>')
+    more = fp + steam_forums.TOPICS_PER_PAGE < total
+    paging = (f'<div class="forum_paging_next"><a href="?fp={fp + steam_forums.TOPICS_PER_PAGE}">&gt;</a></div>'
+              if more else "")
+    return f"<html>{_head()}<body>{''.join(rows)}{paging}</body></html>"
+
+
+def thread_html(thread_id: int) -> str:
+    body = " ".join(f"Paragraph {k} about frame pacing and stutter on thread {thread_id}." for k in range(12))
+    return (f"<html>{_head()}<body><img src='/static/banner.jpg'>"
+            f"<div class='forum_op'><div class='forum_comment_text'>{body}<br>  Any fix?</div></div>"
+            f"<div class='commentthread_comment'><div class='forum_comment_text'>reply</div></div>"
+            f"</body></html>")
+
+
+def js_listing_html(base: str, app_id: int, fp: int, total: int, forum: FixtureForum | None = None) -> str:
+    """Same listing, but the topics are only inserted by script (no topics in the HTML)."""
+    inner = listing_html(base, app_id, fp, total, forum).split("<body>", 1)[1].rsplit("</body>", 1)[0]
+    return (f"<html>{_head()}<body><div id='topics'></div><script>"
+            f"document.getElementById('topics').innerHTML = {inner!r};</script></body></html>")
+
+
+def start_fixture_server(total_threads: int, latency_ms: float, js_listing: bool = False):
+    """Fixture on a daemon thread. Returns (server, base_url, hits Counter, FixtureForum)."""
+    hits  = Counter()
+    lock  = threading.Lock()
+    forum = FixtureForum(total_threads)
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency_ms / 1000)
+            parts = urlsplit(self.path)
+            base  = f"http://{self.headers.get('Host')}"
+            m_thread = re.fullmatch(r"/app/(\d+)/discussions/0/(\d+)/", parts.path)
+            if parts.path.startswith("/static/"):
+                kind = "asset"
+                ext  = parts.path.rsplit(".", 1)[-1]
+                body, ctype = _ASSET_BYTES.get(ext, b""), _ASSET_TYPES.get(ext, "application/octet-stream")
+            elif m_thread:
+                kind = "thread"
+                body, ctype = thread_html(int(m_thread.group(2))).encode(), "text/html; charset=utf-8"
+            elif re.fullmatch(r"/app/(\d+)/discussions/0/", parts.path):
+                kind = "listing"
+                fp   = int(parse_qs(parts.query).get("fp", ["0"])[0])
+                app  = int(parts.path.split("/")[2])
+                render = js_listing_html if js_listing else listing_html
+                body, ctype = render(base, app, fp, total_threads, forum).encode(), "text/html; charset=utf-8"
+            else:
+                self.send_error(404)
+                return
+            with lock:
+                hits[kind] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", hits, forum
+
+
+# ─────────────────────────────────────────────────────────────
+# LEGACY PATH  (the pre-pool fetch_forum_threads, minus the Streamlit wiring)
+# ─────────────────────────────────────────────────────────────
+
+def legacy_fetch(app_id: int, max_threads: int) -> list[dict]:
+    from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+    results = []
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])
+        page    = browser.new_context().new_page()
+        page_num = 0
+        while len(results) < max_threads:
+            page.goto(steam_forums.listing_url(app_id, page_num), timeout=30000,
+                      wait_until="domcontentloaded")
+            try:
+                page.wait_for_selector("div.forum_topic, div.apphub_Card", timeout=12000)
+            except PWTimeout:
+                break
+            topics = page.query_selector_all("div.forum_topic")
+            for topic in topics:
+                title_el = (topic.query_selector("div.forum_topic_name a") or
+                            topic.query_selector("a.forum_topic_overlay"))
+                if not title_el:
+                    continue
+                rep_el = topic.query_selector("div.forum_topic_reply_count")
+                auth_el = (topic.query_selector("a.forum_topic_author") or
+                           topic.query_selector("div.forum_topic_op a"))
+                ts_el = topic.query_selector("span[data-timestamp]")
+                results.append({
+                    "title": title_el.inner_text().strip(),
+                    "url": title_el.get_attribute("href") or "",
+                    "reply_count": int(rep_el.inner_text().strip().replace(",", "") or "0") if rep_el else 0,
+                    "author": auth_el.inner_text().strip() if auth_el else "Unknown",
+                    "timestamp": int(ts_el.get_attribute("data-timestamp")) if ts_el else None,
+                    "date_str": ts_el.inner_text().strip() if ts_el else "",
+                    "is_pinned": topic.query_selector("span.forum_topic_pinned") is not None,
+                    "is_dev_post": topic.query_selector("span.forum_topic_developer") is not None,
+                    "opening_post": "",
+                })
+            if not page.query_selector("div.forum_paging_next a, .pagebtn:last-child") or \
+                    len(results) >= max_threads:
+                break
+            page_num += 1
+            time.sleep(LEGACY_LISTING_SLEEP_S)
+        for thread in results[:max_threads]:
+            page.goto(thread["url"], timeout=20000, wait_until="domcontentloaded")
+            try:
+                page.wait_for_selector("div.forum_op, div.forum_comment_text", timeout=8000)
+            except PWTimeout:
+                continue
+            op_el = (page.query_selector("div.forum_op div.forum_comment_text") or
+                     page.query_selector("div.forum_comment_text"))
+            if op_el:
+                thread["opening_post"] = steam_forums.clean_post(op_el.inner_text())
+            time.sleep(LEGACY_POST_SLEEP_S)
+        browser.close()
+    return results[:max_threads]
+
+
+# ─────────────────────────────────────────────────────────────
+# RUN
+# ─────────────────────────────────────────────────────────────
+
+def _process_tree() -> list[int]:
+    """This pid plus all descendants (the pooled Chromium stays alive between
+    modes, so getrusage(RUSAGE_CHILDREN) would never see it)."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, ValueError, IndexError):
+                continue
+    tree, stack = [], [os.getpid()]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def _tree_usage() -> tuple[float, int]:
+    """(CPU seconds, RSS bytes) summed over the live process tree."""
+    tick, page = os.sysconf("SC_CLK_TCK"), os.sysconf("SC_PAGE_SIZE")
+    cpu, rss = 0.0, 0
+    for pid in _process_tree():
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            cpu += (int(fields[11]) + int(fields[12])) / tick        # utime + stime
+            with open(f"/proc/{pid}/statm") as f:
+                rss += int(f.read().split()[1]) * page
+        except (OSError, ValueError, IndexError):
+            continue
+    return cpu, rss
+
+
+class _TreeSampler:
+    """Peak process-tree RSS while the block runs (50 ms sampling)."""
+
+    def __enter__(self):
+        self.peak, self._stop = 0, threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _tree_usage()[1])
+            self._stop.wait(0.05)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_mode(fetch, hits: Counter) -> dict:
+    hits.clear()
+    cpu0 = _tree_usage()[0]
+    t = time.perf_counter()
+    with _TreeSampler() as mem:
+        threads = fetch()
+    wall = time.perf_counter() - t
+    return {
+        "wall_s":          round(wall, 3),
+        "threads":         len(threads),
+        "with_post":       sum(1 for th in threads if th.get("opening_post")),
+        "threads_per_min": round(len(threads) / wall * 60, 1) if wall else 0.0,
+        "cpu_s":           round(_tree_usage()[0] - cpu0, 2),
+        "peak_rss_mb":     round(mem.peak / 1_048_576, 1),
+        "requests":        dict(hits),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--threads", type=int, default=100)
+    ap.add_argument("--forum-size", type=int, default=300, help="threads the fixture forum holds")
+    ap.add_argument("--tabs", type=int, nargs="+", default=[steam_forums.FORUM_TABS])
+    ap.add_argument("--latency-ms", type=float, default=80.0)
+    ap.add_argument("--skip-legacy", action="store_true")
+    ap.add_argument("--http-only", action="store_true", help="only the HTTP modes (no Chromium)")
+    ap.add_argument("--js-listing", action="store_true", help="fixture renders listings client-side")
+    ap.add_argument("--bump", type=int, default=10,
+                    help="threads that gain a reply before the store_refresh round")
+    ap.add_argument("--out", default=str(RESULTS_DIR / "forum_scrape.json"))
+    args = ap.parse_args()
+
+    browser = steam_forums.PLAYWRIGHT_AVAILABLE and not args.http_only
+    if not browser and not args.http_only:
+        print("playwright is not installed — running the HTTP modes only")
+
+    server, base, hits, forum = start_fixture_server(args.forum_size, args.latency_ms, args.js_listing)
+    steam_forums.FORUM_BASE_URL = base
+    modes = {}
+
+    def _fetch(tabs, cached, http_first, use_store=False):
+        return lambda: steam_forums.fetch_forum_threads(
+            APP_ID, "Sim Game", args.threads, max_tabs=tabs, use_cache=cached,
+            http_first=http_first, use_store=use_store)[0]
+
+    try:
+        if browser and not args.skip_legacy:
+            modes["legacy"] = run_mode(lambda: legacy_fetch(APP_ID, args.threads), hits)
+        for i, tabs in enumerate(args.tabs):
+            if browser:
+                # Only the very first pooled call pays the browser launch
+                steam_forums.clear_listing_cache()
+                for label, cached in (("cold" if i == 0 else "first", False), ("warm", False), ("cached", True)):
+                    modes[f"pooled_{label}_t{tabs}"] = run_mode(_fetch(tabs, cached, False), hits)
+            steam_forums.clear_listing_cache()
+            modes[f"http_t{tabs}"]        = run_mode(_fetch(tabs, False, True), hits)
+            modes[f"http_cached_t{tabs}"] = run_mode(_fetch(tabs, True, True), hits)
+
+        # Incremental refresh against a throwaway store: full scrape, then bump
+        # threads near the end of the requested range and refresh
+        tabs = args.tabs[-1]
+        with tempfile.TemporaryDirectory() as tmp:
+            forum_store.FORUM_STORE_PATH = Path(tmp) / "forum_store.sqlite"
+            steam_forums.clear_listing_cache()
+            modes[f"store_cold_t{tabs}"] = run_mode(_fetch(tabs, False, not args.js_listing, True), hits)
+            forum.bump(args.bump, args.threads)
+            modes[f"store_refresh_t{tabs}"] = run_mode(_fetch(tabs, False, not args.js_listing, True), hits)
+    finally:
+        server.shutdown()
+
+    print(f"\n{args.threads} threads, {args.latency_ms:g} ms fixture latency"
+          + (", JS-rendered listing" if args.js_listing else ""))
+    for name, m in modes.items():
+        print(f"  {name:<22} {m['wall_s']:8.2f}s  {m['threads']:>4} threads "
+              f"({m['with_post']} with post)  {m['threads_per_min']:>8.1f}/min  "
+              f"cpu {m['cpu_s']:6.2f}s  peak {m['peak_rss_mb']:7.1f} MB  requests {m['requests']}")
+
+    append_result(Path(args.out), {
+        "commit":     git_commit(),
+        "timestamp":  datetime.utcnow().isoformat(),
+        "threads":    args.threads,
+        "latency_ms": args.latency_ms,
+        "js_listing": args.js_listing,
+        "bump":       args.bump,
+        "modes":      modes,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+bench_import_time.py — Cold-start import profile per entry point (headless).
+============================================================================
+For each Streamlit entry point, runs that script's module-level import
+statements (found with ast — no page is rendered) in a fresh interpreter
+under `python -X importtime`, and reports:
+
+    import_ms   — summed cumulative time of the top-level imports
+    wall_ms     — interpreter start → imports done, minus a bare `python -c pass`
+    heaviest    — the most expensive top-level packages
+    lazy_loaded — optional heavy packages (LAZY_PACKAGES) imported at startup;
+                  these should load on first use (lazy_imports.py), so any
+                  entry here fails the run
+
+and checks import_ms against the entry point's target in TARGETS_MS.
+
+Run:
+    python bench_import_time.py                       # every entry point, 3 runs each
+    python bench_import_time.py --runs 5 --entry steam_sentiment.py
+    python bench_import_time.py --rev HEAD~1          # profile another commit's tree too
+
+--rev profiles `git archive <rev>` in a temp dir alongside the working tree,
+for before/after numbers. Results (median of --runs) are appended to
+bench_results/import_time.json tagged with the git commit; the exit status
+is 1 if any target or lazy check fails.
+"""
+
+import argparse
+import ast
+import io
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+# Budget for the module-level imports of each entry point (ms, median run).
+# streamlit + pandas + plotly alone are ~1.3 s cold on the reference box.
+TARGETS_MS = {
+    "steam_sentiment.py":          2000,
+    "shooter_sentiment.py":        1800,
+    "pages/1_Weekly_Report.py":    1800,
+    "pages/2_Deep_Dive.py":        1800,
+    "pages/3_Monthly_Analysis.py": 1800,
+    "pages/4_Admin.py":            1800,
+}
+
+# Optional dependencies that must not load until used
+LAZY_PACKAGES = ["anthropic", "reportlab", "markdown", "vaderSentiment", "wordcloud",
+                 "matplotlib", "apscheduler", "playwright", "bs4"]
+
+
+def import_snippet(path: Path) -> str:
+    """The script's module-level imports (and try/except import blocks) as code."""
+    keep = []
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            keep.append(node)
+        elif isinstance(node, ast.Try) and node.body and isinstance(node.body[0], (ast.Import, ast.ImportFrom)):
+            keep.append(node)
+    return ast.unparse(ast.Module(body=keep, type_ignores=[]))
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """-X importtime lines → [(depth, cumulative_us, module)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        name  = name[1:]                       # "| " then two spaces per nesting level
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((depth, int(cum_us), name.strip()))
+    return rows
+
+
+def profile_once(tree: Path, snippet: str, python: str) -> dict:
+    t = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", "-c", snippet], cwd=tree,
+                          capture_output=True, text=True, timeout=300)
+    wall = (time.perf_counter() - t) * 1000
+    rows = parse_importtime(proc.stderr)
+    top  = defaultdict(int)
+    for depth, cum, name in rows:
+        if depth == 0:
+            top[name.partition(".")[0]] += cum
+    loaded = sorted({name.partition(".")[0] for _, _, name in rows} & set(LAZY_PACKAGES))
+    return {
+        "import_ms":   round(sum(top.values()) / 1000, 1),
+        "wall_ms":     wall,
+        "heaviest":    {k: round(v / 1000, 1) for k, v in sorted(top.items(), key=lambda kv: -kv[1])[:8]},
+        "lazy_loaded": loaded,
+        "error":       proc.stderr.strip().splitlines()[-1] if proc.returncode else "",
+    }
+
+
+def bare_interpreter_ms(python: str) -> float:
+    t = time.perf_counter()
+    subprocess.run([python, "-c", "pass"], check=True)
+    return (time.perf_counter() - t) * 1000
+
+
+def profile_tree(tree: Path, entries: list[str], runs: int, python: str, bare_ms: float) -> dict:
+    out = {}
+    for entry in entries:
+        path = tree / entry
+        if not path.exists():
+            continue
+        snippet = import_snippet(path)
+        samples = [profile_once(tree, snippet, python) for _ in range(runs)]
+        best = sorted(samples, key=lambda s: s["import_ms"])[len(samples) // 2]
+        out[entry] = {
+            **best,
+            "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+            "wall_ms":   round(statistics.median(s["wall_ms"] for s in samples) - bare_ms, 1),
+            "target_ms": TARGETS_MS.get(entry),
+        }
+    return out
+
+
+def extract_rev(rev: str, dest: Path) -> None:
+    blob = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(blob)) as tar:
+        tar.extractall(dest)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--entry", nargs="+", default=list(TARGETS_MS))
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--rev", help="also profile this git revision's tree")
+    ap.add_argument("--python", default=sys.executable)
+    ap.add_argument("--out", default=str(RESULTS_DIR / "import_time.json"))
+    args = ap.parse_args()
+
+    bare = statistics.median(bare_interpreter_ms(args.python) for _ in range(3))
+
+    trees = {"working_tree": profile_tree(ROOT, args.entry, args.runs, args.python, bare)}
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            extract_rev(args.rev, Path(tmp))
+            trees[args.rev] = profile_tree(Path(tmp), args.entry, args.runs, args.python, bare)
+
+    failed = False
+    for label, results in trees.items():
+        print(f"\n{label}  (median of {args.runs}, bare interpreter {bare:.0f} ms)")
+        for entry, r in results.items():
+            ok = (not r["lazy_loaded"] and not r["error"]
+                  and (r["target_ms"] is None or r["import_ms"] <= r["target_ms"]))
+            if label == "working_tree":
+                failed |= not ok
+            r["ok"] = ok
+            heavy = ", ".join(f"{k} {v:g}" for k, v in list(r["heaviest"].items())[:4])
+            print(f"  {'ok  ' if ok else 'FAIL'} {entry:<28} {r['import_ms']:8.1f} ms "
+                  f"(target {r['target_ms']})  wall {r['wall_ms']:7.1f} ms  [{heavy}]"
+                  + (f"  lazy loaded: {', '.join(r['lazy_loaded'])}" if r["lazy_loaded"] else "")
+                  + (f"  error: {r['error']}" if r["error"] else ""))
+
+    append_result(Path(args.out), {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "runs":      args.runs,
+        "bare_ms":   round(bare, 1),
+        "trees":     trees,
+    })
+    print(f"\nAppended results to {args.out}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
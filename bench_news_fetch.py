@@ -0,0 +1,138 @@
+"""
+bench_news_fetch.py — Steam News ingestion benchmark (headless).
+================================================================
+Loads news for N titles against the local upstream simulator the way the
+charts consume it (month labels for the CCU history chart, typed events for
+the review timeline) and compares:
+
+    legacy   — the old helpers: common.fetch_steam_news and
+               steam_sentiment.fetch_game_events each requesting
+               GetNewsForApp with their own parameters, one title at a time
+    cold     — steam_news.prefetch_news over the roster with an empty store
+               (temp file), then both views for every title
+    warm     — a new process's view of the same store: memory cache dropped,
+               items read back from disk, no requests
+    refresh  — --advance-days later with the TTL expired: one enddate-paged
+               request per title, stopping at the first stored item
+    views    — both views for every title again (memoised)
+
+Run:
+    python bench_news_fetch.py                          # 40 titles, 80 ms latency
+    python bench_news_fetch.py --titles 80 --workers 4 16 --latency-ms 150
+
+Reports wall time, upstream requests and items / events held per mode.
+Results are appended to bench_results/news_fetch.json tagged with the git
+commit.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import news_store
+import steam_news
+import upstream_sim
+
+NEWS_NOW = 1_780_000_000
+
+
+def legacy_fetch(app_id: int) -> tuple[int, int]:
+    """The two pre-service requests for one title; (labels, events) derived."""
+    pages = []
+    for maxlength in (0, 1200):
+        r = requests.get(steam_news.STEAM_NEWS_URL, timeout=12, params={
+            "appid": app_id, "count": 100, "maxlength": maxlength, "format": "json"})
+        items = r.json().get("appnews", {}).get("newsitems", []) if r.ok else []
+        pages.append([{"gid": i["gid"], "date": i["date"], "title": i["title"].strip(),
+                       "url": i.get("url", ""), "contents": i.get("contents") or ""} for i in items])
+    return (len(steam_news._labels(pages[0])),
+            len(steam_news._events(pages[1], app_id, f"Sim Game {app_id}")))
+
+
+def run_mode(fn, base: str) -> dict:
+    upstream_sim.reset_stats(base)
+    t = time.perf_counter()
+    out = fn()
+    wall = time.perf_counter() - t
+    return {"wall_s": round(wall, 3), "requests": upstream_sim.fetch_stats(base)["total"], **out}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--titles", type=int, default=40)
+    ap.add_argument("--workers", type=int, nargs="+", default=[steam_news.NEWS_PREFETCH_WORKERS])
+    ap.add_argument("--latency-ms", type=float, default=80.0)
+    ap.add_argument("--jitter-ms", type=float, default=30.0)
+    ap.add_argument("--advance-days", type=int, default=30, help="time passed before the refresh round")
+    ap.add_argument("--skip-legacy", action="store_true")
+    ap.add_argument("--out", default=str(RESULTS_DIR / "news_fetch.json"))
+    args = ap.parse_args()
+
+    sim_cfg = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "news_now": NEWS_NOW}
+    server, base, state = upstream_sim.start_server(0, sim_cfg)
+    upstream_sim.install_redirect(base)
+    ids = [200000 + i for i in range(args.titles)]
+
+    def _views():
+        labels = sum(len(steam_news.update_labels(a)) for a in ids)
+        events = sum(len(steam_news.game_events(a, f"Sim Game {a}")) for a in ids)
+        return {"labels": labels, "events": events,
+                "items": sum(len(steam_news.news_items(a)) for a in ids)}
+
+    def _prefetch(workers):
+        def _run():
+            steam_news.prefetch_news(ids, max_workers=workers)
+            return _views()
+        return _run
+
+    modes = {}
+    try:
+        if not args.skip_legacy:
+            def _legacy():
+                found = [legacy_fetch(a) for a in ids]
+                return {"labels": sum(f[0] for f in found), "events": sum(f[1] for f in found)}
+            modes["legacy"] = run_mode(_legacy, base)
+        for w in args.workers:
+            with tempfile.TemporaryDirectory() as tmp:
+                news_store.NEWS_STORE_PATH = Path(tmp) / "news_store.sqlite"
+                steam_news.clear_news_cache()
+                modes[f"cold_w{w}"] = run_mode(_prefetch(w), base)
+                steam_news.clear_news_cache()
+                modes[f"warm_w{w}"] = run_mode(_prefetch(w), base)
+
+                state.cfg["news_now"] = NEWS_NOW + args.advance_days * 86400
+                steam_news.clear_news_cache()
+                for a in ids:
+                    news_store.mark_fetched(a, 0)
+                modes[f"refresh_w{w}"] = run_mode(_prefetch(w), base)
+                modes[f"views_w{w}"]   = run_mode(_views, base)
+                state.cfg["news_now"] = NEWS_NOW
+    finally:
+        upstream_sim.uninstall_redirect()
+        server.shutdown()
+
+    print(f"\n{args.titles} titles, {args.latency_ms:g} ms latency")
+    for name, m in modes.items():
+        extra = "  ".join(f"{k} {v:,}" for k, v in m.items() if k not in ("wall_s", "requests"))
+        print(f"  {name:<14} {m['wall_s']:8.3f}s  {m['requests']:>4} requests  {extra}")
+
+    append_result(Path(args.out), {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "titles":    args.titles,
+        "simulator": sim_cfg,
+        "modes":     modes,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+bench_report_prompt.py — AI report prompt size benchmark (headless, no API calls).
+==================================================================================
+Builds the Steam AI report prompt for synthetic genres of increasing size
+(games with a long-tailed review count, simulator review texts with
+copy-pasted duplicates mixed in) and compares:
+
+    legacy    — the old unbudgeted prompt: every game's full block plus 10
+                most-helpful/longest samples per polarity at 500 characters
+    budgeted  — steam_report.build_analysis_prompt at PROMPT_TOKEN_BUDGET
+
+Reports estimated prompt tokens, build time, samples kept, near-duplicates
+dropped and games condensed/omitted per size. Then the map-reduce pipeline
+(steam_report.summarise_slices) against SimClient, a stand-in for the
+Anthropic client that answers after --latency-ms with canned notes:
+
+    cold      — every slice mapped (plus combine levels if the notes are long)
+    rerun     — the same data again: every step from the cache
+    plus_one  — one more game added: only that game's map step (and the
+                combine step of the group it falls into) goes out
+
+with calls made, wall time, combine levels and the reduce prompt's size. Nothing is sent to Claude.
+The map steps' report_cache is pointed at a throwaway file so runs start cold.
+
+Run:
+    python bench_report_prompt.py                          # 5 / 20 / 60 / 150 games
+    python bench_report_prompt.py --games 10 300 --budget 8000 --latency-ms 800
+
+Results are appended to bench_results/report_prompt.json tagged with the git
+commit.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import report_cache
+import steam_report
+import upstream_sim
+from keyword_engine import KeywordEngine
+from prompt_budget import estimate_tokens
+from review_facets import ReviewFacets
+
+_ENGINE = KeywordEngine({"the", "and", "but", "this", "that", "with", "for", "game", "was", "are", "its"})
+
+
+def extract_keywords(texts: list[str], top_n: int = 30) -> list[tuple[str, int]]:
+    return _ENGINE.top_terms(texts, top_n)
+
+
+def synthetic_reviews(n_games: int, rng: random.Random) -> pd.DataFrame:
+    rows = []
+    for g in range(n_games):
+        n   = max(20, int(rng.lognormvariate(6, 1.1)))
+        pos = rng.uniform(0.35, 0.95)
+        dup = None
+        for _ in range(n):
+            up   = rng.random() < pos
+            text = " ".join(upstream_sim._review_text(rng, up) for _ in range(rng.randint(1, 6)))
+            if dup and rng.random() < 0.05:
+                text = dup                       # copy-pasted review
+            elif rng.random() < 0.02:
+                dup = text
+            rows.append({"game_title": f"Sim Game {g:03d}", "voted_up": up, "review_text": text,
+                         "author_playtime_hrs": round(rng.lognormvariate(2.5, 1.4), 1),
+                         "votes_helpful": int(rng.paretovariate(1.5)) - 1,
+                         "timestamp_created": 1_700_000_000 + rng.randint(0, 30_000_000)})
+    return pd.DataFrame(rows)
+
+
+class SimClient:
+    """Just enough of anthropic.Anthropic for summarise_slices: messages.create
+    sleeps latency_ms and returns ~350 tokens of notes."""
+
+    def __init__(self, latency_ms: float):
+        self.latency  = latency_ms / 1000
+        self.calls    = 0
+        self._lock    = threading.Lock()
+        self.messages = self
+
+    def create(self, model, max_tokens, system, messages):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        prompt = messages[0]["content"]
+        notes  = "- Verdict: mixed.\n" + "\n".join(f"- Theme {i}: {prompt[i * 40:i * 40 + 60]!r}" for i in range(18))
+        return SimpleNamespace(content=[SimpleNamespace(text=notes)],
+                               usage=SimpleNamespace(input_tokens=estimate_tokens(prompt),
+                                                     output_tokens=estimate_tokens(notes)))
+
+
+def _hit_rate_since(before: dict) -> float:
+    after   = report_cache.hit_rate("steam_map")
+    lookups = {k: after[k] - before[k] for k in ("hits", "misses", "bypassed")}
+    total   = sum(lookups.values())
+    return round(lookups["hits"] / total, 3) if total else 0.0
+
+
+def map_reduce_modes(df: pd.DataFrame, extra: pd.DataFrame, latency_ms: float, focus: str, tone: str) -> dict:
+    modes = {}
+    for name, frame in (("cold", df), ("rerun", df), ("plus_one", pd.concat([df, extra], ignore_index=True))):
+        view   = ReviewFacets(frame).view()
+        sdf    = view.summary()
+        client = SimClient(latency_ms)
+        before = report_cache.hit_rate("steam_map")
+        t = time.perf_counter()
+        notes, stats = steam_report.summarise_slices(client, view, sdf, extract_keywords)
+        prompt, _ = steam_report.build_analysis_prompt(
+            view, sdf, focus, tone, "Sim genre", extract_keywords, notes=notes,
+            token_budget=steam_report.REDUCE_TOKEN_BUDGET)
+        modes[name] = {"wall_s": round(time.perf_counter() - t, 2), "calls": client.calls,
+                       "cached": stats["cached"], "slices": stats["slices"], "levels": stats["levels"],
+                       "reduce_tokens": estimate_tokens(prompt),
+                       "hit_rate": _hit_rate_since(before)}
+        if name == "cold":
+            modes[name]["map_input_tokens"] = stats["input_tokens"]
+    return modes
+
+
+def legacy_prompt_tokens(view, sdf, fixed_tokens: int) -> int:
+    """The pre-budget prompt's size: fixed sections + every full game block + 2 × 10 samples."""
+    n_reviews = len(view.df)
+    blocks = sum(estimate_tokens(steam_report.game_block(view, r, extract_keywords, n_reviews, False)) + 1
+                 for _, r in sdf.iterrows())
+
+    def samples(voted, n=10):
+        sub = view.df[view.df["voted_up"] == voted]
+        sub = sub[sub["review_text"].str.len() > 80]
+        top_helpful = sub.nlargest(n // 2, "votes_helpful")
+        top_long    = sub.iloc[sub["review_text"].str.len().argsort()[::-1].values[: n // 2]]
+        return sum(estimate_tokens(f'  [{r["game_title"]}] (123h playtime, 45 found helpful)\n  "'
+                                   f'{r["review_text"][:500]}"') + 1
+                   for _, r in pd.concat([top_helpful, top_long]).drop_duplicates().iterrows())
+
+    return fixed_tokens + blocks + samples(True) + samples(False)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--games", type=int, nargs="+", default=[5, 20, 60, 150])
+    ap.add_argument("--budget", type=int, default=steam_report.PROMPT_TOKEN_BUDGET)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--latency-ms", type=float, default=400.0, help="SimClient latency per call")
+    ap.add_argument("--out", default=str(RESULTS_DIR / "report_prompt.json"))
+    args = ap.parse_args()
+
+    report_cache.REPORT_CACHE_PATH = Path(tempfile.mkdtemp()) / "report_cache.sqlite"
+    focus = next(iter(steam_report.FOCUS_PROMPTS))
+    tone  = next(iter(steam_report.TONE_PROMPTS))
+    sizes = {}
+    for n_games in args.games:
+        df   = synthetic_reviews(n_games, random.Random(args.seed + n_games))
+        view = ReviewFacets(df).view()
+        sdf  = view.summary()
+
+        t = time.perf_counter()
+        prompt, stats = steam_report.build_analysis_prompt(view, sdf, focus, tone, "Sim genre",
+                                                           extract_keywords, token_budget=args.budget)
+        build_ms = (time.perf_counter() - t) * 1000
+        fixed    = sum(v for k, v in stats["sections"].items() if k not in ("games", "samples"))
+        sizes[n_games] = {
+            "reviews":         len(df),
+            "legacy_tokens":   legacy_prompt_tokens(view, sdf, fixed),
+            "budgeted_tokens": estimate_tokens(prompt),
+            "build_ms":        round(build_ms, 1),
+            **{k: v for k, v in stats.items() if k not in ("tokens", "budget")},
+        }
+        extra = synthetic_reviews(1, random.Random(args.seed - n_games)).assign(game_title="Sim Game new")
+        sizes[n_games]["map_reduce"] = map_reduce_modes(df, extra, args.latency_ms, focus, tone)
+
+    print(f"\nbudget {args.budget:,} tokens")
+    for n_games, m in sizes.items():
+        print(f"  {n_games:>4} games {m['reviews']:>7,} reviews  legacy {m['legacy_tokens']:>7,}  "
+              f"budgeted {m['budgeted_tokens']:>6,} ({m['build_ms']:.0f} ms)  "
+              f"samples {m.get('samples', 0)}  dupes dropped {m.get('duplicates_dropped', 0)}  "
+              f"condensed {m.get('games_condensed', 0)}  omitted {m.get('games_omitted', 0)}")
+        for mode, r in m["map_reduce"].items():
+            print(f"       map-reduce {mode:<9} {r['wall_s']:6.2f}s  {r['calls']:>3} calls  "
+                  f"{r['cached']:>3} cached  {r['slices']} slices  {r['levels']} combine levels  "
+                  f"reduce prompt {r['reduce_tokens']:,}  cache hit rate {r['hit_rate']:.0%}")
+
+    append_result(Path(args.out), {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "budget":    args.budget,
+        "sizes":     sizes,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+bench_review_fetch.py — Steam review collection benchmark (headless).
+=====================================================================
+Pages N games × M reviews through steam_reviews against the local upstream
+simulator and compares:
+
+    sequential  — one game at a time, 0.6 s between pages (the old fetch loop)
+    concurrent  — fetch_reviews_concurrent with the shared per-host throttle
+    store_cold / store_warm (--store) — concurrent with the local review store,
+                  first against an empty temp database, then a second refresh
+
+Run:
+    python bench_review_fetch.py                          # 10 games × 500 reviews
+    python bench_review_fetch.py --games 30 --reviews 1000 --latency-ms 150
+    python bench_review_fetch.py --workers 4 8 --interval 0.25 0.1
+    python bench_review_fetch.py --store                  # add cold vs warm store refresh
+
+Reports wall time, reviews/s, upstream requests and response statuses seen
+by the simulator per mode. Results are appended to
+bench_results/review_fetch.json tagged with the git commit.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import review_store
+import steam_reviews
+import upstream_sim
+
+LEGACY_PAGE_SLEEP_S = 0.6
+
+
+def run_mode(games: list[dict], reviews: int, workers: int, interval: float, base: str,
+             use_store: bool = False) -> dict:
+    steam_reviews.HOST_MIN_INTERVAL_S = interval
+    steam_reviews._HOST_NEXT_SLOT.clear()
+    upstream_sim.reset_stats(base)
+    t = time.perf_counter()
+    results, errors = steam_reviews.fetch_reviews_concurrent(
+        games, reviews, max_workers=workers, use_store=use_store)
+    wall  = time.perf_counter() - t
+    total = sum(len(v) for v in results.values())
+    stats = upstream_sim.fetch_stats(base)
+    return {
+        "workers":       workers,
+        "interval_s":    interval,
+        "wall_s":        round(wall, 3),
+        "reviews":       total,
+        "reviews_per_s": round(total / wall, 1) if wall else 0.0,
+        "requests":      stats["total"],
+        "status":        stats["by_status"],
+        "errors":        len(errors),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--games", type=int, default=10)
+    ap.add_argument("--reviews", type=int, default=500)
+    ap.add_argument("--workers", type=int, nargs="+", default=[steam_reviews.REVIEW_FETCH_WORKERS])
+    ap.add_argument("--interval", type=float, nargs="+", default=[steam_reviews.HOST_MIN_INTERVAL_S])
+    ap.add_argument("--latency-ms", type=float, default=80.0)
+    ap.add_argument("--jitter-ms", type=float, default=30.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--skip-sequential", action="store_true")
+    ap.add_argument("--store", action="store_true", help="also time cold vs warm store refresh")
+    ap.add_argument("--out", default=str(RESULTS_DIR / "review_fetch.json"))
+    args = ap.parse_args()
+
+    sim_cfg = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+               "rate_429": args.rate_429, "reviews_per_app": max(args.reviews, 3000)}
+    server, base, _ = upstream_sim.start_server(0, sim_cfg)
+    upstream_sim.install_redirect(base)
+    games = [{"app_id": 100000 + i, "name": f"Sim Game {i + 1}"} for i in range(args.games)]
+
+    modes = {}
+    try:
+        if not args.skip_sequential:
+            modes["sequential"] = run_mode(games, args.reviews, 1, LEGACY_PAGE_SLEEP_S, base)
+        for w in args.workers:
+            for iv in args.interval:
+                modes[f"concurrent_w{w}_i{iv:g}"] = run_mode(games, args.reviews, w, iv, base)
+        if args.store:
+            with tempfile.TemporaryDirectory() as tmp:
+                review_store.REVIEW_STORE_PATH = Path(tmp) / "review_store.sqlite"
+                for label in ("store_cold", "store_warm"):
+                    modes[label] = run_mode(games, args.reviews, args.workers[0],
+                                            args.interval[0], base, use_store=True)
+    finally:
+        upstream_sim.uninstall_redirect()
+        server.shutdown()
+
+    print(f"\n{args.games} games × {args.reviews} reviews")
+    for name, m in modes.items():
+        print(f"  {name:<24} {m['wall_s']:8.2f}s  {m['reviews']:>6,} reviews  "
+              f"{m['reviews_per_s']:>8.1f}/s  {m['requests']:>4} requests  status {m['status']}")
+
+    append_result(Path(args.out), {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "games":     args.games,
+        "reviews":   args.reviews,
+        "simulator": sim_cfg,
+        "modes":     modes,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
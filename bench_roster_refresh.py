@@ -0,0 +1,230 @@
+"""
+bench_roster_refresh.py — End-to-end roster refresh benchmark (headless).
+========================================================================
+Times the same pipeline the Dashboard runs on a fresh fetch — CSV load,
+snapshot load, parallel _fetch_one_game, compute_period_diff, snapshot save,
+daily cache save — against the local upstream simulator (upstream_sim.py),
+for the FPS, TPS and BOTH rosters. No Streamlit server needed.
+
+Run:
+    python bench_roster_refresh.py                         # 5 iterations per roster
+    python bench_roster_refresh.py --iterations 10 --latency-ms 120 --error-rate 0.05
+    python bench_roster_refresh.py --rosters FPS --warm     # keep caches between iterations
+
+Reports p50/p95 wall time, a per-stage breakdown, upstream request counts
+(from the simulator's /__sim/stats) and peak RSS. Each roster runs in its own
+child process so peak RSS is per-roster rather than cumulative. Results are
+appended to bench_results/roster_refresh.json tagged with the git commit, so
+regressions show up as a diff across commits.
+
+Snapshot and daily-cache writes go to a temp directory — data/ is never
+touched (an existing ccu_snapshots.json is copied in as the starting state).
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT        = Path(__file__).parent
+RESULTS_DIR = ROOT / "bench_results"
+STAGES      = ["csv_load", "snapshot_load", "fetch", "period_diff",
+               "snapshot_save", "daily_cache_save"]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (no numpy needed)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[k]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def append_result(path: Path, run: dict) -> None:
+    """Append one run to a JSON list file under bench_results/."""
+    path.parent.mkdir(exist_ok=True)
+    history = json.loads(path.read_text()) if path.exists() else []
+    history.append(run)
+    path.write_text(json.dumps(history, indent=2))
+
+
+# ─────────────────────────────────────────────────────────────
+# CHILD — one roster, N iterations, inside a fresh interpreter
+# ─────────────────────────────────────────────────────────────
+
+def _reset_fetch_state(common) -> None:
+    """Cold start: drop every in-process cache the fetch path consults."""
+    common.st.cache_data.clear()
+    with common._FIELD_LOCK:
+        common._FIELD_CACHE.clear()
+        common._FIELD_INFLIGHT.clear()
+    with common._BREAKER_LOCK:
+        for b in common._BREAKERS.values():
+            b.update(state="closed", failures=0, probing=False)
+    common._TWITCH_GAME_ID_CACHE.clear()
+
+
+def run_child(genre: str, iterations: int, warm: bool, workdir: Path, sim_base: str) -> dict:
+    import concurrent.futures
+    sys.path.insert(0, str(ROOT))
+    import upstream_sim
+    import common
+
+    # Keep writes out of data/
+    common._snapshot_path = lambda: workdir / "ccu_snapshots.json"
+    common._cache_path    = lambda: workdir / "daily_cache.json"
+
+    if genre == "BOTH":
+        ids    = list(dict.fromkeys(common.FPS_ROSTER_IDS + common.TPS_ROSTER_IDS))
+        roster = [{"app_id": a, **common.GAME_CATALOG[a]} for a in ids if a in common.GAME_CATALOG]
+    else:
+        roster = common.get_roster(genre)
+    roster_ids = frozenset(g["app_id"] for g in roster)
+
+    runs = []
+    for i in range(iterations):
+        if not warm or i == 0:
+            _reset_fetch_state(common)
+        upstream_sim.reset_stats(sim_base)
+        stage = {}
+        t_all = time.perf_counter()
+
+        t = time.perf_counter()
+        historical = common.load_all_historical(roster_ids)
+        raw_data   = common.load_all_raw(roster_ids)
+        stage["csv_load"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        snapshots = common.load_ccu_snapshots()
+        stage["snapshot_load"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda g: common._fetch_one_game(g, historical, raw_data, snapshots), roster))
+        results.sort(key=lambda x: x["ccu"], reverse=True)
+        stage["fetch"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        common.compute_period_diff(raw_data, {r["app_id"]: r["ccu"] for r in results}, days=7)
+        stage["period_diff"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        common.save_ccu_snapshot(results)
+        stage["snapshot_save"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        common.save_daily_cache(genre, [r["app_id"] for r in results], results, "")
+        stage["daily_cache_save"] = time.perf_counter() - t
+
+        wall  = time.perf_counter() - t_all
+        stats = upstream_sim.fetch_stats(sim_base)
+        health = common.summarize_fetch_health(results)
+        runs.append({"wall_s": wall, "stages": stage, "requests": stats["total"],
+                     "requests_by_host": stats["by_host"], "status": stats["by_status"],
+                     "live_count": health["live_count"], "pending_count": health["pending_count"]})
+
+    walls = [r["wall_s"] for r in runs]
+    return {
+        "titles":       len(roster),
+        "iterations":   iterations,
+        "p50_s":        round(percentile(walls, 50), 4),
+        "p95_s":        round(percentile(walls, 95), 4),
+        "stages_p50_s": {s: round(percentile([r["stages"][s] for r in runs], 50), 4) for s in STAGES},
+        "stages_p95_s": {s: round(percentile([r["stages"][s] for r in runs], 95), 4) for s in STAGES},
+        "requests_p50": percentile([r["requests"] for r in runs], 50),
+        "requests_by_host_last": runs[-1]["requests_by_host"],
+        "status_last":  runs[-1]["status"],
+        "live_last":    runs[-1]["live_count"],
+        "pending_last": runs[-1]["pending_count"],
+        "peak_rss_mb":  round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# PARENT — simulator + one child per roster + report
+# ─────────────────────────────────────────────────────────────
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--rosters", nargs="+", default=["FPS", "TPS", "BOTH"])
+    ap.add_argument("--iterations", type=int, default=5)
+    ap.add_argument("--warm", action="store_true", help="keep caches between iterations")
+    ap.add_argument("--latency-ms", type=float, default=40.0)
+    ap.add_argument("--jitter-ms", type=float, default=15.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--out", default=str(RESULTS_DIR / "roster_refresh.json"))
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        res = run_child(args.child, args.iterations, args.warm, Path(args.workdir),
+                        os.environ["UPSTREAM_SIM_URL"])
+        print("BENCH_RESULT " + json.dumps(res))
+        return
+
+    sys.path.insert(0, str(ROOT))
+    import upstream_sim
+    sim_cfg = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+               "error_rate": args.error_rate, "rate_429": args.rate_429}
+    server, base, _ = upstream_sim.start_server(0, sim_cfg)
+
+    report = {}
+    try:
+        for genre in args.rosters:
+            with tempfile.TemporaryDirectory() as tmp:
+                src = ROOT / "data" / "ccu_snapshots.json"
+                if src.exists():
+                    shutil.copy(src, Path(tmp) / "ccu_snapshots.json")
+                proc = subprocess.run(
+                    [sys.executable, __file__, "--child", genre, "--workdir", tmp,
+                     "--iterations", str(args.iterations)] + (["--warm"] if args.warm else []),
+                    env={**os.environ, "UPSTREAM_SIM_URL": base},
+                    capture_output=True, text=True, cwd=ROOT,
+                )
+            line = next((l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT ")), None)
+            if line is None:
+                print(f"{genre}: child failed\n{proc.stderr[-2000:]}", file=sys.stderr)
+                continue
+            report[genre] = json.loads(line[len("BENCH_RESULT "):])
+    finally:
+        server.shutdown()
+
+    for genre, r in report.items():
+        print(f"\n{genre}: {r['titles']} titles × {r['iterations']} iterations — "
+              f"p50 {r['p50_s']:.2f}s · p95 {r['p95_s']:.2f}s · "
+              f"{r['requests_p50']:.0f} requests · peak RSS {r['peak_rss_mb']} MB")
+        for s in STAGES:
+            print(f"  {s:<17} p50 {r['stages_p50_s'][s]*1000:9.1f} ms   p95 {r['stages_p95_s'][s]*1000:9.1f} ms")
+
+    run = {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "mode":      "warm" if args.warm else "cold",
+        "simulator": sim_cfg,
+        "rosters":   report,
+    }
+    append_result(Path(args.out), run)
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_scoring.py — VADER batch scoring throughput benchmark.
+============================================================
+Scores the local review corpus (data/review_store.sqlite, filled by the
+Steam Review Analyzer) through sentiment_scoring with 1, 2, 4 and 8 worker
+processes and reports texts/sec. Caching is bypassed so every run measures
+raw scoring; pool start-up is timed separately from throughput.
+
+Multi-worker runs always go through the process pool. A corpus smaller than
+sentiment_scoring.PARALLEL_MIN_TEXTS would be scored in-process by the app,
+so those rows are flagged "forced" in the output and results.
+
+Run:
+    python bench_scoring.py                       # whole corpus, 1/2/4/8 workers
+    python bench_scoring.py --limit 20000 --workers 1 4
+    python bench_scoring.py --synthetic 50000     # no corpus yet: simulator-style texts
+
+Results are appended to bench_results/scoring.json tagged with the git commit.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import review_store
+import sentiment_scoring
+
+
+def corpus(limit: int | None, synthetic: int) -> tuple[list[str], str]:
+    if not synthetic:
+        texts = [t for t in review_store.load_texts(limit) if t]
+        if texts:
+            return texts, str(review_store.REVIEW_STORE_PATH)
+        synthetic = limit or 20000
+        print("Review store is empty — falling back to synthetic texts.")
+    import upstream_sim
+    rng = random.Random(7)
+    return [upstream_sim._review_text(rng, rng.random() < 0.7) for _ in range(synthetic)], "synthetic"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--limit", type=int, default=None, help="max corpus texts")
+    ap.add_argument("--synthetic", type=int, default=0, help="score N synthetic texts instead")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default=str(RESULTS_DIR / "scoring.json"))
+    args = ap.parse_args()
+
+    if not sentiment_scoring.VADER_AVAILABLE:
+        sys.exit("vaderSentiment is not installed.")
+    texts, source = corpus(args.limit, args.synthetic)
+    norm = [sentiment_scoring.normalize_text(t) for t in texts]
+    print(f"{len(norm):,} texts from {source} · {os.cpu_count()} CPUs")
+    forced = len(norm) < sentiment_scoring.PARALLEL_MIN_TEXTS
+    if forced:
+        print(f"Below PARALLEL_MIN_TEXTS ({sentiment_scoring.PARALLEL_MIN_TEXTS:,}): the app would score "
+              f"this in-process; multi-worker rows force the pool and are marked forced.")
+    parallel_min = sentiment_scoring.PARALLEL_MIN_TEXTS
+    sentiment_scoring.PARALLEL_MIN_TEXTS = 0          # so workers > 1 really uses the pool
+
+    runs = {}
+    for w in args.workers:
+        sentiment_scoring.shutdown_pool()
+        t = time.perf_counter()
+        if w > 1:
+            # Spin up the pool (spawn + lexicon load per worker) outside the timed runs
+            list(sentiment_scoring._get_pool(w).map(sentiment_scoring._analyze_local, [["warm"]] * w))
+        startup = time.perf_counter() - t
+        best = None
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            sentiment_scoring._analyze(norm, workers=w) if w > 1 else sentiment_scoring._analyze_local(norm)
+            elapsed = time.perf_counter() - t
+            best = elapsed if best is None else min(best, elapsed)
+        runs[str(w)] = {"best_s": round(best, 3), "texts_per_s": round(len(norm) / best, 1),
+                        "pool_startup_s": round(startup, 3), "forced": forced and w > 1}
+        print(f"  {w} worker(s): {runs[str(w)]['texts_per_s']:>10,.0f} texts/s  "
+              f"(best of {args.repeat}: {best:.2f}s, pool start-up {startup:.2f}s)"
+              + ("  [forced]" if runs[str(w)]["forced"] else ""))
+    sentiment_scoring.shutdown_pool()
+    sentiment_scoring.PARALLEL_MIN_TEXTS = parallel_min
+
+    append_result(Path(args.out), {
+        "commit":          git_commit(),
+        "timestamp":       datetime.utcnow().isoformat(),
+        "texts":           len(norm),
+        "source":          source,
+        "cpus":            os.cpu_count(),
+        "parallel_min":    parallel_min,
+        "chunk":           sentiment_scoring.PARALLEL_CHUNK,
+        "workers":         runs,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
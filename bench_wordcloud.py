@@ -0,0 +1,140 @@
+"""
+bench_wordcloud.py — Word cloud rendering benchmark (headless).
+===============================================================
+Renders keyword clouds from synthetic top-60 frequency lists and compares:
+
+    legacy      — the old generate_wordcloud_img: WordCloud, then a matplotlib
+                  figure saved at dpi 130 (bbox tight), on the calling thread
+    direct      — wordcloud_render.render_png: WordCloud canvas → PNG via PIL
+    cache_hit   — submit_wordcloud for a key already on disk (temp cache dir)
+    page        — what a rerun waits for: submitting the positive and negative
+                  cloud for an unseen filter (placeholders, render in background)
+
+and the cache hit rate when a filter nudges every count by up to ±--nudge
+percent (the old JSON key missed on any change).
+
+Run:
+    python bench_wordcloud.py                       # 20 clouds
+    python bench_wordcloud.py --clouds 50 --nudge 3
+
+Needs wordcloud (and matplotlib for the legacy mode). Results are appended
+to bench_results/wordcloud.json tagged with the git commit.
+"""
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_roster_refresh import RESULTS_DIR, ROOT, append_result, git_commit
+
+sys.path.insert(0, str(ROOT))
+import wordcloud_render
+
+_VOCAB = [f"{a} {b}".strip() for a in ("", "great", "bad", "new", "ranked", "solo")
+          for b in ("gunplay", "servers", "maps", "netcode", "matchmaking", "cheaters", "graphics",
+                    "story", "progression", "season", "balance", "crashes", "friends", "price")]
+
+
+def synthetic_freqs(rng: random.Random) -> dict[str, int]:
+    words = rng.sample(_VOCAB, wordcloud_render.MAX_WORDS)
+    return {w: int(2000 / (i + 1) ** 0.8) + rng.randint(0, 5) for i, w in enumerate(words)}
+
+
+def nudge(freqs: dict[str, int], pct: float, rng: random.Random) -> dict[str, int]:
+    return {w: max(1, round(c * (1 + rng.uniform(-pct, pct) / 100))) for w, c in freqs.items()}
+
+
+def legacy_render(freqs: dict[str, int], positive: bool) -> bytes:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+    wc = WordCloud(
+        width=800, height=380, background_color="#0d0f1a", max_words=60, font_path=None,
+        collocations=False, prefer_horizontal=0.85, min_font_size=10, max_font_size=120,
+        color_func=wordcloud_render._colour_fn(positive), margin=6,
+    ).generate_from_frequencies(freqs)
+    fig, ax = plt.subplots(figsize=(8, 3.8), facecolor="#0d0f1a")
+    ax.imshow(wc, interpolation="bilinear")
+    ax.axis("off")
+    fig.tight_layout(pad=0)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", facecolor="#0d0f1a", bbox_inches="tight", dpi=130)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def timed(fn, cases) -> dict:
+    times, sizes = [], []
+    for args in cases:
+        t = time.perf_counter()
+        png = fn(*args)
+        times.append((time.perf_counter() - t) * 1000)
+        sizes.append(len(png))
+    return {"mean_ms": round(statistics.mean(times), 2), "max_ms": round(max(times), 2),
+            "png_kb": round(statistics.mean(sizes) / 1024, 1)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--clouds", type=int, default=20)
+    ap.add_argument("--nudge", type=float, default=2.0, help="max ± percent change per count")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--skip-legacy", action="store_true")
+    ap.add_argument("--out", default=str(RESULTS_DIR / "wordcloud.json"))
+    args = ap.parse_args()
+
+    if not wordcloud_render.WORDCLOUD_AVAILABLE:
+        sys.exit("wordcloud is not installed — pip install wordcloud")
+
+    rng   = random.Random(args.seed)
+    cases = [(synthetic_freqs(rng), i % 2 == 0) for i in range(args.clouds)]
+    modes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        wordcloud_render.WORDCLOUD_CACHE_DIR = Path(tmp)
+        if not args.skip_legacy:
+            modes["legacy"] = timed(legacy_render, cases)
+        modes["direct"] = timed(lambda f, p: wordcloud_render.render_png(
+            wordcloud_render.normalise(f), p), cases)
+        for f, p in cases:
+            wordcloud_render.submit_wordcloud(f, p).result()
+        modes["cache_hit"] = timed(lambda f, p: wordcloud_render.submit_wordcloud(f, p).result(), cases)
+
+        fresh = [(synthetic_freqs(rng), True) for _ in range(args.clouds)]
+        t = time.perf_counter()
+        futs = [wordcloud_render.submit_wordcloud(f, p) for f, p in fresh]
+        page_ms = (time.perf_counter() - t) * 1000 / len(fresh) * 2
+        for fut in futs:
+            fut.result()
+        modes["page"] = {"wait_ms_per_rerun": round(page_ms, 2),
+                         "background_ms_per_cloud": round((time.perf_counter() - t) * 1000 / len(fresh), 1)}
+
+        # Nudged filters against the clouds already on disk
+        hits = sum(wordcloud_render.submit_wordcloud(nudge(f, args.nudge, rng), p).done()
+                   for f, p in cases)
+        hit_rate = round(hits / len(cases), 3)
+
+    print(f"\n{args.clouds} clouds × {wordcloud_render.MAX_WORDS} words")
+    for name, m in modes.items():
+        print(f"  {name:<10} " + "  ".join(f"{k} {v}" for k, v in m.items()))
+    print(f"  cache hit rate after ±{args.nudge:g}% nudges: {hit_rate:.0%}")
+
+    append_result(Path(args.out), {
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "clouds":    args.clouds,
+        "nudge_pct": args.nudge,
+        "hit_rate":  hit_rate,
+        "modes":     modes,
+    })
+    print(f"\nAppended results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
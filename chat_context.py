@@ -0,0 +1,134 @@
+"""
+chat_context.py — Follow-up chat requests laid out for Anthropic prompt caching.
+================================================================================
+The chat tabs used to resend, on every turn, one system string holding the
+dataset context and the full report, plus the whole conversation so far.
+Every turn paid full input price (and prefill time) for the same tens of
+thousands of tokens. A chat request is now laid out as:
+
+    system    [ instructions + context      ← cache breakpoint ]  fixed for the session
+              [ summary of older turns ]                          changes once per fold
+    messages  the most recent turns, breakpoint on the newest one
+
+so after the first turn the large block is read from the prompt cache
+(a tenth of the input price, and a much shorter prefill), and the recent
+turns are cached incrementally as well. Older turns are folded into a
+rolling summary FOLD_EVERY messages at a time rather than every turn, so
+the cached prefix stays put between folds.
+
+    build_request()  — system blocks + recent messages, folding first if due
+    stream_reply()   — stream a reply; returns the text and per-turn stats
+                       (time to first token, prompt tokens, cache read/write)
+    turn_caption()   — one-line summary of those stats for the UI
+
+Callers keep the fold state (new_memory()) and the stats in their session;
+a cleared or replaced history is detected here, so resets need no extra call.
+Kept free of Streamlit.
+"""
+
+import hashlib
+import time
+
+import report_cache
+
+RECENT_MESSAGES    = 8      # newest history messages always sent verbatim
+FOLD_EVERY         = 4      # older messages are folded into the summary this many at a time
+SUMMARY_MAX_TOKENS = 400
+_EPHEMERAL         = {"type": "ephemeral"}
+
+_FOLD_SYSTEM = ("You keep a running summary of a follow-up chat about an analysis report. "
+                "Be factual and compact; keep figures, names and any conclusions the user relied on.")
+
+
+def new_memory() -> dict:
+    """Fold state for one conversation: the summary, how many messages it
+    covers, and a digest of those messages."""
+    return {"summary": "", "folded": 0, "digest": ""}
+
+
+def _digest(messages: list[dict]) -> str:
+    h = hashlib.sha1()
+    for m in messages:
+        h.update(f"{m['role']}\0{m['content']}\0".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _fold_prompt(summary: str, turns: list[dict]) -> str:
+    lines = "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in turns)
+    return (f"Summary so far:\n{summary or '(none)'}\n\nNew turns:\n{lines}\n\n"
+            "Rewrite the summary to cover both in at most 200 words: the questions asked, "
+            "the answers and figures given, and anything left open.")
+
+
+def _fold(client, model: str, history: list[dict], memory: dict) -> None:
+    """Fold messages older than the recent window into memory's summary, once
+    FOLD_EVERY of them have piled up. The kept window starts on a user turn."""
+    if memory["folded"] and (memory["folded"] > len(history)
+                             or _digest(history[:memory["folded"]]) != memory["digest"]):
+        memory.update(new_memory())                # history was cleared or replaced
+    cut = len(history) - RECENT_MESSAGES
+    if cut - memory["folded"] < FOLD_EVERY:
+        return
+    while cut < len(history) and history[cut]["role"] != "user":
+        cut += 1
+    try:
+        summary, _ = report_cache.complete(client, "chat_summary", model, SUMMARY_MAX_TOKENS,
+                                           _fold_prompt(memory["summary"], history[memory["folded"]:cut]),
+                                           system=_FOLD_SYSTEM)
+    except Exception:
+        return                                     # send the turns verbatim this time
+    memory.update(summary=summary, folded=cut, digest=_digest(history[:cut]))
+
+
+def _with_breakpoint(message: dict) -> dict:
+    return {"role": message["role"],
+            "content": [{"type": "text", "text": message["content"], "cache_control": _EPHEMERAL}]}
+
+
+def build_request(client, model: str, max_tokens: int, system: str, history: list[dict],
+                  memory: dict, summary_model: str | None = None) -> dict:
+    """messages.stream kwargs for the next reply to history (which ends on the
+    user's new message). system is the stable instructions + context text."""
+    _fold(client, summary_model or model, history, memory)
+    blocks = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+    if memory["summary"]:
+        blocks.append({"type": "text", "text": f"## Earlier in this conversation (summary)\n\n{memory['summary']}"})
+    messages = [{"role": m["role"], "content": m["content"]} for m in history[memory["folded"]:]]
+    if messages:
+        messages[-1] = _with_breakpoint(messages[-1])
+    return {"model": model, "max_tokens": max_tokens, "system": blocks, "messages": messages}
+
+
+def stream_reply(client, request: dict, on_text=None) -> tuple[str, dict]:
+    """(reply, stats) for request; on_text(text_so_far) is called per delta."""
+    t0, ttft, text = time.perf_counter(), None, ""
+    with client.messages.stream(**request) as stream:
+        for delta in stream.text_stream:
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+            text += delta
+            if on_text:
+                on_text(text)
+        final = stream.get_final_message()
+    total = time.perf_counter() - t0
+    usage = getattr(final, "usage", None)
+    read  = getattr(usage, "cache_read_input_tokens", 0) or 0
+    write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    fresh = getattr(usage, "input_tokens", 0) or 0
+    return text, {
+        "ttft_s":             round(ttft if ttft is not None else total, 2),
+        "total_s":            round(total, 2),
+        "prompt_tokens":      fresh + read + write,
+        "cache_read_tokens":  read,
+        "cache_write_tokens": write,
+        "output_tokens":      getattr(usage, "output_tokens", 0) or 0,
+    }
+
+
+def turn_caption(stats: dict, memory: dict | None = None) -> str:
+    """One-line summary of a stream_reply stats dict."""
+    parts = [f"First token {stats['ttft_s']:.1f}s",
+             f"prompt {stats['prompt_tokens']:,} tokens ({stats['cache_read_tokens']:,} from cache)"]
+    if memory and memory["folded"]:
+        parts.append(f"{memory['folded']} earlier messages summarised")
+    return " · ".join(parts)
@@ -43,28 +43,19 @@ import plotly.graph_objects as go
 import streamlit as st
 import streamlit.components.v1 as _st_components
 
-try:
-    import markdown as _md_lib
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+from steam_news import prefetch_news, update_labels
+from lazy_imports import lazy_module, module_available
+from chat_context import new_memory as new_chat_memory
+import upstream_sim
 
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    from reportlab.lib import colors as _rl_colors
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Preformatted
-    import io as _rl_io
-    _REPORTLAB_AVAILABLE = True
-except ImportError:
-    _REPORTLAB_AVAILABLE = False
+# Heavy optional dependencies load on first use (see lazy_imports.py)
+_md_lib    = lazy_module("markdown")
+_anthropic = lazy_module("anthropic")
+MARKDOWN_AVAILABLE   = _md_lib is not None
+ANTHROPIC_AVAILABLE  = _anthropic is not None
+_REPORTLAB_AVAILABLE = module_available("reportlab")   # imported in report_to_pdf
 
-try:
-    import anthropic as _anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+upstream_sim.install_from_env()   # no-op unless UPSTREAM_SIM_URL is set — see upstream_sim.py
 
 # ─────────────────────────────────────────────────────────────
 # HTML TABLE HELPER
@@ -864,66 +855,18 @@ TPS_ROSTER_IDS = [
 # NOTABLE EVENTS PER GAME  (date → label for chart annotations)
 # ─────────────────────────────────────────────────────────────
 
-# Steam News API — replaces hardcoded GAME_EVENTS
-STEAM_NEWS_URL = "https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/"
-
-# Keywords that suggest a meaningful update (patch notes, seasons, DLC, major releases)
-_NEWS_KEYWORDS = [
-    "update", "patch", "season", "dlc", "expansion", "launch", "release",
-    "major", "anniversary", "free", "wipe", "reset", "event", "content",
-    "chapter", "operation", "overhaul", "rework", "battle pass", "new map",
-    "new mode", "hotfix", "balance", "2.0", "3.0",
-]
-
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_steam_news(app_id: int, count: int = 100) -> list[tuple[str, str]]:
-    """
-    Fetch latest news for a game from the Steam News API.
-    Returns list of (YYYY-MM, title) tuples filtered to meaningful update events,
-    deduplicated to one event per month (the most prominent).
-    """
-    try:
-        r = requests.get(
-            STEAM_NEWS_URL,
-            params={
-                "appid":     app_id,
-                "count":     count,
-                "maxlength": 0,       # titles only, no body content
-                "format":    "json",
-            },
-            timeout=10,
-        )
-        if not r.ok:
-            return []
-        items = r.json().get("appnews", {}).get("newsitems", [])
-    except Exception:
-        return []
+# Steam News API — replaces hardcoded GAME_EVENTS. Items are fetched, stored
+# and filtered in steam_news; these wrappers are what the pages call.
 
-    events: dict[str, str] = {}  # month -> best label (dedup to 1 per month)
-    for item in items:
-        title = item.get("title", "").strip()
-        ts    = item.get("date", 0)
-        if not title or not ts:
-            continue
-        title_lower = title.lower()
-        if not any(kw in title_lower for kw in _NEWS_KEYWORDS):
-            continue
-        from datetime import datetime, timezone
-        dt    = datetime.fromtimestamp(ts, tz=timezone.utc)
-        month = dt.strftime("%Y-%m")
-        # Truncate long titles for annotation legibility
-        label = title[:40].rstrip() + ("…" if len(title) > 40 else "")
-        # Keep shortest/clearest label per month (prefer patch notes)
-        if month not in events or len(label) < len(events[month]):
-            events[month] = label
+def get_game_events(app_id: int) -> list[tuple[str, str]]:
+    """(YYYY-MM, label) per month with a notable update, oldest → newest."""
+    return update_labels(app_id)
 
-    # Return sorted oldest → newest
-    return sorted(events.items())
 
+def prefetch_game_events(app_ids) -> None:
+    """Refresh news for several titles in parallel before a chart reads them."""
+    prefetch_news(app_ids)
 
-def get_game_events(app_id: int) -> list[tuple[str, str]]:
-    """Wrapper — fetches from Steam News API with caching."""
-    return fetch_steam_news(app_id)
 
 def get_roster(genre: str = "FPS") -> list[dict]:
     """Return roster list for given genre, merging catalog metadata."""
@@ -969,22 +912,138 @@ _STEAM_CCU_SEM = threading.Semaphore(6)
 _STEAMSPY_SEM  = threading.Semaphore(4)
 
 
+# Per-upstream circuit breakers. Retries protect against a single blip, but
+# when an upstream is actually down every title still walks through three
+# retries with backoff, multiplying the outage into minutes of blocked worker
+# threads. After BREAKER_FAIL_THRESHOLD consecutive failed calls the breaker
+# opens and calls fail fast (returning None, so callers take their existing
+# cache/CSV fallbacks). After BREAKER_COOLDOWN_S one half-open probe call is
+# let through; success closes the breaker, failure re-opens it.
+# Only timeouts, connection errors, 429 and 5xx count as failures — a 4xx for
+# one bad app_id says nothing about the upstream's health.
+BREAKER_FAIL_THRESHOLD = 5
+BREAKER_COOLDOWN_S     = 60.0
+
+UPSTREAMS = {
+    "steam_api":   "Steam Web API (CCU, News)",
+    "steam_store": "Steam Store (appreviews)",
+    "steamspy":    "SteamSpy",
+    "twitch":      "Twitch Helix",
+}
+_BREAKERS: dict[str, dict] = {
+    name: {"state": "closed", "failures": 0, "opened_at": 0.0, "probing": False, "trips": 0}
+    for name in UPSTREAMS
+}
+_BREAKER_LOCK = threading.Lock()
+
+
+class UpstreamShortCircuit(Exception):
+    """Raised inside the st.cache_data fetchers while an upstream's breaker is
+    open. Streamlit does not memoise exceptions, so the fast-fail is not cached
+    for the fetcher's TTL; the public wrappers turn it back into their usual
+    empty value."""
+
+
+def _breaker_allow(upstream: str | None) -> bool | str:
+    """Truthy if a call to this upstream may proceed — "probe" when it is the
+    single call a half-open breaker lets through. An open breaker whose
+    cooldown has elapsed moves to half_open and admits exactly one probe."""
+    if upstream not in _BREAKERS:
+        return True
+    with _BREAKER_LOCK:
+        b = _BREAKERS[upstream]
+        if b["state"] == "closed":
+            return True
+        if b["state"] == "open" and time.time() - b["opened_at"] >= BREAKER_COOLDOWN_S:
+            b["state"] = "half_open"
+            b["probing"] = False
+        if b["state"] == "half_open" and not b["probing"]:
+            b["probing"] = True
+            return "probe"
+        return False
+
+
+def _breaker_record(upstream: str | None, ok: bool) -> None:
+    """Record the outcome of one call (after its retries) to an upstream."""
+    if upstream not in _BREAKERS:
+        return
+    with _BREAKER_LOCK:
+        b = _BREAKERS[upstream]
+        b["probing"] = False
+        if ok:
+            b["state"], b["failures"] = "closed", 0
+            return
+        b["failures"] += 1
+        if b["state"] == "half_open" or b["failures"] >= BREAKER_FAIL_THRESHOLD:
+            if b["state"] != "open":
+                b["trips"] += 1
+            b["state"], b["opened_at"] = "open", time.time()
+
+
+def breaker_is_open(upstream: str) -> bool:
+    """True while calls to this upstream are being short-circuited."""
+    with _BREAKER_LOCK:
+        return _BREAKERS.get(upstream, {}).get("state") == "open"
+
+
+def reset_breaker(upstream: str) -> None:
+    """Force a breaker to half_open so the next call is a real probe —
+    used by run_connectivity_probe() so an explicit check always hits the
+    network rather than reporting a short-circuit."""
+    with _BREAKER_LOCK:
+        b = _BREAKERS.get(upstream)
+        if b and b["state"] == "open":
+            b["state"], b["probing"] = "half_open", False
+
+
+def circuit_breaker_status() -> list[dict]:
+    """Snapshot of every upstream breaker for the Admin page / health summary."""
+    now = time.time()
+    with _BREAKER_LOCK:
+        return [{
+            "upstream":   name,
+            "label":      UPSTREAMS[name],
+            "state":      b["state"],
+            "failures":   b["failures"],
+            "trips":      b["trips"],
+            "retry_in_s": (max(0, round(BREAKER_COOLDOWN_S - (now - b["opened_at"])))
+                           if b["state"] == "open" else 0),
+        } for name, b in _BREAKERS.items()]
+
+
 def _http_get_with_retry(url: str, params: dict, timeout: float,
-                         max_retries: int = 3, base_delay: float = 0.6) -> requests.Response | None:
+                         max_retries: int = 3, base_delay: float = 0.6,
+                         upstream: str | None = None) -> requests.Response | None:
     """GET with retry-with-backoff. Returns the response on success (status
     200-299), or None if every attempt failed (timeout, connection error, or
     non-2xx status). Used by fetch_ccu / fetch_steamspy / fetch_steam_reviews
     so a single rate-limited or transiently-failed request doesn't silently
-    zero out that title for the rest of the cache TTL."""
+    zero out that title for the rest of the cache TTL.
+
+    upstream names the circuit breaker (see UPSTREAMS) guarding this call:
+    while it is open this raises UpstreamShortCircuit immediately (so the
+    cached caller doesn't memoise it), and a half-open probe gets a single
+    attempt with no retries."""
+    admitted = _breaker_allow(upstream)
+    if not admitted:
+        raise UpstreamShortCircuit(upstream)
+    if admitted == "probe":
+        max_retries = 1
+    healthy = False
     for attempt in range(max_retries):
         try:
             r = requests.get(url, params=params, timeout=timeout)
             if r.ok:
+                _breaker_record(upstream, True)
                 return r
+            healthy = r.status_code != 429 and r.status_code < 500
         except Exception:
-            pass
+            healthy = False
         if attempt < max_retries - 1:
+            if upstream is not None and breaker_is_open(upstream):
+                break             # another worker tripped it — stop hammering
             time.sleep(base_delay * (2 ** attempt) + random.uniform(0, 0.25))
+    _breaker_record(upstream, healthy)
     return None
 
 # ── Twitch Helix API ─────────────────────────────────────────
@@ -1050,6 +1109,8 @@ def _twitch_game_id(game_name: str) -> str | None:
     if not token:
         _TWITCH_GAME_ID_CACHE[game_name] = None
         return None
+    if not _breaker_allow("twitch"):
+        raise UpstreamShortCircuit("twitch")   # don't cache the miss — retry once the breaker closes
     try:
         r = requests.get(
             TWITCH_GAMES_URL,
@@ -1060,19 +1121,20 @@ def _twitch_game_id(game_name: str) -> str | None:
             },
             timeout=8,
         )
+        _breaker_record("twitch", r.status_code != 429 and r.status_code < 500)
         if r.ok:
             data = r.json().get("data", [])
             gid  = data[0]["id"] if data else None
             _TWITCH_GAME_ID_CACHE[game_name] = gid
             return gid
     except Exception:
-        pass
+        _breaker_record("twitch", False)
     _TWITCH_GAME_ID_CACHE[game_name] = None
     return None
 
 
 @st.cache_data(ttl=300, show_spinner=False)
-def fetch_twitch_viewers(app_id: int, game_name: str) -> int | None:
+def _fetch_twitch_viewers_cached(app_id: int, game_name: str) -> int | None:
     """
     Return total live viewer count on Twitch (sum across top-100 streams).
     Returns None when TWITCH_CLIENT_ID is not configured or the game isn't found.
@@ -1090,6 +1152,8 @@ def fetch_twitch_viewers(app_id: int, game_name: str) -> int | None:
     token = _get_twitch_token()
     if not token:
         return None
+    if not _breaker_allow("twitch"):
+        raise UpstreamShortCircuit("twitch")
     try:
         r = requests.get(
             TWITCH_STREAMS_URL,
@@ -1100,12 +1164,22 @@ def fetch_twitch_viewers(app_id: int, game_name: str) -> int | None:
             },
             timeout=10,
         )
+        _breaker_record("twitch", r.status_code != 429 and r.status_code < 500)
         if r.ok:
             return sum(s.get("viewer_count", 0) for s in r.json().get("data", []))
     except Exception:
-        pass
+        _breaker_record("twitch", False)
     return None
 
+
+def fetch_twitch_viewers(app_id: int, game_name: str) -> int | None:
+    """Cached Twitch viewer total (5 min); None while the Twitch breaker is
+    open, without caching that None."""
+    try:
+        return _fetch_twitch_viewers_cached(app_id, game_name)
+    except UpstreamShortCircuit:
+        return None
+
 # ─────────────────────────────────────────────────────────────
 # STEAMDB HISTORICAL CSV LOADER
 # ─────────────────────────────────────────────────────────────
@@ -1852,6 +1926,7 @@ def _run_monday_archive() -> None:
 
 
 _scheduler_started = False   # module-level flag — common.py is imported once per process
+SCHEDULER_START_DELAY_S = 5.0   # APScheduler loads after the first page has rendered
 
 def _start_scheduler() -> None:
     """Start the APScheduler background thread (idempotent — safe to call from
@@ -1886,8 +1961,11 @@ def _start_scheduler() -> None:
         pass  # Already running or other issue — fail silently
 
 
-# Start scheduler on module load
-_start_scheduler()
+# Start the scheduler shortly after module load, off the import path — importing
+# APScheduler and starting its thread would otherwise add to every cold start
+_sched_timer = threading.Timer(SCHEDULER_START_DELAY_S, _start_scheduler)
+_sched_timer.daemon = True
+_sched_timer.start()
 
 # ─────────────────────────────────────────────────────────────
 # CCU SNAPSHOT PERSISTENCE
@@ -1920,11 +1998,15 @@ def save_ccu_snapshot(ccu_data: list[dict]) -> None:
 
     Retention is 400 days so compute_yoy_from_snapshots() has a full 12-month
     window plus a 30-day tolerance band on either side.
+
+    A CCU that is still pending or stale (last-good value from cache, not
+    fetched this run) is left out of "data" so it isn't re-stamped as today's.
     """
     snapshots = load_ccu_snapshots()
     entry = {
         "ts":      datetime.utcnow().isoformat(),
-        "data":    {str(r["app_id"]): r["ccu"] for r in ccu_data},
+        "data":    {str(r["app_id"]): r["ccu"] for r in ccu_data
+                    if "ccu" not in (r.get("pending") or []) + (r.get("stale") or [])},
         "reviews": {
             str(r["app_id"]): (r.get("pos_reviews", 0) or 0) + (r.get("neg_reviews", 0) or 0)
             for r in ccu_data
@@ -2026,11 +2108,11 @@ PRESET_QUERIES = [
 STEAMSPY_URL = "https://steamspy.com/api.php"
 
 @st.cache_data(ttl=300, show_spinner=False)
-def fetch_ccu(app_id: int) -> int | None:
+def _fetch_ccu_cached(app_id: int) -> int | None:
     """Fetch live concurrent player count from the Steam public API.
     Retries transient failures (timeout, connection error, non-2xx) up to
     3 times with backoff before giving up — see _http_get_with_retry()."""
-    r = _http_get_with_retry(CCU_URL, {"appid": app_id}, timeout=8)
+    r = _http_get_with_retry(CCU_URL, {"appid": app_id}, timeout=8, upstream="steam_api")
     if r is None:
         return None
     try:
@@ -2038,13 +2120,21 @@ def fetch_ccu(app_id: int) -> int | None:
     except Exception:
         return None
 
+def fetch_ccu(app_id: int) -> int | None:
+    """Live CCU, cached 5 min; None while the Steam API breaker is open
+    (not cached, so the title recovers as soon as the breaker closes)."""
+    try:
+        return _fetch_ccu_cached(app_id)
+    except UpstreamShortCircuit:
+        return None
+
 @st.cache_data(ttl=3600, show_spinner=False)
-def fetch_steam_reviews(app_id: int) -> int | None:
+def _fetch_steam_reviews_cached(app_id: int) -> int | None:
     """Fallback: fetch all-time review score from Steam store API."""
     r = _http_get_with_retry(
         f"https://store.steampowered.com/appreviews/{app_id}",
         {"json": 1, "language": "all", "review_type": "all", "purchase_type": "all"},
-        timeout=8,
+        timeout=8, upstream="steam_store",
     )
     if r is None:
         return None
@@ -2058,8 +2148,15 @@ def fetch_steam_reviews(app_id: int) -> int | None:
         pass
     return None
 
+def fetch_steam_reviews(app_id: int) -> int | None:
+    """Review score fallback, cached 1 h; None while the store breaker is open (not cached)."""
+    try:
+        return _fetch_steam_reviews_cached(app_id)
+    except UpstreamShortCircuit:
+        return None
+
 @st.cache_data(ttl=3600, show_spinner=False)
-def fetch_steamspy(app_id: int) -> dict:
+def _fetch_steamspy_cached(app_id: int) -> dict:
     """
     Fetch game data from SteamSpy (no API key required, updates daily).
     Returns fields including:
@@ -2070,6 +2167,7 @@ def fetch_steamspy(app_id: int) -> dict:
     """
     r = _http_get_with_retry(
         STEAMSPY_URL, {"request": "appdetails", "appid": app_id}, timeout=12,
+        upstream="steamspy",
     )
     if r is None:
         return {}
@@ -2078,6 +2176,13 @@ def fetch_steamspy(app_id: int) -> dict:
     except Exception:
         return {}
 
+def fetch_steamspy(app_id: int) -> dict:
+    """SteamSpy appdetails, cached 1 h; {} while the SteamSpy breaker is open (not cached)."""
+    try:
+        return _fetch_steamspy_cached(app_id)
+    except UpstreamShortCircuit:
+        return {}
+
 def parse_yoy_from_steamspy(ss: dict) -> tuple[str, int]:
     """
     Derive a YoY proxy from SteamSpy's playtime data.
@@ -2102,11 +2207,227 @@ def parse_yoy_from_steamspy(ss: dict) -> tuple[str, int]:
     return f"{sign}{pct}%", pct
 
 
+# Fields that come from slower, optional upstreams (Twitch, the Steam store
+# review fallback). In progressive mode the Dashboard fetches these in a
+# second pass so a slow Twitch/store call never holds back a title's row.
+LATE_FIELDS = ("twitch_viewers", "review_pct")
+
+# Overall time budget for one title's independent upstream calls. CCU,
+# SteamSpy and Twitch each retry up to 3× with 8–12s timeouts, so done
+# serially a single bad upstream used to hold one title for 60+ seconds.
+# They now run concurrently on _FIELD_POOL; anything still running when the
+# budget expires is served from _FIELD_CACHE (last good value this process
+# saw) and listed under the row's "pending" key. The in-flight call is NOT
+# cancelled — _fetch_late_fields() can still collect it afterwards.
+FETCH_DEADLINE_S     = 10.0
+LATE_FIELD_TIMEOUT_S = 30.0
+
+_FIELD_POOL       = concurrent.futures.ThreadPoolExecutor(max_workers=24, thread_name_prefix="field")
+_FIELD_CACHE: dict[tuple[str, int], object] = {}                      # (field, app_id) → last good value
+_FIELD_INFLIGHT: dict[tuple[str, int], concurrent.futures.Future] = {}  # (field, app_id) → call not yet collected
+_FIELD_LOCK       = threading.Lock()
+
+
+def _ccu_job(app_id: int) -> int | None:
+    with _STEAM_CCU_SEM:
+        ccu = fetch_ccu(app_id)
+        time.sleep(0.08)          # polite pause while holding the semaphore
+    return ccu
+
+
+def _steamspy_job(app_id: int) -> dict:
+    with _STEAMSPY_SEM:
+        ss = fetch_steamspy(app_id)
+        time.sleep(0.12)          # polite pause while holding the semaphore
+    return ss
+
+
+def _remember_field(key: tuple[str, int], fut: concurrent.futures.Future) -> None:
+    """Done-callback: keep the last non-empty value per (field, app_id). The
+    future itself stays in _FIELD_INFLIGHT until someone collects it, so a
+    call that lands after the deadline but before _fetch_late_fields() runs
+    is still picked up rather than re-requested."""
+    try:
+        value = fut.result()
+    except Exception:
+        value = None
+    if value not in (None, {}):
+        with _FIELD_LOCK:
+            _FIELD_CACHE[key] = value
+
+
+def _take_field(name: str, app_id: int) -> concurrent.futures.Future | None:
+    """Claim the uncollected call for (field, app_id), running or finished."""
+    with _FIELD_LOCK:
+        return _FIELD_INFLIGHT.pop((name, app_id), None)
+
+
+def _release_field(key: tuple[str, int], fut: concurrent.futures.Future) -> None:
+    """Drop fut from _FIELD_INFLIGHT once its result has been used."""
+    with _FIELD_LOCK:
+        if _FIELD_INFLIGHT.get(key) is fut:
+            del _FIELD_INFLIGHT[key]
+
+
+def _submit_field(name: str, app_id: int, fn, *args) -> concurrent.futures.Future:
+    """Submit one field fetch, reusing a call that is still running for the
+    same (field, app_id) — e.g. one left running by an earlier deadline miss —
+    instead of sending a duplicate request upstream. A finished but
+    uncollected call is replaced: a new fetch wants a fresh value."""
+    key = (name, app_id)
+    with _FIELD_LOCK:
+        fut = _FIELD_INFLIGHT.get(key)
+        if fut is not None and not fut.done():
+            return fut
+        fut = _FIELD_POOL.submit(fn, *args)
+        _FIELD_INFLIGHT[key] = fut
+    fut.add_done_callback(lambda f, k=key: _remember_field(k, f))
+    return fut
+
+
+# Which circuit breaker (see UPSTREAMS) guards each row field.
+FIELD_UPSTREAM = {
+    "ccu":            "steam_api",
+    "steamspy":       "steamspy",
+    "twitch_viewers": "twitch",
+    "review_pct":     "steam_store",
+}
+
+
+def _fetch_fields_with_deadline(app_id: int, jobs: dict[str, tuple],
+                                budget_s: float) -> tuple[dict, list[str], list[str]]:
+    """Run independent field fetches concurrently under one time budget.
+
+    jobs: {field_name: (fn, *args)}. Returns (values, pending, stale):
+      pending — fields that missed the budget; value is the cached last-good
+                one (or None) and the call is still in flight
+      stale   — fields whose upstream circuit breaker is open; the call
+                failed fast and the value is the cached last-good one
+    """
+    futs = {name: _submit_field(name, app_id, *job) for name, job in jobs.items()}
+    concurrent.futures.wait(futs.values(), timeout=max(budget_s, 0.0))
+    values, pending, stale = {}, [], []
+    for name, fut in futs.items():
+        if fut.done():
+            _release_field((name, app_id), fut)
+            try:
+                values[name] = fut.result()
+            except Exception:
+                values[name] = None
+            if values[name] in (None, {}) and breaker_is_open(FIELD_UPSTREAM.get(name, "")):
+                with _FIELD_LOCK:
+                    values[name] = _FIELD_CACHE.get((name, app_id), values[name])
+                stale.append(name)
+        else:
+            with _FIELD_LOCK:
+                values[name] = _FIELD_CACHE.get((name, app_id))
+            pending.append(name)
+    return values, pending, stale
+
+
+def _await_field(name: str, app_id: int, timeout: float):
+    """Collect a field left in flight by a deadline miss, whether it is still
+    running or has finished since. Returns the cached last-good value if it
+    doesn't finish within timeout, fails, or nothing is left to collect."""
+    fut = _take_field(name, app_id)
+    if fut is not None:
+        try:
+            return fut.result(timeout=timeout)
+        except Exception:
+            pass
+    with _FIELD_LOCK:
+        return _FIELD_CACHE.get((name, app_id))
+
+
+def _collect_or_fetch(name: str, app_id: int, timeout: float, fn, *args):
+    """Collect the uncollected call for this field if there is one (claimed
+    under the lock, so it can't be lost in between), otherwise call fn(*args)
+    directly."""
+    fut = _take_field(name, app_id)
+    if fut is None:
+        return fn(*args)
+    try:
+        return fut.result(timeout=timeout)
+    except Exception:
+        with _FIELD_LOCK:
+            return _FIELD_CACHE.get((name, app_id))
+
+
+def _steamspy_review_fields(ss: dict) -> dict:
+    """Review counts/score and recent playtime derived from a SteamSpy payload."""
+    pos_reviews = ss.get("positive", 0) or 0
+    neg_reviews = ss.get("negative", 0) or 0
+    total_rev   = pos_reviews + neg_reviews
+    return {
+        "pos_reviews": pos_reviews,
+        "neg_reviews": neg_reviews,
+        "review_pct":  round(pos_reviews / total_rev * 100) if total_rev else None,
+        "avg_2w_hrs":  round((ss.get("average_2weeks", 0) or 0) / 60, 1),
+    }
+
+
+def last_known_ccu(snapshots: list[dict], raw_data: dict[int, pd.DataFrame],
+                   app_id: int) -> int:
+    """Best pre-fetch guess at a title's CCU — the newest saved snapshot,
+    else the last CSV row, else 0. Used to order the roster so the biggest
+    titles are fetched (and rendered) first."""
+    for s in reversed(snapshots or []):
+        v = (s.get("data") or {}).get(str(app_id))
+        if v:
+            return int(v)
+    return get_csv_last_ccu(raw_data, app_id) or 0
+
+
+def order_roster_by_last_ccu(roster: list[dict], snapshots: list[dict],
+                             raw_data: dict[int, pd.DataFrame]) -> list[dict]:
+    """Return roster sorted by last-known CCU, largest first (top-N first)."""
+    return sorted(roster, key=lambda g: last_known_ccu(snapshots, raw_data, g["app_id"]),
+                  reverse=True)
+
+
+def _fetch_late_fields(row: dict, timeout: float = LATE_FIELD_TIMEOUT_S) -> dict:
+    """Second-pass fetch for everything listed in row["pending"] — LATE_FIELDS
+    skipped via include_late=False, plus any field that missed the
+    FETCH_DEADLINE_S budget. Deadline misses are collected from the call
+    still in flight rather than re-requested. Returns only the updated keys
+    so the caller can merge them into the already-rendered row."""
+    app_id  = row["app_id"]
+    pending = set(row.get("pending") or [])
+    out: dict = {"pending": []}
+
+    if "ccu" in pending:
+        ccu = _await_field("ccu", app_id, timeout)
+        if ccu:
+            out.update(ccu=ccu, ccu_live=True, ccu_from_csv=False)
+        else:
+            out["stale"] = [*row.get("stale", []), "ccu"]   # still the cached value
+
+    if "steamspy" in pending:
+        ss = _await_field("steamspy", app_id, timeout) or {}
+        if ss:
+            out.update(_steamspy_review_fields(ss))
+            if row.get("yoy_source") == "steamspy":
+                out["yoy"], out["yoy_val"] = parse_yoy_from_steamspy(ss)
+
+    if "twitch_viewers" in pending:
+        out["twitch_viewers"] = _collect_or_fetch("twitch_viewers", app_id, timeout,
+                                                  fetch_twitch_viewers, app_id, row["name"])
+
+    review_pct = out.get("review_pct", row.get("review_pct"))
+    if review_pct is None and pending & {"review_pct", "steamspy"}:
+        # fallback to Steam store API
+        review_pct = _collect_or_fetch("review_pct", app_id, timeout, fetch_steam_reviews, app_id)
+    out["review_pct"] = review_pct
+    return out
+
+
 def _fetch_one_game(
     game: dict,
     historical: dict[int, pd.DataFrame],
     raw_data: dict[int, pd.DataFrame],
     snapshots: list[dict],
+    include_late: bool = True,
+    budget_s: float = FETCH_DEADLINE_S,
 ) -> dict:
     """Fetch all external data for a single game.
 
@@ -2124,22 +2445,33 @@ def _fetch_one_game(
     was. fetch_ccu/fetch_steamspy themselves retry transient failures with
     backoff — see _http_get_with_retry().
 
+    CCU, SteamSpy and Twitch are independent, so they run concurrently under
+    a single budget_s deadline (see FETCH_DEADLINE_S). A field that misses it
+    is filled from the last good value and listed under "pending".
+
     YoY priority: snapshot-based (real) → SteamDB CSV → SteamSpy proxy
+
+    include_late=False skips LATE_FIELDS (Twitch + store review fallback) and
+    lists them under "pending" — the progressive Dashboard fills them in
+    afterwards via _fetch_late_fields().
     """
     app_id = game["app_id"]
+    t0     = time.monotonic()
 
-    # ── Steam live CCU ──
-    with _STEAM_CCU_SEM:
-        ccu = fetch_ccu(app_id)
-        time.sleep(0.08)          # polite pause while holding the semaphore
-
-    # ── SteamSpy ── (one call; reused for both YoY proxy and reviews)
-    with _STEAMSPY_SEM:
-        ss = fetch_steamspy(app_id)
-        time.sleep(0.12)          # polite pause while holding the semaphore
-
-    # ── Twitch live viewers ── (graceful no-op when credentials absent)
-    twitch_viewers = fetch_twitch_viewers(app_id, game["name"])
+    # ── Steam live CCU + SteamSpy + Twitch, concurrently under one budget ──
+    jobs = {
+        "ccu":      (_ccu_job, app_id),
+        "steamspy": (_steamspy_job, app_id),   # one call; reused for YoY proxy and reviews
+    }
+    if include_late:
+        # graceful no-op when Twitch credentials are absent
+        jobs["twitch_viewers"] = (fetch_twitch_viewers, app_id, game["name"])
+    values, pending, stale = _fetch_fields_with_deadline(app_id, jobs, budget_s)
+    ccu            = values["ccu"]
+    ss             = values["steamspy"] or {}
+    twitch_viewers = values.get("twitch_viewers")
+    if not include_late:
+        pending += list(LATE_FIELDS)
 
     # ── Historical CSV data ──
     hist_df  = historical.get(app_id)
@@ -2163,17 +2495,33 @@ def _fetch_one_game(
         hist_summary = {}
 
     # ── Reviews ──
-    pos_reviews = ss.get("positive", 0) or 0
-    neg_reviews = ss.get("negative", 0) or 0
-    total_rev   = pos_reviews + neg_reviews
-    review_pct  = round(pos_reviews / total_rev * 100) if total_rev else None
-    if review_pct is None:
-        review_pct = fetch_steam_reviews(app_id)   # fallback to Steam store API
+    ss_fields  = _steamspy_review_fields(ss)
+    review_pct = ss_fields["review_pct"]
+    if review_pct is None and include_late and "steamspy" not in pending:
+        # Fallback to Steam store API — only with budget left, else defer it
+        if time.monotonic() - t0 < budget_s:
+            fut = _submit_field("review_pct", app_id, fetch_steam_reviews, app_id)
+            try:
+                review_pct = fut.result(timeout=max(budget_s - (time.monotonic() - t0), 0.0))
+                _release_field(("review_pct", app_id), fut)
+            except concurrent.futures.TimeoutError:
+                with _FIELD_LOCK:
+                    review_pct = _FIELD_CACHE.get(("review_pct", app_id))
+                pending.append("review_pct")
+            except Exception:
+                _release_field(("review_pct", app_id), fut)
+                review_pct = None
+        else:
+            pending.append("review_pct")
 
     # ── Review velocity (reviews/day over last 7 days from snapshots) ──
     review_velocity = compute_review_velocity(snapshots, app_id, days=7)
 
-    avg_2w_hrs = round((ss.get("average_2weeks", 0) or 0) / 60, 1)
+    # ── CCU fallback when the live call missed the budget or its breaker
+    # is open: last snapshot ──
+    ccu_cached = "ccu" in pending or "ccu" in stale
+    if ccu is None and ccu_cached:
+        ccu = last_known_ccu(snapshots, {}, app_id) or None
 
     # ── CSV CCU fallback ── (when live API returns 0, e.g. Deadlock beta period)
     ccu_from_csv = False
@@ -2185,18 +2533,20 @@ def _fetch_one_game(
         **game,
         "ccu":             ccu if ccu else 0,
         "ccu_from_csv":    ccu_from_csv,
-        "ccu_live":        ccu is not None,
+        "ccu_live":        ccu is not None and not ccu_cached,
         "twitch_viewers":  twitch_viewers,           # int | None
         "yoy":             yoy_str,
         "yoy_val":         yoy_pct,
         "yoy_source":      yoy_source,               # "snapshot" | "csv" | "steamspy"
         "has_hist":        has_hist,
         "hist_summary":    hist_summary,
-        "avg_2w_hrs":      avg_2w_hrs,
+        "avg_2w_hrs":      ss_fields["avg_2w_hrs"],
         "review_pct":      review_pct,
         "review_velocity": review_velocity,          # float | None  (reviews/day)
-        "pos_reviews":     pos_reviews,
-        "neg_reviews":     neg_reviews,
+        "pos_reviews":     ss_fields["pos_reviews"],
+        "neg_reviews":     ss_fields["neg_reviews"],
+        "pending":         pending,                  # fields served from cache / still in flight
+        "stale":           stale,                    # fields served from cache / breaker open
     }
 
 # ─────────────────────────────────────────────────────────────
@@ -2234,7 +2584,12 @@ hr{{border:none;border-top:1px solid #232640;margin:1.5rem 0}}
 def report_to_pdf(md_text: str) -> bytes | None:
     if not _REPORTLAB_AVAILABLE:
         return None
-    buf = _rl_io.BytesIO()
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.lib import colors as _rl_colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Preformatted
+    buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4,
                             leftMargin=2*cm, rightMargin=2*cm,
                             topMargin=2*cm, bottomMargin=2*cm)
@@ -3151,6 +3506,8 @@ def init_session_defaults() -> None:
         "ai_report": "",
         "ai_chat_history": [],
         "ai_chat_pending": False,
+        "ai_chat_memory": new_chat_memory(),   # rolling summary of older chat turns
+        "ai_chat_turn": None,                  # chat_context stats for the last reply
         "report_label": "",
         "custom_query": "",
         "report_language": "English",
@@ -3161,6 +3518,7 @@ def init_session_defaults() -> None:
         "drilldown_game":   None,           # app_id of selected game
         "drilldown_report": "",             # cached drilldown report
         "drilldown_cache":  {},             # {app_id: report_text}
+        "progressive_fetch": True,          # render Dashboard rows as they arrive
     }
     for k, v in defaults.items():
         if k not in st.session_state:
@@ -3184,6 +3542,21 @@ TRANSLATIONS = {
         "admin_log_header":       "Scheduler Log (last 20 entries)",
         "admin_log_none":         "No scheduler log yet — entries appear here after the first Monday run, or after any error.",
         "admin_log_clear":       "Clear log",
+        "fetch_diag_header":     "FETCH DIAGNOSTICS",
+        "fetch_diag_desc":       "Timing and health of the last Dashboard CCU fetch in this session.",
+        "fetch_diag_none":       "No live fetch has run in this session yet — the Dashboard may have loaded from the daily cache.",
+        "fetch_diag_timing":     "Time to first row: **{first}s** · all rows: **{core}s** · late fields complete: **{total}s** ({n} titles, {mode})",
+        "breaker_header":        "Upstream circuit breakers",
+        "breaker_desc":          "A breaker opens after {n} consecutive failed calls to an upstream; while open, calls fail fast to cached/CSV data. After {cooldown}s one probe call is let through to test recovery.",
+        "report_cache_header":   "AI report cache",
+        "report_cache_desc":     "Claude completions are stored under a hash of the prompt, model, system prompt and token limit, shared by every user of this deployment. An identical request within {hours}h is answered from disk; Regenerate buttons bypass the cache.",
+        "report_cache_stats":    "{entries} cached completions · {size} MB · overall hit rate {rate}",
+        "report_cache_none":     "No AI report has been requested yet.",
+        "report_cache_purge":    "Purge expired",
+        "report_cache_purged":   "Removed {n} expired completions.",
+        "report_cache_clear":    "Clear cache",
+        "progressive_toggle":    "Progressive Dashboard render",
+        "progressive_help":      "Show the CCU table and KPIs as each title's result arrives (largest titles first) instead of waiting for the whole roster. Twitch and review fallbacks fill in afterwards.",
         "fetch_health_warning":  "⚠️ Live CCU fetch failed for all {n} titles this run — every value below is 0 because the Steam API call didn't succeed, not because these games genuinely have no players. Check the connectivity diagnostics on the Admin page.",
         "fetch_health_partial":  "ℹ️ Live CCU succeeded for only {pct}% of titles this run ({live}/{total}); the rest fell back to cached/CSV data or show as 0. This can happen during a transient Steam/SteamSpy rate limit — try Refresh CCU Data again in a minute.",
         "conn_check_header":     "CONNECTIVITY CHECK",
@@ -3245,6 +3618,7 @@ TRANSLATIONS = {
         "fetch_ccu_btn":          "Fetch Live CCU Data",
         "fetch_spinner":          "Pulling live CCU from Steam + SteamSpy…",
         "fetching_game":          "Fetching: {name}…",
+        "progressive_loaded":     "{done}/{total} titles loaded · first row in {first}s",
         "fetch_done":             "Fetched {n} titles",
         "refresh_ccu_btn":        "Refresh CCU Data",
         "cache_loaded_toast":     "Loaded from cache ({age})",
@@ -3266,6 +3640,7 @@ TRANSLATIONS = {
         "exec_summary_header":    "EXECUTIVE SUMMARY",
         "exec_summary_spinner":   "Generating executive summary…",
         "exec_summary_caption":   "AI-generated from live CCU data · refreshes when data refreshes · full analysis on the Weekly Report tab",
+        "exec_summary_regen_help": "Ask Claude again instead of reusing the cached summary",
         "exec_summary_error":     "Summary generation failed — check AWS Bedrock credentials on the Admin page.",
         "exec_summary_no_key":    "Add AWS Bedrock credentials to secrets.toml to enable the executive summary.",
         "auto_archive_success":   "📦 This week's data has been automatically archived for the Monthly Analysis.",
@@ -3360,6 +3735,7 @@ TRANSLATIONS = {
         "custom_query_label":     "Custom Query",
         # AI report
         "cache_notice":           "Loaded from cache — data unchanged since last run. Re-fetch CCU to force refresh.",
+        "report_cache_hit":       "Served from the AI report cache — the same request was answered within the last {hours}h. Click Regenerate to ask Claude again.",
         "no_ccu_warning":         "Please fetch live CCU data first.",
         "spinner_generating":     "Claude is generating your analysis…",
         "no_key_warning":         "AWS Bedrock credentials not found. Add AWS_ACCESS_KEY_ID_API to .streamlit/secrets.toml to run AI analysis.",
@@ -3456,6 +3832,21 @@ TRANSLATIONS = {
         "admin_log_header":       "スケジューラーログ（直近20件）",
         "admin_log_none":        "スケジューラーログはまだありません — 最初の月曜実行後、またはエラー発生時にここに表示されます。",
         "admin_log_clear":       "ログをクリア",
+        "fetch_diag_header":     "取得診断",
+        "fetch_diag_desc":       "このセッションで最後に実行したダッシュボードCCU取得のタイミングと状態です。",
+        "fetch_diag_none":       "このセッションではまだライブ取得が実行されていません — ダッシュボードは日次キャッシュから読み込まれた可能性があります。",
+        "fetch_diag_timing":     "最初の行まで: **{first}秒** · 全行: **{core}秒** · 遅延フィールド完了: **{total}秒**（{n} タイトル、{mode}）",
+        "breaker_header":        "上流APIサーキットブレーカー",
+        "breaker_desc":          "上流APIへの呼び出しが {n} 回連続で失敗するとブレーカーが開き、開いている間はキャッシュ/CSVデータへ即座にフォールバックします。{cooldown}秒後に回復確認のためのプローブ呼び出しを1回だけ通します。",
+        "report_cache_header":   "AIレポートキャッシュ",
+        "report_cache_desc":     "Claudeの生成結果は、プロンプト・モデル・システムプロンプト・トークン上限のハッシュをキーに保存され、このデプロイの全ユーザーで共有されます。{hours}時間以内の同一リクエストはディスクから返されます。再生成ボタンはキャッシュを使いません。",
+        "report_cache_stats":    "キャッシュ済み {entries} 件 · {size} MB · 全体ヒット率 {rate}",
+        "report_cache_none":     "AIレポートはまだリクエストされていません。",
+        "report_cache_purge":    "期限切れを削除",
+        "report_cache_purged":   "期限切れの生成結果を {n} 件削除しました。",
+        "report_cache_clear":    "キャッシュをクリア",
+        "progressive_toggle":    "ダッシュボードの段階的表示",
+        "progressive_help":      "ロスター全体を待たずに、各タイトルの結果が届き次第（大きいタイトルから順に）CCUテーブルとKPIを表示します。Twitchとレビューのフォールバックは後から反映されます。",
         "fetch_health_warning":  "⚠️ 今回の取得で {n} タイトル全てのライブCCU取得が失敗しました — 以下の値が0なのはSteam APIの呼び出しが成功しなかったためであり、実際にプレイヤーが0人というわけではありません。Adminページの接続診断を確認してください。",
         "fetch_health_partial":  "ℹ️ 今回はライブCCUが {live}/{total} タイトル（{pct}%）でのみ成功しました。残りはキャッシュ/CSVデータにフォールバックするか0として表示されています。Steam/SteamSpyの一時的なレート制限が原因の場合があります — 1分ほど待ってから「CCUデータを更新」を再試行してください。",
         "conn_check_header":     "接続診断",
@@ -3517,6 +3908,7 @@ TRANSLATIONS = {
         "fetch_ccu_btn":          "ライブCCUデータを取得",
         "fetch_spinner":          "Steam / SteamSpyからライブCCUを取得中…",
         "fetching_game":          "取得中: {name}…",
+        "progressive_loaded":     "{done}/{total} タイトル読み込み済み · 最初の行まで {first}秒",
         "fetch_done":             "{n} タイトルを取得しました",
         "refresh_ccu_btn":        "CCUデータを更新",
         "cache_loaded_toast":     "キャッシュから読み込みました（{age}）",
@@ -3538,6 +3930,7 @@ TRANSLATIONS = {
         "exec_summary_header":    "エグゼクティブサマリー",
         "exec_summary_spinner":   "エグゼクティブサマリーを生成中…",
         "exec_summary_caption":   "ライブCCUデータから自動生成 · データ更新時に再生成 · 詳細分析はWeekly Reportタブで",
+        "exec_summary_regen_help": "キャッシュ済みのサマリーを使わずにClaudeで再生成します",
         "exec_summary_error":     "サマリー生成に失敗しました。AdminページでAWS Bedrockの認証情報を確認してください。",
         "exec_summary_no_key":    "エグゼクティブサマリーを有効にするにはsecrets.tomlにAWS Bedrockの認証情報を追加してください。",
         "auto_archive_success":   "📦 今週のデータが月次分析用に自動アーカイブされました。",
@@ -3632,6 +4025,7 @@ TRANSLATIONS = {
         "custom_query_label":     "カスタムクエリ",
         # AI report
         "cache_notice":           "キャッシュから読み込みました — 前回実行からデータに変更はありません。CCUを再取得すると更新されます。",
+        "report_cache_hit":       "AIレポートキャッシュから表示しています — 同じリクエストに過去{hours}時間以内に回答済みです。再生成をクリックするとClaudeに再度問い合わせます。",
         "no_ccu_warning":         "先にライブCCUデータを取得してください。",
         "spinner_generating":     "Claudeが分析を生成しています…",
         "no_key_warning":         "AWS Bedrock認証情報が見つかりません。.streamlit/secrets.toml に AWS_ACCESS_KEY_ID_API を追加してください。",
@@ -4207,18 +4601,31 @@ def summarize_fetch_health(ccu_data: list[dict]) -> dict:
                    number filled in instead (ccu may still be meaningful)
     zero_count   — titles where ccu ended up at exactly 0 (live failed AND
                    no fallback data existed)
+    cache_fallback — titles whose live CCU call missed the FETCH_DEADLINE_S
+                   budget (or hit an open circuit breaker) and were served
+                   from the last known value instead
+    pending_count  — titles with any field still listed under "pending"
+    open_breakers  — upstreams whose circuit breaker is currently open
+                     (see circuit_breaker_status())
     """
-    total        = len(ccu_data)
-    live_count   = sum(1 for r in ccu_data if r.get("ccu_live"))
-    csv_fallback = sum(1 for r in ccu_data if r.get("ccu_from_csv"))
-    zero_count   = sum(1 for r in ccu_data if (r.get("ccu") or 0) == 0)
+    total          = len(ccu_data)
+    live_count     = sum(1 for r in ccu_data if r.get("ccu_live"))
+    csv_fallback   = sum(1 for r in ccu_data if r.get("ccu_from_csv"))
+    zero_count     = sum(1 for r in ccu_data if (r.get("ccu") or 0) == 0)
+    cache_fallback = sum(1 for r in ccu_data
+                         if "ccu" in (r.get("pending") or []) + (r.get("stale") or [])
+                         and (r.get("ccu") or 0) > 0 and not r.get("ccu_from_csv"))
+    pending_count  = sum(1 for r in ccu_data if r.get("pending"))
     return {
         "total": total,
         "live_count": live_count,
         "csv_fallback": csv_fallback,
+        "cache_fallback": cache_fallback,
+        "pending_count": pending_count,
         "zero_count": zero_count,
         "live_pct": round(live_count / total * 100) if total else 0,
-        "looks_systemic": total > 0 and live_count == 0 and csv_fallback == 0,
+        "looks_systemic": total > 0 and live_count == 0 and csv_fallback == 0 and cache_fallback == 0,
+        "open_breakers": [b["upstream"] for b in circuit_breaker_status() if b["state"] == "open"],
     }
 
 
@@ -4235,13 +4642,17 @@ def run_connectivity_probe(test_app_id: int = 730, test_name: str = "Counter-Str
     returned all zeros — the probe wasn't testing the same code.
 
     Clears the relevant @st.cache_data caches first so a stale cached failure
-    can't be mistaken for a fresh one.
+    can't be mistaken for a fresh one, and moves any open circuit breaker to
+    half-open so each check is a real network call rather than a fast-fail.
+    The final row reports every upstream's breaker state after the probe.
     """
     results = []
+    for _upstream in UPSTREAMS:
+        reset_breaker(_upstream)
 
     # Steam CCU — via the real fetch_ccu(), main thread
     try:
-        fetch_ccu.clear()
+        _fetch_ccu_cached.clear()
     except Exception:
         pass
     t0 = time.time()
@@ -4257,7 +4668,7 @@ def run_connectivity_probe(test_app_id: int = 730, test_name: str = "Counter-Str
 
     # SteamSpy — via the real fetch_steamspy(), main thread
     try:
-        fetch_steamspy.clear()
+        _fetch_steamspy_cached.clear()
     except Exception:
         pass
     t0 = time.time()
@@ -4287,6 +4698,12 @@ def run_connectivity_probe(test_app_id: int = 730, test_name: str = "Counter-Str
         results.append({"api": "Twitch", "ok": None,
                          "detail": "Not configured — TWITCH_CLIENT_ID not in secrets (this is fine if you don't use Twitch data)"})
 
+    _breakers = circuit_breaker_status()
+    results.append({"api": "Circuit breakers",
+                    "ok": all(b["state"] == "closed" for b in _breakers),
+                    "detail": " · ".join(f"{b['label']}: {b['state']}"
+                                         + (f" (retry in {b['retry_in_s']}s)" if b["state"] == "open" else "")
+                                         for b in _breakers)})
     return results
 
 
@@ -4299,23 +4716,23 @@ def run_connectivity_probe(test_app_id: int = 730, test_name: str = "Counter-Str
 # their common.py usage changes.
 _EXPECTED_COMMON_SYMBOLS = [
     "ANTHROPIC_AVAILABLE", "FPS_ROSTER_IDS", "GAME_CATALOG", "HOME_PAGE",
-    "PLOTLY_BASE", "PRESET_QUERIES", "T", "TPS_ROSTER_IDS",
+    "BREAKER_COOLDOWN_S", "BREAKER_FAIL_THRESHOLD", "FETCH_DEADLINE_S", "PLOTLY_BASE", "PRESET_QUERIES", "T", "TPS_ROSTER_IDS",
     "build_ccu_mecha_prompt", "build_competitive_gap_prompt",
     "build_drilldown_prompt", "build_social_metrics_prompt",
-    "build_system_prompt", "build_table_stakes_prompt",
+    "build_system_prompt", "build_table_stakes_prompt", "circuit_breaker_status",
     "build_exec_summary_prompt", "build_weekly_report_prompt", "cache_age_str", "compute_period_diff",
     "enforce_common_module_integrity",
-    "generate_pptx_bytes", "generate_pptx_snapshot_bytes", "get_game_events",
-    "get_roster", "init_session_defaults", "inject_css",
+    "generate_pptx_bytes", "generate_pptx_snapshot_bytes", "get_game_events", "prefetch_game_events",
+    "get_roster", "html_table", "init_session_defaults", "inject_css",
     "list_archived_reports", "load_all_historical", "load_all_raw",
-    "load_ccu_snapshots", "load_daily_cache", "render_footer",
+    "load_ccu_snapshots", "load_daily_cache", "order_roster_by_last_ccu", "render_footer",
     "render_nav_tabs", "render_report_with_tables", "render_table",
     "render_topbar", "report_to_html", "report_to_pdf", "require_auth",
     "run_connectivity_probe", "run_pipeline_probe", "safe_page_link",
     "save_ccu_snapshot", "save_daily_cache", "save_report_to_archive",
     "self_check_common_module", "should_auto_archive", "summarize_fetch_health",
     # underscore-prefixed names individual pages import explicitly
-    "_fetch_one_game", "_REPORTLAB_AVAILABLE", "_anthropic",
+    "_fetch_one_game", "_fetch_late_fields", "_REPORTLAB_AVAILABLE", "_anthropic",
     "_archive_dir", "_cache_path",
 ]
 
@@ -316,6 +316,9 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+from chat_context import build_request as build_chat_request, new_memory as new_chat_memory
+from chat_context import stream_reply, turn_caption
+
 # ─────────────────────────────────────────────────────────────
 # TEXT EXTRACTION
 # ─────────────────────────────────────────────────────────────
@@ -428,6 +431,8 @@ for key, default in [
     ("comparison_result", ""),
     ("chat_history",      []),
     ("chat_pending",      False),
+    ("chat_memory",       new_chat_memory()),   # rolling summary of older chat turns
+    ("chat_turn",         None),                # chat_context stats for the last reply
     ("doc_a_text",        ""),
     ("doc_b_text",        ""),
     ("doc_a_name",        ""),
@@ -1218,24 +1223,17 @@ Answer follow-up questions concisely and specifically. Reference the actual docu
     # Stream pending reply
     if st.session_state.chat_pending and claude_key:
         st.session_state.chat_pending = False
-        _api_messages = [
-            {"role": m["role"], "content": m["content"]}
-            for m in st.session_state.chat_history
-        ]
         try:
             _chat_client = _anthropic.Anthropic(api_key=claude_key)
             with st.chat_message("assistant"):
-                _reply = ""
-                _ph    = st.empty()
-                with _chat_client.messages.stream(
-                    model=model,
-                    max_tokens=2048,
-                    system=_build_chat_system(),
-                    messages=_api_messages,
-                ) as _stream:
-                    for _delta in _stream.text_stream:
-                        _reply += _delta
-                        _ph.markdown(_escape_dollars(_reply) + "▌")
+                _ph = st.empty()
+                # Both documents + report as a cached prefix; older turns folded into a summary
+                _request = build_chat_request(_chat_client, model, 2048, _build_chat_system(),
+                                              st.session_state.chat_history, st.session_state.chat_memory)
+                _reply, st.session_state.chat_turn = stream_reply(
+                    _chat_client, _request,
+                    on_text=lambda _t: _ph.markdown(_escape_dollars(_t) + "▌"),
+                )
                 _ph.markdown(_escape_dollars(_reply))
             st.session_state.chat_history.append({"role": "assistant", "content": _reply})
         except _anthropic.AuthenticationError:
@@ -1245,6 +1243,9 @@ Answer follow-up questions concisely and specifically. Reference the actual docu
         except Exception as _e:
             st.error(f"Chat error: {type(_e).__name__}: {_e}")
 
+    if st.session_state.chat_history and st.session_state.chat_turn:
+        st.caption(turn_caption(st.session_state.chat_turn, st.session_state.chat_memory))
+
     # Chat input
     _user_msg = st.chat_input("Ask a question about the documents…", key="chat_input")
     if _user_msg:
@@ -1257,6 +1258,7 @@ Answer follow-up questions concisely and specifically. Reference the actual docu
         if st.button("Clear chat history", key="clear_chat"):
             st.session_state.chat_history = []
             st.session_state.chat_pending = False
+            st.session_state.chat_turn    = None
             st.rerun()
 
 # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,114 @@
+"""
+forum_store.py — Local SQLite store of Steam forum threads for incremental refresh.
+===================================================================================
+Every thread steam_forums loads is kept here, keyed by its URL, so reopening
+the Forums tab reads threads from disk. A refresh only walks the listing
+until it reaches threads already stored and unchanged, and only re-downloads
+opening posts for threads that are new or whose reply_count / timestamp
+moved.
+
+Table
+─────
+threads — one row per thread URL: app_id, timestamp (last activity as shown
+          in the listing), reply_count, the full thread dict as JSON
+          (opening_post included) and last_seen (when a listing last showed it).
+
+Path defaults to data/forum_store.sqlite; override with FORUM_STORE_PATH.
+Connections are opened per call (WAL mode), so worker threads can share it.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+FORUM_STORE_PATH = Path(os.environ.get(
+    "FORUM_STORE_PATH", Path(__file__).parent / "data" / "forum_store.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    url         TEXT PRIMARY KEY,
+    app_id      INTEGER NOT NULL,
+    timestamp   INTEGER,
+    reply_count INTEGER DEFAULT 0,
+    row_json    TEXT NOT NULL,
+    last_seen   REAL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_threads_app_ts ON threads (app_id, timestamp DESC);
+"""
+
+_initialised: set[str] = set()
+
+
+@contextmanager
+def _conn():
+    path = str(FORUM_STORE_PATH)
+    FORUM_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _initialised:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _initialised.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def thread_changed(current: dict, stored: dict | None) -> bool:
+    """True if a listing entry is new or its reply count / last activity moved."""
+    return (stored is None
+            or int(stored.get("reply_count") or 0) != int(current.get("reply_count") or 0)
+            or stored.get("timestamp") != current.get("timestamp"))
+
+
+def load_threads(app_id: int) -> dict[str, dict]:
+    """url → stored thread dict for app_id."""
+    if not FORUM_STORE_PATH.exists():
+        return {}
+    with _conn() as c:
+        return {url: json.loads(row) for url, row in c.execute(
+            "SELECT url, row_json FROM threads WHERE app_id = ?", (app_id,))}
+
+
+def recent_threads(app_id: int, limit: int, game: str | None = None) -> list[dict]:
+    """Most recently active stored threads for app_id (pinned first, like the listing)."""
+    threads = sorted(load_threads(app_id).values(),
+                     key=lambda t: (not t.get("is_pinned"), -(t.get("timestamp") or 0)))[:limit]
+    if game is not None:
+        for t in threads:
+            t["game"] = game
+    return threads
+
+
+def upsert_threads(threads: list[dict]) -> None:
+    """Insert or refresh threads (each dict needs url and app_id)."""
+    rows = [t for t in threads if t.get("url")]
+    if not rows:
+        return
+    now = time.time()
+    with _conn() as c:
+        c.executemany(
+            "INSERT OR REPLACE INTO threads VALUES (?, ?, ?, ?, ?, ?)",
+            [(t["url"], t["app_id"], t.get("timestamp"), int(t.get("reply_count") or 0),
+              json.dumps(t), now) for t in rows],
+        )
+
+
+def store_summary() -> dict:
+    """Totals for UI captions: threads stored, apps covered, file size in MB."""
+    if not FORUM_STORE_PATH.exists():
+        return {"threads": 0, "apps": 0, "size_mb": 0.0}
+    with _conn() as c:
+        n, apps = c.execute("SELECT COUNT(*), COUNT(DISTINCT app_id) FROM threads").fetchone()
+    return {"threads": n, "apps": apps,
+            "size_mb": round(FORUM_STORE_PATH.stat().st_size / 1_048_576, 1)}
+
+
+def clear_app(app_id: int) -> None:
+    """Forget every stored thread for app_id (forces a full re-scrape)."""
+    with _conn() as c:
+        c.execute("DELETE FROM threads WHERE app_id = ?", (app_id,))
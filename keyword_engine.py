@@ -0,0 +1,102 @@
+"""
+keyword_engine.py — Shared tokenizer / n-gram counter for the sentiment apps.
+=============================================================================
+Each app configures one KeywordEngine (its own stopwords and token regex) and
+keeps it alive across reruns with st.cache_resource. A text is tokenized the
+first time the engine sees it; after that its tokens live in the engine as
+integer arrays. So counting any subset (per game, per polarity, per tab) is a
+NumPy concatenate + count over cached ids, with no regex work.
+
+Ordering matches Counter(unigrams) + Counter(bigrams) .most_common(): by count,
+then unigrams before bigrams, then first appearance within the subset.
+"""
+
+import re
+import threading
+
+import numpy as np
+
+_EMPTY_U = np.zeros(0, dtype=np.int64)
+
+
+class KeywordEngine:
+    """Tokenize-once keyword counter.
+
+    stopwords      — tokens dropped before counting (and before bigram pairing)
+    token_pattern  — regex whose matches on the lower-cased text are tokens
+    strip_pattern  — optional regex removed (replaced by strip_repl) first
+    min_len        — tokens shorter than this are dropped
+    bigrams        — count adjacent-token bigrams alongside unigrams
+    """
+
+    def __init__(self, stopwords, token_pattern: str = r"[a-z]{3,}",
+                 strip_pattern: str | None = None, strip_repl: str = " ",
+                 min_len: int = 0, bigrams: bool = True, max_cached: int = 250_000):
+        self.stopwords   = frozenset(stopwords)
+        self.bigrams     = bigrams
+        self.min_len     = min_len
+        self.max_cached  = max_cached
+        self._token_re   = re.compile(token_pattern)
+        self._strip_re   = re.compile(strip_pattern) if strip_pattern else None
+        self._strip_repl = strip_repl
+        self._vocab: dict[str, int] = {}
+        self._terms: list[str] = []
+        self._cache: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def tokens(self, text) -> list[str]:
+        """Filtered tokens for one text (not cached — see encode)."""
+        t = str(text or "").lower()
+        if self._strip_re is not None:
+            t = self._strip_re.sub(self._strip_repl, t)
+        sw, n = self.stopwords, self.min_len
+        return [w for w in self._token_re.findall(t) if w not in sw and len(w) >= n]
+
+    def encode(self, text) -> tuple[np.ndarray, np.ndarray]:
+        """(unigram ids, bigram codes) for text, cached by text."""
+        key = str(text or "")
+        hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+        toks = self.tokens(key)
+        with self._lock:
+            ids = []
+            for w in toks:
+                i = self._vocab.get(w)
+                if i is None:
+                    i = self._vocab[w] = len(self._terms)
+                    self._terms.append(w)
+                ids.append(i)
+            uni = np.asarray(ids, dtype=np.int64) if ids else _EMPTY_U
+            bi  = (uni[:-1] << 32) | uni[1:] if self.bigrams and len(uni) > 1 else _EMPTY_U
+            if len(self._cache) >= self.max_cached:
+                self._cache.clear()
+            self._cache[key] = (uni, bi)
+        return uni, bi
+
+    def _term(self, code: int, is_bigram: bool) -> str:
+        if is_bigram:
+            return f"{self._terms[code >> 32]} {self._terms[code & 0xFFFFFFFF]}"
+        return self._terms[code]
+
+    def top_terms(self, texts, top_n: int = 30) -> list[tuple[str, int]]:
+        """Most common unigrams (+ bigrams) across texts, as (term, count)."""
+        encoded = [self.encode(t) for t in texts]
+        if not encoded:
+            return []
+        ranked = []
+        for kind, arr in enumerate((np.concatenate([e[0] for e in encoded]),
+                                    np.concatenate([e[1] for e in encoded]))):
+            if not len(arr):
+                continue
+            codes, first, counts = np.unique(arr, return_index=True, return_counts=True)
+            if len(codes) > top_n:
+                # Only codes that can reach the top_n overall (ties at the cutoff included)
+                keep   = counts >= np.partition(counts, -top_n)[-top_n]
+                codes, first, counts = codes[keep], first[keep], counts[keep]
+            ranked.extend(zip((-counts).tolist(), [kind] * len(codes), first.tolist(), codes.tolist()))
+        ranked.sort()
+        return [(self._term(code, kind == 1), -neg) for neg, kind, _, code in ranked[:top_n]]
+
+    def cache_info(self) -> dict:
+        return {"texts": len(self._cache), "vocab": len(self._terms)}
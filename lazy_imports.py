@@ -0,0 +1,79 @@
+"""
+lazy_imports.py — Optional heavy dependencies, imported on first use.
+=====================================================================
+anthropic, reportlab, markdown, vaderSentiment, wordcloud, playwright and
+APScheduler each cost from tens of milliseconds to seconds to import, and the
+apps used to import all of them at module top even on runs that never build a
+PDF or call the API. Instead:
+
+    _anthropic = lazy_module("anthropic")      # None when not installed
+    ANTHROPIC_AVAILABLE = _anthropic is not None
+    ...
+    client = _anthropic.Anthropic(...)         # the real import happens here
+
+module_available() answers "is it installed?" from the import system's spec
+lookup without executing the package. LazyModule instances are shared per
+name, so Streamlit reruns reuse the same proxy (and the real module lives in
+sys.modules as usual once loaded).
+
+bench_import_time.py profiles each entry point's module-level imports with
+`python -X importtime` and checks none of these load at startup.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+
+_AVAILABLE: dict[str, bool] = {}
+_MODULES: dict[str, "LazyModule"] = {}
+_LOCK = threading.Lock()
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name: str):
+        self._name   = name
+        self._module = None
+        self._lock   = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}{' (loaded)' if self.loaded else ''}>"
+
+
+def module_available(name: str) -> bool:
+    """Whether `name`'s top-level package can be imported, without importing it."""
+    top = name.partition(".")[0]
+    if top in sys.modules:
+        return True
+    if top not in _AVAILABLE:
+        try:
+            _AVAILABLE[top] = importlib.util.find_spec(top) is not None
+        except (ImportError, ValueError):
+            _AVAILABLE[top] = False
+    return _AVAILABLE[top]
+
+
+def lazy_module(name: str) -> LazyModule | None:
+    """Shared LazyModule for `name`, or None if it isn't installed."""
+    if not module_available(name):
+        return None
+    with _LOCK:
+        return _MODULES.setdefault(name, LazyModule(name))
@@ -0,0 +1,130 @@
+"""
+news_store.py — Local SQLite store of Steam News items for incremental refresh.
+===============================================================================
+Every GetNewsForApp item steam_news pulls is kept here, keyed by its gid, so a
+refresh only pages (newest first, via enddate) until it meets items already
+on disk, and every chart view of a game's news reads the same stored items.
+
+Tables
+──────
+news        — one row per gid: app_id, date (unix seconds) and the item dict
+              as JSON (title, url, feedlabel, contents trimmed to maxlength).
+sync_state  — one row per app_id: fetched_at (last successful refresh) and
+              gap_enddates — JSON list of enddates where a walk stopped short
+              of the stored items, newest first; later refreshes resume
+              each one until it meets them.
+
+Path defaults to data/news_store.sqlite; override with NEWS_STORE_PATH.
+Connections are opened per call (WAL mode), so worker threads can share it.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+NEWS_STORE_PATH = Path(os.environ.get(
+    "NEWS_STORE_PATH", Path(__file__).parent / "data" / "news_store.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    gid       TEXT PRIMARY KEY,
+    app_id    INTEGER NOT NULL,
+    date      INTEGER,
+    item_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_news_app_date ON news (app_id, date DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    app_id       INTEGER PRIMARY KEY,
+    fetched_at   REAL DEFAULT 0,
+    gap_enddates TEXT DEFAULT '[]'
+);
+"""
+
+_initialised: set[str] = set()
+
+
+@contextmanager
+def _conn():
+    path = str(NEWS_STORE_PATH)
+    NEWS_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _initialised:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.execute("ALTER TABLE sync_state ADD COLUMN gap_enddates TEXT DEFAULT '[]'")
+            except sqlite3.OperationalError:
+                pass                                   # created with it, or migrated already
+            _initialised.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_items(app_id: int) -> list[dict]:
+    """Stored news items for app_id, newest first."""
+    if not NEWS_STORE_PATH.exists():
+        return []
+    with _conn() as c:
+        return [json.loads(row) for (row,) in c.execute(
+            "SELECT item_json FROM news WHERE app_id = ? ORDER BY date DESC", (app_id,))]
+
+
+def upsert_items(app_id: int, items: list[dict]) -> None:
+    rows = [i for i in items if i.get("gid")]
+    if not rows:
+        return
+    with _conn() as c:
+        c.executemany(
+            "INSERT OR REPLACE INTO news VALUES (?, ?, ?, ?)",
+            [(str(i["gid"]), app_id, int(i.get("date") or 0), json.dumps(i)) for i in rows],
+        )
+
+
+def fetched_at(app_id: int) -> float:
+    """When app_id was last refreshed successfully (0 if never)."""
+    if not NEWS_STORE_PATH.exists():
+        return 0.0
+    with _conn() as c:
+        row = c.execute("SELECT fetched_at FROM sync_state WHERE app_id = ?", (app_id,)).fetchone()
+    return row[0] if row else 0.0
+
+
+def gap_enddates(app_id: int) -> list[int]:
+    """enddates still to backfill for app_id, newest first."""
+    if not NEWS_STORE_PATH.exists():
+        return []
+    with _conn() as c:
+        row = c.execute("SELECT gap_enddates FROM sync_state WHERE app_id = ?", (app_id,)).fetchone()
+    return json.loads(row[0] or "[]") if row else []
+
+
+def mark_fetched(app_id: int, ts: float | None = None, gaps: list[int] | None = None) -> None:
+    """Record a refresh of app_id; gaps replaces the stored gap_enddates (kept if None)."""
+    if gaps is None:
+        gaps = gap_enddates(app_id)
+    with _conn() as c:
+        c.execute("INSERT OR REPLACE INTO sync_state (app_id, fetched_at, gap_enddates) VALUES (?, ?, ?)",
+                  (app_id, time.time() if ts is None else ts, json.dumps(gaps)))
+
+
+def store_summary() -> dict:
+    """Totals for UI captions: items stored, apps covered, file size in MB."""
+    if not NEWS_STORE_PATH.exists():
+        return {"items": 0, "apps": 0, "size_mb": 0.0}
+    with _conn() as c:
+        n, apps = c.execute("SELECT COUNT(*), COUNT(DISTINCT app_id) FROM news").fetchone()
+    return {"items": n, "apps": apps,
+            "size_mb": round(NEWS_STORE_PATH.stat().st_size / 1_048_576, 1)}
+
+
+def clear_app(app_id: int) -> None:
+    """Forget every stored item for app_id (forces a full re-fetch)."""
+    with _conn() as c:
+        c.execute("DELETE FROM news WHERE app_id = ?", (app_id,))
+        c.execute("DELETE FROM sync_state WHERE app_id = ?", (app_id,))
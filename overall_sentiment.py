@@ -17,9 +17,8 @@ Required:  pip install streamlit requests pandas plotly anthropic
            matplotlib wordcloud vaderSentiment tweepy reportlab markdown
 """
 
-import re, time, io, json, os
+import time, io, json, os
 from datetime import datetime, timedelta
-from collections import Counter
 from pathlib import Path
 
 import requests
@@ -27,6 +26,8 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from keyword_engine import KeywordEngine
+
 # ── Optional dependencies ──────────────────────────────────────
 try:
     from wordcloud import WordCloud as _WC
@@ -42,11 +43,12 @@ try:
 except ImportError:
     ANTHROPIC_OK = False
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer as _Vader
-    VADER_OK = True
-except ImportError:
-    VADER_OK = False
+# VADER via the shared scoring service (single analyzer + persistent score cache)
+from sentiment_scoring import VADER_AVAILABLE as VADER_OK, compound_score, compound_scores
+from chat_context import build_request as build_chat_request, new_memory as new_chat_memory
+from chat_context import stream_reply, turn_caption
+import report_cache
+import upstream_sim
 
 try:
     import tweepy
@@ -54,6 +56,8 @@ try:
 except ImportError:
     TWEEPY_OK = False
 
+upstream_sim.install_from_env()   # no-op unless UPSTREAM_SIM_URL is set — see upstream_sim.py
+
 try:
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -100,6 +104,9 @@ TRANSLATIONS = {
         "fetch": "Fetch",
         "analyse": "Analyse",
         "generate_report": "Generate AI Report",
+        "regenerate_report": "↻ Regenerate",
+        "regenerate_help": "Ask Claude again instead of reusing the cached report",
+        "report_cached": "Served from the report cache",
         "no_data": "NO DATA YET",
         "loading": "Loading…",
         "genre": "Genre / Topic",
@@ -207,6 +214,9 @@ TRANSLATIONS = {
         "fetch": "取得",
         "analyse": "分析",
         "generate_report": "AIレポート生成",
+        "regenerate_report": "↻ 再生成",
+        "regenerate_help": "キャッシュ済みのレポートを使わずにClaudeで再生成します",
+        "report_cached": "レポートキャッシュから表示",
         "no_data": "データなし",
         "loading": "読み込み中…",
         "genre": "ジャンル / トピック",
@@ -358,13 +368,13 @@ STOPWORDS = {
     "than","after","also","than","game","games","want","need","love","hate",
 }
 
+@st.cache_resource(show_spinner=False)
+def _keyword_engine() -> KeywordEngine:
+    return KeywordEngine(STOPWORDS, token_pattern=r"\S+", strip_pattern=r"[^a-z\s]",
+                         strip_repl="", min_len=4, bigrams=False)
+
 def keywords(texts, n=20):
-    words = []
-    for t in texts:
-        for w in re.sub(r"[^a-z\s]", "", str(t).lower()).split():
-            if w not in STOPWORDS and len(w) > 3:
-                words.append(w)
-    return Counter(words).most_common(n)
+    return _keyword_engine().top_terms(texts, n)
 
 def sentiment_label(score: float) -> str:
     lang = st.session_state.get("lang", "en")
@@ -376,13 +386,19 @@ def sentiment_label(score: float) -> str:
 
 def vader_score(text: str) -> float:
     if VADER_OK:
-        return _Vader().polarity_scores(str(text))["compound"]
+        return compound_score(text)
     # Naive fallback
     pos_words = {"good","great","amazing","love","best","awesome","excellent","fun","enjoyed","perfect"}
     neg_words = {"bad","terrible","awful","hate","worst","broken","garbage","horrible","disappointing"}
     words = set(str(text).lower().split())
     return min(1.0, max(-1.0, (len(words & pos_words) - len(words & neg_words)) * 0.15))
 
+def vader_scores(texts: list) -> list[float]:
+    """Batch vader_score — one cache lookup and analyzer pass for the whole list."""
+    if VADER_OK:
+        return compound_scores(texts)
+    return [vader_score(t) for t in texts]
+
 def section_header(title: str):
     st.markdown(
         f'<div class="section-header"><span class="dot"></span>{title}</div>',
@@ -756,10 +772,16 @@ RPG_GAMES_COMMUNITY = [
     {"appid": 1105510, "name": "Yakuza: Like a Dragon"},
 ]
 
-def stream_ai_report(prompt: str, system: str = "") -> str:
+def stream_ai_report(prompt: str, system: str = "", regenerate: bool = False) -> str:
     key = get_claude_key()
     if not key or not ANTHROPIC_OK:
         return ""
+    rkey   = report_cache.cache_key(prompt, ai_model, system, 4096)
+    cached = report_cache.get(rkey, "overall_report", regenerate=regenerate)
+    if cached is not None:
+        st.caption(T("report_cached"))
+        st.markdown(cached)
+        return cached
     client = _anthropic.Anthropic(api_key=key)
     ph = st.empty(); txt = ""
     try:
@@ -771,6 +793,7 @@ def stream_ai_report(prompt: str, system: str = "") -> str:
             for d in s.text_stream:
                 txt += d; ph.markdown(txt + "▌")
         ph.markdown(txt)
+        report_cache.put(rkey, "overall_report", txt, ai_model)
     except _anthropic.AuthenticationError:
         st.error(T("err_auth"))
     except _anthropic.RateLimitError:
@@ -784,14 +807,24 @@ def render_ai_tab(report_key: str, prompt_fn, chat_system_fn=None, slug: str = "
     if not key:
         st.warning(T("err_no_key"))
         return
+    regen_key = f"regen_{report_key}"
     if not st.session_state.get(report_key):
-        if st.button(T("generate_report"), key=f"gen_{report_key}"):
-            report = stream_ai_report(prompt_fn())
+        regenerate = st.session_state.pop(regen_key, False)
+        if st.button(T("generate_report"), key=f"gen_{report_key}") or regenerate:
+            report = stream_ai_report(prompt_fn(), regenerate=regenerate)
             st.session_state[report_key] = report
     else:
         st.markdown(st.session_state[report_key])
 
     if st.session_state.get(report_key):
+        c1, c2 = st.columns([4, 1])
+        with c1:
+            st.caption(report_cache.hit_rate_line("overall_report"))
+        with c2:
+            if st.button(T("regenerate_report"), key=f"btn_{regen_key}", help=T("regenerate_help")):
+                st.session_state[report_key] = ""
+                st.session_state[regen_key] = True
+                st.rerun()
         _show_download_buttons(st.session_state[report_key], slug)
         if chat_system_fn:
             _render_chat(report_key, chat_system_fn)
@@ -815,10 +848,13 @@ def _render_chat(report_key: str, system_fn):
     section_header("FOLLOW-UP CHAT")
     chat_key = f"chat_{report_key}"
     pending_key = f"pending_{report_key}"
+    memory_key = f"chatmem_{report_key}"
     if chat_key not in st.session_state:
         st.session_state[chat_key] = []
     if pending_key not in st.session_state:
         st.session_state[pending_key] = False
+    if memory_key not in st.session_state:
+        st.session_state[memory_key] = new_chat_memory()
 
     for msg in st.session_state[chat_key]:
         with st.chat_message(msg["role"]):
@@ -829,20 +865,20 @@ def _render_chat(report_key: str, system_fn):
         key = get_claude_key()
         client = _anthropic.Anthropic(api_key=key)
         with st.chat_message("assistant"):
-            ph = st.empty(); rep = ""
+            ph = st.empty()
             try:
-                with client.messages.stream(
-                    model=ai_model, max_tokens=2048,
-                    system=system_fn(),
-                    messages=[{"role": m["role"], "content": m["content"]} for m in st.session_state[chat_key]],
-                ) as s:
-                    for d in s.text_stream:
-                        rep += d; ph.markdown(rep + "▌")
+                request = build_chat_request(client, ai_model, 2048, system_fn(),
+                                             st.session_state[chat_key], st.session_state[memory_key])
+                rep, st.session_state[f"chatturn_{report_key}"] = stream_reply(
+                    client, request, on_text=lambda t: ph.markdown(t + "▌"))
                 ph.markdown(rep)
                 st.session_state[chat_key].append({"role": "assistant", "content": rep})
             except Exception as e:
                 st.error(f"Chat error: {e}")
 
+    if st.session_state[chat_key] and st.session_state.get(f"chatturn_{report_key}"):
+        st.caption(turn_caption(st.session_state[f"chatturn_{report_key}"], st.session_state[memory_key]))
+
     um = st.chat_input(T("chat_placeholder"), key=f"ci_{report_key}")
     if um:
         st.session_state[chat_key].append({"role": "user", "content": um})
@@ -853,6 +889,7 @@ def _render_chat(report_key: str, system_fn):
         if st.button(T("clear_chat"), key=f"clr_{report_key}"):
             st.session_state[chat_key] = []
             st.session_state[pending_key] = False
+            st.session_state.pop(f"chatturn_{report_key}", None)
             st.rerun()
 
 # ─────────────────────────────────────────────────────────────
@@ -1295,8 +1332,7 @@ if active == "reddit":
             for i, sub in enumerate(subs):
                 posts = reddit_fetch_posts(sub, limit=r_limit, sort=r_sort)
                 # Score sentiment on posts
-                for p in posts:
-                    sc = vader_score(p["full_text"])
+                for p, sc in zip(posts, vader_scores([p["full_text"] for p in posts])):
                     p["sent_score"] = sc
                     p["sentiment"] = sentiment_label(sc)
                 all_posts.extend(posts)
@@ -1311,8 +1347,7 @@ if active == "reddit":
                 sample_posts = sorted(all_posts, key=lambda x: x["score"], reverse=True)[:min(30, len(all_posts))]
                 for i, p in enumerate(sample_posts):
                     cmts = reddit_fetch_comments(p["permalink"].replace("https://reddit.com",""), limit=15)
-                    for c in cmts:
-                        sc = vader_score(c["full_text"])
+                    for c, sc in zip(cmts, vader_scores([c["full_text"] for c in cmts])):
                         c["sent_score"] = sc
                         c["sentiment"] = sentiment_label(sc)
                     all_comments.extend(cmts)
@@ -1515,8 +1550,7 @@ elif active == "twitter":
                         tweet_fields=["created_at", "public_metrics", "lang"],
                     )
                     if resp.data:
-                        for tw in resp.data:
-                            sc = vader_score(tw.text)
+                        for tw, sc in zip(resp.data, vader_scores([tw.text for tw in resp.data])):
                             metrics = tw.public_metrics or {}
                             all_tweets.append({
                                 "query": q,
@@ -1668,8 +1702,7 @@ elif active == "discord":
                 prog = st.progress(0)
                 for i, ch in enumerate(channels):
                     msgs = discord_fetch_messages(ch, token, limit=dc_limit)
-                    for m in msgs:
-                        sc = vader_score(m["content"])
+                    for m, sc in zip(msgs, vader_scores([m["content"] for m in msgs])):
                         m["sent_score"] = sc
                         m["sentiment"] = sentiment_label(sc)
                         m["channel_id"] = ch
@@ -1791,9 +1824,8 @@ elif active == "steam_reviews":
                 prog = st.progress(0)
                 for i, g in enumerate(selected_game_dicts):
                     revs = steam_reviews_fetch(g["appid"], sr_reviews_per)
-                    for rv in revs:
+                    for rv, sc in zip(revs, vader_scores([rv.get("review","") for rv in revs])):
                         txt = rv.get("review","")
-                        sc = vader_score(txt)
                         all_reviews.append({
                             "appid": g["appid"],
                             "game": g["name"],
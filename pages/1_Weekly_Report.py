@@ -10,6 +10,9 @@ import streamlit as st
 
 from common import *  # noqa: F401,F403
 from common import _REPORTLAB_AVAILABLE, _anthropic  # leading underscore — import * skips these
+from chat_context import build_request as build_chat_request
+from chat_context import stream_reply, turn_caption
+import report_cache
 
 st.set_page_config(
     page_title="SEGA Shooter Intel — Weekly Report",
@@ -152,13 +155,17 @@ if st.session_state.active_query:
                         aws_secret_key=st.secrets.get("AWS_SECRET_ACCESS_KEY_API", ""),
                         aws_region=st.secrets.get("AWS_BEDROCK_REGION", "us-east-1"),
                     )
-                    _r2  = _cl2.messages.create(
+                    _txt2, _from_cache2 = report_cache.complete(
+                        _cl2, "shooter_weekly_report",
                         model="us.anthropic.claude-sonnet-4-6",
                         max_tokens=_max_tok,
+                        prompt=_up2,
                         system=build_system_prompt(st.session_state.report_language),
-                        messages=[{"role": "user", "content": _up2}],
+                        regenerate=st.session_state.pop("report_regenerate", False),
                     )
-                    st.session_state.ai_report = _r2.content[0].text
+                    st.session_state.ai_report = _txt2
+                    if _from_cache2:
+                        st.info(T("report_cache_hit", hours=report_cache.REPORT_CACHE_TTL_S // 3600))
                     st.session_state.report_cache[_ck] = st.session_state.ai_report
                     save_daily_cache(
                         st.session_state.get("roster_genre", "FPS"),
@@ -179,6 +186,7 @@ if st.session_state.active_query:
                     st.error(T("analysis_failed", e=_e2))
     if st.session_state.ai_report:
         render_report_with_tables(st.session_state.ai_report)
+        st.caption(report_cache.hit_rate_line("shooter_weekly_report"))
         st.markdown("<br>", unsafe_allow_html=True)
         _fn2 = re.sub(r"[^a-z0-9]+", "_", st.session_state.report_label.lower())[:40]
         fname2 = f"sega_shooter_intel_{_fn2}"
@@ -238,6 +246,7 @@ if st.session_state.active_query:
             if st.button(T("regen_btn"), key="regen_top", use_container_width=True):
                 st.session_state.ai_report = ""
                 st.session_state.report_cache = {}
+                st.session_state.report_regenerate = True
                 st.rerun()
         with _da6:
             if st.button(T("archive_btn"), key="archive_btn", use_container_width=True):
@@ -289,8 +298,6 @@ if st.session_state.active_query:
 
         if st.session_state.ai_chat_pending:
             st.session_state.ai_chat_pending = False
-            api_msgs = [{"role": m["role"], "content": m["content"]}
-                        for m in st.session_state.ai_chat_history]
             try:
                 _cc = _anthropic.AnthropicBedrock(
                 aws_access_key=st.secrets.get("AWS_ACCESS_KEY_ID_API", ""),
@@ -298,26 +305,27 @@ if st.session_state.active_query:
                 aws_region=st.secrets.get("AWS_BEDROCK_REGION", "us-east-1"),
             )
                 with st.chat_message("assistant"):
-                    _reply = ""
                     _ph_chat = st.empty()
-                    with _cc.messages.stream(
-                        model="us.anthropic.claude-sonnet-4-6",
-                        max_tokens=2048,
-                        system=build_chat_system_top(),
-                        messages=api_msgs,
-                    ) as _stream:
-                        for _delta in _stream.text_stream:
-                            _reply += _delta
-                            _ph_chat.markdown(_reply + "▌")
+                    # Report + CCU snapshot as a cached prefix; older turns folded into a summary
+                    _request = build_chat_request(
+                        _cc, "us.anthropic.claude-sonnet-4-6", 2048, build_chat_system_top(),
+                        st.session_state.ai_chat_history, st.session_state.ai_chat_memory,
+                    )
+                    _reply, st.session_state.ai_chat_turn = stream_reply(
+                        _cc, _request, on_text=lambda _t: _ph_chat.markdown(_t + "▌"))
                     _ph_chat.markdown(_reply)
                 st.session_state.ai_chat_history.append({"role": "assistant", "content": _reply})
             except Exception as _ce:
                 st.error(T("chat_error", e=f"{type(_ce).__name__}: {_ce}"))
 
+        if st.session_state.ai_chat_history and st.session_state.ai_chat_turn:
+            st.caption(turn_caption(st.session_state.ai_chat_turn, st.session_state.ai_chat_memory))
+
         if st.session_state.ai_chat_history:
             if st.button(T("chat_clear"), key="clear_chat_top"):
                 st.session_state.ai_chat_history = []
                 st.session_state.ai_chat_pending = False
+                st.session_state.ai_chat_turn    = None
                 st.rerun()
 
     st.markdown("---")
@@ -7,6 +7,7 @@ import streamlit as st
 
 from common import *  # noqa: F401,F403
 from common import _archive_dir, _cache_path  # leading underscore — import * skips these
+import report_cache
 
 st.set_page_config(
     page_title="SEGA Shooter Intel — Admin",
@@ -186,6 +187,73 @@ else:
 
 st.markdown("---")
 
+# ─────────────────────────────────────────────────────────────
+# FETCH DIAGNOSTICS  (last Dashboard fetch in this session)
+# ─────────────────────────────────────────────────────────────
+
+st.markdown(f"""
+<div class="section-header">
+  <span class="dot"></span>{T("fetch_diag_header")}
+</div>
+""", unsafe_allow_html=True)
+st.caption(T("fetch_diag_desc"))
+
+st.session_state.progressive_fetch = st.toggle(
+    T("progressive_toggle"), value=st.session_state.progressive_fetch,
+    help=T("progressive_help"), key="progressive_fetch_toggle",
+)
+_timing = st.session_state.get("_fetch_timing")
+if _timing:
+    st.markdown(T("fetch_diag_timing",
+                  first=_timing["first_row_s"], core=_timing["core_s"],
+                  total=_timing["total_s"], n=_timing["titles"],
+                  mode="progressive" if _timing["progressive"] else "batch"))
+    _health = st.session_state.get("_fetch_health")
+    if _health:
+        st.caption(f"live {_health['live_count']}/{_health['total']} · "
+                   f"csv fallback {_health['csv_fallback']} · "
+                   f"deadline/cache fallback {_health.get('cache_fallback', 0)} · "
+                   f"pending {_health.get('pending_count', 0)} · zero {_health['zero_count']}")
+    st.caption(f"Per-title budget: {FETCH_DEADLINE_S:.0f}s")
+else:
+    st.info(T("fetch_diag_none"))
+
+st.markdown(f"**{T('breaker_header')}**")
+st.caption(T("breaker_desc", n=BREAKER_FAIL_THRESHOLD, cooldown=int(BREAKER_COOLDOWN_S)))
+_state_icon = {"closed": "🟢 closed", "half_open": "🟡 half-open", "open": "🔴 open"}
+render_table([{
+    "Upstream":         b["label"],
+    "State":            _state_icon.get(b["state"], b["state"]),
+    "Failures":         b["failures"],
+    "Trips":            b["trips"],
+    "Retry in":         f"{b['retry_in_s']}s" if b["state"] == "open" else "—",
+} for b in circuit_breaker_status()])
+
+st.markdown(f"**{T('report_cache_header')}**")
+st.caption(T("report_cache_desc", hours=report_cache.REPORT_CACHE_TTL_S // 3600))
+_rc_summary = report_cache.store_summary()
+_rc_overall = report_cache.hit_rate()
+st.caption(T("report_cache_stats", entries=_rc_summary["entries"], size=_rc_summary["size_mb"],
+             rate=f"{_rc_overall['rate']:.0%}"))
+if report_cache.kinds():
+    render_table([{
+        "Report":   _kind,
+        "Hits":     _r["hits"],
+        "Misses":   _r["misses"],
+        "Bypassed": _r["bypassed"],
+        "Hit rate": f"{_r['rate']:.0%}",
+    } for _kind in report_cache.kinds() for _r in [report_cache.hit_rate(_kind)]])
+else:
+    st.info(T("report_cache_none"))
+_rc_purge, _rc_clear, _ = st.columns([1, 1, 4])
+if _rc_purge.button(T("report_cache_purge"), key="report_cache_purge"):
+    st.success(T("report_cache_purged", n=report_cache.purge_expired()))
+if _rc_clear.button(T("report_cache_clear"), key="report_cache_clear"):
+    report_cache.clear()
+    st.rerun()
+
+st.markdown("---")
+
 # ─────────────────────────────────────────────────────────────
 # CONNECTIVITY CHECK
 # ─────────────────────────────────────────────────────────────
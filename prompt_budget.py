@@ -0,0 +1,106 @@
+"""
+prompt_budget.py — Token accounting for the prompts sent to Claude.
+===================================================================
+The report prompts are assembled from sections of very different value per
+token (dataset stats, per-game blocks, keyword lists, review samples). Used to
+be: everything in, whatever the size. Here a prompt is built against a token
+budget instead:
+
+    estimate_tokens()  — cheap local estimate (characters / CHARS_PER_TOKEN);
+                         no API round-trip, errs on the high side for English
+    allocate()         — split a budget across games (or any keys) in
+                         proportion to their weight, with a per-key floor
+    NearDuplicates     — spot near-identical texts (copy-pasted reviews,
+                         "10/10 would X again" variants) by word-shingle overlap
+    clip()             — cut a text to a token allowance at a word boundary
+    PromptBudget       — running per-section tally; report() is what the app
+                         shows before sending
+
+Kept free of Streamlit so the prompt builders can be driven headless.
+"""
+
+import math
+import re
+
+CHARS_PER_TOKEN  = 3.5    # Claude averages ~3.5–4 chars/token on English review text
+DEDUPE_THRESHOLD = 0.7    # word-shingle Jaccard at or above which two texts count as the same
+_SHINGLE         = 3
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def clip(text: str, max_tokens: int, ellipsis: str = "…") -> str:
+    """text cut to roughly max_tokens, at a word boundary."""
+    limit = int(max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= limit:
+        return text
+    cut = text[:max(limit - len(ellipsis), 0)]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,.;:-") + ellipsis
+
+
+def allocate(weights: dict, total: int, floor: int = 0) -> dict:
+    """total tokens split by weight; every key gets at least `floor` if total allows."""
+    if not weights:
+        return {}
+    floor = min(floor, total // len(weights))
+    spare = total - floor * len(weights)
+    w_sum = sum(max(w, 0) for w in weights.values())
+    return {k: floor + (int(spare * max(w, 0) / w_sum) if w_sum else spare // len(weights))
+            for k, w in weights.items()}
+
+
+def _shingles(text: str) -> frozenset:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= _SHINGLE:
+        return frozenset([" ".join(words)])
+    return frozenset(" ".join(words[i:i + _SHINGLE]) for i in range(len(words) - _SHINGLE + 1))
+
+
+class NearDuplicates:
+    """Texts seen so far; add() is False for one too close to an earlier text."""
+
+    def __init__(self, threshold: float = DEDUPE_THRESHOLD):
+        self.threshold = threshold
+        self._seen: list[frozenset] = []
+
+    def add(self, text: str) -> bool:
+        sh = _shingles(text)
+        if any(len(sh & other) / len(sh | other) >= self.threshold for other in self._seen):
+            return False
+        self._seen.append(sh)
+        return True
+
+
+class PromptBudget:
+    """Token tally of a prompt being assembled, section by section."""
+
+    def __init__(self, total: int):
+        self.total    = total
+        self.sections: dict[str, int] = {}
+        self.notes:    dict[str, int] = {}     # counters for the report (dropped duplicates, …)
+
+    @property
+    def used(self) -> int:
+        return sum(self.sections.values())
+
+    @property
+    def remaining(self) -> int:
+        return max(self.total - self.used, 0)
+
+    def add(self, section: str, text: str) -> str:
+        """Record text under section; returns it for inline use."""
+        self.sections[section] = self.sections.get(section, 0) + estimate_tokens(text)
+        return text
+
+    def note(self, key: str, n: int = 1) -> None:
+        self.notes[key] = self.notes.get(key, 0) + n
+
+    def report(self) -> dict:
+        return {"tokens": self.used, "budget": self.total,
+                "sections": dict(self.sections), **self.notes}
@@ -6,13 +6,14 @@ Requires:  pip install -r requirements.txt
 """
 
 import re, time, io
-from collections import Counter
 
 import requests
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from keyword_engine import KeywordEngine
+
 # ── Optional deps ─────────────────────────────────────────────
 try:
     from wordcloud import WordCloud as _WC
@@ -28,11 +29,10 @@ try:
 except ImportError:
     ANTHROPIC_OK = False
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer as _Vader
-    VADER_OK = True
-except ImportError:
-    VADER_OK = False
+# VADER via the shared scoring service (single analyzer + persistent score cache)
+from sentiment_scoring import VADER_AVAILABLE as VADER_OK, compound_scores
+import report_cache
+import upstream_sim
 
 try:
     from reportlab.lib.pagesizes import A4
@@ -44,6 +44,8 @@ try:
 except ImportError:
     REPORTLAB_OK = False
 
+upstream_sim.install_from_env()   # no-op unless UPSTREAM_SIM_URL is set — see upstream_sim.py
+
 # ─────────────────────────────────────────────────────────────
 st.set_page_config(page_title="SEGA Reddit Lens", page_icon=":material/forum:",
                    layout="wide", initial_sidebar_state="collapsed")
@@ -520,10 +522,8 @@ def fetch_comments(post_id: str, sub: str, limit=50) -> list[dict]:
 
 def run_sentiment(texts: list[str]) -> list[tuple[str, float]]:
     if VADER_OK:
-        a = _Vader()
         out = []
-        for t in texts:
-            c = a.polarity_scores(t)["compound"]
+        for c in compound_scores(texts):
             out.append(("Positive" if c >= 0.05 else "Negative" if c <= -0.05 else "Neutral", round(c,4)))
         return out
     POS = {"good","great","love","amazing","best","excellent","fun","enjoy","awesome",
@@ -538,10 +538,12 @@ def run_sentiment(texts: list[str]) -> list[tuple[str, float]]:
         out.append(("Positive" if sc>0 else "Negative" if sc<0 else "Neutral", round(sc,4)))
     return out
 
+@st.cache_resource(show_spinner=False)
+def _keyword_engine() -> KeywordEngine:
+    return KeywordEngine(SW, token_pattern=r"\b[a-z]{3,}\b", bigrams=False)
+
 def keywords(texts: list[str], n=30) -> list[tuple[str,int]]:
-    words = []
-    for t in texts: words.extend(re.findall(r"\b[a-z]{3,}\b", t.lower()))
-    return Counter(w for w in words if w not in SW).most_common(n)
+    return _keyword_engine().top_terms(texts, n)
 
 # ─────────────────────────────────────────────────────────────
 # CHARTS
@@ -1276,7 +1278,8 @@ if st.session_state.fetch_done and st.session_state.posts_df is not None:
             st.info("Add CLAUDE_KEY to secrets to enable AI reports.")
         else:
             if not st.session_state.ai_report:
-                if st.button("✨ Generate AI Report", key="gen_rpt"):
+                _regen = st.session_state.pop("ai_regenerate", False)
+                if st.button("✨ Generate AI Report", key="gen_rpt") or _regen:
                     gname  = st.session_state.get("active_genre","the genre").strip()
                     pk_s   = ", ".join(f"{w}({c})" for w,c in keywords(df_posts[df_posts["sentiment"]=="Positive"]["full_text"].tolist())[:20])
                     nk_s   = ", ".join(f"{w}({c})" for w,c in keywords(df_posts[df_posts["sentiment"]=="Negative"]["full_text"].tolist())[:20])
@@ -1318,13 +1321,17 @@ Write a comprehensive report covering:
 
 Use markdown. Be specific with numbers."""
 
+                    rkey   = report_cache.cache_key(prompt, ai_model, "", 4096)
+                    cached = report_cache.get(rkey, "reddit_report", regenerate=_regen)
                     client = _anthropic.Anthropic(api_key=_SECRET_KEY)
-                    ph = st.empty(); txt = ""
+                    ph = st.empty(); txt = cached or ""
                     try:
-                        with client.messages.stream(model=ai_model, max_tokens=4096,
-                                                    messages=[{"role":"user","content":prompt}]) as s:
-                            for d in s.text_stream:
-                                txt += d; ph.markdown(txt+"▌")
+                        if cached is None:
+                            with client.messages.stream(model=ai_model, max_tokens=4096,
+                                                        messages=[{"role":"user","content":prompt}]) as s:
+                                for d in s.text_stream:
+                                    txt += d; ph.markdown(txt+"▌")
+                            report_cache.put(rkey, "reddit_report", txt, ai_model)
                         ph.markdown(txt)
                         st.session_state.ai_report = txt
                     except _anthropic.AuthenticationError: st.error("Invalid API key.")
@@ -1334,6 +1341,13 @@ Use markdown. Be specific with numbers."""
                 st.markdown(st.session_state.ai_report)
 
             if st.session_state.ai_report:
+                rc1, rc2 = st.columns([4, 1])
+                with rc1: st.caption(report_cache.hit_rate_line("reddit_report"))
+                with rc2:
+                    if st.button("↻ Regenerate", key="regen_rpt", help="Ask Claude again instead of reusing the cached report"):
+                        st.session_state.ai_report = ""
+                        st.session_state.ai_regenerate = True
+                        st.rerun()
                 slug = st.session_state.get("active_genre","report").replace(" ","_")
                 st.markdown("<br>", unsafe_allow_html=True)
                 st.markdown('<div style="font-size:.62rem;font-weight:700;letter-spacing:.18em;text-transform:uppercase;color:var(--muted);margin-bottom:.5rem;">DOWNLOAD REPORT</div>', unsafe_allow_html=True)
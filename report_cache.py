@@ -0,0 +1,181 @@
+"""
+report_cache.py — Local SQLite cache of Claude completions, content-addressed.
+=============================================================================
+Clicking "Generate" with the same data and settings used to stream a whole
+new report (and, on the Steam dashboard, repeat the JSON summary call). Each
+completion is now stored under a hash of the full request:
+
+    cache_key(prompt, model, system, max_tokens)  →  text
+
+so an identical request, from any session or user of this deployment, is
+answered from disk. Entries older than the caller's TTL are treated as
+missing, and purge_expired() drops those past the TTL they were written
+with; an explicit regenerate bypasses the lookup and overwrites the entry.
+
+Tables
+──────
+completions — one row per key: kind (steam_report, reddit_report, …), model,
+              created_at, expires_at (created_at + the writer's TTL), hits, text.
+lookups     — per kind: hits, misses, bypassed (regenerate) — for hit rate.
+
+Path defaults to data/report_cache.sqlite; override with REPORT_CACHE_PATH.
+Connections are opened per call (WAL mode), so worker threads can share it.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+REPORT_CACHE_PATH = Path(os.environ.get(
+    "REPORT_CACHE_PATH", Path(__file__).parent / "data" / "report_cache.sqlite"))
+
+REPORT_CACHE_TTL_S = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key        TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    model      TEXT,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    hits       INTEGER DEFAULT 0,
+    text       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_expires ON completions (expires_at);
+CREATE TABLE IF NOT EXISTS lookups (
+    kind     TEXT PRIMARY KEY,
+    hits     INTEGER DEFAULT 0,
+    misses   INTEGER DEFAULT 0,
+    bypassed INTEGER DEFAULT 0
+);
+"""
+
+_initialised: set[str] = set()
+
+
+@contextmanager
+def _conn():
+    path = str(REPORT_CACHE_PATH)
+    REPORT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _initialised:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _initialised.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def cache_key(prompt: str, model: str, system: str = "", max_tokens: int = 0) -> str:
+    """Content address of one completion request."""
+    h = hashlib.sha256()
+    for part in (model, system or "", str(max_tokens), prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _count(c, kind: str, column: str) -> None:
+    c.execute("INSERT OR IGNORE INTO lookups (kind) VALUES (?)", (kind,))
+    c.execute(f"UPDATE lookups SET {column} = {column} + 1 WHERE kind = ?", (kind,))
+
+
+def get(key: str, kind: str, ttl: float = REPORT_CACHE_TTL_S, regenerate: bool = False) -> str | None:
+    """Stored text for key if younger than ttl; None on a miss or when regenerating.
+    Every call is counted towards kind's hit rate."""
+    with _conn() as c:
+        if regenerate:
+            _count(c, kind, "bypassed")
+            return None
+        row = c.execute("SELECT text FROM completions WHERE key = ? AND created_at >= ?",
+                        (key, time.time() - ttl)).fetchone()
+        if row is None:
+            _count(c, kind, "misses")
+            return None
+        _count(c, kind, "hits")
+        c.execute("UPDATE completions SET hits = hits + 1 WHERE key = ?", (key,))
+    return row[0]
+
+
+def put(key: str, kind: str, text: str, model: str = "", ttl: float = REPORT_CACHE_TTL_S) -> None:
+    if not text:
+        return
+    now = time.time()
+    with _conn() as c:
+        c.execute("INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, 0, ?)",
+                  (key, kind, model, now, now + ttl, text))
+
+
+def complete(client, kind: str, model: str, max_tokens: int, prompt: str, system: str = "",
+             ttl: float = REPORT_CACHE_TTL_S, regenerate: bool = False) -> tuple[str, bool]:
+    """(text, from_cache) for a non-streamed messages.create through the cache."""
+    key  = cache_key(prompt, model, system, max_tokens)
+    text = get(key, kind, ttl, regenerate)
+    if text is not None:
+        return text, True
+    kwargs = dict(model=model, max_tokens=max_tokens, messages=[{"role": "user", "content": prompt}])
+    if system:
+        kwargs["system"] = system
+    text = client.messages.create(**kwargs).content[0].text
+    put(key, kind, text, model, ttl)
+    return text, False
+
+
+def hit_rate(kind: str | None = None) -> dict:
+    """{"hits", "misses", "bypassed", "rate"} for kind, or summed over all kinds.
+    rate is hits / (hits + misses + bypassed), 0 with no lookups yet."""
+    if not REPORT_CACHE_PATH.exists():
+        return {"hits": 0, "misses": 0, "bypassed": 0, "rate": 0.0}
+    with _conn() as c:
+        where, args = ("WHERE kind = ?", (kind,)) if kind else ("", ())
+        hits, misses, bypassed = c.execute(
+            f"SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(misses), 0), COALESCE(SUM(bypassed), 0) "
+            f"FROM lookups {where}", args).fetchone()
+    total = hits + misses + bypassed
+    return {"hits": hits, "misses": misses, "bypassed": bypassed,
+            "rate": round(hits / total, 3) if total else 0.0}
+
+
+def hit_rate_line(kind: str | None = None) -> str:
+    """One-line hit rate summary for UI captions."""
+    r     = hit_rate(kind)
+    total = r["hits"] + r["misses"] + r["bypassed"]
+    return (f"Report cache hit rate {r['rate']:.0%} ({r['hits']}/{total} requests) · "
+            f"{store_summary()['entries']} cached completions")
+
+
+def kinds() -> list[str]:
+    if not REPORT_CACHE_PATH.exists():
+        return []
+    with _conn() as c:
+        return [k for (k,) in c.execute("SELECT kind FROM lookups ORDER BY kind")]
+
+
+def store_summary() -> dict:
+    """Totals for UI captions: entries stored, file size in MB."""
+    if not REPORT_CACHE_PATH.exists():
+        return {"entries": 0, "size_mb": 0.0}
+    with _conn() as c:
+        (n,) = c.execute("SELECT COUNT(*) FROM completions").fetchone()
+    return {"entries": n, "size_mb": round(REPORT_CACHE_PATH.stat().st_size / 1_048_576, 1)}
+
+
+def purge_expired() -> int:
+    """Delete entries past the TTL they were written with; returns how many went."""
+    if not REPORT_CACHE_PATH.exists():
+        return 0
+    with _conn() as c:
+        return c.execute("DELETE FROM completions WHERE expires_at < ?", (time.time(),)).rowcount
+
+
+def clear() -> None:
+    """Forget every stored completion and reset the hit counters."""
+    with _conn() as c:
+        c.execute("DELETE FROM completions")
+        c.execute("DELETE FROM lookups")
@@ -0,0 +1,223 @@
+"""
+review_facets.py — Facet index for the Steam review results dashboard.
+======================================================================
+Built once per fetched dataset (steam_sentiment keeps it in session_state
+next to results_df). Columns the dashboard filters and groups on are pulled
+out once as NumPy arrays:
+
+    game_codes  — categorical code per row (games = code → title)
+    voted_up / ea / playtime / ts / helpful / vader
+    month_key   — year*12 + month-1 (UTC), -1 where timestamp is missing
+
+A filter combination (EA / playtime / date / game) becomes a boolean mask,
+and view() returns a FacetView for it. Views are cached per filter tuple and
+memoise their own aggregates — summary, per-game slices, keyword counts,
+playtime quantiles, monthly counts — so a tab re-render or a filter toggled
+back reads stored results instead of re-scanning the frame.
+
+Text search goes through a ReviewSearchIndex (review_search.py) built on the
+first FacetView.search() call and shared by every view of the dataset.
+"""
+
+import numpy as np
+import pandas as pd
+
+from review_search import ReviewSearchIndex
+
+_VIEW_CACHE_MAX = 24
+
+
+def month_label(key: int) -> str:
+    """month_key → "YYYY-MM"."""
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+
+class ReviewFacets:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        titles = df["game_title"]
+        cat = (titles.cat.remove_unused_categories().array
+               if isinstance(titles.dtype, pd.CategoricalDtype) else pd.Categorical(titles.astype(str)))
+        self.games      = list(cat.categories)
+        self.game_index = {g: i for i, g in enumerate(self.games)}
+        self.game_codes = np.asarray(cat.codes, dtype=np.int32)
+        self.voted_up   = df["voted_up"].fillna(False).astype(bool).to_numpy()
+        self.playtime   = pd.to_numeric(df["author_playtime_hrs"], errors="coerce").to_numpy(dtype=float)
+        self.helpful    = pd.to_numeric(df["votes_helpful"], errors="coerce").to_numpy(dtype=float)
+        self.ts         = pd.to_numeric(df["timestamp_created"], errors="coerce").to_numpy(dtype=float)
+        self.ea = (df["written_during_ea"].fillna(False).astype(bool).to_numpy()
+                   if "written_during_ea" in df.columns else np.zeros(len(df), dtype=bool))
+        self.vader = (pd.to_numeric(df["vader_compound"], errors="coerce").to_numpy(dtype=float)
+                      if "vader_compound" in df.columns else None)
+        # Kept in the frame's own (Arrow-backed when compacted) storage; Python
+        # strings are only materialised for the slice being tokenized
+        texts = df["review_text"]
+        if not isinstance(texts.dtype, pd.StringDtype):
+            texts = texts.fillna("").astype(str)
+        self.texts = texts.fillna("").array
+
+        valid = ~np.isnan(self.ts)
+        dt    = pd.to_datetime(np.where(valid, self.ts, 0), unit="s")
+        self.month_key = np.where(valid, dt.year * 12 + dt.month - 1, -1).astype(np.int32)
+        self._views: dict[tuple, FacetView] = {}
+        self._search: ReviewSearchIndex | None = None
+
+    def search_index(self) -> ReviewSearchIndex:
+        """Inverted index over review_text, built on first use."""
+        if self._search is None:
+            self._search = ReviewSearchIndex(self.texts, self.helpful)
+        return self._search
+
+    def mask(self, ea: str = "All", pt_low=None, pt_high=None,
+             ts_from=None, ts_to=None, game: str | None = None) -> np.ndarray:
+        m = np.ones(len(self.df), dtype=bool)
+        if ea == "EA Only":
+            m &= self.ea
+        elif ea == "Post-EA Only":
+            m &= ~self.ea
+        if pt_low is not None:
+            m &= self.playtime >= pt_low
+        if pt_high is not None:
+            m &= self.playtime <= pt_high
+        if ts_from is not None:
+            m &= self.ts >= ts_from
+        if ts_to is not None:
+            m &= self.ts <= ts_to
+        if game is not None:
+            m &= self.game_codes == self.game_index.get(game, -2)
+        return m
+
+    def view(self, ea: str = "All", pt_low=None, pt_high=None,
+             ts_from=None, ts_to=None, game: str | None = None) -> "FacetView":
+        key = (ea, pt_low, pt_high, ts_from, ts_to, game)
+        v = self._views.get(key)
+        if v is None:
+            if len(self._views) >= _VIEW_CACHE_MAX:
+                self._views.pop(next(iter(self._views)))
+            v = self._views[key] = FacetView(self, self.mask(*key), key)
+        return v
+
+
+class FacetView:
+    """One filtered slice of a ReviewFacets dataset, with memoised aggregates."""
+
+    def __init__(self, facets: ReviewFacets, mask: np.ndarray, key: tuple = ()):
+        self.facets = facets
+        self.key    = key
+        self.rows   = np.flatnonzero(mask)
+        self.df     = facets.df.iloc[self.rows]
+        self._memo: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _memoised(self, key, build):
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    def _rows_for(self, game=None, voted_up=None) -> np.ndarray:
+        f, r = self.facets, self.rows
+        if game is not None:
+            r = r[f.game_codes[r] == f.game_index.get(game, -2)]
+        if voted_up is not None:
+            r = r[f.voted_up[r] == bool(voted_up)]
+        return r
+
+    def subset(self, game: str) -> "FacetView":
+        """This view narrowed to one game (cached on the parent index)."""
+        return self.facets.view(*self.key[:5], game=game)
+
+    def frame(self, game=None, voted_up=None) -> pd.DataFrame:
+        if game is None and voted_up is None:
+            return self.df
+        return self._memoised(("frame", game, voted_up),
+                              lambda: self.facets.df.iloc[self._rows_for(game, voted_up)])
+
+    def texts(self, game=None, voted_up=None) -> list[str]:
+        # Not memoised — callers memoise what they derive (keywords), and a
+        # cached list would pin a second copy of the slice's text per session
+        return self.facets.texts[self._rows_for(game, voted_up)].tolist()
+
+    def keywords(self, extractor, top_n: int, game=None, voted_up=None) -> list[tuple[str, int]]:
+        """extractor(texts, top_n) over the slice, memoised per (game, polarity, top_n)."""
+        return self._memoised(("kw", getattr(extractor, "__name__", id(extractor)), top_n, game, voted_up),
+                              lambda: extractor(self.texts(game, voted_up), top_n))
+
+    def search(self, query: str, k: int = 10, game=None, voted_up=None) -> tuple[int, pd.DataFrame]:
+        """(match count, top-k matching rows — most helpful, then longest) in the slice."""
+        def _build():
+            f      = self.facets
+            within = np.zeros(len(f.df), dtype=bool)
+            within[self._rows_for(game, voted_up)] = True
+            n, top = f.search_index().search(query, k, within)
+            return n, f.df.iloc[top]
+        return self._memoised(("search", str(query).strip().lower(), k, game, voted_up), _build)
+
+    def summary(self) -> pd.DataFrame:
+        """Same columns and order as steam_sentiment.build_summary, one groupby."""
+        def _build():
+            f, r = self.facets, self.rows
+            if not len(r):
+                return pd.DataFrame(columns=["game_title", "total_reviews", "positive_reviews",
+                                             "negative_reviews", "positive_pct", "avg_playtime_hrs",
+                                             "median_playtime_hrs", "avg_helpful_votes"])
+            g = pd.DataFrame({"code": f.game_codes[r], "up": f.voted_up[r],
+                              "pt": f.playtime[r], "hv": f.helpful[r]}).groupby("code")
+            agg = pd.DataFrame({
+                "total_reviews":       g.size(),
+                "positive_reviews":    g["up"].sum().astype(int),
+                "avg_playtime_hrs":    g["pt"].mean().round(1),
+                "median_playtime_hrs": g["pt"].median().round(1),
+                "avg_helpful_votes":   g["hv"].mean().round(2),
+            })
+            agg["negative_reviews"] = agg["total_reviews"] - agg["positive_reviews"]
+            agg["positive_pct"]     = (agg["positive_reviews"] / agg["total_reviews"] * 100).round(1)
+            agg.insert(0, "game_title", [f.games[c] for c in agg.index])
+            cols = ["game_title", "total_reviews", "positive_reviews", "negative_reviews",
+                    "positive_pct", "avg_playtime_hrs", "median_playtime_hrs", "avg_helpful_votes"]
+            return agg[cols].reset_index(drop=True).sort_values("positive_pct", ascending=False)
+        return self._memoised(("summary",), _build)
+
+    def game_stats(self, game: str) -> dict:
+        """n, share of view, playtime median/p90 and mean VADER for one game."""
+        def _build():
+            f, r = self.facets, self._rows_for(game)
+            pt = f.playtime[r]
+            pt = pt[~np.isnan(pt)]
+            vd = f.vader[r] if f.vader is not None else np.array([])
+            vd = vd[~np.isnan(vd)]
+            return {
+                "n":         len(r),
+                "share":     len(r) / len(self.rows) if len(self.rows) else 0.0,
+                "pt_median": float(np.median(pt)) if len(pt) else float("nan"),
+                "pt_p90":    float(np.quantile(pt, 0.90)) if len(pt) else float("nan"),
+                "vader":     float(vd.mean()) if len(vd) else float("nan"),
+            }
+        return self._memoised(("stats", game), _build)
+
+    def monthly(self) -> pd.DataFrame:
+        """Per game × month: reviews, positive, pct_pos, vader_mean (one grouped pass).
+        Rows are sorted by game title then month; month is "YYYY-MM"."""
+        def _build():
+            f, r = self.facets, self.rows
+            r = r[f.month_key[r] >= 0]
+            frame = pd.DataFrame({"code": f.game_codes[r], "month_key": f.month_key[r],
+                                  "up": f.voted_up[r].astype(float)})
+            if f.vader is not None:
+                frame["vader"] = f.vader[r]
+            g   = frame.groupby(["code", "month_key"], sort=True)
+            out = g.agg(reviews=("up", "size"), positive=("up", "sum"),
+                        **({"vader_mean": ("vader", "mean")} if f.vader is not None else {}))
+            out = out.reset_index()
+            out["positive"]   = out["positive"].astype(int)
+            out["pct_pos"]    = out["positive"] / out["reviews"] * 100
+            out["game_title"] = [f.games[c] for c in out["code"]]
+            out["month"]      = [month_label(k) for k in out["month_key"]]
+            return out.drop(columns="code")
+        return self._memoised(("monthly",), _build)
+
+
+def monthly_by_game(df: pd.DataFrame) -> pd.DataFrame:
+    """FacetView.monthly() for an arbitrary review frame (no stored index)."""
+    return ReviewFacets(df).view().monthly()
@@ -0,0 +1,135 @@
+"""
+review_search.py — Positional inverted index over review text.
+==============================================================
+Backs the "reviews mentioning" drill-down in steam_sentiment. Built once per
+dataset (ReviewFacets.search_index builds it on the first search), after which
+a query is a handful of NumPy slices instead of a regex scan over every review.
+
+Layout
+──────
+Every review is tokenized once (lower-cased word runs, apostrophes and
+punctuation split) into one int32 token stream; offsets[i] is where review i
+starts in it. Token ids follow sorted term order, so:
+
+    positions[ptr[t]:ptr[t+1]]   — stream positions of term t
+    a prefix ("fun*")            — one contiguous id range → one slice
+
+Queries
+───────
+    "stutter"       term    — whole-word match
+    "frame drops"   phrase  — adjacent tokens, same review
+    "optimi*"       prefix  — trailing * on the last word (phrases too)
+
+Phrases are anchored on their rarest word and the other positions checked
+directly in the stream. Matches are ranked like the old drill-down — most
+helpful first, then longest text — using a rank precomputed at build time, so
+top-k is an argpartition over the matching rows.
+"""
+
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_EMPTY    = np.zeros(0, dtype=np.int64)
+
+
+def tokenize(text) -> list[str]:
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def parse_query(query: str) -> list[tuple[str, bool]]:
+    """[(token, is_prefix)] — only the last token can be a prefix."""
+    q      = str(query or "").strip()
+    prefix = q.endswith("*")
+    toks   = tokenize(q.rstrip("*"))
+    return [(t, prefix and i == len(toks) - 1) for i, t in enumerate(toks)]
+
+
+def highlight_pattern(query: str) -> re.Pattern | None:
+    """Regex matching what the query matches, for bolding hits in a snippet."""
+    parts = [re.escape(t) + (r"[^\W_]*" if p else r"\b") for t, p in parse_query(query)]
+    return re.compile(r"\b" + r"[\W_]+".join(parts), re.IGNORECASE) if parts else None
+
+
+class ReviewSearchIndex:
+    """Inverted index over `texts` (row i = texts[i]); helpful drives ranking."""
+
+    def __init__(self, texts, helpful=None):
+        texts  = list(texts)
+        n      = len(texts)
+        vocab: dict[str, int] = {}
+        ids: list[int] = []
+        lengths = np.zeros(n, dtype=np.int64)
+        for i, text in enumerate(texts):
+            toks = tokenize(text)
+            lengths[i] = len(toks)
+            ids.extend([vocab.setdefault(w, len(vocab)) for w in toks])
+
+        # Renumber ids into sorted term order so prefixes are contiguous id ranges
+        self.terms = sorted(vocab)
+        rank_of    = {w: i for i, w in enumerate(self.terms)}
+        remap      = np.fromiter((rank_of[w] for w in vocab), dtype=np.int32, count=len(vocab))
+        self.stream  = remap[np.asarray(ids, dtype=np.int32)] if ids else np.zeros(0, dtype=np.int32)
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.positions = np.argsort(self.stream, kind="stable").astype(np.int64)
+        self.ptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.stream, minlength=len(self.terms)), out=self.ptr[1:])
+
+        # rank[i] = position of row i in (helpful desc, text length desc) order
+        hv = np.nan_to_num(np.asarray(helpful, dtype=float), nan=0.0) if helpful is not None \
+            else np.zeros(n)
+        chars = np.fromiter((len(str(t or "")) for t in texts), dtype=np.int64, count=n)
+        self.rank = np.empty(n, dtype=np.int64)
+        self.rank[np.lexsort((-chars, -hv))] = np.arange(n)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _id_range(self, token: str, prefix: bool) -> tuple[int, int]:
+        lo = bisect_left(self.terms, token)
+        if prefix:
+            return lo, bisect_left(self.terms, token + "\U0010ffff", lo)
+        return (lo, lo + 1) if lo < len(self.terms) and self.terms[lo] == token else (lo, lo)
+
+    def match(self, query: str) -> np.ndarray:
+        """Sorted row ids of every review matching query."""
+        spec = [self._id_range(t, p) for t, p in parse_query(query)]
+        if not spec:
+            return _EMPTY
+        counts = [self.ptr[hi] - self.ptr[lo] for lo, hi in spec]
+        if min(counts) == 0:
+            return _EMPTY
+        anchor = int(np.argmin(counts))
+        lo, hi = spec[anchor]
+        starts = self.positions[self.ptr[lo]:self.ptr[hi]] - anchor
+        starts = starts[starts >= 0]
+        for j, (lo, hi) in enumerate(spec):
+            if j == anchor:
+                continue
+            starts = starts[starts + j < len(self.stream)]
+            tok    = self.stream[starts + j]
+            starts = starts[(tok >= lo) & (tok < hi)]
+        rows = np.searchsorted(self.offsets, starts, side="right") - 1
+        if len(spec) > 1:
+            rows = rows[starts + len(spec) <= self.offsets[rows + 1]]   # phrase can't span reviews
+        hit = np.zeros(len(self), dtype=bool)
+        hit[rows] = True
+        return np.flatnonzero(hit)
+
+    def search(self, query: str, k: int = 10, within: np.ndarray | None = None) -> tuple[int, np.ndarray]:
+        """(number of matches, top-k row ids best-ranked first).
+
+        within — optional boolean mask over rows restricting the search."""
+        rows = self.match(query)
+        if within is not None:
+            rows = rows[within[rows]]
+        n = len(rows)
+        if n > k:
+            rows = rows[np.argpartition(self.rank[rows], k)[:k]]
+        return n, rows[np.argsort(self.rank[rows])]
+
+    def memory_bytes(self) -> int:
+        return sum(a.nbytes for a in (self.stream, self.offsets, self.positions, self.ptr, self.rank))
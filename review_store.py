@@ -0,0 +1,213 @@
+"""
+review_store.py — Local SQLite corpus of Steam reviews for incremental refresh.
+===============================================================================
+Every review steam_reviews pulls is kept here, keyed by recommendation_id, so a
+re-fetch only pages until it meets reviews already on disk.
+
+Tables
+──────
+reviews     — one row per recommendation_id: app_id, review language,
+              timestamp_created and the full row dict as JSON.
+fetched     — (app_id, request language, recommendation_id): which reviews
+              each request language has paged past, so an "all" fetch after
+              an "english" one is not satisfied by the English rows alone.
+sync_state  — one row per (app_id, request language):
+              newest_ts    — newest timestamp_created stored for this request
+              tail_cursor  — Steam cursor just past the oldest page stored,
+                             so history backfill resumes where it stopped
+              gap_cursors  — JSON list of cursors where a head pass stopped
+                             short of the stored reviews, newest first; the
+                             pages between are backfilled on later fetches
+              exhausted    — 1 once Steam returned no more history
+
+The request language is the appreviews `language` param ("english" / "all").
+Rows store the review's own language, so an "all" fetch also fills "english"
+reads.
+
+Path defaults to data/review_store.sqlite; override with REVIEW_STORE_PATH.
+Connections are opened per call (WAL mode), so worker threads can share it.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+REVIEW_STORE_PATH = Path(os.environ.get(
+    "REVIEW_STORE_PATH", Path(__file__).parent / "data" / "review_store.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    recommendation_id TEXT PRIMARY KEY,
+    app_id            INTEGER NOT NULL,
+    language          TEXT,
+    timestamp_created INTEGER,
+    row_json          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_app_ts ON reviews (app_id, timestamp_created DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    app_id      INTEGER NOT NULL,
+    language    TEXT    NOT NULL,
+    newest_ts   INTEGER DEFAULT 0,
+    tail_cursor TEXT    DEFAULT '',
+    exhausted   INTEGER DEFAULT 0,
+    updated_at  REAL    DEFAULT 0,
+    gap_cursors TEXT    DEFAULT '[]',
+    PRIMARY KEY (app_id, language)
+);
+CREATE TABLE IF NOT EXISTS fetched (
+    app_id            INTEGER NOT NULL,
+    language          TEXT    NOT NULL,
+    recommendation_id TEXT    NOT NULL,
+    PRIMARY KEY (app_id, language, recommendation_id)
+);
+"""
+
+# Stores written before the fetched table existed: credit each stored row to
+# the request languages that had synced the app and would have returned it.
+_BACKFILL_FETCHED = """
+INSERT OR IGNORE INTO fetched
+SELECT r.app_id, s.language, r.recommendation_id
+FROM reviews r JOIN sync_state s ON s.app_id = r.app_id
+WHERE (s.language = 'all' OR s.language = r.language)
+  AND NOT EXISTS (SELECT 1 FROM fetched)
+"""
+
+_initialised: set[str] = set()
+
+
+@contextmanager
+def _conn():
+    path = str(REVIEW_STORE_PATH)
+    REVIEW_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _initialised:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.execute("ALTER TABLE sync_state ADD COLUMN gap_cursors TEXT DEFAULT '[]'")
+            except sqlite3.OperationalError:
+                pass                                   # created with it, or migrated already
+            conn.execute(_BACKFILL_FETCHED)
+            _initialised.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _lang_clause(language: str) -> tuple[str, tuple]:
+    return ("", ()) if language == "all" else (" AND language = ?", (language,))
+
+
+def known_ids(app_id: int) -> set[str]:
+    """Every recommendation_id stored for app_id (any language)."""
+    with _conn() as c:
+        return {r[0] for r in c.execute(
+            "SELECT recommendation_id FROM reviews WHERE app_id = ?", (app_id,))}
+
+
+def count_reviews(app_id: int, language: str) -> int:
+    clause, args = _lang_clause(language)
+    with _conn() as c:
+        return c.execute(f"SELECT COUNT(*) FROM reviews WHERE app_id = ?{clause}",
+                         (app_id, *args)).fetchone()[0]
+
+
+def fetched_ids(app_id: int, language: str) -> set[str]:
+    """recommendation_ids a request in `language` has already paged past."""
+    with _conn() as c:
+        return {r[0] for r in c.execute(
+            "SELECT recommendation_id FROM fetched WHERE app_id = ? AND language = ?", (app_id, language))}
+
+
+def mark_fetched(app_id: int, language: str, ids: list[str]) -> None:
+    if not ids:
+        return
+    with _conn() as c:
+        c.executemany("INSERT OR IGNORE INTO fetched VALUES (?, ?, ?)",
+                      [(app_id, language, i) for i in ids])
+
+
+def upsert_reviews(rows: list[dict], review_languages: list[str | None]) -> None:
+    """Insert or refresh rows. A review fetched again replaces the stored copy,
+    so its text and vote counts are as of the last page that returned it."""
+    if not rows:
+        return
+    with _conn() as c:
+        c.executemany(
+            "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?)",
+            [(r["recommendation_id"], r["app_id"], lang, r.get("timestamp_created"), json.dumps(r))
+             for r, lang in zip(rows, review_languages)],
+        )
+
+
+def load_reviews(app_id: int, language: str, limit: int, title: str | None = None) -> list[dict]:
+    """Newest `limit` stored rows for app_id, newest first."""
+    clause, args = _lang_clause(language)
+    with _conn() as c:
+        rows = [json.loads(r[0]) for r in c.execute(
+            f"SELECT row_json FROM reviews WHERE app_id = ?{clause} "
+            f"ORDER BY timestamp_created DESC LIMIT ?", (app_id, *args, limit))]
+    if title is not None:
+        for r in rows:
+            r["game_title"] = title
+    return rows
+
+
+def load_texts(limit: int | None = None) -> list[str]:
+    """Review bodies across every stored app, newest first (for benchmarks)."""
+    if not REVIEW_STORE_PATH.exists():
+        return []
+    with _conn() as c:
+        rows = c.execute("SELECT row_json FROM reviews ORDER BY timestamp_created DESC"
+                         + (" LIMIT ?" if limit else ""), (limit,) if limit else ())
+        return [json.loads(r[0]).get("review_text", "") for r in rows]
+
+
+def get_sync_state(app_id: int, language: str) -> dict | None:
+    with _conn() as c:
+        row = c.execute(
+            "SELECT newest_ts, tail_cursor, exhausted, updated_at, gap_cursors FROM sync_state "
+            "WHERE app_id = ? AND language = ?", (app_id, language)).fetchone()
+    if row is None:
+        return None
+    return {"newest_ts": row[0] or 0, "tail_cursor": row[1] or "",
+            "exhausted": bool(row[2]), "updated_at": row[3] or 0.0,
+            "gap_cursors": json.loads(row[4] or "[]")}
+
+
+def set_sync_state(app_id: int, language: str, **fields) -> None:
+    """Upsert any of newest_ts / tail_cursor / gap_cursors / exhausted for (app_id, language)."""
+    state = get_sync_state(app_id, language) or {"newest_ts": 0, "tail_cursor": "", "exhausted": False,
+                                                 "gap_cursors": []}
+    state.update(fields)
+    with _conn() as c:
+        c.execute(
+            "INSERT OR REPLACE INTO sync_state "
+            "(app_id, language, newest_ts, tail_cursor, exhausted, updated_at, gap_cursors) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (app_id, language, int(state["newest_ts"] or 0), state["tail_cursor"] or "",
+             int(bool(state["exhausted"])), time.time(), json.dumps(state["gap_cursors"])),
+        )
+
+
+def store_summary() -> dict:
+    """Totals for UI captions: reviews stored, apps covered, file size in MB."""
+    if not REVIEW_STORE_PATH.exists():
+        return {"reviews": 0, "apps": 0, "size_mb": 0.0}
+    with _conn() as c:
+        n, apps = c.execute("SELECT COUNT(*), COUNT(DISTINCT app_id) FROM reviews").fetchone()
+    return {"reviews": n, "apps": apps,
+            "size_mb": round(REVIEW_STORE_PATH.stat().st_size / 1_048_576, 1)}
+
+
+def clear_app(app_id: int) -> None:
+    """Forget everything stored for app_id (forces a full re-download)."""
+    with _conn() as c:
+        c.execute("DELETE FROM reviews WHERE app_id = ?", (app_id,))
+        c.execute("DELETE FROM sync_state WHERE app_id = ?", (app_id,))
+        c.execute("DELETE FROM fetched WHERE app_id = ?", (app_id,))
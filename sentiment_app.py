@@ -188,6 +188,9 @@ try:
 except ImportError:
     PLOTLY_AVAILABLE = False
 
+from chat_context import build_request as build_chat_request, new_memory as new_chat_memory
+from chat_context import stream_reply, turn_caption
+
 # ─────────────────────────────────────────────────────────────
 # POSTGRES PROJECT STORAGE
 # ─────────────────────────────────────────────────────────────
@@ -399,6 +402,8 @@ for _k, _v in [
     ("analysed_dfs",    {}),
     ("chat_history",    []),
     ("chat_pending",    False),
+    ("chat_memory",     new_chat_memory()),   # rolling summary of older chat turns
+    ("chat_turn",       None),                # chat_context stats for the last reply
     ("analysis_done",   False),
     ("active_project",  ""),
     ("col_config",      {}),
@@ -1182,21 +1187,14 @@ with tab_chat:
     # Stream pending reply
     if st.session_state.chat_pending:
         st.session_state.chat_pending = False
-        _api_msgs = [{"role": m["role"], "content": m["content"]}
-                     for m in st.session_state.chat_history]
         try:
             with st.chat_message("assistant"):
-                _reply = ""
-                _ph    = st.empty()
-                with client.messages.stream(
-                    model="us.anthropic.claude-haiku-4-6",
-                    max_tokens=1000,
-                    system=_build_system(),
-                    messages=_api_msgs,
-                ) as _stream:
-                    for _delta in _stream.text_stream:
-                        _reply += _delta
-                        _ph.markdown(_reply + "▌")
+                _ph = st.empty()
+                # Dataset context as a cached prefix; older turns folded into a summary
+                _request = build_chat_request(client, "us.anthropic.claude-haiku-4-6", 1000, _build_system(),
+                                              st.session_state.chat_history, st.session_state.chat_memory)
+                _reply, st.session_state.chat_turn = stream_reply(
+                    client, _request, on_text=lambda _t: _ph.markdown(_t + "▌"))
                 _ph.markdown(_reply)
             st.session_state.chat_history.append({"role": "assistant", "content": _reply})
             # Auto-save chat to active project
@@ -1211,6 +1209,9 @@ with tab_chat:
         except Exception as _e:
             st.error(f"Chat error: {type(_e).__name__}: {_e}")
 
+    if st.session_state.chat_history and st.session_state.chat_turn:
+        st.caption(turn_caption(st.session_state.chat_turn, st.session_state.chat_memory))
+
     _user_msg = st.chat_input("Ask Claude about your datasets and sentiment results…")
     if _user_msg:
         st.session_state.chat_history.append({"role": "user", "content": _user_msg})
@@ -1221,6 +1222,7 @@ with tab_chat:
         if st.button("Clear chat history", key="clear_chat"):
             st.session_state.chat_history = []
             st.session_state.chat_pending = False
+            st.session_state.chat_turn    = None
             st.rerun()
 
 # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,238 @@
+"""
+sentiment_scoring.py — Shared VADER scoring service with a persistent cache.
+============================================================================
+Used by steam_sentiment, reddit_sentiment and overall_sentiment so the same
+text is only ever run through VADER once, across reruns, refetches and apps.
+
+Cache
+─────
+Key   — blake2b digest of the normalised text (whitespace collapsed, stripped).
+Value — VADER compound / pos / neu / neg.
+A bounded in-memory dict sits in front of a SQLite table
+(data/score_cache.sqlite, override with SCORE_CACHE_PATH). Both are keyed
+by content, so an identical comment seen by two apps is scored once.
+
+The analyzer is built once per process (it loads the lexicon on init) and
+shared by every caller. If vaderSentiment is missing, VADER_AVAILABLE is
+False and the batch APIs return None per text — callers keep their own
+keyword fallbacks.
+
+Large batches
+─────────────
+Cache misses at or above PARALLEL_MIN_TEXTS are sharded into PARALLEL_CHUNK
+slices across a process pool (SCORING_WORKERS processes, spawn context so it
+is safe under Streamlit's threads). Results come back in input order. The
+pool is started on first use and reused; if it breaks, scoring falls back to
+in-process. Smaller batches never pay the IPC cost.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import get_context
+from pathlib import Path
+
+from lazy_imports import module_available
+
+VADER_AVAILABLE = module_available("vaderSentiment")   # imported by get_analyzer()
+
+SCORE_CACHE_PATH = Path(os.environ.get(
+    "SCORE_CACHE_PATH", Path(__file__).parent / "data" / "score_cache.sqlite"))
+MEMORY_CACHE_MAX = 200_000    # entries kept in-process before the front cache is reset
+_SQL_CHUNK       = 500        # keys per SELECT … IN (…)
+
+PARALLEL_MIN_TEXTS = int(os.environ.get("SCORING_PARALLEL_MIN", 5000))   # below this: in-process
+PARALLEL_CHUNK     = 1000                                                # texts per pool task
+SCORING_WORKERS    = int(os.environ.get("SCORING_WORKERS", 0)) or min(8, os.cpu_count() or 1)
+
+_FIELDS = ("compound", "pos", "neu", "neg")
+_WS_RE  = re.compile(r"\s+")
+
+_ANALYZER = None
+_ANALYZER_LOCK = threading.Lock()
+_MEM: dict[str, tuple[float, float, float, float]] = {}
+_MEM_LOCK = threading.Lock()
+_STATS = {"memory_hits": 0, "disk_hits": 0, "scored": 0}
+_db_ready: set[str] = set()
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def normalize_text(text) -> str:
+    return _WS_RE.sub(" ", str(text or "")).strip()
+
+
+def text_key(text) -> str:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_analyzer():
+    """The process-wide SentimentIntensityAnalyzer (None without vaderSentiment)."""
+    global _ANALYZER
+    if not VADER_AVAILABLE:
+        return None
+    if _ANALYZER is None:
+        with _ANALYZER_LOCK:
+            if _ANALYZER is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                _ANALYZER = SentimentIntensityAnalyzer()
+    return _ANALYZER
+
+
+@contextmanager
+def _conn():
+    path = str(SCORE_CACHE_PATH)
+    SCORE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "key TEXT PRIMARY KEY, compound REAL, pos REAL, neu REAL, neg REAL)")
+            _db_ready.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _remember(entries: dict[str, tuple]) -> None:
+    with _MEM_LOCK:
+        if len(_MEM) + len(entries) > MEMORY_CACHE_MAX:
+            _MEM.clear()
+        _MEM.update(entries)
+
+
+def _disk_lookup(keys: list[str]) -> dict[str, tuple]:
+    found = {}
+    try:
+        with _conn() as c:
+            for i in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[i:i + _SQL_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for row in c.execute(
+                        f"SELECT key, compound, pos, neu, neg FROM scores WHERE key IN ({marks})", chunk):
+                    found[row[0]] = tuple(row[1:])
+    except sqlite3.Error:
+        pass    # cache is best-effort — a locked/corrupt file just means rescoring
+    return found
+
+
+def _disk_store(entries: dict[str, tuple]) -> None:
+    try:
+        with _conn() as c:
+            c.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)",
+                          [(k, *v) for k, v in entries.items()])
+    except sqlite3.Error:
+        pass
+
+
+def _analyze_local(texts: list[str]) -> list[tuple]:
+    analyzer = get_analyzer()
+    out = []
+    for t in texts:
+        s = analyzer.polarity_scores(t)
+        out.append((s["compound"], s["pos"], s["neu"], s["neg"]))
+    return out
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                                        initializer=get_analyzer)
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+def _analyze(texts: list[str], workers: int | None = None) -> list[tuple]:
+    """Score texts in order — across the process pool for big batches."""
+    workers = SCORING_WORKERS if workers is None else workers
+    if workers <= 1 or len(texts) < PARALLEL_MIN_TEXTS:
+        return _analyze_local(texts)
+    chunks = [texts[i:i + PARALLEL_CHUNK] for i in range(0, len(texts), PARALLEL_CHUNK)]
+    try:
+        out = []
+        for part in _get_pool(workers).map(_analyze_local, chunks):
+            out.extend(part)
+        return out
+    except (BrokenProcessPool, OSError):
+        shutdown_pool()
+        return _analyze_local(texts)
+
+
+def score_texts(texts: list, persist: bool = True, workers: int | None = None) -> list[dict | None]:
+    """Full VADER scores ({compound, pos, neu, neg}) for each text, in order.
+
+    Duplicates within the batch are scored once; cached texts are not scored
+    at all. workers overrides SCORING_WORKERS for the misses (1 = in-process).
+    Returns [None] * len(texts) when vaderSentiment is unavailable.
+    """
+    if not VADER_AVAILABLE:
+        return [None] * len(texts)
+    norm = [normalize_text(t) for t in texts]
+    keys = [hashlib.blake2b(t.encode("utf-8"), digest_size=16).hexdigest() for t in norm]
+
+    with _MEM_LOCK:
+        resolved = {k: _MEM[k] for k in set(keys) if k in _MEM}
+    _STATS["memory_hits"] += sum(1 for k in keys if k in resolved)
+
+    missing = [k for k in dict.fromkeys(keys) if k not in resolved]
+    if missing and persist:
+        disk = _disk_lookup(missing)
+        resolved.update(disk)
+        _STATS["disk_hits"] += len(disk)
+        _remember(disk)
+        missing = [k for k in missing if k not in disk]
+
+    if missing:
+        first = {}
+        for k, t in zip(keys, norm):
+            first.setdefault(k, t)
+        fresh = dict(zip(missing, _analyze([first[k] for k in missing], workers)))
+        _STATS["scored"] += len(fresh)
+        resolved.update(fresh)
+        _remember(fresh)
+        if persist:
+            _disk_store(fresh)
+
+    return [dict(zip(_FIELDS, resolved[k])) for k in keys]
+
+
+def compound_scores(texts: list, persist: bool = True, workers: int | None = None) -> list[float | None]:
+    """VADER compound per text, in order (None each without vaderSentiment)."""
+    return [s["compound"] if s else None for s in score_texts(texts, persist=persist, workers=workers)]
+
+
+def compound_score(text, persist: bool = True) -> float | None:
+    return compound_scores([text], persist=persist)[0]
+
+
+def cache_stats() -> dict:
+    """Counters since process start plus the on-disk entry count."""
+    disk_entries = 0
+    if SCORE_CACHE_PATH.exists():
+        try:
+            with _conn() as c:
+                disk_entries = c.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        except sqlite3.Error:
+            pass
+    return {**_STATS, "memory_entries": len(_MEM), "disk_entries": disk_entries}
@@ -13,12 +13,14 @@ functions, translations, and auth.
 """
 
 import concurrent.futures
+import time
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 
 from common import *  # noqa: F401,F403 — shared module; see common.py docstring
-from common import _fetch_one_game, _anthropic  # leading underscore — import * skips these
+from common import _fetch_one_game, _fetch_late_fields, _anthropic  # leading underscore — import * skips these
+import report_cache
 
 # ─────────────────────────────────────────────────────────────
 # PAGE SETUP  (must run before any other Streamlit call)
@@ -187,9 +189,16 @@ if not st.session_state.ccu_data:
         # Snapshots are small (JSON) — load once in the main thread, pass to all workers
         _snapshots = load_ccu_snapshots()
 
+        _progressive = bool(st.session_state.get("progressive_fetch", True))
+        if _progressive:
+            # Biggest titles first, so the top of the table fills in first
+            roster = order_roster_by_last_ccu(roster, _snapshots, raw_data)
+
         prog   = st.progress(0.0)
         status = st.empty()
         status.caption(f"Fetching {total} titles in parallel…")
+        _kpi_slot   = st.empty()
+        _table_slot = st.empty()
 
         results: list[dict] = []
         _placeholder: dict = {   # returned when a worker raises an exception
@@ -198,33 +207,98 @@ if not st.session_state.ccu_data:
             "yoy_source": "steamspy", "has_hist": False,
             "hist_summary": {}, "avg_2w_hrs": 0,
             "review_pct": None, "review_velocity": None,
-            "pos_reviews": 0, "neg_reviews": 0,
+            "pos_reviews": 0, "neg_reviews": 0, "pending": [],
         }
 
+        def _render_progress(rows: list[dict], done: int, first_row_s: float | None) -> None:
+            """Partial KPI + CCU table while the fetch is still running."""
+            _rows = sorted(rows, key=lambda x: x["ccu"], reverse=True)
+            _kpi_slot.markdown(f"""<div class="metric-card blue-top">
+            <div class="metric-label">{T("kpi_total_ccu")}</div>
+            <div class="metric-value">{sum(r["ccu"] for r in _rows):,}</div>
+            <div class="metric-sub">{T("progressive_loaded", done=done, total=total,
+                                        first=f"{first_row_s or 0:.1f}")}</div>
+            </div>""", unsafe_allow_html=True)
+            _c_tw, _c_rev = T("col_twitch"), T("col_review")
+            _table_slot.markdown(html_table([{
+                T("col_rank"):     i + 1,
+                T("col_title"):    r["name"],
+                T("col_live_ccu"): (f"{r['ccu']:,} …" if "ccu" in r.get("pending", [])
+                                    else f"{r['ccu']:,} *" if r.get("ccu_from_csv") else f"{r['ccu']:,}"),
+                _c_tw:  ("…" if "twitch_viewers" in r.get("pending", [])
+                         else f"{r['twitch_viewers']:,}" if r.get("twitch_viewers") is not None else "—"),
+                _c_rev: ("…" if "review_pct" in r.get("pending", []) and r.get("review_pct") is None
+                         else f"{r['review_pct']}%" if r.get("review_pct") else "—"),
+            } for i, r in enumerate(_rows)]), unsafe_allow_html=True)
+
         # Worker count kept moderate (was 12) — Steam/SteamSpy concurrency is
         # capped separately per-API by _STEAM_CCU_SEM / _STEAMSPY_SEM inside
         # each worker regardless, but fewer total threads means less burst
         # pressure overall when many titles miss cache at once.
+        # In progressive mode each title is fetched in two passes: the core
+        # row (CCU, SteamSpy, history) renders as soon as it lands, then
+        # LATE_FIELDS (Twitch, store review fallback) are merged in place.
+        # Fields that missed FETCH_DEADLINE_S get the same late pass in both
+        # modes, so the snapshot below never records a cached CCU as today's.
+        _t0          = time.perf_counter()
+        _first_row_s = None
+        _core_s      = None
         with concurrent.futures.ThreadPoolExecutor(max_workers=8) as _pool:
             _futures = {
-                _pool.submit(_fetch_one_game, game, historical, raw_data, _snapshots): game
+                _pool.submit(_fetch_one_game, game, historical, raw_data, _snapshots,
+                             include_late=not _progressive): game
                 for game in roster
             }
+            _late_futures: dict = {}
+            _pending = set(_futures)
             _done = 0
-            for _fut in concurrent.futures.as_completed(_futures):
-                _done += 1
-                _game = _futures[_fut]
-                prog.progress(_done / total)
-                status.caption(
-                    T("fetching_game", name=_game["name"])
-                    + f" ({_done}/{total})"
-                )
-                try:
-                    results.append(_fut.result())
-                except Exception as _exc:
-                    # Keep a zero-CCU placeholder so the game still appears
-                    results.append({**_game, **_placeholder})
-
+            while _pending:
+                _finished, _pending = concurrent.futures.wait(
+                    _pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for _fut in _finished:
+                    if _fut in _late_futures:
+                        _row = _late_futures[_fut]
+                        try:
+                            _row.update(_fut.result())
+                        except Exception:
+                            if "ccu" in _row["pending"]:
+                                _row["stale"] = [*_row.get("stale", []), "ccu"]
+                            _row["pending"] = []
+                        continue
+                    _done += 1
+                    _game = _futures[_fut]
+                    prog.progress(_done / total)
+                    status.caption(
+                        T("fetching_game", name=_game["name"])
+                        + f" ({_done}/{total})"
+                    )
+                    try:
+                        _row = _fut.result()
+                    except Exception as _exc:
+                        # Keep a zero-CCU placeholder so the game still appears
+                        _row = {**_game, **_placeholder}
+                    results.append(_row)
+                    if _first_row_s is None:
+                        _first_row_s = time.perf_counter() - _t0
+                    if _done == total:
+                        _core_s = time.perf_counter() - _t0
+                    if _row.get("pending"):
+                        _late_fut = _pool.submit(_fetch_late_fields, _row)
+                        _late_futures[_late_fut] = _row
+                        _pending.add(_late_fut)
+                if _progressive:
+                    _render_progress(results, _done, _first_row_s)
+
+        _total_s = time.perf_counter() - _t0
+        st.session_state["_fetch_timing"] = {
+            "first_row_s": round(_first_row_s or 0.0, 2),
+            "core_s":      round(_core_s or _total_s, 2),
+            "total_s":     round(_total_s, 2),
+            "titles":      total,
+            "progressive": _progressive,
+        }
+        _kpi_slot.empty()
+        _table_slot.empty()
         status.empty()
         results.sort(key=lambda x: x["ccu"], reverse=True)
         st.session_state.ccu_data = results
@@ -329,7 +403,8 @@ st.markdown("<br>", unsafe_allow_html=True)
 # EXECUTIVE SUMMARY
 # Auto-generated after every live fetch. Cached in session_state
 # so it doesn't regenerate on every Streamlit rerun, only when
-# ccu_data changes (genre switch, roster change, or refresh).
+# ccu_data changes (genre switch, roster change, or refresh) or
+# Regenerate is clicked, which also bypasses the shared report cache.
 # ─────────────────────────────────────────────────────────────
 
 st.markdown(f"""
@@ -351,19 +426,33 @@ if not st.session_state.get(_exec_key):
                     aws_secret_key=st.secrets.get("AWS_SECRET_ACCESS_KEY_API", ""),
                     aws_region=st.secrets.get("AWS_BEDROCK_REGION", "us-east-1"),
                 )
-                _exec_resp = _exec_client.messages.create(
+                _exec_text, _exec_cached = report_cache.complete(
+                    _exec_client, "shooter_exec_summary",
                     model="us.anthropic.claude-sonnet-4-6",
                     max_tokens=600,
+                    prompt=_exec_prompt,
                     system=build_system_prompt(st.session_state.report_language),
-                    messages=[{"role": "user", "content": _exec_prompt}],
+                    regenerate=st.session_state.pop("exec_regenerate", False),
                 )
-            st.session_state[_exec_key] = _exec_resp.content[0].text
+            st.session_state[_exec_key] = _exec_text
+            st.session_state[f"{_exec_key}_cached"] = _exec_cached
         except Exception as _exec_e:
             st.caption(T("exec_summary_error"))
 
 if st.session_state.get(_exec_key):
     st.markdown(st.session_state[_exec_key])
     st.caption(T("exec_summary_caption"))
+    if st.session_state.get(f"{_exec_key}_cached"):
+        st.caption(T("report_cache_hit", hours=report_cache.REPORT_CACHE_TTL_S // 3600))
+    _ex1, _ex2 = st.columns([5, 1])
+    with _ex1:
+        st.caption(report_cache.hit_rate_line("shooter_exec_summary"))
+    with _ex2:
+        if st.button(T("regen_btn"), key="regen_exec", help=T("exec_summary_regen_help"),
+                     use_container_width=True):
+            st.session_state.pop(_exec_key, None)
+            st.session_state.exec_regenerate = True
+            st.rerun()
 
 st.markdown("---")
 
@@ -598,6 +687,7 @@ with st.expander(T("table_expander", genre=_tbl_genre), expanded=True):
 hist_titles = [r for r in ccu_data if r.get("has_hist")]
 if hist_titles:
     historical = load_all_historical(frozenset(r["app_id"] for r in hist_titles))
+    prefetch_game_events(r["app_id"] for r in hist_titles)
     with st.expander(T("history_expander")):
         fig2 = go.Figure()
         # Collect all x values across all traces for event matching
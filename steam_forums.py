@@ -0,0 +1,609 @@
+"""
+steam_forums.py — Steam community forum scraping for the Steam Review Analyzer.
+===============================================================================
+Loads discussion listings and each thread's opening post. Kept free of
+Streamlit so it can be driven headless (see bench_forum_scrape.py).
+
+HTTP first
+──────────
+Steam serves discussion listings and thread pages as server-rendered HTML,
+so the default path is a pooled requests.Session + BeautifulSoup, with the
+same selectors the browser path uses. Headless Chromium (Playwright) is the
+fallback, used only for:
+    - the listing, when its first page has no server-rendered topics
+      (JS-rendered) or is a login wall;
+    - the individual threads whose opening post isn't in the HTML.
+
+Browser pool
+────────────
+One Chromium is launched per process, on first use, and kept warm. Playwright
+objects are bound to the event loop that created them, and Streamlit runs
+every rerun on its own thread. So the browser lives on a dedicated daemon
+thread running an asyncio loop, and callers submit coroutines to it. One
+browser context is kept per cookie set (anonymous, or a user's
+steamLoginSecure/sessionid), up to MAX_CONTEXTS.
+
+Every context aborts image / font / stylesheet / media requests. The scraper
+only reads DOM text, so those bytes and decodes are pure overhead.
+
+Per call
+────────
+Listing pages (15 topics each) and opening-post pages are fetched in
+parallel, at most max_tabs at a time (HTTP requests or browser tabs). In the
+browser each page is parsed with one evaluate() instead of a query_selector
+round trip per field. Listings are cached per app_id for LISTING_TTL_S, so
+re-opening the Forums tab does not re-walk them.
+
+Threads are also persisted in forum_store (by URL), which makes a refresh
+incremental: listing pages are walked in order only until one has nothing
+new or changed, the rest of the listing comes from the store, and stored
+opening posts are reused for threads whose reply count hasn't moved.
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lazy_imports import lazy_module
+
+# Both load on first use (see lazy_imports.py); None when not installed
+_pw_api = lazy_module("playwright.async_api")
+_bs4    = lazy_module("bs4")
+PLAYWRIGHT_AVAILABLE = _pw_api is not None
+BS4_AVAILABLE        = _bs4 is not None
+
+import forum_store as _forum_store
+from forum_store import recent_threads, thread_changed
+
+FORUM_BASE_URL   = os.environ.get("STEAM_FORUM_BASE_URL", "https://steamcommunity.com")
+TOPICS_PER_PAGE  = 15
+FORUM_TABS       = 6        # pages loaded concurrently per call
+LISTING_TTL_S    = 600      # listing cache lifetime per app_id
+MAX_CONTEXTS     = 4        # warm browser contexts (one per cookie set)
+BLOCKED_RESOURCES = frozenset({"image", "font", "stylesheet", "media"})
+
+_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu",
+                "--disable-blink-features=AutomationControlled"]
+_USER_AGENT  = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/124.0.0.0 Safari/537.36")
+_WS_RE = re.compile(r"\s{2,}")
+
+# One evaluate() per listing page — same selectors the per-field lookups used
+_TOPICS_JS = """
+els => els.map(t => {
+  const a = t.querySelector("div.forum_topic_name a") || t.querySelector("a.forum_topic_overlay");
+  if (!a) return null;
+  const rep = t.querySelector("div.forum_topic_reply_count");
+  const au  = t.querySelector("a.forum_topic_author") || t.querySelector("div.forum_topic_op a");
+  const ts  = t.querySelector("span[data-timestamp]");
+  return {
+    title:    a.innerText.trim(),
+    url:      a.getAttribute("href") || "",
+    replies:  rep ? rep.innerText.trim() : null,
+    author:   au ? au.innerText.trim() : "Unknown",
+    ts:       ts ? ts.getAttribute("data-timestamp") : null,
+    date_str: ts ? ts.innerText.trim() : "",
+    pinned:   !!t.querySelector("span.forum_topic_pinned"),
+    dev:      !!t.querySelector("span.forum_topic_developer"),
+  };
+})
+"""
+
+_LISTING_CACHE: dict[tuple, tuple[float, list[dict], bool]] = {}
+_LISTING_LOCK = threading.Lock()
+
+CHROMIUM_STATUS: dict = {}      # {"ok": bool, "msg": str} once ensure_chromium() has run
+_CHROMIUM_LOCK = threading.Lock()
+
+
+def listing_url(app_id: int, page_num: int) -> str:
+    return f"{FORUM_BASE_URL}/app/{app_id}/discussions/0/?fp={page_num * TOPICS_PER_PAGE}"
+
+
+def _thread_row(raw: dict, app_id: int, game_name: str) -> dict | None:
+    """Listing entry → thread dict (None if the reply count doesn't parse, as before)."""
+    try:
+        replies = int((raw["replies"] or "").replace(",", "") or "0") if raw["replies"] is not None else 0
+        ts_val  = int(raw["ts"]) if raw["ts"] else None
+    except ValueError:
+        return None
+    return {
+        "app_id": app_id, "game": game_name,
+        "title": raw["title"], "url": raw["url"],
+        "author": raw["author"], "reply_count": replies,
+        "timestamp": ts_val, "date_str": raw["date_str"],
+        "is_pinned": raw["pinned"], "is_dev_post": raw["dev"],
+        "opening_post": "",
+    }
+
+
+def clean_post(raw: str) -> str:
+    return _WS_RE.sub(" ", raw.strip())[:1500]
+
+
+async def _block_heavy(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _BrowserPool:
+    """Process-wide Chromium driven from one asyncio thread."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock     = threading.Lock()
+        self._pw       = None
+        self._browser  = None
+        self._contexts: dict[tuple, object] = {}
+        self._ctx_lock: asyncio.Lock | None = None    # created on the pool loop
+
+    def run(self, coro, timeout: float):
+        """Run coro on the pool's loop from any thread and wait for its result."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever,
+                                 name="forum-browser", daemon=True).start()
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return fut.result(timeout)
+        except FuturesTimeout:
+            fut.cancel()
+            raise
+
+    async def context(self, cookies: tuple[str, str]):
+        """Warm context for (steamLoginSecure, sessionid); launches Chromium if needed."""
+        if self._ctx_lock is None:
+            self._ctx_lock = asyncio.Lock()
+        async with self._ctx_lock:       # concurrent calls must not launch twice
+            if self._browser is None or not self._browser.is_connected():
+                if self._pw is None:
+                    self._pw = await _pw_api.async_playwright().start()
+                self._contexts.clear()
+                self._browser = await self._pw.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+            ctx = self._contexts.get(cookies)
+            if ctx is None:
+                if len(self._contexts) >= MAX_CONTEXTS:
+                    oldest = self._contexts.pop(next(iter(self._contexts)))
+                    await oldest.close()
+                login_secure, session_id = cookies
+                kwargs = {}
+                if login_secure or session_id:
+                    kwargs["storage_state"] = {"cookies": [
+                        {"name": name, "value": value, "domain": "steamcommunity.com", "path": "/"}
+                        for name, value in (("steamLoginSecure", login_secure), ("sessionid", session_id))
+                        if value
+                    ]}
+                ctx = await self._browser.new_context(
+                    **kwargs, user_agent=_USER_AGENT, viewport={"width": 1280, "height": 900})
+                await ctx.route("**/*", _block_heavy)
+                self._contexts[cookies] = ctx
+            return ctx
+
+    async def reset(self):
+        """Drop the browser (after a crash); the next call relaunches it."""
+        self._contexts.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+
+_POOL = _BrowserPool()
+
+
+async def _load_listing_page(ctx, app_id: int, page_num: int, sem, debug: list) -> tuple[list[dict], bool]:
+    """(raw topics, has_next) for one listing page."""
+    url = listing_url(app_id, page_num)
+    async with sem:
+        page = await ctx.new_page()
+        try:
+            debug.append(f"Loading: {url}")
+            try:
+                await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+            except _pw_api.TimeoutError:
+                debug.append(f"Page {page_num}: load timeout")
+                return [], False
+            try:
+                await page.wait_for_selector("div.forum_topic, div.apphub_Card", timeout=12000)
+            except _pw_api.TimeoutError:
+                debug.append(f"Page {page_num}: timed out waiting for forum_topic")
+                title = await page.title()
+                debug.append(f"Page title: {title!r}")
+                if "Sign In" in title or not await page.query_selector("div.forum_topic"):
+                    debug.append("No topics found after JS wait. May need login cookies.")
+                return [], False
+            topics   = [t for t in await page.eval_on_selector_all("div.forum_topic", _TOPICS_JS) if t]
+            has_next = await page.query_selector("div.forum_paging_next a, .pagebtn:last-child") is not None
+            debug.append(f"Page {page_num}: found {len(topics)} topics")
+            return topics, has_next
+        finally:
+            await page.close()
+
+
+async def _load_opening_post(ctx, thread: dict, sem) -> None:
+    async with sem:
+        page = await ctx.new_page()
+        try:
+            await page.goto(thread["url"], timeout=20000, wait_until="domcontentloaded")
+            try:
+                await page.wait_for_selector("div.forum_op, div.forum_comment_text", timeout=8000)
+            except _pw_api.TimeoutError:
+                return
+            op_el = (await page.query_selector("div.forum_op div.forum_comment_text") or
+                     await page.query_selector("div.forum_comment_text"))
+            if op_el:
+                thread["opening_post"] = clean_post(await op_el.inner_text())
+        except Exception:
+            pass
+        finally:
+            await page.close()
+
+
+def _listing_pages_needed(max_threads: int) -> range:
+    return range(math.ceil(max_threads / TOPICS_PER_PAGE))
+
+
+def _assemble_listing(pages, app_id: int, game_name: str) -> tuple[list[dict], bool]:
+    """Concatenate (topics, has_next) pages in order, stopping at the first page
+    that is empty or has no "next" link. complete = the forum's last page was seen."""
+    listing = []
+    for topics, has_next in pages:
+        listing.extend(filter(None, (_thread_row(t, app_id, game_name) for t in topics)))
+        if not topics or not has_next:
+            return listing, bool(topics)      # empty = failed load, not the end
+    return listing, False
+
+
+def _listing_key(app_id: int, cookies: tuple[str, str]) -> tuple:
+    """Listing cache key: a logged-in listing is only shared with the same
+    login, keyed on a digest of the cookie pair rather than the cookies."""
+    if not (cookies[0] or cookies[1]):
+        return (app_id, "")
+    return (app_id, hashlib.sha256(f"{cookies[0]}\0{cookies[1]}".encode("utf-8")).hexdigest())
+
+
+def _cached_listing(cache_key: tuple, max_threads: int, debug: list) -> list[dict] | None:
+    with _LISTING_LOCK:
+        hit = _LISTING_CACHE.get(cache_key)
+    if hit and time.time() - hit[0] < LISTING_TTL_S and (len(hit[1]) >= max_threads or hit[2]):
+        debug.append(f"Listing from cache ({len(hit[1])} threads)")
+        return [dict(t) for t in hit[1][:max_threads]]
+    return None
+
+
+def _cache_listing(cache_key: tuple, listing: list[dict], complete: bool) -> None:
+    if listing:
+        with _LISTING_LOCK:
+            _LISTING_CACHE[cache_key] = (time.time(), [dict(t) for t in listing], complete)
+
+
+# ─────────────────────────────────────────────────────────────
+# HTTP PATH  (server-rendered pages — no browser)
+# ─────────────────────────────────────────────────────────────
+
+_HTTP_SESSION: "requests.Session | None" = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _http_session() -> "requests.Session":
+    """Shared keep-alive session, pooled for FORUM_TABS concurrent requests."""
+    global _HTTP_SESSION
+    with _HTTP_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(FORUM_TABS, 10))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": _USER_AGENT, "Accept-Language": "en-US,en;q=0.8"})
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
+def _http_get(url: str, cookies: tuple[str, str]) -> tuple["_bs4.BeautifulSoup | None", str]:
+    """(parsed page, status) — status is "ok", "login" or "error"."""
+    jar = {name: value for name, value in (("steamLoginSecure", cookies[0]), ("sessionid", cookies[1]))
+           if value}
+    try:
+        resp = _http_session().get(url, cookies=jar or None, timeout=20)
+        resp.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None, "error"
+    soup  = _bs4.BeautifulSoup(resp.text, "html.parser")
+    title = soup.title.get_text() if soup.title else ""
+    if "/login" in resp.url or "Sign In" in title or soup.select_one("form#loginForm, div.newlogindialog"):
+        return soup, "login"
+    return soup, "ok"
+
+
+def _text(el) -> str:
+    """Element text the way innerText reads it for these fields (<br> = newline)."""
+    for br in el.find_all("br"):
+        br.replace_with("\n")
+    return el.get_text().strip()
+
+
+def _http_listing_page(app_id: int, page_num: int, cookies) -> tuple[list[dict], bool, str]:
+    """(raw topics, has_next, status) — status "js" when the page has no
+    server-rendered topics (they must be rendered client-side)."""
+    soup, status = _http_get(listing_url(app_id, page_num), cookies)
+    if status != "ok":
+        return [], False, status
+    topics = []
+    for t in soup.select("div.forum_topic"):
+        a = t.select_one("div.forum_topic_name a") or t.select_one("a.forum_topic_overlay")
+        if not a:
+            continue
+        rep = t.select_one("div.forum_topic_reply_count")
+        au  = t.select_one("a.forum_topic_author") or t.select_one("div.forum_topic_op a")
+        ts  = t.select_one("span[data-timestamp]")
+        topics.append({
+            "title":    _text(a),
+            "url":      a.get("href") or "",
+            "replies":  _text(rep) if rep else None,
+            "author":   _text(au) if au else "Unknown",
+            "ts":       ts.get("data-timestamp") if ts else None,
+            "date_str": _text(ts) if ts else "",
+            "pinned":   t.select_one("span.forum_topic_pinned") is not None,
+            "dev":      t.select_one("span.forum_topic_developer") is not None,
+        })
+    if not topics:
+        return [], False, "js"
+    has_next = soup.select_one("div.forum_paging_next a, .pagebtn:last-child") is not None
+    return topics, has_next, "ok"
+
+
+def _http_listing(app_id, game_name, max_threads, cookies, max_tabs, debug) -> tuple[list[dict], bool] | None:
+    """Listing via plain HTTP; None when the first page needs the browser."""
+    with ThreadPoolExecutor(max_workers=max(1, max_tabs)) as pool:
+        pages = list(pool.map(lambda n: _http_listing_page(app_id, n, cookies),
+                              _listing_pages_needed(max_threads)))
+    first_status = pages[0][2]
+    if first_status != "ok":
+        debug.append({"login": "HTTP listing hit a login wall — using headless browser",
+                      "js":    "HTTP listing has no server-rendered topics — using headless browser",
+                      }.get(first_status, "HTTP listing request failed — using headless browser"))
+        return None
+    for n, (topics, _, status) in enumerate(pages):
+        debug.append(f"HTTP page {n}: found {len(topics)} topics" + ("" if status == "ok" else f" ({status})"))
+    return _assemble_listing([(topics, has_next) for topics, has_next, _ in pages], app_id, game_name)
+
+
+def _http_opening_post(thread: dict, cookies) -> bool:
+    """Fill thread["opening_post"] over HTTP; False if the page needs the browser."""
+    soup, status = _http_get(thread["url"], cookies)
+    if status != "ok":
+        return False
+    op_el = soup.select_one("div.forum_op div.forum_comment_text") or soup.select_one("div.forum_comment_text")
+    if op_el is None:
+        return False
+    thread["opening_post"] = clean_post(_text(op_el))
+    return True
+
+
+# ─────────────────────────────────────────────────────────────
+# BROWSER PATH
+# ─────────────────────────────────────────────────────────────
+
+async def _browser_listing(app_id, game_name, max_threads, cookies, max_tabs, debug) -> tuple[list[dict], bool]:
+    """Every listing page the request can need, as parallel tabs, kept in order."""
+    ctx = await _POOL.context(cookies)
+    sem = asyncio.Semaphore(max(1, max_tabs))
+    pages = await asyncio.gather(*[
+        _load_listing_page(ctx, app_id, n, sem, debug) for n in _listing_pages_needed(max_threads)
+    ])
+    return _assemble_listing(pages, app_id, game_name)
+
+
+async def _browser_listing_page(app_id, page_num, cookies, debug) -> tuple[list[dict], bool]:
+    ctx = await _POOL.context(cookies)
+    return await _load_listing_page(ctx, app_id, page_num, asyncio.Semaphore(1), debug)
+
+
+async def _browser_posts(threads, cookies, max_tabs) -> None:
+    ctx = await _POOL.context(cookies)
+    sem = asyncio.Semaphore(max(1, max_tabs))
+    await asyncio.gather(*[_load_opening_post(ctx, t, sem) for t in threads if t["url"]])
+
+
+def _run_browser(coro, timeout: float, debug: list, default=None):
+    """Run a browser coroutine on the pool; default (and a pool reset) on failure."""
+    if not PLAYWRIGHT_AVAILABLE:
+        coro.close()
+        debug.append("playwright not installed. Run: pip install playwright && playwright install chromium")
+        return default
+    try:
+        return _POOL.run(coro, timeout=timeout)
+    except Exception as e:
+        debug.append(f"Browser error: {e!r}")
+        debug.append("If Chromium is missing run: python3 -m playwright install chromium")
+        try:
+            _POOL.run(_POOL.reset(), timeout=30)
+        except Exception:
+            pass
+        return default
+
+
+# ─────────────────────────────────────────────────────────────
+# LISTING + POSTS
+# ─────────────────────────────────────────────────────────────
+
+def _listing_page(app_id, page_num, cookies, via_browser, debug) -> tuple[list[dict], bool, str]:
+    """One listing page as (raw topics, has_next, status) from either path."""
+    if not via_browser:
+        return _http_listing_page(app_id, page_num, cookies)
+    topics, has_next = _run_browser(_browser_listing_page(app_id, page_num, cookies, debug),
+                                    60, debug, ([], False))
+    return topics, has_next, "ok" if topics else "error"
+
+
+def _incremental_listing(app_id, game_name, max_threads, cookies, stored, via_browser, debug) -> list[dict] | None:
+    """Listing pages in order until one holds nothing new or changed (pinned
+    threads aside — they stay on top regardless) and the store covers the
+    rest of max_threads; the rest of the listing is filled from the store.
+    None if the first page couldn't be read this way.
+
+    Steam orders discussions by last activity, so a thread that gained a reply
+    further down has moved up onto the pages walked here. When the store
+    holds fewer threads than asked for (a larger max_threads than the first
+    scrape), the walk carries on into older pages."""
+    fresh: list[dict] = []
+    seen:  set[str]   = set()
+    page_num = 0
+    while len(fresh) < max_threads:
+        topics, has_next, status = _listing_page(app_id, page_num, cookies, via_browser, debug)
+        if status != "ok":
+            if page_num == 0:
+                return None
+            break
+        rows = [r for r in (_thread_row(t, app_id, game_name) for t in topics) if r]
+        fresh.extend(rows)
+        seen.update(r["url"] for r in rows)
+        moved = sum(1 for r in rows if not r["is_pinned"] and thread_changed(r, stored.get(r["url"])))
+        debug.append(f"{'Browser' if via_browser else 'HTTP'} page {page_num}: "
+                     f"{len(rows)} topics, {moved} new or updated")
+        if not has_next:
+            break
+        if not moved and len(fresh) + sum(1 for url in stored if url not in seen) >= max_threads:
+            break
+        page_num += 1
+    older = sorted((dict(t, game=game_name) for url, t in stored.items() if url not in seen),
+                   key=lambda t: -(t.get("timestamp") or 0))
+    return (fresh + older)[:max_threads]
+
+
+def _fetch_listing(app_id, game_name, max_threads, cookies, max_tabs, stored, http_ok, debug) -> list[dict]:
+    cache_key = _listing_key(app_id, cookies)
+    if stored:
+        listing = None
+        if http_ok:
+            listing = _incremental_listing(app_id, game_name, max_threads, cookies, stored, False, debug)
+        if listing is None and PLAYWRIGHT_AVAILABLE:
+            debug.append("Listing needs the headless browser")
+            listing = _incremental_listing(app_id, game_name, max_threads, cookies, stored, True, debug)
+        if listing is None:
+            debug.append("Listing unavailable — showing stored threads")
+            return recent_threads(app_id, max_threads, game_name)
+        _cache_listing(cache_key, listing, False)
+        return listing
+
+    fetched = _http_listing(app_id, game_name, max_threads, cookies, max_tabs, debug) if http_ok else None
+    if fetched is None:
+        fetched = _run_browser(_browser_listing(app_id, game_name, max_threads, cookies, max_tabs, debug),
+                               60 + max_threads, debug, ([], False))
+    listing, complete = fetched
+    _cache_listing(cache_key, listing, complete)
+    return listing[:max_threads]
+
+
+def _fetch_posts(threads, cookies, max_tabs, http_ok, debug) -> None:
+    """Opening posts for threads — HTTP first, the browser for whatever's left."""
+    todo = [t for t in threads if t["url"]]
+    if http_ok and todo:
+        with ThreadPoolExecutor(max_workers=max(1, max_tabs)) as pool:
+            done = list(pool.map(lambda t: _http_opening_post(t, cookies), todo))
+        debug.append(f"HTTP opening posts: {sum(done)}/{len(done)}")
+        todo = [t for t, ok in zip(todo, done) if not ok]
+    if todo:
+        _run_browser(_browser_posts(todo, cookies, max_tabs), 60 + 5 * len(todo), debug)
+
+
+def fetch_forum_threads(app_id: int, game_name: str, max_threads: int = 100,
+                        login_secure: str = "", session_id: str = "",
+                        max_tabs: int = FORUM_TABS, use_cache: bool = True,
+                        http_first: bool = True, use_store: bool = True,
+                        stats: dict | None = None) -> tuple:
+    """Fetch Steam community forum threads (listing + opening posts).
+
+    With http_first (and BeautifulSoup installed) pages are fetched over
+    pooled HTTP and parsed server-side; the headless browser is only used for
+    the listing when its first page is JS-rendered or behind a login wall,
+    and for the individual threads whose opening post isn't in the HTML.
+
+    With use_store (and forum_store importable) a refresh walks the listing
+    only until it meets stored, unchanged threads, and opening posts are only
+    downloaded for new threads or ones whose reply count / activity changed.
+    stats, if given, is filled with {"new", "updated", "unchanged",
+    "posts_fetched", "posts_reused"}.
+    Returns (list[dict], debug_lines).
+    """
+    debug: list[str] = []
+    stats = stats if stats is not None else {}
+    stats.update(new=0, updated=0, unchanged=0, posts_fetched=0, posts_reused=0)
+    cookies = (login_secure.strip(), session_id.strip())
+    store   = _forum_store if use_store else None
+    stored  = store.load_threads(app_id) if store else {}
+    http_ok = http_first and BS4_AVAILABLE
+
+    listing = _cached_listing(_listing_key(app_id, cookies), max_threads, debug) if use_cache else None
+    if listing is None:
+        listing = _fetch_listing(app_id, game_name, max_threads, cookies, max_tabs, stored, http_ok, debug)
+
+    # Reuse stored opening posts for threads that haven't moved
+    todo = []
+    for t in listing:
+        prev = stored.get(t["url"])
+        if prev is None:
+            stats["new"] += 1
+        elif thread_changed(t, prev):
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
+        if prev and prev.get("opening_post") and not thread_changed(t, prev):
+            t["opening_post"] = prev["opening_post"]
+            stats["posts_reused"] += 1
+        elif not t.get("opening_post"):
+            todo.append(t)
+    _fetch_posts(todo, cookies, max_tabs, http_ok, debug)
+    stats["posts_fetched"] = sum(1 for t in todo if t["opening_post"])
+
+    if store:
+        store.upsert_threads(listing)
+    debug.append(f"Total threads collected: {len(listing)} "
+                 f"({stats['new']} new, {stats['updated']} updated, {stats['unchanged']} unchanged)")
+    return listing, debug
+
+
+def _install_chromium() -> None:
+    try:
+        r = subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"],
+                           capture_output=True, text=True, timeout=300)
+        CHROMIUM_STATUS.update(ok=r.returncode == 0,
+                               msg="Chromium ready" if r.returncode == 0 else f"Install failed: {r.stderr[:300]}")
+    except Exception as e:
+        CHROMIUM_STATUS.update(ok=False, msg=str(e)[:200])
+
+
+def ensure_chromium() -> None:
+    """Install the Chromium binary the browser fallback needs, if missing —
+    once per process, on a daemon thread (playwright install is a no-op when
+    it is already there). Does nothing without playwright."""
+    with _CHROMIUM_LOCK:
+        if not PLAYWRIGHT_AVAILABLE or CHROMIUM_STATUS:
+            return
+        CHROMIUM_STATUS["ok"] = None        # started
+    threading.Thread(target=_install_chromium, daemon=True, name="chromium-install").start()
+
+
+def clear_listing_cache(app_id: int | None = None) -> None:
+    with _LISTING_LOCK:
+        if app_id is None:
+            _LISTING_CACHE.clear()
+        else:
+            for key in [k for k in _LISTING_CACHE if k[0] == app_id]:
+                del _LISTING_CACHE[key]
@@ -0,0 +1,275 @@
+"""
+steam_news.py — Steam News ingestion for the chart event overlays.
+===================================================================
+One place that talks to ISteamNews/GetNewsForApp. Each app's news is fetched
+once per NEWS_TTL_S, persisted in news_store and kept in memory; the chart
+views are derived from those same items:
+
+    update_labels(app_id)       — [(YYYY-MM, label)], one notable update per
+                                  month (CCU history hover / annotations)
+    game_events(app_id, name)   — [{ts, date_str, month, title, type, …}]
+                                  typed Update / DLC / Release events for the
+                                  review-sentiment timeline
+
+Refresh is incremental: pages are requested newest first and walked back
+with `enddate` until a page holds an item already stored (or, for a game
+seen for the first time, until NEWS_HISTORY_ITEMS items are in). A walk cut
+short by a failed page or the NEWS_MAX_PAGES budget leaves a gap enddate in
+news_store, and later refreshes resume it until it meets the stored items.
+Derived
+views are memoised next to the items, so calling them twice per title per
+rerun costs a dict lookup. prefetch_news() refreshes a whole roster on a
+thread pool. Kept free of Streamlit so it can be driven headless.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import news_store as _news_store
+except ImportError:
+    _news_store = None
+
+STEAM_NEWS_URL = "https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/"
+
+NEWS_TTL_S            = 3600   # how long an app's news counts as fresh
+NEWS_PAGE_SIZE        = 100    # items per GetNewsForApp request
+NEWS_MAXLENGTH        = 1200   # contents characters Steam returns per item
+NEWS_HISTORY_ITEMS    = 100    # items pulled the first time an app is seen
+NEWS_MAX_PAGES        = 5      # enddate pages per refresh
+NEWS_PREFETCH_WORKERS = 8
+
+# Titles that suggest a meaningful update (month labels on the CCU charts)
+_LABEL_KEYWORDS = [
+    "update", "patch", "season", "dlc", "expansion", "launch", "release",
+    "major", "anniversary", "free", "wipe", "reset", "event", "content",
+    "chapter", "operation", "overhaul", "rework", "battle pass", "new map",
+    "new mode", "hotfix", "balance", "2.0", "3.0",
+]
+# Titles kept as typed events on the review timeline, and the ones dropped
+_EVENT_KEYWORDS = [
+    "update", "patch", "hotfix", "fix", "dlc", "expansion",
+    "content", "season", "version", "release", "launch",
+    "major", "anniversary", "early access", "full release",
+]
+_EVENT_SKIP = ["sale", "discount", "contest", "giveaway", "stream", "tournament", "esport"]
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_CACHE: dict[int, dict] = {}     # app_id → {"at": checked, "items": [...], "views": {...}}
+_CACHE_LOCK = threading.Lock()
+_APP_LOCKS: dict[int, threading.Lock] = {}
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _http_session() -> requests.Session:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            s = requests.Session()
+            s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=NEWS_PREFETCH_WORKERS))
+            _SESSION = s
+        return _SESSION
+
+
+def _app_lock(app_id: int) -> threading.Lock:
+    with _CACHE_LOCK:
+        return _APP_LOCKS.setdefault(app_id, threading.Lock())
+
+
+def _fetch_page(app_id: int, enddate: int | None = None) -> list[dict] | None:
+    """One GetNewsForApp page (newest first, items dated ≤ enddate); None on failure."""
+    params = {"appid": app_id, "count": NEWS_PAGE_SIZE, "maxlength": NEWS_MAXLENGTH, "format": "json"}
+    if enddate is not None:
+        params["enddate"] = enddate
+    try:
+        r = _http_session().get(STEAM_NEWS_URL, params=params, timeout=12)
+        if not r.ok:
+            return None
+        items = r.json().get("appnews", {}).get("newsitems", [])
+    except Exception:
+        return None
+    return [{"gid": str(i.get("gid", "")), "date": int(i.get("date") or 0),
+             "title": (i.get("title") or "").strip(), "url": i.get("url", ""),
+             "feedlabel": i.get("feedlabel", ""), "contents": i.get("contents") or ""}
+            for i in items if i.get("gid")]
+
+
+def _walk(app_id: int, enddate: int | None, stored: set[str], new: list[dict],
+          seen: set[str], pages: int, cap: int | None = None) -> tuple[int, int | None, bool]:
+    """Page back from enddate, appending unseen items to new, for at most
+    pages requests. Returns (requests made, enddate to resume from — None once
+    a page held a stored item, Steam ran out or cap items are in — and
+    whether a request failed)."""
+    used = 0
+    while used < pages:
+        used += 1
+        page = _fetch_page(app_id, enddate)
+        if page is None:
+            return used, enddate, True
+        fresh = [i for i in page if i["gid"] not in stored and i["gid"] not in seen]
+        seen.update(i["gid"] for i in fresh)
+        new.extend(fresh)
+        oldest = min((i["date"] for i in page), default=0)
+        # items dated enddate were on the previous page (or where a gap stopped)
+        overlap = any(i["gid"] in stored and (enddate is None or i["date"] < enddate) for i in page)
+        if (overlap or len(page) < NEWS_PAGE_SIZE
+                or (cap is not None and len(new) >= cap) or (enddate is not None and oldest >= enddate)):
+            return used, None, False
+        enddate = oldest   # inclusive — same-second items come back and dedupe by gid
+    return used, enddate, False
+
+
+def _pull(app_id: int, stored: set[str], gaps: list[int]) -> tuple[list[dict], list[int]] | None:
+    """(new items, gap enddates still open). Walks back from the newest item
+    until a page overlaps what was stored before this pull (or, for an app
+    seen for the first time, until NEWS_HISTORY_ITEMS are in), then resumes
+    the open gaps with the pages left. None if the first page couldn't be
+    fetched."""
+    new: list[dict] = []
+    seen: set[str] = set()
+    gaps = list(gaps)
+    used, resume, failed = _walk(app_id, None, stored, new, seen, NEWS_MAX_PAGES,
+                                 cap=None if stored else NEWS_HISTORY_ITEMS)
+    if failed and not new:
+        return None
+    if resume is not None:
+        gaps.insert(0, resume)
+    budget = NEWS_MAX_PAGES - used
+    while gaps and budget > 0 and not failed:
+        used, resume, failed = _walk(app_id, gaps[0], stored, new, seen, budget)
+        budget -= used
+        if resume is None:
+            gaps.pop(0)
+        else:
+            gaps[0] = resume
+    return new, gaps
+
+
+def news_items(app_id: int, force: bool = False) -> list[dict]:
+    """Every known news item for app_id, newest first (refreshed if stale)."""
+    now   = time.time()
+    entry = _CACHE.get(app_id)
+    if entry and not force and now - entry["at"] < NEWS_TTL_S:
+        return entry["items"]
+    with _app_lock(app_id):
+        entry = _CACHE.get(app_id)
+        if entry and not force and time.time() - entry["at"] < NEWS_TTL_S:
+            return entry["items"]
+        store  = _news_store
+        stored = store.load_items(app_id) if store else (entry["items"] if entry else [])
+        gaps   = store.gap_enddates(app_id) if store else (entry["gaps"] if entry else [])
+        if store and not force and now - store.fetched_at(app_id) < NEWS_TTL_S:
+            items = stored
+        else:
+            pulled = _pull(app_id, {i["gid"] for i in stored}, gaps)
+            if pulled is not None:
+                new, gaps = pulled
+                if store:
+                    store.upsert_items(app_id, new)
+                    store.mark_fetched(app_id, gaps=gaps)
+                items = sorted(new + stored, key=lambda i: -i["date"])
+            else:
+                items = stored
+        with _CACHE_LOCK:
+            _CACHE[app_id] = {"at": time.time(), "items": items, "views": {}, "gaps": gaps}
+        return items
+
+
+def prefetch_news(app_ids, max_workers: int = NEWS_PREFETCH_WORKERS) -> dict[int, list[dict]]:
+    """Refresh every app's news in parallel; {app_id: items}."""
+    ids = list(dict.fromkeys(int(a) for a in app_ids))
+    if not ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids))),
+                            thread_name_prefix="news") as pool:
+        return dict(zip(ids, pool.map(news_items, ids)))
+
+
+def _view(app_id: int, key: tuple, build):
+    items = news_items(app_id)
+    entry = _CACHE.get(app_id)
+    if entry is None or entry["items"] is not items:
+        return build(items)
+    views = entry["views"]
+    if key not in views:
+        views[key] = build(items)
+    return views[key]
+
+
+def _month(ts: int) -> datetime:
+    return datetime.fromtimestamp(int(ts), tz=timezone.utc)
+
+
+def _labels(items: list[dict]) -> list[tuple[str, str]]:
+    events: dict[str, str] = {}   # month → shortest matching label
+    for item in items:
+        title, ts = item["title"], item["date"]
+        if not title or not ts or not any(kw in title.lower() for kw in _LABEL_KEYWORDS):
+            continue
+        month = _month(ts).strftime("%Y-%m")
+        # Truncate long titles for annotation legibility
+        label = title[:40].rstrip() + ("…" if len(title) > 40 else "")
+        if month not in events or len(label) < len(events[month]):
+            events[month] = label
+    return sorted(events.items())
+
+
+def _events(items: list[dict], app_id: int, game_name: str) -> list[dict]:
+    results = []
+    for item in items:
+        title, ts = item["title"], item["date"]
+        if not title or not ts:
+            continue
+        tl = title.lower()
+        if not any(kw in tl for kw in _EVENT_KEYWORDS) or any(sw in tl for sw in _EVENT_SKIP):
+            continue
+        if any(k in tl for k in ["dlc", "expansion", "season pass", "content pack"]):
+            etype = "DLC"
+        elif any(k in tl for k in ["early access", "full release", "launch", "release"]):
+            etype = "Release"
+        else:
+            etype = "Update"
+        dt = _month(ts)
+        contents = re.sub(r" {2,}", " ", _TAG_RE.sub(" ", item["contents"]).strip())
+        results.append({
+            "ts":       int(ts),
+            "date_str": dt.strftime("%b %d, %Y"),
+            "month":    dt.strftime("%Y-%m"),
+            "title":    title[:80],
+            "type":     etype,
+            "game":     game_name,
+            "app_id":   app_id,
+            "url":      item["url"],
+            "contents": contents[:1000],
+        })
+    # One event per month and type, the earliest
+    seen = {}
+    for ev in sorted(results, key=lambda x: x["ts"]):
+        seen.setdefault((ev["month"], ev["type"]), ev)
+    return sorted(seen.values(), key=lambda x: x["ts"])
+
+
+def update_labels(app_id: int) -> list[tuple[str, str]]:
+    """(YYYY-MM, label) per month with a notable update, oldest → newest."""
+    return _view(app_id, ("labels",), _labels)
+
+
+def game_events(app_id: int, game_name: str) -> list[dict]:
+    """Typed Update / DLC / Release events (one per month and type), oldest → newest."""
+    return _view(app_id, ("events", game_name), lambda items: _events(items, app_id, game_name))
+
+
+def clear_news_cache(app_id: int | None = None) -> None:
+    with _CACHE_LOCK:
+        if app_id is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(app_id, None)
@@ -0,0 +1,551 @@
+"""
+steam_report.py — Prompt assembly for the Steam Review Analyzer's AI report.
+============================================================================
+build_analysis_prompt() turns a FacetView (review_facets.py) of the fetched
+reviews into the analyst brief sent to Claude, within PROMPT_TOKEN_BUDGET
+(prompt_budget.py):
+
+    fixed sections   — dataset overview, cross-game keywords, task and tone;
+                       always included, counted first
+    per-game blocks  — whatever the samples leave (at least GAME_BLOCK_SHARE
+                       of the budget after the fixed sections). Every game gets its
+                       compact block (stats); the rest is split across games
+                       by their share of the reviews and upgrades them to the
+                       full block (stats + their keywords). Games that don't
+                       fit even compact — smallest first — are named in one line
+    review samples   — the rest, half per polarity and at most
+                       SAMPLES_PER_POLARITY each, again split by each game's
+                       share of that polarity. Candidates are each game's most
+                       helpful and longest reviews, skipping near-duplicates of
+                       samples already taken; a sample is clipped to the game's
+                       remaining allowance rather than dropped, and allowance
+                       a small game can't use goes to the others
+
+The returned stats dict (tokens, budget, per-section tokens, samples kept,
+duplicates dropped, games condensed) is shown before the request is sent.
+
+For large datasets the report is map-reduced instead of resting on a couple
+of dozen samples:
+
+    map      — summarise_slices() writes notes on every game (or, for a
+               one-game scope, every playtime band) concurrently with the
+               cheap MAP_MODEL, each from that slice's own stats, keywords
+               and samples only
+    combine  — while the notes exceed NOTES_TOKEN_BUDGET, groups of about
+               COMBINE_GROUP (bucketed by label hash) are merged, level by level
+    reduce   — build_analysis_prompt(notes=...) puts the notes into the brief,
+               streamed with the user's model as before
+
+Each map/combine completion goes through report_cache (kind "steam_map"),
+keyed by a hash of its request, so re-running with one more game only maps
+that game — in any session.
+Kept free of Streamlit so it can be driven headless.
+"""
+
+import hashlib
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+import report_cache
+from prompt_budget import NearDuplicates, PromptBudget, allocate, clip, estimate_tokens
+from report_cache import cache_key
+
+PROMPT_TOKEN_BUDGET      = 10_000
+GAME_BLOCK_SHARE         = 0.4     # of the budget left after the fixed sections
+KEYWORD_LINES_MIN_TOKENS = 30      # less spare than this can't upgrade a game to its full block
+UPGRADE_MAX_MISSES       = 3       # full blocks built that didn't fit before an upgrade pass stops
+SAMPLES_PER_POLARITY     = 12
+SAMPLE_MAX_TOKENS        = 145     # ≈ the old 500-character cap
+SAMPLE_MIN_TOKENS        = 30      # shorter than this once clipped isn't worth sending
+SAMPLE_MIN_CHARS         = 80
+SAMPLE_CANDIDATES        = 6       # per game and polarity: half most helpful, half longest
+REPORT_MAX_TOKENS        = 4096
+
+# Map-reduce pipeline (summarise_slices → build_analysis_prompt(notes=...))
+MAP_MODEL                   = "claude-haiku-4-5-20251001"
+MAP_MAX_TOKENS              = 600
+MAP_TOKEN_BUDGET            = 6_000    # per slice prompt
+MAP_SAMPLES_PER_POLARITY    = 16
+MAP_WORKERS                 = 6
+MAP_BAND_SPLIT              = 2_000    # a one-game scope above this many reviews is mapped per playtime band
+MAP_CACHE_TTL_S             = 7 * 24 * 3600   # a slice's notes only change with its reviews
+MAP_REDUCE_MIN_REVIEWS      = 5_000    # the app defaults to map-reduce from here
+COMBINE_GROUP               = 8        # notes merged per combine step
+NOTES_TOKEN_BUDGET          = 12_000   # notes are combined level by level until they fit
+REDUCE_TOKEN_BUDGET         = 22_000
+REDUCE_SAMPLES_PER_POLARITY = 4
+
+PLAYTIME_BANDS = [("under 2h", 0, 2), ("2–10h", 2, 10), ("10–100h", 10, 100), ("100h+", 100, math.inf)]
+
+SYSTEM_PROMPT = (
+    "You are a senior games market analyst. "
+    "Respond only with your analysis report in well-structured markdown. "
+    "Do not add preamble or sign-off."
+)
+
+_RULE = "═══════════════════════════════════════"
+
+FOCUS_PROMPTS = {
+    "Full overview — all games, all themes": """
+Provide a comprehensive analysis covering:
+1. Genre-level sentiment summary and what it signals about player satisfaction
+2. Rankings and comparisons across all games with concrete reasoning
+3. The 3-5 most important themes emerging from positive reviews — what players love and why
+4. The 3-5 most important themes emerging from negative reviews — recurring pain points and what they signal
+5. Playtime patterns and what they reveal about player engagement and review timing bias
+6. Differentiating keywords (words that only appear on one side) and what they reveal
+7. Specific actionable insights: what should a developer or publisher take away from this data?
+Be specific. Name games. Quote or closely paraphrase actual review language. Avoid vague statements.""",
+
+    "Sentiment deep-dive — what drives positive vs negative": """
+Analyse the specific drivers of positive and negative sentiment:
+1. Identify the top 4-5 factors that correlate with positive reviews — go beyond keywords to infer underlying causes
+2. Identify the top 4-5 factors that correlate with negative reviews — be specific about what players are reacting to
+3. Compare the emotional language in positive vs negative reviews — tone, intensity, specificity
+4. Look at playtime distribution for positive vs negative reviewers — does engagement time predict sentiment?
+5. Are there keywords that appear in BOTH positive and negative reviews? What does that ambivalence signal?
+6. Which games best exemplify each driver? Quote specific review language.
+Be analytical. Avoid surface-level observations like "players liked the gameplay." Explain WHY.""",
+
+    "Competitive comparison — how games stack up against each other": """
+Compare all games head-to-head:
+1. Create a ranked leaderboard with specific reasoning for each position
+2. For the top 2 games: what are they doing right that others aren't?
+3. For the bottom 2 games: what specific issues are dragging their scores down?
+4. Are there surprising patterns — games with high playtime but low sentiment, or vice versa?
+5. Compare keyword profiles between games — what does each game's unique vocabulary reveal?
+6. What does the spread between best and worst ({spread:.0f} percentage points) suggest about genre consistency?
+Quote reviews. Name games. Be direct about which games have problems and why.""",
+
+    "Player pain points — what's most criticised and why": """
+Deep-dive into negative sentiment:
+1. Identify and group all major pain points into 4-6 distinct themes
+2. For each theme: how prevalent is it (approximate % of negative reviews), which games are most affected, and quote specific review language
+3. Distinguish between fixable issues (bugs, balance, pricing) vs fundamental design problems
+4. Look at playtime of negative reviewers — are complaints coming from casual or invested players?
+5. Are any pain points unique to specific games, or are they genre-wide problems?
+6. What do the negative differentiator keywords reveal that the positive reviews obscure?
+7. Prioritise: if a developer read this, what are the top 3 things to fix first?
+Be specific and direct. Avoid vague summaries.""",
+
+    "Player praise — what's most celebrated and why": """
+Deep-dive into positive sentiment:
+1. Identify and group all major praise themes into 4-6 distinct categories
+2. For each theme: how prevalent is it, which games exemplify it best, quote specific review language
+3. What aspects of these games are generating genuine enthusiasm vs mild satisfaction?
+4. Do high-playtime reviewers praise different things than low-playtime reviewers?
+5. What do the positive differentiator keywords reveal about what this genre's audience uniquely values?
+6. Which specific design or business decisions (pricing, updates, community, content) are being praised?
+7. What does this praise data suggest about unmet needs in the genre that other games could capitalise on?
+Be specific. Quote reviews. Identify what makes top performers genuinely stand out.""",
+}
+
+TONE_PROMPTS = {
+    "Analytical & objective":
+        "Write in a precise, analytical tone. Use data to support every claim. Avoid hedging language like 'may' or 'seems' — if the data shows it, state it confidently.",
+    "Executive summary (brief)":
+        "Write as a tight executive briefing. Use headers and bullets. Lead with the single most important finding. Total length: 350-500 words. Every sentence must earn its place.",
+    "Consumer research style":
+        "Write in a formal consumer research report style with numbered sections, clear headings, and a findings + implications structure for each major point.",
+}
+
+
+def _heading(title: str) -> str:
+    return f"{_RULE}\n{title}\n{_RULE}"
+
+
+def game_block(view, row, keyword_fn, n_reviews: int, vader: bool, full: bool = True) -> str:
+    """One game's stats (and, when full, its top 8 keywords per polarity)."""
+    g       = row["game_title"]
+    g_stats = view.game_stats(g)
+    vader_str = ""
+    if vader and not pd.isna(g_stats["vader"]):
+        vader_str = f", VADER compound {g_stats['vader']:+.3f}"
+    block = (
+        f"### {g}\n"
+        f"- Sentiment: {row['positive_pct']}% positive "
+        f"({row['positive_reviews']} pos / {row['negative_reviews']} neg, "
+        f"{n_reviews and round(g_stats['n']/n_reviews*100)}% of dataset){vader_str}\n"
+        f"- Playtime at review: avg {row['avg_playtime_hrs']}h, "
+        f"median {g_stats['pt_median']:.1f}h, 90th‑pct {g_stats['pt_p90']:.0f}h"
+    )
+    if full:
+        pos_kw = view.keywords(keyword_fn, 8, game=g, voted_up=True)
+        neg_kw = view.keywords(keyword_fn, 8, game=g, voted_up=False)
+        block += (
+            f"\n- Top positive keywords: {', '.join(f'{w}({c})' for w, c in pos_kw) or '—'}"
+            f"\n- Top negative keywords: {', '.join(f'{w}({c})' for w, c in neg_kw) or '—'}"
+        )
+    return block
+
+
+def _game_section(view, sdf, keyword_fn, n_reviews: int, vader: bool, tokens: int,
+                  budget: PromptBudget) -> str:
+    ordered = sdf.sort_values("positive_pct", ascending=False)
+    rows    = {r["game_title"]: r for _, r in ordered.iterrows()}
+    compact = {g: game_block(view, r, keyword_fn, n_reviews, vader, full=False) for g, r in rows.items()}
+
+    # Smallest games go first when even the compact blocks don't fit
+    by_share = sorted(rows, key=lambda g: -int(rows[g]["total_reviews"]))
+    kept, cost = [], 0
+    for g in by_share:
+        c = estimate_tokens(compact[g]) + 1
+        if cost + c > tokens and kept:
+            break
+        kept.append(g)
+        cost += c
+    omitted = [g for g in by_share if g not in kept]
+
+    # Every kept game gets its compact block; the spare tokens upgrade games to
+    # the full block — first within each game's proportional allocation,
+    # then whatever is left, largest games first. Building a full block runs
+    # keyword extraction twice, so a pass stops once the spare can't cover any
+    # upgrade or UPGRADE_MAX_MISSES built blocks have failed to fit
+    alloc  = allocate({g: int(rows[g]["total_reviews"]) for g in kept}, tokens)
+    cost   = {g: estimate_tokens(compact[g]) + 1 for g in kept}
+    spare  = tokens - sum(cost.values())
+    chosen = dict(compact)
+    full: dict[str, str] = {}
+    for first_pass in (True, False):
+        misses = 0
+        for g in kept:
+            if spare < KEYWORD_LINES_MIN_TOKENS or misses >= UPGRADE_MAX_MISSES:
+                break
+            if chosen[g] is not compact[g]:
+                continue
+            room = min(alloc[g] - cost[g], spare) if first_pass else spare
+            if room < KEYWORD_LINES_MIN_TOKENS:
+                continue
+            if g not in full:
+                full[g] = game_block(view, rows[g], keyword_fn, n_reviews, vader)
+            extra = estimate_tokens(full[g]) - estimate_tokens(compact[g])
+            if extra <= room:
+                chosen[g] = full[g]
+                spare    -= extra
+            else:
+                misses += 1
+    blocks = [chosen[g] for g in rows if g in chosen]
+    budget.note("games_condensed", sum(chosen[g] is compact[g] for g in kept))
+    text = "".join("\n\n" + b for b in blocks)
+    if omitted:
+        budget.note("games_omitted", len(omitted))
+        text += "\n\n" + clip(f"({len(omitted)} smaller games omitted for length: {', '.join(omitted)})", 120)
+    return budget.add("games", text)
+
+
+def _sample_line(r, max_tokens: int) -> str:
+    snippet = clip(str(r["review_text"]).replace("\n", " ").strip(), max_tokens)
+    hrs     = r.get("author_playtime_hrs", 0)
+    helpful = r.get("votes_helpful", 0)
+    meta    = f"{hrs:.0f}h playtime"
+    if helpful > 0:
+        meta += f", {helpful} found helpful"
+    return f'  [{r["game_title"]}] ({meta})\n  "{snippet}"'
+
+
+def _candidates(frame: pd.DataFrame, n: int = SAMPLE_CANDIDATES) -> pd.DataFrame:
+    sub = frame[frame["review_text"].str.len() > SAMPLE_MIN_CHARS]
+    if sub.empty:
+        return sub
+    # Mix: half most-helpful, half longest (catches detailed but less-voted reviews)
+    top_helpful = sub.nlargest(n // 2, "votes_helpful")
+    top_long    = sub.iloc[sub["review_text"].str.len().argsort()[::-1].values[:n - n // 2]]
+    combined    = pd.concat([top_helpful, top_long])
+    return combined[~combined.index.duplicated()]
+
+
+def _sample_section(frame_for, shares: dict, tokens: int, budget: PromptBudget,
+                    max_samples: int = SAMPLES_PER_POLARITY,
+                    candidates: int = SAMPLE_CANDIDATES) -> str:
+    """Samples from frame_for(key) for each key of shares, sized by its share."""
+    shares = {k: n for k, n in shares.items() if n > 0}
+    order  = sorted(shares, key=lambda k: -shares[k])
+    alloc  = allocate(shares, tokens)
+    queues: dict[str, list] = {}
+    seen   = NearDuplicates()
+    lines, used = [], 0
+
+    def fill(k, room: int) -> int:
+        spent = 0
+        while len(lines) < max_samples:
+            cap = min(SAMPLE_MAX_TOKENS, room - spent - 25)    # ~25 tokens of game/meta framing
+            if cap < SAMPLE_MIN_TOKENS:
+                break
+            if k not in queues:
+                queues[k] = [r for _, r in _candidates(frame_for(k), candidates).iterrows()]
+            if not queues[k]:
+                break
+            r = queues[k].pop(0)
+            if not seen.add(str(r["review_text"])):
+                budget.note("duplicates_dropped")
+                continue
+            lines.append(_sample_line(r, cap))
+            spent += estimate_tokens(lines[-1]) + 1
+        return spent
+
+    # Each key's own allowance first (largest share first), then whatever is
+    # still unused goes to keys with candidates left
+    for k in order:
+        used += fill(k, alloc[k])
+    for k in order:
+        used += fill(k, tokens - used)
+    budget.note("samples", len(lines))
+    return budget.add("samples", "\n\n".join(lines) if lines else "  (none)")
+
+
+def build_analysis_prompt(view, sdf, focus: str, tone: str, genre_label: str, keyword_fn,
+                          vader: bool = False, notes: list[tuple[str, str]] | None = None,
+                          token_budget: int = PROMPT_TOKEN_BUDGET) -> tuple[str, dict]:
+    """(prompt, stats) — the analyst brief for view, sized to token_budget.
+
+    notes, from summarise_slices(), makes this the reduce step: the per-slice
+    summaries go in ahead of everything but the fixed sections, and only a few
+    raw samples are kept for quoting."""
+    budget    = PromptBudget(token_budget)
+    df        = view.df
+    n_games   = sdf["game_title"].nunique()
+    n_reviews = len(df)
+    avg_pos   = sdf["positive_pct"].mean()
+
+    # ── Overall keyword frequencies (with counts) ─
+    pos_kw_all = view.keywords(keyword_fn, 30, voted_up=True)
+    neg_kw_all = view.keywords(keyword_fn, 30, voted_up=False)
+    pos_kw_str = ", ".join(f"{w}({c})" for w, c in pos_kw_all)
+    neg_kw_str = ", ".join(f"{w}({c})" for w, c in neg_kw_all)
+
+    # Keywords that appear only in positive OR only in negative (differentiators)
+    pos_words = {w for w, _ in pos_kw_all}
+    neg_words = {w for w, _ in neg_kw_all}
+    only_pos  = ", ".join(w for w, _ in pos_kw_all if w not in neg_words) or "—"
+    only_neg  = ", ".join(w for w, _ in neg_kw_all if w not in pos_words) or "—"
+
+    # ── Playtime insight ──────────────────────────
+    overall_pt = df["author_playtime_hrs"]
+    pt_insight = (
+        f"Overall playtime at review: avg {overall_pt.mean():.1f}h, "
+        f"median {overall_pt.median():.1f}h. "
+        f"Reviewers with <2h: {(overall_pt < 2).sum():,} "
+        f"({(overall_pt < 2).mean()*100:.0f}%), "
+        f"10h+: {(overall_pt >= 10).sum():,} "
+        f"({(overall_pt >= 10).mean()*100:.0f}%), "
+        f"100h+: {(overall_pt >= 100).sum():,} "
+        f"({(overall_pt >= 100).mean()*100:.0f}%)."
+    )
+
+    # ── Sentiment polarity spread ─────────────────
+    pos_pcts = sdf["positive_pct"].tolist()
+    spread   = max(pos_pcts) - min(pos_pcts) if len(pos_pcts) > 1 else 0
+    best     = sdf.iloc[0]["game_title"]
+    worst    = sdf.iloc[-1]["game_title"] if len(sdf) > 1 else best
+
+    head = budget.add("overview", f"""You are a senior games market analyst with deep expertise in player psychology and game design critique. You have been given Steam review data collected via the public Steam API.
+
+Your task is to produce a genuinely insightful analysis — not a surface-level summary. Dig into the data. Find patterns. Make arguments. Quote reviews. Be specific about which games have which issues. A good analyst doesn't just describe the data; they interpret it.
+
+{_heading("DATASET OVERVIEW")}
+Genre / search: {genre_label}
+Total reviews: {n_reviews:,} across {n_games} games
+Average positive sentiment: {avg_pos:.1f}%
+Sentiment spread: {spread:.0f}pp (best: {best}, worst: {worst})
+{pt_insight}
+
+{_heading("PER-GAME DATA (sorted best → worst)")}""")
+
+    keywords = budget.add("keywords", f"""
+
+{_heading("CROSS-GAME KEYWORD FREQUENCIES")}
+Positive reviews — top 30 terms (with mention counts):
+{pos_kw_str}
+
+Negative reviews — top 30 terms (with mention counts):
+{neg_kw_str}
+
+Differentiator keywords (positive only, not in top-30 negative): {only_pos}
+Differentiator keywords (negative only, not in top-30 positive): {only_neg}
+
+{_heading("REVIEW SAMPLES — POSITIVE (most helpful + most detailed)")}
+""")
+
+    task = budget.add("task", f"""
+
+{_heading("YOUR TASK")}
+{FOCUS_PROMPTS[focus].format(spread=spread)}
+
+OUTPUT TONE: {TONE_PROMPTS[tone]}
+
+HARD RULES:
+- Every claim must reference specific data from this brief (game names, keywords, review quotes, numbers)
+- Do not write generic observations that could apply to any game genre
+- Do not pad with transitions or summaries — every paragraph must contain new analysis
+- Max tokens will be used — write a thorough report, not a brief one
+- Use markdown formatting with clear section headers""")
+
+    neg_head = budget.add("keywords", f"\n\n{_heading('REVIEW SAMPLES — NEGATIVE (most helpful + most detailed)')}\n")
+
+    notes_text = ""
+    if notes:
+        notes_text = budget.add("notes", f"\n\n{_heading('ANALYST NOTES (each summarised from every review in its slice)')}"
+                                + "".join(f"\n\n#### {label}\n{text.strip()}" for label, text in notes))
+
+    # Samples are capped in count, so whatever they leave goes to the games
+    max_samples   = REDUCE_SAMPLES_PER_POLARITY if notes else SAMPLES_PER_POLARITY
+    sample_tokens = int(budget.remaining * (1 - GAME_BLOCK_SHARE))
+    pos_smp = _sample_section(lambda g: view.frame(g, True),
+                              dict(zip(sdf["game_title"], sdf["positive_reviews"].astype(int))),
+                              sample_tokens // 2, budget, max_samples)
+    neg_smp = _sample_section(lambda g: view.frame(g, False),
+                              dict(zip(sdf["game_title"], sdf["negative_reviews"].astype(int))),
+                              sample_tokens - estimate_tokens(pos_smp), budget, max_samples)
+    games   = _game_section(view, sdf, keyword_fn, n_reviews, vader, budget.remaining, budget)
+
+    prompt = head + games + notes_text + keywords + pos_smp + neg_head + neg_smp + task
+    return prompt, budget.report()
+
+
+# ── Map-reduce ───────────────────────────────────────────────
+MAP_SYSTEM_PROMPT = (
+    "You summarise Steam reviews for a games market analyst who will combine your notes "
+    "with notes on other games. Be specific and factual; keep short verbatim quotes. "
+    "Respond only with the notes in markdown bullets, no preamble."
+)
+
+COMBINE_SYSTEM_PROMPT = (
+    "You merge analyst notes on several Steam games into one set of notes for a games "
+    "market analyst. Keep every game's name attached to its points, keep the strongest "
+    "quotes and any numbers. Respond only with the merged notes in markdown bullets."
+)
+
+_MAP_TASK = """Write notes on these reviews (at most 250 words):
+- Verdict: one line on how players feel overall
+- Praise: the 3-5 main themes, most common first, each with rough prevalence and a short quote
+- Complaints: the 3-5 main themes, most common first, each with rough prevalence and a short quote
+- Patterns: anything notable about playtime, ambivalent terms or recent changes"""
+
+def _complete(client, model: str, system: str, max_tokens: int, prompt: str) -> tuple[str, dict]:
+    """(text, usage) for one map/combine step through the report cache; usage is
+    empty when it came from the cache."""
+    key  = cache_key(prompt, model, system, max_tokens)
+    text = report_cache.get(key, "steam_map", MAP_CACHE_TTL_S)
+    if text is not None:
+        return text, {}
+    resp = client.messages.create(model=model, max_tokens=max_tokens, system=system,
+                                  messages=[{"role": "user", "content": prompt}])
+    text = resp.content[0].text
+    report_cache.put(key, "steam_map", text, model, MAP_CACHE_TTL_S)
+    usage = getattr(resp, "usage", None)
+    return text, {"input_tokens":  getattr(usage, "input_tokens", 0) or 0,
+                  "output_tokens": getattr(usage, "output_tokens", 0) or 0}
+
+
+def _run_steps(client, prompts: dict[str, str], system: str, model: str, workers: int,
+               stats: dict, on_progress=None) -> dict[str, str]:
+    """label → completion for every prompt, concurrently; cached ones return at once."""
+    out, done = {}, 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-map") as pool:
+        futs = {pool.submit(_complete, client, model, system, MAP_MAX_TOKENS, p): label
+                for label, p in prompts.items()}
+        try:
+            for fut in as_completed(futs):
+                text, usage = fut.result()
+                out[futs[fut]] = text
+                stats["calls" if usage else "cached"] += 1
+                stats["input_tokens"]  += usage.get("input_tokens", 0)
+                stats["output_tokens"] += usage.get("output_tokens", 0)
+                done += 1
+                if on_progress:
+                    on_progress(done, len(prompts))
+        except Exception:
+            for f in futs:
+                f.cancel()
+            raise
+    return {label: out[label] for label in prompts}
+
+
+def report_slices(view, sdf) -> list[tuple[str, pd.DataFrame]]:
+    """The map step's inputs: one slice per game, largest first, or per playtime
+    band when the scope is a single game with more than MAP_BAND_SPLIT reviews."""
+    games = list(sdf.sort_values("total_reviews", ascending=False)["game_title"])
+    if len(games) == 1 and len(view.df) > MAP_BAND_SPLIT:
+        df = view.df
+        pt = pd.to_numeric(df["author_playtime_hrs"], errors="coerce")
+        bands = [(f"{games[0]} — {name} playtime", df[(pt >= lo) & (pt < hi)])
+                 for name, lo, hi in PLAYTIME_BANDS]
+        return [(label, frame) for label, frame in bands if len(frame)]
+    return [(g, view.frame(g)) for g in games]
+
+
+def slice_prompt(label: str, frame: pd.DataFrame, keyword_fn, vader: bool = False) -> str:
+    """Map-step prompt for one slice. Depends on nothing outside the slice, so a
+    slice whose reviews are unchanged has the same prompt (and cache entry)."""
+    budget = PromptBudget(MAP_TOKEN_BUDGET)
+    up     = frame["voted_up"].fillna(False).astype(bool)
+    n, pos = len(frame), int(up.sum())
+    pt     = pd.to_numeric(frame["author_playtime_hrs"], errors="coerce")
+    vader_str = ""
+    if vader and "vader_compound" in frame.columns and frame["vader_compound"].notna().any():
+        vader_str = f"\nVADER compound mean: {frame['vader_compound'].mean():+.3f}"
+    texts = lambda mask: frame.loc[mask, "review_text"].fillna("").astype(str).tolist()
+    pos_kw = keyword_fn(texts(up), 15)
+    neg_kw = keyword_fn(texts(~up), 15)
+
+    head = budget.add("overview", (
+        f"Slice: {label}\n"
+        f"Reviews: {n:,} ({pos / n * 100 if n else 0:.1f}% positive — {pos:,} pos / {n - pos:,} neg)\n"
+        f"Playtime at review: median {pt.median():.1f}h, 90th-pct {pt.quantile(0.9):.0f}h"
+        f"{vader_str}\n"
+        f"Top positive terms: {', '.join(f'{w}({c})' for w, c in pos_kw) or '—'}\n"
+        f"Top negative terms: {', '.join(f'{w}({c})' for w, c in neg_kw) or '—'}\n\n"
+        f"{_MAP_TASK}\n\nPOSITIVE REVIEWS (most helpful + most detailed):\n"))
+    neg_head = budget.add("overview", "\n\nNEGATIVE REVIEWS (most helpful + most detailed):\n")
+    half = budget.remaining // 2
+    pos_smp = _sample_section(lambda _: frame[up], {label: pos}, half, budget,
+                              MAP_SAMPLES_PER_POLARITY, MAP_SAMPLES_PER_POLARITY * 2)
+    neg_smp = _sample_section(lambda _: frame[~up], {label: n - pos}, budget.remaining, budget,
+                              MAP_SAMPLES_PER_POLARITY, MAP_SAMPLES_PER_POLARITY * 2)
+    return head + pos_smp + neg_head + neg_smp
+
+
+def _combine_prompt(notes: list[tuple[str, str]]) -> str:
+    return ("Merge these notes into one set (at most 400 words), grouped by theme:\n"
+            + "".join(f"\n\n#### {label}\n{text.strip()}" for label, text in notes))
+
+
+def _combine_groups(notes: list[tuple[str, str]], level: int) -> dict[str, list[tuple[str, str]]]:
+    """Notes bucketed by a hash of their label into a power-of-two number of
+    groups (~COMBINE_GROUP each), so one added slice changes only its own group
+    at each level. Group labels depend only on the bucket, not its members."""
+    n_groups = 1 << (math.ceil(len(notes) / COMBINE_GROUP) - 1).bit_length()
+    groups: dict[int, list] = {}
+    for label, text in notes:
+        bucket = int(hashlib.sha1(label.encode("utf-8")).hexdigest(), 16) % n_groups
+        groups.setdefault(bucket, []).append((label, text))
+    return {f"Combined notes L{level}.{b + 1}": groups[b] for b in sorted(groups)}
+
+
+def summarise_slices(client, view, sdf, keyword_fn, vader: bool = False, model: str = MAP_MODEL,
+                     workers: int = MAP_WORKERS, on_progress=None) -> tuple[list[tuple[str, str]], dict]:
+    """Map step (and, if the notes are too long, combine levels) for the report.
+
+    Returns ([(label, notes)], stats). Every completion is cached by the hash of
+    its request, so re-running with one game added only maps that game (and
+    redoes the combine steps of the group its notes fall into).
+    on_progress(stage, done, total) is called as steps finish."""
+    stats  = {"slices": 0, "calls": 0, "cached": 0, "levels": 0, "input_tokens": 0, "output_tokens": 0}
+    slices = report_slices(view, sdf)
+    stats["slices"] = len(slices)
+    prompts = {label: slice_prompt(label, frame, keyword_fn, vader) for label, frame in slices}
+
+    def step(stage: str):
+        return (lambda done, total: on_progress(stage, done, total)) if on_progress else None
+
+    notes = list(_run_steps(client, prompts, MAP_SYSTEM_PROMPT, model, workers, stats,
+                            step("Summarising")).items())
+
+    while len(notes) > 1 and sum(estimate_tokens(t) for _, t in notes) > NOTES_TOKEN_BUDGET:
+        stats["levels"] += 1
+        prompts = {label: _combine_prompt(g) for label, g in _combine_groups(notes, stats["levels"]).items()}
+        notes   = list(_run_steps(client, prompts, COMBINE_SYSTEM_PROMPT, model, workers, stats,
+                                  step("Combining")).items())
+    return notes, stats
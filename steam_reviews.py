@@ -0,0 +1,355 @@
+"""
+steam_reviews.py — Steam review collection for the Steam Review Analyzer.
+=========================================================================
+Pages the public appreviews endpoint for one or many games. Kept free of
+Streamlit so it can be driven headless (see bench_review_fetch.py).
+
+Concurrency model
+─────────────────
+fetch_reviews_concurrent() pages several games at once on a thread pool.
+Every request to a host first passes through _throttle(host), which hands
+out evenly spaced send slots across *all* threads — so running 6 games in
+parallel never exceeds HOST_MIN_INTERVAL_S spacing against the same host.
+A 429 pushes the host's next slot back by RATE_LIMIT_BACKOFF_S for everyone.
+
+Per-game progress callbacks (pct in 0..1) still fire from the worker thread
+that owns the game; callers that need to touch UI state from their own thread
+pass on_tick, which runs on the calling thread between waits.
+
+compact_reviews() turns the collected rows' DataFrame into the compact,
+columnar form the dashboard keeps in session_state (see _review_row for the
+schema it expects).
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+
+try:
+    import review_store as _review_store
+except ImportError:
+    _review_store = None
+
+try:
+    import pyarrow  # noqa: F401  — backs the compact string columns
+    _TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    _TEXT_DTYPE = None            # leave text columns as object
+
+STEAM_REVIEW_URL = "https://store.steampowered.com/appreviews/{app_id}"
+
+REVIEW_FETCH_WORKERS = 6      # games paged concurrently
+HOST_MIN_INTERVAL_S  = 0.25   # min spacing between requests to one host (≈4 req/s)
+RATE_LIMIT_BACKOFF_S = 5.0    # host-wide pause after a 429
+MAX_PAGE_RETRIES     = 2      # retries per page on 429 / transient errors
+
+_HOST_NEXT_SLOT: dict[str, float] = {}
+_HOST_LOCK = threading.Lock()
+
+
+def _throttle(host: str) -> None:
+    """Block until this thread's send slot for `host` comes up."""
+    with _HOST_LOCK:
+        now  = time.monotonic()
+        slot = max(now, _HOST_NEXT_SLOT.get(host, 0.0))
+        _HOST_NEXT_SLOT[host] = slot + HOST_MIN_INTERVAL_S
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _backoff_host(host: str, seconds: float) -> None:
+    with _HOST_LOCK:
+        _HOST_NEXT_SLOT[host] = max(_HOST_NEXT_SLOT.get(host, 0.0), time.monotonic() + seconds)
+
+
+def _get_page(url: str, params: dict) -> dict | None:
+    """One throttled appreviews request; None on a non-retryable failure."""
+    host = urlparse(url).netloc
+    for attempt in range(MAX_PAGE_RETRIES + 1):
+        _throttle(host)
+        try:
+            resp = requests.get(url, params=params, timeout=15)
+            if resp.status_code == 429:
+                _backoff_host(host, RATE_LIMIT_BACKOFF_S * (attempt + 1))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+        except requests.exceptions.RequestException:
+            if attempt == MAX_PAGE_RETRIES:
+                return None
+        except ValueError:
+            return None
+    return None
+
+
+def _review_row(r: dict, app_id: int, title: str) -> dict:
+    author = r.get("author", {})
+    return {
+        "app_id":                   app_id,
+        "game_title":               title,
+        "recommendation_id":        r.get("recommendationid", ""),
+        "voted_up":                 r.get("voted_up"),
+        "author_steamid":           author.get("steamid", ""),
+        "author_num_reviews":       author.get("num_reviews", 0),
+        "author_num_games_owned":   author.get("num_games_owned", 0),
+        "author_playtime_hrs":      round(author.get("playtime_at_review", 0) / 60, 1),
+        "author_playtime_total_hrs":round(author.get("playtime_forever", 0) / 60, 1),
+        "votes_helpful":            r.get("votes_up", 0),
+        "votes_funny":              r.get("votes_funny", 0),
+        "timestamp_created":        r.get("timestamp_created"),
+        "review_text":              r.get("review", "").strip(),
+        "written_during_ea":        r.get("written_during_early_access", False),
+    }
+
+
+# Compact in-session dtypes per _review_row column (anything else that is
+# object-typed becomes an Arrow string; vader_compound is added after scoring)
+_CATEGORY_COLS = ("game_title",)
+_BOOL_COLS     = ("voted_up", "written_during_ea")
+_INT64_COLS    = ("recommendation_id", "author_steamid", "timestamp_created")
+_UINT32_COLS   = ("app_id", "author_num_reviews", "author_num_games_owned",
+                  "votes_helpful", "votes_funny")
+_FLOAT64_COLS  = ("author_playtime_hrs", "author_playtime_total_hrs", "vader_compound")
+
+
+def _compact_column(name: str, s: pd.Series) -> pd.Series:
+    if name in _CATEGORY_COLS:
+        return s.astype("category")
+    if name in _BOOL_COLS:
+        return s.eq(True)
+    if name in _FLOAT64_COLS:
+        return pd.to_numeric(s, errors="coerce").astype("float64")
+    if name in _INT64_COLS or name in _UINT32_COLS:
+        n = pd.to_numeric(s, errors="coerce")
+        if n.isna().any():
+            # A missing/non-numeric id stays text; missing counts/timestamps stay float
+            return s.astype(_TEXT_DTYPE) if name in _INT64_COLS and _TEXT_DTYPE else n
+        if name in _UINT32_COLS and len(n) and (n.min() < 0 or n.max() >= 2 ** 32):
+            return n.astype("int64")
+        return n.astype("uint32" if name in _UINT32_COLS else "int64")
+    if s.dtype == object and _TEXT_DTYPE:
+        return s.astype(_TEXT_DTYPE)
+    return s
+
+
+def compact_reviews(df: pd.DataFrame, report: dict | None = None) -> pd.DataFrame:
+    """df with compact dtypes: categorical game_title, int64 ids/timestamps,
+    uint32 counts, float64 hours/VADER, bool flags, Arrow-backed strings.
+
+    Hours and VADER stay float64: float32 aggregates (mean/median) come back
+    as np.float32 and print with binary noise (91.30000305175781) in the
+    report prompt and the Game Table, for 4 bytes a row.
+
+    report, if given, is filled with {"before", "after"} total bytes and
+    "columns": column → (before, after) bytes (pandas deep memory_usage).
+    """
+    out = pd.DataFrame({c: _compact_column(c, df[c]) for c in df.columns}, index=df.index)
+    if report is not None:
+        before = df.memory_usage(deep=True)
+        after  = out.memory_usage(deep=True)
+        report.update(before=int(before.sum()), after=int(after.sum()),
+                      columns={c: (int(before[c]), int(after[c])) for c in df.columns})
+    return out
+
+
+def _iter_pages(app_id: int, language: str, cursor: str = "*"):
+    """Yield (raw_reviews, next_cursor) per page. A final ([], None) means Steam
+    has no more history; stopping without it means a request failed."""
+    base = {
+        "json": 1, "language": language, "review_type": "all",
+        "purchase_type": "steam", "num_per_page": 100, "filter": "recent",
+    }
+    while True:
+        data = _get_page(STEAM_REVIEW_URL.format(app_id=app_id), {**base, "cursor": cursor})
+        if not data or not data.get("success"):
+            return
+        reviews    = data.get("reviews", [])
+        new_cursor = data.get("cursor")
+        if not reviews:
+            yield [], None
+            return
+        if not new_cursor or new_cursor == cursor:
+            yield reviews, None
+            return
+        yield reviews, new_cursor
+        cursor = new_cursor
+
+
+def fetch_reviews_for_game(
+    app_id: int, title: str, max_reviews: int, progress_cb=None, language: str = "english",
+    use_store: bool = True, stats: dict | None = None,
+) -> list[dict]:
+    """Newest `max_reviews` reviews for app_id, newest first.
+
+    With use_store (and review_store importable) only reviews not already on
+    disk are downloaded. The first fetch for a request language pages from
+    the newest review until max_reviews have been paged under it. Later
+    fetches run a head pass from the newest review until it meets one this
+    language already paged past, then backfill any gap an earlier head pass
+    left (gap_cursors), then — if fewer than max_reviews have been paged
+    under this language — resume history from the saved tail cursor.
+
+    Every review on a fetched page is written back, so edits and
+    votes_helpful refresh for the ones the head pass sees again. Older
+    stored reviews are not re-paged: their text and votes stay as of the
+    fetch that last returned them.
+    stats, if given, is filled with {"new", "from_store", "requests"}.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(new=0, from_store=0, requests=0)
+
+    if not (use_store and _review_store):
+        collected = []
+        for reviews, _ in _iter_pages(app_id, language):
+            stats["requests"] += 1
+            for r in reviews:
+                collected.append(_review_row(r, app_id, title))
+                if len(collected) >= max_reviews:
+                    break
+            if progress_cb:
+                progress_cb(min(len(collected) / max(max_reviews, 1), 1.0))
+            if len(collected) >= max_reviews:
+                break
+        stats["new"] = len(collected)
+        return collected
+
+    store  = _review_store
+    state  = store.get_sync_state(app_id, language)
+    known  = store.known_ids(app_id)
+    seen   = store.fetched_ids(app_id, language)
+    have   = len(seen)
+    newest = state["newest_ts"] if state else 0
+    gaps   = list(state["gap_cursors"]) if state else []
+    paged  = 0                                  # reviews new to this language, this call
+
+    def _keep(reviews):
+        """Store the page (refreshing reviews already on disk) and credit it
+        to this request language; returns how many it had not paged past before."""
+        nonlocal have, newest, paged
+        rows  = [_review_row(r, app_id, title) for r in reviews]
+        store.upsert_reviews(rows, [r.get("language") for r in reviews])
+        fresh = [row["recommendation_id"] for row in rows if row["recommendation_id"] not in known]
+        known.update(fresh)
+        unseen = [r.get("recommendationid", "") for r in reviews if r.get("recommendationid", "") not in seen]
+        store.mark_fetched(app_id, language, unseen)
+        seen.update(unseen)
+        have         += len(unseen)
+        paged        += len(unseen)
+        stats["new"] += len(fresh)
+        newest = max([newest] + [row["timestamp_created"] or 0 for row in rows])
+        if progress_cb:
+            progress_cb(min(have / max(max_reviews, 1), 1.0))
+        return len(unseen)
+
+    # Head — everything newer than the newest review this language has paged
+    if state:
+        cursor, reached_seen = "", False
+        for reviews, nxt in _iter_pages(app_id, language):
+            stats["requests"] += 1
+            if _keep(reviews) < len(reviews):
+                reached_seen = True
+                break
+            cursor = nxt or ""
+            if paged >= max_reviews or not nxt:
+                break
+        if not reached_seen and paged >= max_reviews and cursor:
+            # Stopped short of the stored reviews — backfill the gap from here later
+            gaps.insert(0, cursor)
+            store.set_sync_state(app_id, language, gap_cursors=gaps)
+
+    # Gaps — pages between an earlier head pass and the reviews it didn't reach
+    while gaps and paged < max_reviews:
+        cursor, closed = gaps[0], False
+        for reviews, nxt in _iter_pages(app_id, language, cursor):
+            stats["requests"] += 1
+            if _keep(reviews) < len(reviews) or nxt is None:
+                closed = True
+                break
+            cursor = nxt
+            if paged >= max_reviews:
+                break
+        if closed:
+            gaps.pop(0)
+        else:
+            gaps[0] = cursor
+        store.set_sync_state(app_id, language, gap_cursors=gaps)
+        if not closed:
+            break
+
+    # Tail — older history until max_reviews have been paged under this language
+    if have < max_reviews and not (state and state["exhausted"]):
+        saved = state["tail_cursor"] if state else ""
+        for start in ([saved, "*"] if saved else ["*"]):
+            resumed = False
+            for reviews, nxt in _iter_pages(app_id, language, start):
+                resumed = True
+                stats["requests"] += 1
+                _keep(reviews)
+                store.set_sync_state(app_id, language, tail_cursor=nxt or "", exhausted=nxt is None)
+                if nxt is None or have >= max_reviews:
+                    break
+            if resumed:
+                break
+
+    store.set_sync_state(app_id, language, newest_ts=newest)
+    rows = store.load_reviews(app_id, language, max_reviews, title=title)
+    stats["from_store"] = max(len(rows) - stats["new"], 0)
+    return rows
+
+
+def fetch_reviews_concurrent(
+    games: list[dict],
+    max_reviews: int,
+    language: str = "english",
+    progress_cb=None,
+    on_tick=None,
+    max_workers: int = REVIEW_FETCH_WORKERS,
+    tick_s: float = 0.25,
+    use_store: bool = True,
+    stats: dict | None = None,
+) -> tuple[dict[int, list[dict]], dict[int, str]]:
+    """Page every game in `games` ({"app_id", "name"}) concurrently.
+
+    progress_cb(app_id, pct) — per-game progress, called from worker threads.
+    on_tick(progress, results, errors) — called on the *calling* thread every
+    tick_s and after each game finishes; safe for Streamlit element updates.
+    stats, if given, is filled app_id → fetch_reviews_for_game stats.
+
+    Returns (results, errors): app_id → review rows, app_id → error message.
+    """
+    progress = {g["app_id"]: 0.0 for g in games}
+    results: dict[int, list[dict]] = {}
+    errors:  dict[int, str] = {}
+    stats    = stats if stats is not None else {}
+
+    def _game_cb(app_id):
+        def _cb(pct):
+            progress[app_id] = pct
+            if progress_cb:
+                progress_cb(app_id, pct)
+        return _cb
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            pool.submit(fetch_reviews_for_game, g["app_id"], g["name"], max_reviews,
+                        _game_cb(g["app_id"]), language, use_store,
+                        stats.setdefault(g["app_id"], {})): g["app_id"]
+            for g in games
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=tick_s, return_when=FIRST_COMPLETED)
+            for fut in done:
+                app_id = futures[fut]
+                try:
+                    results[app_id] = fut.result()
+                except Exception as e:
+                    results[app_id], errors[app_id] = [], str(e)
+                progress[app_id] = 1.0
+            if on_tick:
+                on_tick(progress, results, errors)
+    return results, errors
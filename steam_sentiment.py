@@ -3,82 +3,47 @@ Steam Genre Review Analyzer — SEGA-branded Streamlit App
 =========================================================
 Run with:  streamlit run steam_review_app.py
 
-Required:  pip install streamlit requests pandas plotly anthropic matplotlib wordcloud httpx
+Required:  pip install streamlit requests pandas plotly anthropic wordcloud httpx
 """
 
-import time
 import re
 import os
 import json
-from collections import Counter
 import requests
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 import io
 import json as _json
-
-try:
-    from wordcloud import WordCloud as _WC
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-    WORDCLOUD_AVAILABLE = True
-except ImportError:
-    WORDCLOUD_AVAILABLE = False
-
-try:
-    import markdown as _markdown
-except ImportError:
-    _markdown = None
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    from reportlab.lib import colors as _rl_colors
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
-    from reportlab.platypus import Preformatted
-    import io as _rl_io
-    _REPORTLAB_AVAILABLE = True
-except ImportError:
-    _REPORTLAB_AVAILABLE = False
-try:
-    import anthropic as _anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
-
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer as _VaderAnalyzer
-    VADER_AVAILABLE = True
-except ImportError:
-    VADER_AVAILABLE = False
-
-# ── Ensure Playwright Chromium is installed (runs once, cached) ──────────────
-@st.cache_resource(show_spinner=False)
-def _ensure_playwright_chromium():
-    """Install playwright chromium browser if not already present."""
-    import subprocess as _sp
-    try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as _pw:
-            # Try launching — if it fails the binary is missing
-            _b = _pw.chromium.launch(headless=True, args=["--no-sandbox"])
-            _b.close()
-        return True, "Chromium ready"
-    except Exception as _e:
-        if "Executable doesn't exist" in str(_e) or "playwright install" in str(_e):
-            # Run playwright install
-            _r = _sp.run(
-                ["python3", "-m", "playwright", "install", "chromium"],
-                capture_output=True, text=True, timeout=120,
-            )
-            if _r.returncode == 0:
-                return True, "Chromium installed"
-            return False, f"Install failed: {_r.stderr[:300]}"
-        return False, str(_e)[:200]
-
-_pw_ready, _pw_msg = _ensure_playwright_chromium()
+from steam_reviews import compact_reviews, fetch_reviews_concurrent
+from steam_forums import ensure_chromium, fetch_forum_threads
+from steam_news import game_events, prefetch_news
+from forum_store import recent_threads as stored_forum_threads, store_summary as forum_store_summary
+from sentiment_scoring import compound_scores
+from keyword_engine import KeywordEngine
+from review_facets import ReviewFacets, monthly_by_game
+from review_search import highlight_pattern
+from wordcloud_render import WORDCLOUD_AVAILABLE, submit_wordcloud
+from steam_report import (MAP_REDUCE_MIN_REVIEWS, PROMPT_TOKEN_BUDGET, REDUCE_TOKEN_BUDGET,
+                          REPORT_MAX_TOKENS, SYSTEM_PROMPT as REPORT_SYSTEM_PROMPT,
+                          build_analysis_prompt, summarise_slices)
+from lazy_imports import lazy_module, module_available
+from chat_context import build_request as build_chat_request, new_memory as new_chat_memory
+from chat_context import stream_reply, turn_caption
+import report_cache
+import upstream_sim
+
+# Heavy optional dependencies load on first use (see lazy_imports.py)
+_markdown  = lazy_module("markdown")          # None when not installed
+_anthropic = lazy_module("anthropic")
+ANTHROPIC_AVAILABLE  = _anthropic is not None
+_REPORTLAB_AVAILABLE = module_available("reportlab")   # imported in the PDF export
+VADER_AVAILABLE      = module_available("vaderSentiment")
+
+upstream_sim.install_from_env()   # no-op unless UPSTREAM_SIM_URL is set — see upstream_sim.py
+
+# ── Ensure Playwright Chromium is installed (once per process, in the background) ──
+ensure_chromium()
 
 # ─────────────────────────────────────────────────────────────
 # PAGE CONFIG
@@ -617,7 +582,7 @@ div[data-baseweb="notification"] {
 # ─────────────────────────────────────────────────────────────
 
 STEAM_SEARCH_URL = "https://store.steampowered.com/search/results"
-STEAM_REVIEW_URL = "https://store.steampowered.com/appreviews/{app_id}"
+STRUCT_SUMMARY_MODEL = "claude-haiku-4-5-20251001"
 
 PLOTLY_BASE = dict(
     paper_bgcolor="rgba(0,0,0,0)",
@@ -882,70 +847,13 @@ def search_games_by_genre(genre: str, max_results: int = 30) -> list[dict]:
     return games[:max_results]
 
 
-def fetch_reviews_for_game(
-    app_id: int, title: str, max_reviews: int, progress_cb=None, language: str = "english",
-) -> list[dict]:
-    collected, cursor = [], "*"
-    base = {
-        "json": 1, "language": language, "review_type": "all",
-        "purchase_type": "steam", "num_per_page": 100, "filter": "recent",
-    }
-    while len(collected) < max_reviews:
-        try:
-            resp = requests.get(
-                STEAM_REVIEW_URL.format(app_id=app_id),
-                params={**base, "cursor": cursor}, timeout=15,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception:
-            break
-
-        if not data.get("success"):
-            break
-        reviews = data.get("reviews", [])
-        if not reviews:
-            break
-
-        for r in reviews:
-            author = r.get("author", {})
-            collected.append({
-                "app_id":                   app_id,
-                "game_title":               title,
-                "recommendation_id":        r.get("recommendationid", ""),
-                "voted_up":                 r.get("voted_up"),
-                "author_steamid":           author.get("steamid", ""),
-                "author_num_reviews":       author.get("num_reviews", 0),
-                "author_num_games_owned":   author.get("num_games_owned", 0),
-                "author_playtime_hrs":      round(author.get("playtime_at_review", 0) / 60, 1),
-                "author_playtime_total_hrs":round(author.get("playtime_forever", 0) / 60, 1),
-                "votes_helpful":            r.get("votes_up", 0),
-                "votes_funny":              r.get("votes_funny", 0),
-                "timestamp_created":        r.get("timestamp_created"),
-                "review_text":              r.get("review", "").strip(),
-                "written_during_ea":        r.get("written_during_early_access", False),
-            })
-            if len(collected) >= max_reviews:
-                break
-
-        if progress_cb:
-            progress_cb(min(len(collected) / max(max_reviews, 1), 1.0))
-
-        new_cursor = data.get("cursor")
-        if not new_cursor or new_cursor == cursor:
-            break
-        cursor = new_cursor
-        time.sleep(0.6)
-
-    return collected
-
 # ─────────────────────────────────────────────────────────────
 # SUMMARY BUILDER
 # ─────────────────────────────────────────────────────────────
 
 def build_summary(df: pd.DataFrame) -> pd.DataFrame:
     rows = []
-    for title, grp in df.groupby("game_title"):
+    for title, grp in df.groupby("game_title", observed=True):
         pos = grp["voted_up"].sum()
         rows.append({
             "game_title":          title,
@@ -990,81 +898,82 @@ STOPWORDS = {
     "another","second","different","better","best","worst","worse","less","far",
 }
 
+@st.cache_resource(show_spinner=False)
+def _keyword_engine() -> KeywordEngine:
+    """Tokens are cached per review text for the life of the process."""
+    return KeywordEngine(STOPWORDS)
+
+
 def extract_keywords(texts: list[str], top_n: int = 30) -> list[tuple[str, int]]:
     """Extract top unigrams and bigrams from a list of review texts."""
-    words_all: list[str] = []
-    bigrams_all: list[str] = []
-    for text in texts:
-        tokens = re.findall(r"[a-z]{3,}", text.lower())
-        tokens = [t for t in tokens if t not in STOPWORDS]
-        words_all.extend(tokens)
-        bigrams_all.extend(f"{tokens[i]} {tokens[i+1]}" for i in range(len(tokens)-1))
-    counter = Counter(words_all) + Counter(bigrams_all)
-    return counter.most_common(top_n)
-
-
-@st.cache_data(show_spinner=False)
-def generate_wordcloud_img(freq_json: str, positive: bool) -> bytes:
-    """
-    Given a JSON-serialised {word: count} dict, produce a PNG word cloud
-    and return raw bytes. Cached so re-runs don't re-render.
+    return _keyword_engine().top_terms(texts, top_n)
+
+
+def show_wordcloud(slot, freqs: dict, positive: bool) -> None:
+    """Word cloud into an st.empty() slot — at once if rendered before, otherwise
+    a placeholder now and the image once _finish_wordclouds() runs."""
+    fut = submit_wordcloud(freqs, positive)
+    if fut.done():
+        if fut.result():
+            slot.image(fut.result(), width="stretch", output_format="PNG")
+        return
+    slot.markdown(
+        '<div style="height:180px;display:flex;align-items:center;justify-content:center;'
+        'background:var(--surface);border:1px dashed var(--border);border-radius:6px;'
+        'font-size:.75rem;color:var(--muted);">Rendering word cloud…</div>',
+        unsafe_allow_html=True,
+    )
+    _wc_pending.append((slot, fut))
+
+
+def _finish_wordclouds(timeout: float = 60) -> None:
+    """Fill the placeholders left by show_wordcloud (called at the end of the script)."""
+    while _wc_pending:
+        slot, fut = _wc_pending.pop(0)
+        try:
+            png = fut.result(timeout=timeout)
+        except Exception:
+            png = b""
+        if png:
+            slot.image(png, width="stretch", output_format="PNG")
+        else:
+            slot.empty()
+
+
+def _report_cache_caption(kind: str, served_from_cache: bool | None = None) -> str:
+    """Report cache hit rate for kind (report_cache counters, all sessions)."""
+    return ("Served from the report cache · " if served_from_cache else "") + report_cache.hit_rate_line(kind)
+
+
+def _prompt_stats_caption(stats: dict) -> str:
+    """One-line summary of the assembled report prompt (steam_report stats dict)."""
+    parts = [f"Prompt ≈ {stats['tokens']:,} tokens of {stats['budget']:,} budget",
+             f"{stats.get('samples', 0)} review samples"]
+    if stats.get("map"):
+        m = stats["map"]
+        levels = f", {m['levels']} combine levels" if m["levels"] else ""
+        parts.insert(0, f"{m['slices']} slices summarised ({m['cached']} steps cached, "
+                        f"{m['calls']} new{levels})")
+    if stats.get("duplicates_dropped"):
+        parts.append(f"{stats['duplicates_dropped']} near-duplicates dropped")
+    if stats.get("games_condensed"):
+        parts.append(f"{stats['games_condensed']} games condensed")
+    if stats.get("games_omitted"):
+        parts.append(f"{stats['games_omitted']} games omitted")
+    return " · ".join(parts)
+
+
+def score_reviews_vader(df: pd.DataFrame) -> pd.Series:
+    """VADER compound for every row of df, aligned to df.index.
+
+    Works on the frame directly (no JSON round trip). Scoring goes through
+    sentiment_scoring, whose content-addressed cache persists across reruns,
+    refetches and the other sentiment apps, so known texts skip the analyzer.
     """
-    import json as _json
-    freqs = _json.loads(freq_json)
-    if not freqs:
-        return b""
-
-    bg      = "#0d0f1a"
-    hi      = "#20c65a" if positive else "#ff3d52"
-    lo      = "#1a4a2e" if positive else "#4a1a1a"
-
-    def colour_fn(word, font_size, position, orientation, random_state=None, **kw):
-        # Shade from bright (hi) to dim (lo) based on relative font size
-        t = min(font_size / 120, 1.0)
-        hi_rgb = tuple(int(hi[i:i+2], 16) for i in (1,3,5))
-        lo_rgb = tuple(int(lo[i:i+2], 16) for i in (1,3,5))
-        r = int(lo_rgb[0] + t*(hi_rgb[0]-lo_rgb[0]))
-        g = int(lo_rgb[1] + t*(hi_rgb[1]-lo_rgb[1]))
-        b = int(lo_rgb[2] + t*(hi_rgb[2]-lo_rgb[2]))
-        return f"rgb({r},{g},{b})"
-
-    wc = _WC(
-        width=800, height=380,
-        background_color=bg,
-        max_words=60,
-        font_path=None,           # uses default font
-        collocations=False,
-        prefer_horizontal=0.85,
-        min_font_size=10,
-        max_font_size=120,
-        color_func=colour_fn,
-        margin=6,
-    ).generate_from_frequencies(freqs)
-
-    fig, ax = plt.subplots(figsize=(8, 3.8), facecolor=bg)
-    ax.imshow(wc, interpolation="bilinear")
-    ax.axis("off")
-    fig.tight_layout(pad=0)
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", facecolor=bg, bbox_inches="tight", dpi=130)
-    plt.close(fig)
-    buf.seek(0)
-    return buf.read()
-
-
-@st.cache_data(show_spinner=False)
-def run_vader_on_df(df_json: str) -> str:
-    """Run VADER on all reviews. Accepts/returns JSON for Streamlit caching."""
-    import io as _io
-    df = pd.read_json(_io.StringIO(df_json), orient="records")
-    if VADER_AVAILABLE:
-        analyzer = _VaderAnalyzer()
-        scores = [analyzer.polarity_scores(t or "") for t in df["review_text"].fillna("").tolist()]
-        df["vader_compound"] = [s["compound"] for s in scores]
-    else:
-        df["vader_compound"] = None
-    return df.to_json(orient="records")
+    if not VADER_AVAILABLE or df.empty:
+        return pd.Series(None, index=df.index, dtype="object")
+    return pd.Series(compound_scores(df["review_text"].fillna("").tolist()),
+                     index=df.index, dtype="float64")
 
 
 def _normalise_timestamps(df: pd.DataFrame) -> pd.DataFrame:
@@ -1113,74 +1022,6 @@ def lookup_game(query: str) -> list[dict]:
     return results
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_game_events(app_id: int, game_name: str) -> list[dict]:
-    """Fetch patch/DLC/update events from Steam News API for a single game.
-    Returns list of {ts, date_str, title, event_type} sorted oldest→newest."""
-    UPDATE_KEYWORDS = [
-        "update", "patch", "hotfix", "fix", "dlc", "expansion",
-        "content", "season", "version", "release", "launch",
-        "major", "anniversary", "early access", "full release",
-    ]
-    results = []
-    try:
-        resp = requests.get(
-            "https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/",
-            params={"appid": app_id, "count": 100, "maxlength": 1200, "format": "json"},
-            headers=BROWSER_HEADERS,
-            timeout=12,
-        )
-        if not resp.ok:
-            return []
-        items = resp.json().get("appnews", {}).get("newsitems", [])
-        from datetime import datetime, timezone as _tz
-        for item in items:
-            title = item.get("title", "").strip()
-            ts    = item.get("date")
-            if not title or not ts:
-                continue
-            tl = title.lower()
-            # Only keep items whose title contains an update/DLC keyword
-            if not any(kw in tl for kw in UPDATE_KEYWORDS):
-                continue
-            # Skip if it looks like a sale or community announcement
-            skip_words = ["sale", "discount", "contest", "giveaway", "stream", "tournament", "esport"]
-            if any(sw in tl for sw in skip_words):
-                continue
-            dt  = datetime.fromtimestamp(int(ts), _tz.utc)
-            # Categorise
-            if any(k in tl for k in ["dlc", "expansion", "season pass", "content pack"]):
-                etype = "DLC"
-            elif any(k in tl for k in ["early access", "full release", "launch", "release"]):
-                etype = "Release"
-            else:
-                etype = "Update"
-            # Strip simple HTML tags from contents for clean display
-            import re as _re2
-            raw_contents = item.get("contents", "") or ""
-            clean_contents = _re2.sub(r"<[^>]+>", " ", raw_contents).strip()
-            clean_contents = _re2.sub(r" {2,}", " ", clean_contents)
-            results.append({
-                "ts":       int(ts),
-                "date_str": dt.strftime("%b %d, %Y"),
-                "month":    dt.strftime("%Y-%m"),
-                "title":    title[:80],
-                "type":     etype,
-                "game":     game_name,
-                "app_id":   app_id,
-                "url":      item.get("url", ""),
-                "contents": clean_contents[:1000],
-            })
-    except Exception:
-        pass
-    # Deduplicate by month+type to avoid noise, keep earliest per month
-    seen = {}
-    for ev in sorted(results, key=lambda x: x["ts"]):
-        key = (ev["app_id"], ev["month"], ev["type"])
-        if key not in seen:
-            seen[key] = ev
-    return sorted(seen.values(), key=lambda x: x["ts"])
-
 def chart_sentiment_bar(sdf: pd.DataFrame) -> go.Figure:
     df = sdf.sort_values("positive_pct", ascending=True).tail(15)
     # Colour gradient: red → amber → blue by score
@@ -1341,37 +1182,24 @@ def chart_playtime_hist(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def chart_sentiment_timeline(df: pd.DataFrame, events: list | None = None) -> go.Figure:
-    """Monthly rolling sentiment % over time, one line per game. events = list of event dicts."""
-    from datetime import datetime, UTC
-    _df = df.copy()
-    _df["month"] = pd.to_datetime(_df["timestamp_created"].apply(
-        lambda ts: datetime.fromtimestamp(int(ts), UTC).strftime("%Y-%m")
-        if ts is not None and pd.notna(ts) else None
-    ), errors="coerce")
-    _df = _df.dropna(subset=["month"])
-    if _df.empty:
+def chart_sentiment_timeline(df: pd.DataFrame, events: list | None = None,
+                             monthly: pd.DataFrame | None = None) -> go.Figure:
+    """Monthly rolling sentiment % over time, one line per game. events = list of event dicts.
+    monthly = precomputed FacetView.monthly() for df (computed here if omitted)."""
+    monthly_all = monthly_by_game(df) if monthly is None else monthly
+    if monthly_all.empty:
         return go.Figure()
 
     fig = go.Figure()
     palette = ["#4080ff", "#20c65a", "#ff3d52", "#f0a500", "#a060ff",
                "#00d4ff", "#ff8c00", "#60ff9a", "#ff60a0", "#c0ff40"]
-    games = sorted(_df["game_title"].unique())
-    for i, game in enumerate(games):
-        g = _df[_df["game_title"] == game]
-        monthly = (
-            g.groupby("month")
-            .apply(lambda x: x["voted_up"].mean() * 100, include_groups=False)
-            .reset_index()
-        )
-        monthly.columns = ["month", "pct_pos"]
-        monthly = monthly.sort_values("month")
-        if len(monthly) < 2:
+    for i, (game, game_monthly) in enumerate(monthly_all.groupby("game_title", sort=True)):
+        if len(game_monthly) < 2:
             continue
         colour = palette[i % len(palette)]
         fig.add_trace(go.Scatter(
-            x=monthly["month"].astype(str),
-            y=monthly["pct_pos"],
+            x=game_monthly["month"],
+            y=game_monthly["pct_pos"],
             mode="lines+markers",
             name=game[:22],
             line=dict(color=colour, width=2, shape="spline", smoothing=0.6),
@@ -1431,33 +1259,21 @@ def chart_sentiment_timeline(df: pd.DataFrame, events: list | None = None) -> go
     return fig
 
 
-def chart_review_velocity(df: pd.DataFrame) -> "go.Figure":
+def chart_review_velocity(df: pd.DataFrame, monthly: pd.DataFrame | None = None) -> "go.Figure":
     """Monthly review count per game — shows submission velocity over time."""
-    from datetime import datetime, UTC as _vUTC
-    _df = df.copy()
-    _df["month"] = pd.to_datetime(
-        _df["timestamp_created"].apply(
-            lambda ts: datetime.fromtimestamp(int(ts), _vUTC).strftime("%Y-%m")
-            if ts is not None and pd.notna(ts) else None
-        ), errors="coerce"
-    )
-    _df = _df.dropna(subset=["month"])
-    if _df.empty:
+    monthly_all = monthly_by_game(df) if monthly is None else monthly
+    if monthly_all.empty:
         return go.Figure()
     palette = ["#4080ff", "#20c65a", "#ff3d52", "#f0a500", "#a060ff",
                "#00d4ff", "#ff8c00", "#60ff9a", "#ff60a0", "#c0ff40"]
-    games = sorted(_df["game_title"].unique())
     fig = go.Figure()
-    for i, game in enumerate(games):
-        g = _df[_df["game_title"] == game]
-        monthly = g.groupby("month").size().reset_index(name="count")
-        monthly = monthly.sort_values("month")
-        if len(monthly) < 2:
+    for i, (game, game_monthly) in enumerate(monthly_all.groupby("game_title", sort=True)):
+        if len(game_monthly) < 2:
             continue
         colour = palette[i % len(palette)]
         fig.add_trace(go.Bar(
-            x=monthly["month"].astype(str),
-            y=monthly["count"],
+            x=game_monthly["month"],
+            y=game_monthly["reviews"],
             name=game[:22],
             marker_color=colour,
             opacity=0.8,
@@ -1476,149 +1292,6 @@ def chart_review_velocity(df: pd.DataFrame) -> "go.Figure":
     return fig
 
 
-def fetch_forum_threads(app_id: int, game_name: str, max_threads: int = 100,
-                        login_secure: str = "", session_id: str = "") -> tuple:
-    """Fetch Steam community forum threads using Playwright (headless Chromium).
-    Playwright executes JavaScript so the JS-rendered forum content loads fully.
-    Returns (list[dict], debug_lines)."""
-    import re as _re_f
-    results = []
-    _debug = []
-
-    try:
-        from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
-    except ImportError:
-        _debug.append("playwright not installed. Run: pip install playwright && playwright install chromium")
-        return [], _debug
-
-    with sync_playwright() as pw:
-        try:
-            browser = pw.chromium.launch(
-                headless=True,
-                args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu",
-                      "--disable-blink-features=AutomationControlled"],
-            )
-        except Exception as _le:
-            _debug.append(f"Browser launch failed: {_le}")
-            _debug.append("Run: python3 -m playwright install chromium")
-            return [], _debug
-        ctx_kwargs = {}
-        if login_secure.strip() or session_id.strip():
-            ctx_kwargs["storage_state"] = {
-                "cookies": [
-                    c for c in [
-                        {"name": "steamLoginSecure", "value": login_secure.strip(),
-                         "domain": "steamcommunity.com", "path": "/"}
-                        if login_secure.strip() else None,
-                        {"name": "sessionid", "value": session_id.strip(),
-                         "domain": "steamcommunity.com", "path": "/"}
-                        if session_id.strip() else None,
-                    ] if c
-                ]
-            }
-        context = browser.new_context(
-            **ctx_kwargs,
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 900},
-        )
-        page = context.new_page()
-
-        try:
-            page_num = 0
-            while len(results) < max_threads:
-                url = f"https://steamcommunity.com/app/{app_id}/discussions/0/?fp={page_num * 15}"
-                _debug.append(f"Loading: {url}")
-                try:
-                    page.goto(url, timeout=30000, wait_until="domcontentloaded")
-                except PWTimeout:
-                    _debug.append("Page load timeout")
-                    break
-
-                # Wait for forum topics to appear (JS renders them)
-                try:
-                    page.wait_for_selector("div.forum_topic, div.apphub_Card", timeout=12000)
-                except PWTimeout:
-                    _debug.append("Timed out waiting for forum_topic — checking page state")
-                    title = page.title()
-                    _debug.append(f"Page title: {title!r}")
-                    # Check if we got a login wall
-                    if "Sign In" in title or len(page.query_selector_all("div.forum_topic")) == 0:
-                        _debug.append("No topics found after JS wait. May need login cookies.")
-                    break
-
-                topics = page.query_selector_all("div.forum_topic")
-                _debug.append(f"Page {page_num}: found {len(topics)} topics")
-                if not topics:
-                    break
-
-                for topic in topics:
-                    try:
-                        title_el = (topic.query_selector("div.forum_topic_name a") or
-                                    topic.query_selector("a.forum_topic_overlay"))
-                        if not title_el:
-                            continue
-                        title_text = title_el.inner_text().strip()
-                        link       = title_el.get_attribute("href") or ""
-                        rep_el     = topic.query_selector("div.forum_topic_reply_count")
-                        replies    = int((rep_el.inner_text().strip().replace(",", "") or "0")) if rep_el else 0
-                        auth_el    = (topic.query_selector("a.forum_topic_author") or
-                                      topic.query_selector("div.forum_topic_op a"))
-                        author     = auth_el.inner_text().strip() if auth_el else "Unknown"
-                        ts_el      = topic.query_selector("span[data-timestamp]")
-                        ts_val     = int(ts_el.get_attribute("data-timestamp")) if ts_el else None
-                        ts_str     = ts_el.inner_text().strip() if ts_el else ""
-                        is_pinned  = topic.query_selector("span.forum_topic_pinned") is not None
-                        is_dev     = topic.query_selector("span.forum_topic_developer") is not None
-                        results.append({
-                            "app_id": app_id, "game": game_name,
-                            "title": title_text, "url": link,
-                            "author": author, "reply_count": replies,
-                            "timestamp": ts_val, "date_str": ts_str,
-                            "is_pinned": is_pinned, "is_dev_post": is_dev,
-                            "opening_post": "",
-                        })
-                    except Exception:
-                        continue
-
-                # Check for next page
-                next_btn = page.query_selector("div.forum_paging_next a, .pagebtn:last-child")
-                if not next_btn or len(results) >= max_threads:
-                    break
-                page_num += 1
-                time.sleep(0.5)
-
-        finally:
-            # Second pass: fetch opening posts
-            for thread in results[:max_threads]:
-                if not thread["url"]:
-                    continue
-                try:
-                    page.goto(thread["url"], timeout=20000, wait_until="domcontentloaded")
-                    try:
-                        page.wait_for_selector("div.forum_op, div.forum_comment_text", timeout=8000)
-                    except PWTimeout:
-                        continue
-                    op_el = (page.query_selector("div.forum_op div.forum_comment_text") or
-                             page.query_selector("div.forum_comment_text"))
-                    if op_el:
-                        raw = op_el.inner_text().strip()
-                        raw = _re_f.sub(r"\s{2,}", " ", raw)
-                        thread["opening_post"] = raw[:1500]
-                    time.sleep(0.4)
-                except Exception:
-                    continue
-
-            browser.close()
-
-    _debug.append(f"Total threads collected: {len(results)}")
-    return results[:max_threads], _debug
-
-
-
 # ─────────────────────────────────────────────────────────────
 # SESSION STATE
 # ─────────────────────────────────────────────────────────────
@@ -1628,12 +1301,16 @@ for key, default in [
     ("selected_games",      {}),
     ("results_df",          None),
     ("summary_df",          None),
+    ("results_mem",         None),   # compact_reviews report for results_df
     ("last_genre",          ""),
     ("game_search_results", []),   # candidates from "add a game" lookup
     ("ai_report",           ""),   # last generated report text
     ("ai_chat_history",      []),   # [{role, content}] conversation after report
+    ("ai_chat_memory",       new_chat_memory()),  # rolling summary of older chat turns
+    ("ai_chat_turn",         None),  # chat_context stats for the last reply
     ("ai_struct",             None),  # structured JSON summary from last report
     ("review_lang_all",       False),  # True = all languages, False = english only
+    ("use_review_store",      True),   # reuse reviews saved in data/review_store.sqlite
     ("ea_filter",             "All"),  # "All" | "EA Only" | "Post-EA Only"
     ("alert_threshold",       10.0),   # pp drop threshold for trend alerts
 
@@ -1745,6 +1422,10 @@ with c4:
     st.markdown('<div class="field-label">Language</div>', unsafe_allow_html=True)
     lang_all = st.toggle("All languages", value=st.session_state.review_lang_all, key="lang_toggle")
     st.session_state.review_lang_all = lang_all
+    st.session_state.use_review_store = st.toggle(
+        "Local review store", value=st.session_state.use_review_store, key="store_toggle",
+        help="Only download reviews newer than those already saved on disk from earlier fetches.",
+    )
 btn_col, _ = st.columns([1, 5])
 with btn_col:
     search_clicked = st.button("SEARCH GENRE", width='stretch')
@@ -1902,56 +1583,57 @@ if st.session_state.found_games:
             status_box  = st.empty()
             game_bar    = st.progress(0.0)
 
-            for idx, game in enumerate(selected_list):
-                title, app_id = game["name"], game["app_id"]
+            _counter_html = (
+                '<div style="font-size:.82rem;font-family:Inter Tight,sans-serif;'
+                'font-weight:800;color:var(--blue);text-align:right;padding-top:.3rem;">'
+                '{n:,}<span style="font-size:.65rem;font-weight:400;color:var(--muted);">'
+                ' reviews</span></div>'
+            )
+            _names = {g["app_id"]: g["name"] for g in selected_list}
+
+            def _on_tick(progress, done, errors):
+                # Runs on the script thread between waits — safe for st.* updates
+                _active = [a for a, p in progress.items() if a not in done]
+                overall_bar.progress(sum(progress.values()) / len(progress))
+                game_bar.progress(min(progress[a] for a in _active) if _active else 1.0)
+                live_counter.markdown(
+                    _counter_html.format(n=sum(int(p * reviews_per) for p in progress.values())),
+                    unsafe_allow_html=True,
+                )
+                _label = " · ".join(f"{_names[a]} {progress[a]:.0%}" for a in _active[:4])
+                if len(_active) > 4:
+                    _label += f" +{len(_active) - 4}"
                 status_box.markdown(
                     f'<div style="font-size:0.83rem;color:var(--muted);padding:0.25rem 0;">'
-                    f'↳ Fetching <strong style="color:var(--text);">{title}</strong>'
-                    f'&nbsp;<span style="color:var(--muted);">{idx+1}/{len(selected_list)}</span>'
+                    f'↳ Fetching <strong style="color:var(--text);">{_label}</strong>'
+                    f'&nbsp;<span style="color:var(--muted);">{len(done)}/{len(selected_list)}</span>'
                     f'</div>',
                     unsafe_allow_html=True,
                 )
-                game_bar.progress(0.0)
-                _reviews_before = len(all_reviews)
-
-                def _cb(pct, bar=game_bar, counter=live_counter,
-                        total_so_far=all_reviews, target=reviews_per, gidx=idx):
-                    bar.progress(float(pct))
-                    _est = _reviews_before + int(pct * target)
-                    counter.markdown(
-                        f'<div style="font-size:.82rem;font-family:Inter Tight,sans-serif;'
-                        f'font-weight:800;color:var(--blue);text-align:right;padding-top:.3rem;">'
-                        f'{len(total_so_far) + int(pct * target):,}'
-                        f'<span style="font-size:.65rem;font-weight:400;color:var(--muted);">'
-                        f' reviews</span></div>',
-                        unsafe_allow_html=True,
-                    )
 
-                _lang = "all" if st.session_state.review_lang_all else "english"
-                try:
-                    reviews = fetch_reviews_for_game(app_id, title, reviews_per, _cb, language=_lang)
-                except Exception as _fe:
-                    st.warning(f"Failed to fetch {title}: {_fe} — continuing with other games.")
-                    reviews = []
-                all_reviews.extend(reviews)
-                overall_bar.progress((idx + 1) / len(selected_list))
-                live_counter.markdown(
-                    f'<div style="font-size:.82rem;font-family:Inter Tight,sans-serif;'
-                    f'font-weight:800;color:var(--blue);text-align:right;padding-top:.3rem;">'
-                    f'{len(all_reviews):,}'
-                    f'<span style="font-size:.65rem;font-weight:400;color:var(--muted);"> reviews</span></div>',
-                    unsafe_allow_html=True,
-                )
+            _lang = "all" if st.session_state.review_lang_all else "english"
+            _fetch_stats = {}
+            _by_game, _fetch_errors = fetch_reviews_concurrent(
+                selected_list, reviews_per, language=_lang, on_tick=_on_tick,
+                use_store=st.session_state.use_review_store, stats=_fetch_stats,
+            )
+            for game in selected_list:
+                if game["app_id"] in _fetch_errors:
+                    st.warning(f"Failed to fetch {game['name']}: {_fetch_errors[game['app_id']]} — continuing with other games.")
+                all_reviews.extend(_by_game.get(game["app_id"], []))
+            overall_bar.progress(1.0)
+            live_counter.markdown(_counter_html.format(n=len(all_reviews)), unsafe_allow_html=True)
 
             status_box.markdown(
                 f'<div style="font-size:0.83rem;color:#20c65a;padding:0.25rem 0;">'
-                f'Fetched <strong>{len(all_reviews):,}</strong> reviews across {len(selected_list)} games</div>',
+                f'Fetched <strong>{len(all_reviews):,}</strong> reviews across {len(selected_list)} games'
+                f'<span style="color:var(--muted);"> · {sum(v.get("new", 0) for v in _fetch_stats.values()):,} new from Steam'
+                f' · {sum(v.get("from_store", 0) for v in _fetch_stats.values()):,} from local store</span></div>',
                 unsafe_allow_html=True,
             )
             game_bar.empty()
 
             if all_reviews:
-                import io as _io2
                 _rdf = pd.DataFrame(all_reviews)
                 # Deduplicate on recommendation_id (same reviewer re-fetched)
                 if "recommendation_id" in _rdf.columns:
@@ -1965,17 +1647,18 @@ if st.session_state.found_games:
                         )
                 _rdf = _normalise_timestamps(_rdf)
                 if VADER_AVAILABLE:
-                    _rdf = pd.read_json(
-                        _io2.StringIO(run_vader_on_df(_rdf.to_json(orient="records"))),
-                        orient="records",
-                    )
-                    _rdf = _normalise_timestamps(_rdf)
-                st.session_state.results_df = _rdf
+                    _rdf["vader_compound"] = score_reviews_vader(_rdf)
+                # Compact columnar dtypes — this frame lives in every user's session
+                _mem_report = {}
+                _rdf = compact_reviews(_rdf, report=_mem_report)
+                st.session_state.results_mem = _mem_report
+                st.session_state.results_df  = _rdf
                 st.session_state.summary_df = build_summary(st.session_state.results_df)
-                # Auto-fetch Steam News events for all selected games
+                # Auto-fetch Steam News events for all selected games (in parallel)
+                prefetch_news(_g["app_id"] for _g in selected_list)
                 _all_events = {}
                 for _g in selected_list:
-                    _evs = fetch_game_events(_g["app_id"], _g["name"])
+                    _evs = game_events(_g["app_id"], _g["name"])
                     if _evs:
                         _all_events[_g["app_id"]] = _evs
                 st.session_state.game_events = _all_events
@@ -1987,10 +1670,20 @@ if st.session_state.found_games:
 # RESULTS DASHBOARD
 # ─────────────────────────────────────────────────────────────
 
+# Word clouds still rendering when their slot is drawn; filled in after the footer
+_wc_pending: list = []
+
 if st.session_state.results_df is not None and st.session_state.summary_df is not None:
     df  = st.session_state.results_df
     sdf = st.session_state.summary_df
 
+    # Facet index — built once per dataset; filters below only narrow a mask
+    _facets = st.session_state.get("_review_facets")
+    if _facets is None or _facets.df is not st.session_state.results_df:
+        _facets = ReviewFacets(st.session_state.results_df)
+        st.session_state._review_facets = _facets
+    _ea_sel, _pt_lo, _pt_hi, _ts_lo, _ts_hi = "All", None, None, None, None
+
     # ── Playtime filter ───────────────────────────────────────
     _max_hrs = int(df["author_playtime_hrs"].max()) if len(df) else 1000
     _max_hrs = max(_max_hrs, 1)
@@ -2010,13 +1703,8 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                 label_visibility="collapsed",
             )
             st.session_state.ea_filter = ea_choice
-            if ea_choice == "EA Only":
-                df = df[df["written_during_ea"] == True].copy()
-                sdf = build_summary(df) if len(df) else sdf
-            elif ea_choice == "Post-EA Only":
-                df = df[df["written_during_ea"] == False].copy()
-                sdf = build_summary(df) if len(df) else sdf
-            _ea_n = len(df)
+            _ea_sel = ea_choice
+            _ea_n = int(_facets.mask(_ea_sel).sum())
             st.caption(f"{_ea_n:,} reviews match this filter.")
 
     with st.expander("Filter by playtime at review", expanded=False):
@@ -2042,15 +1730,12 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                 min_value=0, max_value=999999,
                 value=_cap, step=1, key="playtime_max",
             )
-        n_before = len(df)
+        n_before = int(_facets.mask(_ea_sel).sum())
         if pt_low > pt_high:
             st.warning("Min hours must be less than or equal to max hours.")
         else:
-            df = df[
-                (df["author_playtime_hrs"] >= pt_low) &
-                (df["author_playtime_hrs"] <= pt_high)
-            ].copy()
-            n_after = len(df)
+            _pt_lo, _pt_hi = pt_low, pt_high
+            n_after = int(_facets.mask(_ea_sel, _pt_lo, _pt_hi).sum())
             if pt_low != 0 or pt_high != _cap:
                 st.markdown(
                     f'<div style="font-size:.75rem;color:var(--blue);margin-top:.4rem;">'
@@ -2058,13 +1743,12 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     f' &nbsp;·&nbsp; {pt_low}–{pt_high} hrs at review</div>',
                     unsafe_allow_html=True,
                 )
-                sdf = build_summary(df) if len(df) else sdf
 
     # ── Date range filter ─────────────────────────────────────
     from datetime import datetime, timedelta, timezone, date as _date
 
     # Compute the actual min/max dates present in the data
-    _ts_col = df["timestamp_created"].dropna()
+    _ts_col = pd.Series(_facets.ts[_facets.mask(_ea_sel, _pt_lo, _pt_hi)]).dropna()
     if len(_ts_col):
         _ts_min = int(_ts_col.min())
         _ts_max = int(_ts_col.max())
@@ -2183,7 +1867,7 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
             st.session_state.date_from != _data_start or
             st.session_state.date_to   != _data_end
         )
-        _df_before = len(df)
+        _df_before = int(_facets.mask(_ea_sel, _pt_lo, _pt_hi).sum())
         if _di_from > _di_to:
             st.warning("'From' date must be on or before 'To' date.")
         else:
@@ -2191,11 +1875,8 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                                             tzinfo=timezone.utc).timestamp())
             _ts_to   = int(datetime.combine(_di_to,   datetime.max.time(),
                                             tzinfo=timezone.utc).timestamp())
-            df = df[
-                (df["timestamp_created"] >= _ts_from) &
-                (df["timestamp_created"] <= _ts_to)
-            ].copy()
-            _df_after = len(df)
+            _ts_lo, _ts_hi = _ts_from, _ts_to
+            _df_after = int(_facets.mask(_ea_sel, _pt_lo, _pt_hi, _ts_lo, _ts_hi).sum())
             if _dt_active:
                 _label_from = _di_from.strftime("%b %d, %Y")
                 _label_to   = _di_to.strftime("%b %d, %Y")
@@ -2205,8 +1886,12 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     f' &nbsp;·&nbsp; {_label_from} → {_label_to}</div>',
                     unsafe_allow_html=True,
                 )
-                if len(df):
-                    sdf = build_summary(df)
+
+    # One cached view per filter combination — tabs below read its aggregates
+    _view = _facets.view(_ea_sel, _pt_lo, _pt_hi, _ts_lo, _ts_hi)
+    df    = _view.df
+    if len(df) and len(df) != len(st.session_state.results_df):
+        sdf = _view.summary()
 
     # ── KPI strip ──
     total_reviews = len(df)
@@ -2299,6 +1984,29 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
 </div>
 """, unsafe_allow_html=True)
 
+    # ── Session memory report ──
+    _mem = st.session_state.results_mem
+    if _mem and _mem.get("after"):
+        with st.expander(
+            f"Session memory — {_mem['after'] / 1_048_576:.1f} MB for "
+            f"{len(st.session_state.results_df):,} reviews "
+            f"({_mem['before'] / _mem['after']:.1f}× smaller than the raw frame)",
+            expanded=False,
+        ):
+            st.dataframe(
+                pd.DataFrame(
+                    [(c, b / 1024, a / 1024, str(st.session_state.results_df[c].dtype))
+                     for c, (b, a) in _mem["columns"].items()],
+                    columns=["Column", "Raw (KB)", "Compact (KB)", "Dtype"],
+                ).sort_values("Raw (KB)", ascending=False),
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "Raw (KB)":     st.column_config.NumberColumn(format="%.0f"),
+                    "Compact (KB)": st.column_config.NumberColumn(format="%.0f"),
+                },
+            )
+
     # ── Tabs ──
     tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["SENTIMENT", "ENGAGEMENT", "GAME TABLE", "REVIEWS", "KEYWORD INSIGHTS", "AI ANALYSIS", "FORUMS"])
 
@@ -2371,7 +2079,7 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                 _split_date = _ev["date_str"]
 
                 # Apply game filter to the data if set
-                _df_split = df[df["game_title"] == _game_filter].copy() if _game_filter != "All games" else df.copy()
+                _df_split = _view.frame(game=_game_filter) if _game_filter != "All games" else df
 
                 _before = _df_split[_df_split["timestamp_created"] <  _split_ts].copy()
                 _after  = _df_split[_df_split["timestamp_created"] >= _split_ts].copy()
@@ -2586,7 +2294,10 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                         )
 
                 # Timeline with all events marked
-                _tl2 = chart_sentiment_timeline(_df_split, events=_all_ev_flat)
+                _tl2 = chart_sentiment_timeline(
+                    _df_split, events=_all_ev_flat,
+                    monthly=(_view.subset(_game_filter) if _game_filter != "All games" else _view).monthly(),
+                )
                 if _tl2.data:
                     st.markdown(
                         '<div style="margin-top:1rem;font-size:.62rem;font-weight:700;'
@@ -2605,7 +2316,7 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
             unsafe_allow_html=True,
         )
         st.caption("Monthly review submissions per game — spikes often signal launches, updates, or controversy")
-        _vel = chart_review_velocity(df)
+        _vel = chart_review_velocity(df, monthly=_view.monthly())
         if _vel.data:
             st.plotly_chart(_vel, config={"displayModeBar": False})
         else:
@@ -2630,39 +2341,35 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
             unsafe_allow_html=True,
         )
         st.caption("Monthly % positive reviews — shows how reception has shifted over time")
-        _tl = chart_sentiment_timeline(df)
+        _tl = chart_sentiment_timeline(df, monthly=_view.monthly())
         if _tl.data:
             st.plotly_chart(_tl, config={"displayModeBar": False})
         else:
             st.info("Not enough timestamped reviews to plot a timeline.")
 
         # ── Trend alerts ─────────────────────────────────────
-        from datetime import datetime, UTC as _alertUTC
-        _df_ts2 = df.copy()
-        _df_ts2["month"] = pd.to_datetime(
-            _df_ts2["timestamp_created"].apply(
-                lambda ts: datetime.fromtimestamp(int(ts), _alertUTC).strftime("%Y-%m")
-                if ts is not None and pd.notna(ts) else None
-            ), errors="coerce"
-        )
-        _df_ts2 = _df_ts2.dropna(subset=["month"])
+        # Windows are whole months, read from the per-game monthly aggregates
+        _monthly = _view.monthly()
         _alerts = []
-        if len(_df_ts2):
-            _cutoff_90 = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=90)
-            _cutoff_30 = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=30)
-            for _gname in _df_ts2["game_title"].unique():
-                _g = _df_ts2[_df_ts2["game_title"] == _gname]
-                _lifetime_pct = _g["voted_up"].mean() * 100
-                _recent_90 = _g[_g["month"] >= _cutoff_90.strftime("%Y-%m")]
-                _recent_30 = _g[_g["month"] >= _cutoff_30.strftime("%Y-%m")]
-                for _window_label, _window_df in [("last 90 days", _recent_90), ("last 30 days", _recent_30)]:
-                    if len(_window_df) >= 5:
-                        _window_pct = _window_df["voted_up"].mean() * 100
+        if len(_monthly):
+            _now = pd.Timestamp.now(tz="UTC")
+            _cut = {
+                "last 90 days": (_now - pd.Timedelta(days=90)),
+                "last 30 days": (_now - pd.Timedelta(days=30)),
+            }
+            _cut = {k: v.year * 12 + v.month - 1 for k, v in _cut.items()}
+            for _gname, _g in _monthly.groupby("game_title", sort=True):
+                _lifetime_pct = _g["positive"].sum() / _g["reviews"].sum() * 100
+                for _window_label, _cut_key in _cut.items():
+                    _w = _g[_g["month_key"] >= _cut_key]
+                    _wn = int(_w["reviews"].sum())
+                    if _wn >= 5:
+                        _window_pct = _w["positive"].sum() / _wn * 100
                         _drop = _lifetime_pct - _window_pct
                         if _drop >= st.session_state.get("alert_threshold", 10.0):
-                            _alerts.append((_gname, _window_label, _lifetime_pct, _window_pct, _drop, len(_window_df)))
+                            _alerts.append((_gname, _window_label, _lifetime_pct, _window_pct, _drop, _wn))
                         elif (_window_pct - _lifetime_pct) >= st.session_state.get("alert_threshold", 10.0):
-                            _alerts.append((_gname, _window_label, _lifetime_pct, _window_pct, _window_pct - _lifetime_pct, len(_window_df), "rise"))
+                            _alerts.append((_gname, _window_label, _lifetime_pct, _window_pct, _window_pct - _lifetime_pct, _wn, "rise"))
 
         if _alerts:
             st.markdown(
@@ -2725,28 +2432,13 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
             unsafe_allow_html=True,
         )
         # Build sparkline data: monthly sentiment % per game as a list
-        from datetime import datetime, UTC as _UTC
-        _df_ts = df.copy()
-        _df_ts["month"] = pd.to_datetime(_df_ts["timestamp_created"].apply(
-            lambda ts: datetime.fromtimestamp(int(ts), _UTC).strftime("%Y-%m")
-            if ts is not None and pd.notna(ts) else None
-        ), errors="coerce")
-
-        def _sparkline(game):
-            g = _df_ts[_df_ts["game_title"] == game].dropna(subset=["month"])
-            if len(g) < 3:
-                return []
-            monthly = (
-                g.groupby("month")
-                .apply(lambda x: round(x["voted_up"].mean() * 100, 1), include_groups=False)
-                .reset_index()
-            )
-            monthly.columns = ["month", "pct"]
-            monthly = monthly.sort_values("month")
-            return monthly["pct"].tolist()
+        _sparks = {
+            g: (m["pct_pos"].round(1).tolist() if m["reviews"].sum() >= 3 else [])
+            for g, m in _view.monthly().groupby("game_title", sort=True)
+        }
 
         display = sdf.copy()
-        display["Trend"] = display["game_title"].apply(_sparkline)
+        display["Trend"] = display["game_title"].map(lambda g: _sparks.get(g, []))
         display = display.rename(columns={
             "game_title":          "Game",
             "total_reviews":       "Reviews",
@@ -3126,29 +2818,15 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                                 st.session_state[f"{key_prefix}_sentiment"] = sentiment
                         st.markdown('</div>', unsafe_allow_html=True)
 
-        def render_matching_reviews(term, sentiment, df_source, game_filter=None):
-            """Show reviews from df_source that contain term (case-insensitive)."""
+        def render_matching_reviews(term, sentiment, view_, game_filter=None):
+            """Show the most helpful reviews in view_ that mention term (indexed word/phrase match)."""
             is_pos   = sentiment == "pos"
-            voted    = True if is_pos else False
             colour   = "#20c65a" if is_pos else "#ff3d52"
             icon     = "+" if is_pos else "-"
 
-            pool = df_source[df_source["voted_up"] == voted].copy()
-            if game_filter:
-                pool = pool[pool["game_title"] == game_filter]
-
-            # Case-insensitive substring match
-            mask    = pool["review_text"].str.contains(re.escape(term), case=False, na=False)
-            matches = pool[mask].copy()
-
-            # Sort: most helpful first, then longest
-            matches = matches.sort_values(
-                ["votes_helpful", "review_text"],
-                ascending=[False, False],
-                key=lambda s: s if s.name == "votes_helpful" else s.str.len()
-            ).head(10)
-
-            n = len(pool[mask])
+            # Most helpful first, then longest — ranked inside the search index
+            n, matches = view_.search(term, 10, game=game_filter, voted_up=is_pos)
+            _hl_re     = highlight_pattern(term)
             border_hex = colour
             st.markdown(
                 f'<div style="background:var(--surface);border:1px solid var(--border);'
@@ -3173,12 +2851,10 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                 text = row["review_text"]
                 # Bold every occurrence of the keyword
                 _snip = text[:500] + ("…" if len(text) > 500 else "")
-                highlighted = re.sub(
-                    re.escape(term),
+                highlighted = _hl_re.sub(
                     lambda m: '<strong style="color:' + colour + ';font-weight:700;">' + m.group(0) + '</strong>',
                     _snip,
-                    flags=re.IGNORECASE,
-                )
+                ) if _hl_re else _snip
                 steamid   = str(row.get("author_steamid", "") or "")
                 rec_id    = str(row.get("recommendation_id", "") or "")
                 app_id_r  = int(row.get("app_id", 0) or 0)
@@ -3241,11 +2917,12 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
             st.session_state.kw_selected_term      = None
             st.session_state.kw_selected_sentiment = None
 
-        ki_df   = df if ki_game == "All Games" else df[df["game_title"] == ki_game]
-        pos_df  = ki_df[ki_df["voted_up"] == True]
-        neg_df  = ki_df[ki_df["voted_up"] == False]
-        top_pos = extract_keywords(pos_df["review_text"].fillna("").tolist(), top_n=60)
-        top_neg = extract_keywords(neg_df["review_text"].fillna("").tolist(), top_n=60)
+        _ki_g   = None if ki_game == "All Games" else ki_game
+        ki_df   = _view.frame(game=_ki_g)
+        pos_df  = _view.frame(game=_ki_g, voted_up=True)
+        neg_df  = _view.frame(game=_ki_g, voted_up=False)
+        top_pos = _view.keywords(extract_keywords, 60, game=_ki_g, voted_up=True)
+        top_neg = _view.keywords(extract_keywords, 60, game=_ki_g, voted_up=False)
 
         # Keyword CSV export
         _kw_df = pd.DataFrame({
@@ -3291,11 +2968,7 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     unsafe_allow_html=True,
                 )
                 if top_pos:
-                    img_pos = generate_wordcloud_img(
-                        _json.dumps({w: c for w, c in top_pos[:60]}), positive=True
-                    )
-                    if img_pos:
-                        st.image(img_pos, width="stretch", output_format="PNG")
+                    show_wordcloud(st.empty(), dict(top_pos[:60]), positive=True)
                 else:
                     st.info("No positive reviews.")
             with wc_r:
@@ -3305,15 +2978,11 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     unsafe_allow_html=True,
                 )
                 if top_neg:
-                    img_neg = generate_wordcloud_img(
-                        _json.dumps({w: c for w, c in top_neg[:60]}), positive=False
-                    )
-                    if img_neg:
-                        st.image(img_neg, width="stretch", output_format="PNG")
+                    show_wordcloud(st.empty(), dict(top_neg[:60]), positive=False)
                 else:
                     st.info("No negative reviews.")
         elif not WORDCLOUD_AVAILABLE:
-            st.info("`pip install wordcloud matplotlib` to enable word clouds.")
+            st.info("`pip install wordcloud` to enable word clouds.")
         else:
             st.info("No review text found for the selected filter.")
 
@@ -3353,7 +3022,7 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
             render_matching_reviews(
                 st.session_state.kw_selected_term,
                 st.session_state.kw_selected_sentiment,
-                ki_df,
+                _view,
                 game_filter=ki_game if ki_game != "All Games" else None,
             )
 
@@ -3439,7 +3108,7 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     key="ai_report_tone",
                 )
 
-            model_col, gen_col, test_col = st.columns([1.5, 1.5, 1])
+            model_col, gen_col, regen_col, test_col = st.columns([1.5, 1.5, 1, 1])
             with model_col:
                 ai_model = st.selectbox(
                     "Model",
@@ -3453,6 +3122,13 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     "GENERATE REPORT",
                     width='stretch',
                 )
+            with regen_col:
+                st.markdown("<br>", unsafe_allow_html=True)
+                regenerate_clicked = st.button(
+                    "Regenerate",
+                    width='stretch',
+                    help="Ask Claude again instead of reusing the cached report for these exact settings",
+                )
             with test_col:
                 st.markdown("<br>", unsafe_allow_html=True)
                 test_clicked = st.button(
@@ -3460,6 +3136,15 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     width='stretch',
                 )
 
+            ai_map_reduce = st.toggle(
+                "Summarise every game first (map-reduce)",
+                value=len(df) >= MAP_REDUCE_MIN_REVIEWS,
+                key="ai_map_reduce",
+                help="Notes on each game are written from its own reviews with a fast model "
+                     "(cached, so unchanged games are reused), then combined into the report. "
+                     "Slower the first time; covers far more of the data than the sampled brief.",
+            )
+
             if test_clicked:
                 import httpx as _httpx
                 with st.spinner("Testing…"):
@@ -3471,278 +3156,93 @@ if st.session_state.results_df is not None and st.session_state.summary_df is no
                     except Exception as e:
                         st.error(f"{type(e).__name__}: {e}")
 
-            # ── Prompt builder ─────────────────────────────────
-            def build_analysis_prompt(df_, sdf_, focus, tone) -> str:
-                genre_label = st.session_state.get("last_genre", "unknown genre")
-                n_games     = sdf_["game_title"].nunique()
-                n_reviews   = len(df_)
-                avg_pos     = sdf_["positive_pct"].mean()
-
-                # ── Per-game deep stats ───────────────────────
-                game_blocks = []
-                for _, row in sdf_.sort_values("positive_pct", ascending=False).iterrows():
-                    g       = row["game_title"]
-                    g_df    = df_[df_["game_title"] == g]
-                    g_pos   = g_df[g_df["voted_up"] == True]
-                    g_neg   = g_df[g_df["voted_up"] == False]
-
-                    # playtime distribution
-                    pt      = g_df["author_playtime_hrs"]
-                    pt_med  = pt.median()
-                    pt_p90  = pt.quantile(0.90)
-
-                    # VADER compound for this game (computed inline)
-                    vader_str = ""
-                    if VADER_AVAILABLE and "vader_compound" in df_.columns:
-                        gv = df_[df_["game_title"] == g]["vader_compound"].mean()
-                        if not pd.isna(gv):
-                            vader_str = f", VADER compound {gv:+.3f}"
-
-                    # top 8 keywords per sentiment for this game
-                    pos_kw = extract_keywords(g_pos["review_text"].fillna("").tolist(), 8)
-                    neg_kw = extract_keywords(g_neg["review_text"].fillna("").tolist(), 8)
-                    pos_kw_str = ", ".join(f"{w}({c})" for w, c in pos_kw) or "—"
-                    neg_kw_str = ", ".join(f"{w}({c})" for w, c in neg_kw) or "—"
-
-                    block = (
-                        f"### {g}\n"
-                        f"- Sentiment: {row['positive_pct']}% positive "
-                        f"({row['positive_reviews']} pos / {row['negative_reviews']} neg, "
-                        f"{n_reviews and round(len(g_df)/n_reviews*100)}% of dataset){vader_str}\n"
-                        f"- Playtime at review: avg {row['avg_playtime_hrs']}h, "
-                        f"median {pt_med:.1f}h, 90th‑pct {pt_p90:.0f}h\n"
-                        f"- Top positive keywords: {pos_kw_str}\n"
-                        f"- Top negative keywords: {neg_kw_str}"
-                    )
-                    game_blocks.append(block)
-
-                # ── Overall keyword frequencies (with counts) ─
-                pos_texts   = df_[df_["voted_up"] == True]["review_text"].fillna("").tolist()
-                neg_texts   = df_[df_["voted_up"] == False]["review_text"].fillna("").tolist()
-                pos_kw_all  = extract_keywords(pos_texts, 30)
-                neg_kw_all  = extract_keywords(neg_texts, 30)
-                pos_kw_str  = ", ".join(f"{w}({c})" for w, c in pos_kw_all)
-                neg_kw_str  = ", ".join(f"{w}({c})" for w, c in neg_kw_all)
-
-                # Keywords that appear only in positive OR only in negative (differentiators)
-                pos_words = {w for w, _ in pos_kw_all}
-                neg_words = {w for w, _ in neg_kw_all}
-                only_pos  = ", ".join(w for w, _ in pos_kw_all if w not in neg_words) or "—"
-                only_neg  = ", ".join(w for w, _ in neg_kw_all if w not in pos_words) or "—"
-
-                # ── Rich review samples ───────────────────────
-                def sample_reviews(pool_df, voted, n=10):
-                    sub = pool_df[pool_df["voted_up"] == voted].copy()
-                    sub = sub[sub["review_text"].str.len() > 80]
-                    # Mix: half most-helpful, half longest (catches detailed but less-voted reviews)
-                    top_helpful = sub.nlargest(n // 2, "votes_helpful")
-                    top_long    = sub.iloc[sub["review_text"].str.len().argsort()[::-1].values[: n // 2]]
-                    combined    = pd.concat([top_helpful, top_long]).drop_duplicates()
-                    lines = []
-                    for _, r in combined.iterrows():
-                        # Include full review up to 500 chars
-                        snippet = r["review_text"][:500].replace("\n", " ").strip()
-                        hrs     = r.get("author_playtime_hrs", 0)
-                        helpful = r.get("votes_helpful", 0)
-                        meta    = f"{hrs:.0f}h playtime"
-                        if helpful > 0:
-                            meta += f", {helpful} found helpful"
-                        lines.append(f'  [{r["game_title"]}] ({meta})\n  "{snippet}"')
-                    return "\n\n".join(lines) if lines else "  (none)"
-
-                # ── Playtime insight ──────────────────────────
-                overall_pt = df_["author_playtime_hrs"]
-                pt_insight = (
-                    f"Overall playtime at review: avg {overall_pt.mean():.1f}h, "
-                    f"median {overall_pt.median():.1f}h. "
-                    f"Reviewers with <2h: {(overall_pt < 2).sum():,} "
-                    f"({(overall_pt < 2).mean()*100:.0f}%), "
-                    f"10h+: {(overall_pt >= 10).sum():,} "
-                    f"({(overall_pt >= 10).mean()*100:.0f}%), "
-                    f"100h+: {(overall_pt >= 100).sum():,} "
-                    f"({(overall_pt >= 100).mean()*100:.0f}%)."
-                )
-
-                # ── Sentiment polarity spread ─────────────────
-                pos_pcts = sdf_["positive_pct"].tolist()
-                spread   = max(pos_pcts) - min(pos_pcts) if len(pos_pcts) > 1 else 0
-                best     = sdf_.iloc[0]["game_title"]
-                worst    = sdf_.iloc[-1]["game_title"] if len(sdf_) > 1 else best
-
-                focus_map = {
-                    "Full overview — all games, all themes": """
-Provide a comprehensive analysis covering:
-1. Genre-level sentiment summary and what it signals about player satisfaction
-2. Rankings and comparisons across all games with concrete reasoning
-3. The 3-5 most important themes emerging from positive reviews — what players love and why
-4. The 3-5 most important themes emerging from negative reviews — recurring pain points and what they signal
-5. Playtime patterns and what they reveal about player engagement and review timing bias
-6. Differentiating keywords (words that only appear on one side) and what they reveal
-7. Specific actionable insights: what should a developer or publisher take away from this data?
-Be specific. Name games. Quote or closely paraphrase actual review language. Avoid vague statements.""",
-
-                    "Sentiment deep-dive — what drives positive vs negative": """
-Analyse the specific drivers of positive and negative sentiment:
-1. Identify the top 4-5 factors that correlate with positive reviews — go beyond keywords to infer underlying causes
-2. Identify the top 4-5 factors that correlate with negative reviews — be specific about what players are reacting to
-3. Compare the emotional language in positive vs negative reviews — tone, intensity, specificity
-4. Look at playtime distribution for positive vs negative reviewers — does engagement time predict sentiment?
-5. Are there keywords that appear in BOTH positive and negative reviews? What does that ambivalence signal?
-6. Which games best exemplify each driver? Quote specific review language.
-Be analytical. Avoid surface-level observations like "players liked the gameplay." Explain WHY.""",
-
-                    "Competitive comparison — how games stack up against each other": """
-Compare all games head-to-head:
-1. Create a ranked leaderboard with specific reasoning for each position
-2. For the top 2 games: what are they doing right that others aren't?
-3. For the bottom 2 games: what specific issues are dragging their scores down?
-4. Are there surprising patterns — games with high playtime but low sentiment, or vice versa?
-5. Compare keyword profiles between games — what does each game's unique vocabulary reveal?
-6. What does the spread between best and worst ({spread:.0f} percentage points) suggest about genre consistency?
-Quote reviews. Name games. Be direct about which games have problems and why.""",
-
-                    "Player pain points — what's most criticised and why": """
-Deep-dive into negative sentiment:
-1. Identify and group all major pain points into 4-6 distinct themes
-2. For each theme: how prevalent is it (approximate % of negative reviews), which games are most affected, and quote specific review language
-3. Distinguish between fixable issues (bugs, balance, pricing) vs fundamental design problems
-4. Look at playtime of negative reviewers — are complaints coming from casual or invested players?
-5. Are any pain points unique to specific games, or are they genre-wide problems?
-6. What do the negative differentiator keywords reveal that the positive reviews obscure?
-7. Prioritise: if a developer read this, what are the top 3 things to fix first?
-Be specific and direct. Avoid vague summaries.""",
-
-                    "Player praise — what's most celebrated and why": """
-Deep-dive into positive sentiment:
-1. Identify and group all major praise themes into 4-6 distinct categories
-2. For each theme: how prevalent is it, which games exemplify it best, quote specific review language
-3. What aspects of these games are generating genuine enthusiasm vs mild satisfaction?
-4. Do high-playtime reviewers praise different things than low-playtime reviewers?
-5. What do the positive differentiator keywords reveal about what this genre's audience uniquely values?
-6. Which specific design or business decisions (pricing, updates, community, content) are being praised?
-7. What does this praise data suggest about unmet needs in the genre that other games could capitalise on?
-Be specific. Quote reviews. Identify what makes top performers genuinely stand out.""",
-                }
-
-                tone_map = {
-                    "Analytical & objective":
-                        "Write in a precise, analytical tone. Use data to support every claim. Avoid hedging language like 'may' or 'seems' — if the data shows it, state it confidently.",
-                    "Executive summary (brief)":
-                        "Write as a tight executive briefing. Use headers and bullets. Lead with the single most important finding. Total length: 350-500 words. Every sentence must earn its place.",
-                    "Consumer research style":
-                        "Write in a formal consumer research report style with numbered sections, clear headings, and a findings + implications structure for each major point.",
-                }
-
-                return f"""You are a senior games market analyst with deep expertise in player psychology and game design critique. You have been given Steam review data collected via the public Steam API.
-
-Your task is to produce a genuinely insightful analysis — not a surface-level summary. Dig into the data. Find patterns. Make arguments. Quote reviews. Be specific about which games have which issues. A good analyst doesn't just describe the data; they interpret it.
-
-═══════════════════════════════════════
-DATASET OVERVIEW
-═══════════════════════════════════════
-Genre / search: {genre_label}
-Total reviews: {n_reviews:,} across {n_games} games
-Average positive sentiment: {avg_pos:.1f}%
-Sentiment spread: {spread:.0f}pp (best: {best}, worst: {worst})
-{pt_insight}
-
-═══════════════════════════════════════
-PER-GAME DATA (sorted best → worst)
-═══════════════════════════════════════
-{"".join(chr(10)*2 + b for b in game_blocks)}
-
-═══════════════════════════════════════
-CROSS-GAME KEYWORD FREQUENCIES
-═══════════════════════════════════════
-Positive reviews — top 30 terms (with mention counts):
-{pos_kw_str}
-
-Negative reviews — top 30 terms (with mention counts):
-{neg_kw_str}
-
-Differentiator keywords (positive only, not in top-30 negative): {only_pos}
-Differentiator keywords (negative only, not in top-30 positive): {only_neg}
-
-═══════════════════════════════════════
-REVIEW SAMPLES — POSITIVE (most helpful + most detailed)
-═══════════════════════════════════════
-{sample_reviews(df_, True, 10)}
-
-═══════════════════════════════════════
-REVIEW SAMPLES — NEGATIVE (most helpful + most detailed)
-═══════════════════════════════════════
-{sample_reviews(df_, False, 10)}
-
-═══════════════════════════════════════
-YOUR TASK
-═══════════════════════════════════════
-{focus_map[focus]}
-
-OUTPUT TONE: {tone_map[tone]}
-
-HARD RULES:
-- Every claim must reference specific data from this brief (game names, keywords, review quotes, numbers)
-- Do not write generic observations that could apply to any game genre
-- Do not pad with transitions or summaries — every paragraph must contain new analysis
-- Max tokens will be used — write a thorough report, not a brief one
-- Use markdown formatting with clear section headers"""
-
             # ── Generate ───────────────────────────────────────
-            if generate_clicked:
+            if generate_clicked or regenerate_clicked:
                 st.session_state.ai_report = ""
                 # Scope data to selected game if not "All games"
-                _ai_df  = df[df["game_title"] == ai_game_scope].copy() if ai_game_scope != "All games" else df
-                _ai_sdf = build_summary(_ai_df) if ai_game_scope != "All games" else sdf
-                prompt = build_analysis_prompt(_ai_df, _ai_sdf,
-                                               report_focus, report_tone)
-                report_placeholder = st.empty()
-                status_placeholder = st.empty()
+                _ai_view = _view.subset(ai_game_scope) if ai_game_scope != "All games" else _view
+                _ai_sdf  = _ai_view.summary() if ai_game_scope != "All games" else sdf
+                caption_placeholder = st.empty()
+                report_placeholder  = st.empty()
+                status_placeholder  = st.empty()
                 full_text = ""
 
-                try:
-                    client = _anthropic.Anthropic(api_key=st.secrets["CLAUDE_KEY"])
+                def _map_progress(stage, done, total):
                     status_placeholder.markdown(
-                        '<div style="font-size:.78rem;color:var(--muted);">Connecting to Claude…</div>',
+                        f'<div style="font-size:.78rem;color:var(--muted);">{stage} — {done}/{total}…</div>',
                         unsafe_allow_html=True,
                     )
-                    with client.messages.stream(
-                        model=ai_model,
-                        max_tokens=4096,
-                        system=(
-                            "You are a senior games market analyst. "
-                            "Respond only with your analysis report in well-structured markdown. "
-                            "Do not add preamble or sign-off."
-                        ),
-                        messages=[{"role": "user", "content": prompt}],
-                    ) as stream:
-                        status_placeholder.empty()
-                        for delta in stream.text_stream:
-                            full_text += delta
-                            report_placeholder.markdown(full_text + "▌")
+
+                try:
+                    client = _anthropic.Anthropic(api_key=st.secrets["CLAUDE_KEY"])
+                    _notes, _map_stats = None, None
+                    if ai_map_reduce:
+                        _notes, _map_stats = summarise_slices(
+                            client, _ai_view, _ai_sdf, extract_keywords,
+                            vader=VADER_AVAILABLE, on_progress=_map_progress,
+                        )
+                    prompt, _prompt_stats = build_analysis_prompt(
+                        _ai_view, _ai_sdf, report_focus, report_tone,
+                        st.session_state.get("last_genre", "unknown genre"),
+                        extract_keywords, vader=VADER_AVAILABLE, notes=_notes,
+                        token_budget=REDUCE_TOKEN_BUDGET if _notes else PROMPT_TOKEN_BUDGET,
+                    )
+                    if _map_stats:
+                        _prompt_stats["map"] = _map_stats
+                    st.session_state["ai_prompt_stats"] = _prompt_stats
+                    caption_placeholder.caption(_prompt_stats_caption(_prompt_stats))
+
+                    _report_key = report_cache.cache_key(prompt, ai_model, REPORT_SYSTEM_PROMPT, REPORT_MAX_TOKENS)
+                    _cached = report_cache.get(_report_key, "steam_report", regenerate=regenerate_clicked)
+                    if _cached is not None:
+                        full_text = _cached
+                    else:
+                        status_placeholder.markdown(
+                            '<div style="font-size:.78rem;color:var(--muted);">Connecting to Claude…</div>',
+                            unsafe_allow_html=True,
+                        )
+                        with client.messages.stream(
+                            model=ai_model,
+                            max_tokens=REPORT_MAX_TOKENS,
+                            system=REPORT_SYSTEM_PROMPT,
+                            messages=[{"role": "user", "content": prompt}],
+                        ) as stream:
+                            status_placeholder.empty()
+                            for delta in stream.text_stream:
+                                full_text += delta
+                                report_placeholder.markdown(full_text + "▌")
+                        report_cache.put(_report_key, "steam_report", full_text, ai_model)
 
                     report_placeholder.markdown(full_text)
                     st.session_state.ai_report = full_text
+                    st.session_state["ai_report_cached"] = _cached is not None
 
                     # ── Structured summary card (JSON via second call) ──
                     try:
-                        _struct_client = _anthropic.Anthropic(api_key=st.secrets["CLAUDE_KEY"])
-                        _struct_resp = _struct_client.messages.create(
-                            model="claude-haiku-4-5-20251001",
-                            max_tokens=512,
-                            system=(
-                                "Extract a JSON summary from the analysis report. "
-                                "Return ONLY valid JSON, no markdown, no explanation. "
-                                "Schema: {\"overall_sentiment\": \"Positive|Mixed|Negative\", "
-                                "\"top_strength\": str, \"top_weakness\": str, "
-                                "\"sentiment_score\": float 0-100, "
-                                "\"games_ranked\": [{\"name\": str, \"score\": float}], "
-                                "\"key_themes\": [str]}"
-                            ),
-                            messages=[{"role": "user", "content": full_text[:6000]}],
+                        _struct_system = (
+                            "Extract a JSON summary from the analysis report. "
+                            "Return ONLY valid JSON, no markdown, no explanation. "
+                            "Schema: {\"overall_sentiment\": \"Positive|Mixed|Negative\", "
+                            "\"top_strength\": str, \"top_weakness\": str, "
+                            "\"sentiment_score\": float 0-100, "
+                            "\"games_ranked\": [{\"name\": str, \"score\": float}], "
+                            "\"key_themes\": [str]}"
                         )
-                        import json as _json2
-                        _struct = _json2.loads(_struct_resp.content[0].text)
-                        st.session_state["ai_struct"] = _struct
+                        _struct_key  = report_cache.cache_key(full_text[:6000], STRUCT_SUMMARY_MODEL,
+                                                              _struct_system, 512)
+                        _struct_text = report_cache.get(_struct_key, "steam_summary",
+                                                        regenerate=regenerate_clicked)
+                        if _struct_text is None:
+                            _struct_resp = client.messages.create(
+                                model=STRUCT_SUMMARY_MODEL,
+                                max_tokens=512,
+                                system=_struct_system,
+                                messages=[{"role": "user", "content": full_text[:6000]}],
+                            )
+                            _struct_text = _struct_resp.content[0].text
+                            _json.loads(_struct_text)        # only valid JSON goes in the cache
+                            report_cache.put(_struct_key, "steam_summary", _struct_text, STRUCT_SUMMARY_MODEL)
+                        st.session_state["ai_struct"] = _json.loads(_struct_text)
                     except Exception:
                         st.session_state["ai_struct"] = None
 
@@ -3758,9 +3258,12 @@ HARD RULES:
                     st.error(f"Unexpected error: {type(e).__name__}: {e}")
 
             elif st.session_state.ai_report:
+                if st.session_state.get("ai_prompt_stats"):
+                    st.caption(_prompt_stats_caption(st.session_state["ai_prompt_stats"]))
                 st.markdown(st.session_state.ai_report)
 
             if st.session_state.ai_report:
+                st.caption(_report_cache_caption("steam_report", st.session_state.get("ai_report_cached")))
                 _report_slug = st.session_state.get("last_genre", "report").replace(" ", "_")
 
                 # ── Structured summary card ────────────────────────────────
@@ -3861,9 +3364,16 @@ HARD RULES:
                 with _dl3:
                     if _REPORTLAB_AVAILABLE:
                         try:
+                            from reportlab.lib.pagesizes import A4
+                            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                            from reportlab.lib.units import cm
+                            from reportlab.lib import colors as _rl_colors
+                            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
+                            from reportlab.platypus import Preformatted
+
                             def _md_to_pdf(md_text: str) -> bytes:
                                 """Convert markdown text to PDF bytes via ReportLab."""
-                                _buf = _rl_io.BytesIO()
+                                _buf = io.BytesIO()
                                 doc = SimpleDocTemplate(
                                     _buf, pagesize=A4,
                                     leftMargin=2*cm, rightMargin=2*cm,
@@ -4014,26 +3524,22 @@ HARD RULES:
                         "Use markdown for formatting where helpful.\n\n"
                         f"## Report\n\n{st.session_state.ai_report}"
                     )
-                    _chat_messages = [
-                        {"role": m["role"], "content": m["content"]}
-                        for m in st.session_state.ai_chat_history
-                    ]
                     with st.chat_message("assistant"):
                         _reply_placeholder = st.empty()
-                        _reply_text = ""
                         try:
                             _chat_client = _anthropic.Anthropic(
                                 api_key=st.secrets["CLAUDE_KEY"]
                             )
-                            with _chat_client.messages.stream(
-                                model=ai_model,
-                                max_tokens=2048,
-                                system=_chat_system,
-                                messages=_chat_messages,
-                            ) as _stream:
-                                for _delta in _stream.text_stream:
-                                    _reply_text += _delta
-                                    _reply_placeholder.markdown(_reply_text + "▌")
+                            # Report as a cached prefix; older turns folded into a summary
+                            _chat_request = build_chat_request(
+                                _chat_client, ai_model, 2048, _chat_system,
+                                st.session_state.ai_chat_history, st.session_state.ai_chat_memory,
+                                summary_model=STRUCT_SUMMARY_MODEL,
+                            )
+                            _reply_text, st.session_state.ai_chat_turn = stream_reply(
+                                _chat_client, _chat_request,
+                                on_text=lambda _t: _reply_placeholder.markdown(_t + "▌"),
+                            )
                             _reply_placeholder.markdown(_reply_text)
                             st.session_state.ai_chat_history.append(
                                 {"role": "assistant", "content": _reply_text}
@@ -4041,12 +3547,14 @@ HARD RULES:
                         except Exception as _ce:
                             _reply_placeholder.error(f"Error: {_ce}")
 
-
+                if st.session_state.ai_chat_history and st.session_state.ai_chat_turn:
+                    st.caption(turn_caption(st.session_state.ai_chat_turn, st.session_state.ai_chat_memory))
 
                 # Clear chat button
                 if st.session_state.ai_chat_history:
                     if st.button("Clear conversation", key="clear_chat"):
                         st.session_state.ai_chat_history = []
+                        st.session_state.ai_chat_turn    = None
                         st.rerun()
 
     with tab7:
@@ -4055,12 +3563,21 @@ HARD RULES:
             unsafe_allow_html=True,
         )
 
-        # ── Playwright load controls ───────────────────────────────
-        with st.expander("Load forum threads (Playwright / headless browser)", expanded=not bool(st.session_state.get("forum_data"))):
+        # Threads already in the local forum store show up without a scrape
+        if not st.session_state.forum_data:
+            for _fg in st.session_state.get("found_games", []):
+                _stored = stored_forum_threads(int(_fg["app_id"]), 200, _fg["name"])
+                if _stored:
+                    st.session_state.forum_data[int(_fg["app_id"])] = _stored
+
+        # ── Forum load controls (HTTP first, headless browser fallback) ──
+        with st.expander("Load forum threads", expanded=not bool(st.session_state.get("forum_data"))):
             st.markdown(
                 '<div style="font-size:.8rem;color:var(--muted);margin-bottom:.75rem;line-height:1.7;">'
-                'Uses a headless Chromium browser to load the forums exactly as your browser would, '
-                'including JavaScript rendering. Optionally provide cookies for faster loading.<br><br>'
+                'Reads the server-rendered forum pages directly. A headless Chromium browser is only '
+                'used when a page needs JavaScript rendering or sits behind a login wall. '
+                'Threads are kept locally, so a reload only fetches what is new or has new replies. '
+                'Optionally provide cookies for faster loading.<br><br>'
                 '<strong style="color:var(--text);">Optional — Steam session cookies</strong> '
                 '(paste from browser DevTools → Application → Cookies → steamcommunity.com):'
                 '</div>',
@@ -4097,15 +3614,21 @@ HARD RULES:
                     (g["name"] for g in st.session_state.get("found_games", [])
                      if g["app_id"] == int(_pw_appid)), f"App {_pw_appid}"
                 )
-                with st.spinner(f"Loading forums for {_game_name} with headless browser…"):
+                _pw_stats = {}
+                with st.spinner(f"Loading forums for {_game_name}…"):
                     _pw_threads, _pw_debug = fetch_forum_threads(
                         int(_pw_appid), _game_name, max_threads=int(_pw_max),
                         login_secure=_pw_login.strip(),
                         session_id=_pw_sessid.strip(),
+                        stats=_pw_stats,
                     )
                 if _pw_threads:
                     st.session_state.forum_data[int(_pw_appid)] = _pw_threads
-                    st.success(f"Loaded {len(_pw_threads):,} threads.")
+                    st.toast(
+                        f"Loaded {len(_pw_threads):,} threads — {_pw_stats['new']} new, "
+                        f"{_pw_stats['updated']} with new replies, "
+                        f"{_pw_stats['posts_reused']} opening posts reused."
+                    )
                     st.rerun()
                 else:
                     st.warning("No threads found.")
@@ -4113,6 +3636,11 @@ HARD RULES:
                         for line in _pw_debug:
                             st.text(line)
 
+            _fs_sum = forum_store_summary()
+            if _fs_sum["threads"]:
+                st.caption(f"Local forum store: {_fs_sum['threads']:,} threads across "
+                           f"{_fs_sum['apps']} games ({_fs_sum['size_mb']} MB).")
+
         # ── CSV upload (alternative / supplement) ─────────────────
         with st.expander("Or upload a CSV of forum threads"):
             st.markdown(
@@ -4288,4 +3816,7 @@ st.markdown("""
   <div class="footer-brand">SEGA STEAM LENS</div>
   <div class="footer-note">Data sourced from Steam public API · Internal analytics use only</div>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Word clouds last, so nothing above waits on a render
+_finish_wordclouds()
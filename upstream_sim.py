@@ -0,0 +1,577 @@
+"""
+upstream_sim.py — Local stand-in for every upstream API the apps call.
+======================================================================
+Lets the fetch paths (_fetch_one_game, fetch_reviews_for_game, fetch_top,
+fetch_tweets, the news/Twitch helpers) run without the real internet, with
+reproducible latency, error rates and 429 injection — the foundation for the
+throughput benchmarks under bench_*.py.
+
+Run the server:
+    python upstream_sim.py --port 8765                        # replay + synthetic
+    python upstream_sim.py --mode record --fixtures sim_fixtures
+    python upstream_sim.py --latency-ms 120 --jitter-ms 40 --error-rate 0.02 --rate-429 0.01
+
+Point an app at it (the switch):
+    UPSTREAM_SIM_URL=http://127.0.0.1:8765 streamlit run shooter_sentiment.py
+
+When UPSTREAM_SIM_URL is set, install_from_env() (called once at start-up
+by common.py and each standalone app; importing this module alone installs
+nothing) wraps requests.Session.request so any
+request to a host in SIM_HOSTS is rewritten to
+    {UPSTREAM_SIM_URL}/{host}{path}?{query}
+Everything else (Bedrock, fonts, ...) is untouched. tweepy uses requests
+internally, so X/Twitter searches are redirected too.
+
+Modes:
+    replay  — serve a recorded fixture if one exists, else a deterministic
+              synthetic response (default; works with no fixtures at all)
+    record  — forward to the real upstream and save each response as a fixture
+    strict  — replay only; 404 for anything without a fixture
+
+Control endpoints (on the simulator itself):
+    GET  /__sim/stats   — request counts per host / status, fixture hits
+    POST /__sim/reset   — zero the counters
+    POST /__sim/config  — merge a JSON config, e.g.
+                          {"latency_ms": 50, "hosts": {"steamspy.com": {"error_rate": 1.0}}}
+
+Standard library only, so it runs on a bare interpreter.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+SIM_HOSTS = {
+    "api.steampowered.com",
+    "store.steampowered.com",
+    "steamspy.com",
+    "www.reddit.com",
+    "oauth.reddit.com",
+    "reddit.com",
+    "id.twitch.tv",
+    "api.twitch.tv",
+    "api.twitter.com",
+    "api.x.com",
+}
+
+DEFAULT_CONFIG = {
+    "latency_ms":      40.0,    # mean added latency per request
+    "jitter_ms":       15.0,    # gaussian jitter around latency_ms
+    "error_rate":      0.0,     # probability of a 503
+    "rate_429":        0.0,     # probability of a 429 (with Retry-After)
+    "reviews_per_app": 3000,    # synthetic appreviews corpus size per app_id
+    "news_now":        0,       # "now" for GetNewsForApp (unix s; 0 = wall clock)
+    "seed":            1234,
+    "hosts":           {},      # per-host overrides of the keys above
+}
+
+_FIXTURE_DIR = Path(__file__).parent / "sim_fixtures"
+
+
+# ─────────────────────────────────────────────────────────────
+# CLIENT SIDE — the URL switch
+# ─────────────────────────────────────────────────────────────
+
+_ORIG_SESSION_REQUEST = None
+
+
+def sim_url(url: str, base: str) -> str:
+    """Rewrite an upstream URL onto the simulator, or return it unchanged."""
+    parts = urlsplit(url)
+    if parts.hostname not in SIM_HOSTS:
+        return url
+    q = f"?{parts.query}" if parts.query else ""
+    return f"{base.rstrip('/')}/{parts.hostname}{parts.path}{q}"
+
+
+def install_redirect(base: str) -> None:
+    """Route requests to SIM_HOSTS through the simulator at base (idempotent)."""
+    global _ORIG_SESSION_REQUEST
+    import requests
+
+    if _ORIG_SESSION_REQUEST is None:
+        _ORIG_SESSION_REQUEST = requests.Session.request
+
+    orig = _ORIG_SESSION_REQUEST
+
+    def _request(self, method, url, *args, **kwargs):
+        return orig(self, method, sim_url(url, base), *args, **kwargs)
+
+    requests.Session.request = _request
+
+
+def uninstall_redirect() -> None:
+    global _ORIG_SESSION_REQUEST
+    if _ORIG_SESSION_REQUEST is None:
+        return
+    import requests
+    requests.Session.request = _ORIG_SESSION_REQUEST
+    _ORIG_SESSION_REQUEST = None
+
+
+def install_from_env() -> bool:
+    """install_redirect(UPSTREAM_SIM_URL) when that env var is set. No-op otherwise."""
+    base = os.environ.get("UPSTREAM_SIM_URL", "").strip()
+    if not base:
+        return False
+    install_redirect(base)
+    return True
+
+
+def fetch_stats(base: str) -> dict:
+    """GET /__sim/stats from a running simulator."""
+    with urllib.request.urlopen(f"{base.rstrip('/')}/__sim/stats", timeout=5) as r:
+        return json.loads(r.read())
+
+
+def reset_stats(base: str) -> None:
+    req = urllib.request.Request(f"{base.rstrip('/')}/__sim/reset", data=b"{}", method="POST")
+    urllib.request.urlopen(req, timeout=5).close()
+
+
+# ─────────────────────────────────────────────────────────────
+# SYNTHETIC RESPONSES  (deterministic per app_id / subreddit / query)
+# ─────────────────────────────────────────────────────────────
+
+_PHRASES_POS = [
+    "gunplay feels tight and responsive", "great map design", "the new season is fantastic",
+    "matchmaking is quick", "love the art style", "best co-op experience in years",
+    "devs actually listen to the community", "smooth performance on my rig",
+    "the progression system is rewarding", "story missions are genuinely fun",
+]
+_PHRASES_NEG = [
+    "servers keep crashing", "cheaters in every ranked match", "terrible optimization",
+    "the battle pass is a grind", "matchmaking takes forever", "too many microtransactions",
+    "latest patch broke everything", "netcode is awful", "anti cheat does nothing",
+    "balance changes ruined my main",
+]
+_PHRASES_FILL = [
+    "honestly", "after a hundred hours", "I think", "for the price", "with friends",
+    "compared to launch", "at this point", "on the whole", "since the update", "",
+]
+
+
+def _rng(cfg: dict, *key) -> random.Random:
+    h = zlib.crc32("|".join(str(k) for k in key).encode()) ^ int(cfg.get("seed", 0))
+    return random.Random(h)
+
+
+def _review_text(rng: random.Random, positive: bool) -> str:
+    bank = _PHRASES_POS if positive else _PHRASES_NEG
+    other = _PHRASES_NEG if positive else _PHRASES_POS
+    parts = [rng.choice(_PHRASES_FILL), rng.choice(bank), rng.choice(bank)]
+    if rng.random() < 0.3:
+        parts.append("but " + rng.choice(other))
+    if rng.random() < 0.4:
+        parts.append(rng.choice(bank) + " " + rng.choice(_PHRASES_FILL))
+    return ". ".join(p.strip() for p in parts if p.strip()).capitalize() + "."
+
+
+def _synth_ccu(cfg, path, q):
+    app_id = q.get("appid", "0")
+    rng = _rng(cfg, "ccu", app_id)
+    return 200, {"response": {"player_count": int(rng.lognormvariate(9, 1.6)), "result": 1}}
+
+
+def _synth_steamspy(cfg, path, q):
+    app_id = q.get("appid", "0")
+    rng = _rng(cfg, "spy", app_id)
+    pos = int(rng.lognormvariate(10, 1.5))
+    avg_all = rng.randint(600, 30000)
+    return 200, {
+        "appid": int(app_id) if str(app_id).isdigit() else 0,
+        "name": f"Sim Game {app_id}",
+        "positive": pos, "negative": int(pos * rng.uniform(0.05, 0.6)),
+        "average_forever": avg_all, "average_2weeks": int(avg_all * rng.uniform(0.2, 1.8)),
+        "owners": "1,000,000 .. 2,000,000",
+    }
+
+
+def _synth_appreviews(cfg, path, q):
+    app_id = path.rstrip("/").split("/")[-1]
+    total = int(cfg["reviews_per_app"])
+    rng = _rng(cfg, "rev-summary", app_id)
+    pos_share = rng.uniform(0.45, 0.92)
+    per_page = max(1, min(100, int(q.get("num_per_page", 20))))
+    cursor = q.get("cursor", "*")
+    start = 0 if cursor in ("*", "") else int(cursor.lstrip("p") or 0)
+    now = int(time.time())
+    reviews = []
+    for idx in range(start, min(start + per_page, total)):
+        r = _rng(cfg, "rev", app_id, idx)
+        up = r.random() < pos_share
+        reviews.append({
+            "recommendationid": f"{app_id}{idx:07d}",
+            "author": {
+                "steamid": str(76561197960265728 + zlib.crc32(f"{app_id}-{idx}".encode())),
+                "num_games_owned": r.randint(1, 800), "num_reviews": r.randint(1, 60),
+                "playtime_forever": r.randint(30, 200000), "playtime_at_review": r.randint(30, 60000),
+            },
+            "language": "english",
+            "review": _review_text(r, up),
+            "timestamp_created": now - idx * 1800 - r.randint(0, 1700),
+            "timestamp_updated": now - idx * 1800,
+            "voted_up": up, "votes_up": int(r.expovariate(0.3)), "votes_funny": int(r.expovariate(1.5)),
+            "written_during_early_access": r.random() < 0.05,
+        })
+    nxt = start + len(reviews)
+    body = {
+        "success": 1,
+        "query_summary": {"num_reviews": len(reviews), "total_reviews": total,
+                          "total_positive": int(total * pos_share),
+                          "total_negative": total - int(total * pos_share)},
+        "reviews": reviews,
+        "cursor": f"p{nxt}" if nxt < total else cursor,
+    }
+    return 200, body
+
+
+def _synth_news(cfg, path, q):
+    app_id = q.get("appid", "0")
+    count = int(q.get("count", 20))
+    now = int(cfg.get("news_now") or time.time())
+    enddate = min(int(q.get("enddate", now)), now)
+    rng = _rng(cfg, "news", app_id)
+    kinds = ["Patch Notes", "Season {n} Update", "Hotfix", "DLC Expansion Out Now",
+             "Community Spotlight", "Weekend Sale", "Major Update {n}.0", "Balance Patch"]
+    # One fixed timeline per app, walked back from 2030: an item keeps its gid
+    # across requests, so enddate paging and "stop at a known item" both work
+    items = []
+    ts = 1_900_000_000
+    while len(items) < count and ts > 0:
+        ts -= 86400 * rng.randint(3, 12)
+        title = rng.choice(kinds).format(n=rng.randint(2, 9))
+        text = _review_text(rng, True)
+        if ts > enddate:
+            continue
+        items.append({
+            "gid": str(zlib.crc32(f"{app_id}-{ts}".encode())), "title": title,
+            "url": f"https://store.steampowered.com/news/app/{app_id}/view/{ts}",
+            "date": ts, "contents": f"<p>{title}: {text}</p>",
+        })
+    return 200, {"appnews": {"appid": int(app_id) if str(app_id).isdigit() else 0,
+                             "newsitems": items, "count": len(items)}}
+
+
+def _synth_storesearch(cfg, path, q):
+    term = q.get("term", "")
+    rng = _rng(cfg, "search", term)
+    n = min(int(q.get("count", 10)), 25)
+    return 200, {"total": n, "items": [
+        {"id": 100000 + rng.randint(0, 2_000_000), "name": f"{term.title()} Sim {i + 1}",
+         "tiny_image": ""} for i in range(n)]}
+
+
+def _reddit_post(cfg, sub, i, seed):
+    r = _rng(cfg, "rpost", sub, seed, i)
+    up = r.random() < 0.6
+    pid = format(zlib.crc32(f"{sub}-{seed}-{i}".encode()), "x")
+    return {"kind": "t3", "data": {
+        "id": pid, "subreddit": sub, "title": _review_text(r, up)[:90],
+        "selftext": _review_text(r, up) if r.random() < 0.7 else "",
+        "score": int(r.expovariate(0.01)), "upvote_ratio": round(r.uniform(0.5, 0.99), 2),
+        "num_comments": int(r.expovariate(0.05)),
+        "created_utc": time.time() - i * 3600 * r.uniform(1, 20),
+        "author": f"sim_user_{r.randint(1, 9999)}", "permalink": f"/r/{sub}/comments/{pid}/sim/",
+        "link_flair_text": r.choice(["Discussion", "Feedback", "Bug", None]),
+    }}
+
+
+def _synth_reddit(cfg, path, q):
+    parts = [p for p in path.split("/") if p]
+    limit = max(1, min(100, int(q.get("limit", 25))))
+    if parts[-1] in ("about.json",) and len(parts) >= 2:
+        sub = parts[1]
+        return 200, {"kind": "t5", "data": {"display_name": sub, "title": f"r/{sub}",
+                                            "public_description": f"Simulated r/{sub}",
+                                            "subscribers": _rng(cfg, "subs", sub).randint(1000, 2_000_000)}}
+    if parts[:2] == ["subreddits", "search.json"]:
+        term = q.get("q", "games").replace(" ", "")
+        return 200, {"kind": "Listing", "data": {"after": None, "children": [
+            {"kind": "t5", "data": {"display_name": f"{term}{s}", "title": term,
+                                    "public_description": "", "subscribers": 10000 * (5 - i)}}
+            for i, s in enumerate(["", "Game", "Memes", "Competitive"])]}}
+    if "comments" in parts:
+        sub, post_id = parts[1], parts[3].replace(".json", "")
+        comments = []
+        for i in range(limit):
+            r = _rng(cfg, "rcomment", post_id, i)
+            cid = format(zlib.crc32(f"{post_id}-{i}".encode()), "x")
+            comments.append({"kind": "t1", "data": {
+                "id": cid, "body": _review_text(r, r.random() < 0.55), "score": int(r.expovariate(0.05)),
+                "author": f"sim_user_{r.randint(1, 9999)}", "created_utc": time.time() - i * 600,
+                "permalink": f"/r/{sub}/comments/{post_id}/sim/{cid}/"}})
+        return 200, [{"kind": "Listing", "data": {"children": [_reddit_post(cfg, sub, 0, post_id)]}},
+                     {"kind": "Listing", "data": {"children": comments, "after": None}}]
+    # listings: /r/{sub}/top.json, /r/{sub}/new.json, /r/{sub}/search.json, /search.json
+    sub = parts[1] if parts[0] == "r" else "all"
+    page = int((q.get("after") or "t3_p0").split("_p")[-1] or 0)
+    seed = f"{parts[-1]}|{q.get('q', '')}|{q.get('t', '')}"
+    total = 1000
+    start = page * limit
+    children = [_reddit_post(cfg, sub, i, seed) for i in range(start, min(start + limit, total))]
+    after = f"t3_p{page + 1}" if start + limit < total else None
+    return 200, {"kind": "Listing", "data": {"after": after, "children": children}}
+
+
+def _synth_twitch(cfg, path, q):
+    if path.endswith("/oauth2/token"):
+        return 200, {"access_token": "sim-token", "expires_in": 3600, "token_type": "bearer"}
+    if path.endswith("/helix/games"):
+        name = q.get("name", "")
+        return 200, {"data": [{"id": str(zlib.crc32(name.encode())), "name": name}]}
+    if path.endswith("/helix/streams"):
+        rng = _rng(cfg, "twitch", q.get("game_id", ""))
+        n = min(int(q.get("first", 20)), 100)
+        return 200, {"data": [{"viewer_count": int(rng.expovariate(0.002))} for _ in range(n)],
+                     "pagination": {}}
+    return 404, {}
+
+
+def _synth_tweets(cfg, path, q):
+    query = q.get("query", "")
+    n = max(10, min(100, int(q.get("max_results", 10))))
+    rng = _rng(cfg, "tweets", query)
+    now = datetime.now(timezone.utc)
+    data, users = [], {}
+    for i in range(n):
+        uid = str(rng.randint(10_000, 99_999))
+        users[uid] = {"id": uid, "username": f"sim_{uid}", "name": f"Sim {uid}"}
+        data.append({
+            "id": str(1_700_000_000_000_000_000 + zlib.crc32(f"{query}-{i}".encode())),
+            "text": _review_text(rng, rng.random() < 0.55), "author_id": uid,
+            "created_at": (now - timedelta(minutes=7 * i)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "edit_history_tweet_ids": [],
+            "public_metrics": {"like_count": int(rng.expovariate(0.05)), "retweet_count": int(rng.expovariate(0.2)),
+                               "reply_count": int(rng.expovariate(0.5)), "quote_count": 0},
+        })
+    return 200, {"data": data, "includes": {"users": list(users.values())},
+                 "meta": {"result_count": n}}
+
+
+def synthesize(cfg: dict, host: str, path: str, q: dict):
+    """Return (status, json_body) for a request with no recorded fixture."""
+    if host == "api.steampowered.com":
+        if "GetNumberOfCurrentPlayers" in path:
+            return _synth_ccu(cfg, path, q)
+        if "GetNewsForApp" in path:
+            return _synth_news(cfg, path, q)
+    if host == "store.steampowered.com":
+        if path.startswith("/appreviews/"):
+            return _synth_appreviews(cfg, path, q)
+        if path.startswith("/api/storesearch"):
+            return _synth_storesearch(cfg, path, q)
+    if host == "steamspy.com":
+        return _synth_steamspy(cfg, path, q)
+    if host in ("www.reddit.com", "oauth.reddit.com", "reddit.com"):
+        if path.startswith("/api/v1/access_token"):
+            return 200, {"access_token": "sim-token", "expires_in": 86400}
+        return _synth_reddit(cfg, path, q)
+    if host in ("id.twitch.tv", "api.twitch.tv"):
+        return _synth_twitch(cfg, path, q)
+    if host in ("api.twitter.com", "api.x.com") and "tweets/search/recent" in path:
+        return _synth_tweets(cfg, path, q)
+    return 404, {"error": f"no simulator route for {host}{path}"}
+
+
+# ─────────────────────────────────────────────────────────────
+# SERVER
+# ─────────────────────────────────────────────────────────────
+
+def _fixture_path(fixtures: Path, host: str, path: str, q: dict) -> Path:
+    key = path + "?" + urlencode(sorted(q.items()))
+    return fixtures / host / (hashlib.sha1(key.encode()).hexdigest()[:20] + ".json")
+
+
+def _host_cfg(cfg: dict, host: str) -> dict:
+    return {**cfg, **cfg.get("hosts", {}).get(host, {})}
+
+
+class SimState:
+    """Shared, lock-guarded config + counters for one simulator instance."""
+
+    def __init__(self, config: dict | None = None, mode: str = "replay",
+                 fixtures: Path | str = _FIXTURE_DIR):
+        self.cfg      = {**DEFAULT_CONFIG, **(config or {})}
+        self.mode     = mode
+        self.fixtures = Path(fixtures)
+        self.lock     = threading.Lock()
+        self.rng      = random.Random(self.cfg["seed"])
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.stats = {"total": 0, "by_host": {}, "by_status": {},
+                          "fixture_hits": 0, "synthetic": 0, "recorded": 0}
+
+    def count(self, host: str, status: int, source: str) -> None:
+        with self.lock:
+            self.stats["total"] += 1
+            self.stats["by_host"][host] = self.stats["by_host"].get(host, 0) + 1
+            self.stats["by_status"][str(status)] = self.stats["by_status"].get(str(status), 0) + 1
+            if source in ("fixture_hits", "synthetic", "recorded"):
+                self.stats[source] += 1
+
+
+def _make_handler(state: SimState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):     # keep benchmark output clean
+            pass
+
+        def _send(self, status: int, body: bytes, ctype: str = "application/json",
+                  extra: dict | None = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (extra or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _control(self, path: str) -> bool:
+            if not path.startswith("/__sim/"):
+                return False
+            if path == "/__sim/stats":
+                with state.lock:
+                    body = json.dumps({**state.stats, "mode": state.mode,
+                                       "config": state.cfg}).encode()
+                self._send(200, body)
+            elif path == "/__sim/reset":
+                state.reset()
+                self._send(200, b"{}")
+            elif path == "/__sim/config":
+                n = int(self.headers.get("Content-Length") or 0)
+                patch = json.loads(self.rfile.read(n) or b"{}")
+                with state.lock:
+                    hosts = {**state.cfg.get("hosts", {}), **patch.pop("hosts", {})}
+                    state.cfg.update(patch, hosts=hosts)
+                self._send(200, json.dumps(state.cfg).encode())
+            else:
+                self._send(404, b"{}")
+            return True
+
+        def _handle(self, method: str) -> None:
+            parts = urlsplit(self.path)
+            if self._control(parts.path):
+                return
+            segs = parts.path.lstrip("/").split("/", 1)
+            host, path = segs[0], "/" + (segs[1] if len(segs) > 1 else "")
+            q = dict(parse_qsl(parts.query, keep_blank_values=True))
+            n = int(self.headers.get("Content-Length") or 0)
+            req_body = self.rfile.read(n) if n else b""
+
+            cfg = _host_cfg(state.cfg, host)
+            with state.lock:
+                delay = max(0.0, state.rng.gauss(cfg["latency_ms"], cfg["jitter_ms"])) / 1000
+                roll  = state.rng.random()
+            time.sleep(delay)
+
+            if roll < cfg["rate_429"]:
+                state.count(host, 429, "")
+                self._send(429, b'{"error":"rate limited"}', extra={"Retry-After": "1"})
+                return
+            if roll < cfg["rate_429"] + cfg["error_rate"]:
+                state.count(host, 503, "")
+                self._send(503, b'{"error":"injected failure"}')
+                return
+
+            fx = _fixture_path(state.fixtures, host, path, q)
+            if state.mode == "record":
+                status, ctype, body = self._forward(method, host, path, parts.query, req_body)
+                fx.parent.mkdir(parents=True, exist_ok=True)
+                fx.write_text(json.dumps({"status": status, "content_type": ctype,
+                                          "body_b64": base64.b64encode(body).decode()}))
+                state.count(host, status, "recorded")
+                self._send(status, body, ctype)
+                return
+            if fx.exists():
+                rec = json.loads(fx.read_text())
+                state.count(host, rec["status"], "fixture_hits")
+                self._send(rec["status"], base64.b64decode(rec["body_b64"]), rec["content_type"])
+                return
+            if state.mode == "strict":
+                state.count(host, 404, "")
+                self._send(404, b'{"error":"no fixture"}')
+                return
+            status, payload = synthesize(cfg, host, path, q)
+            state.count(host, status, "synthetic")
+            self._send(status, json.dumps(payload).encode())
+
+        def _forward(self, method, host, path, query, req_body):
+            url = f"https://{host}{path}" + (f"?{query}" if query else "")
+            headers = {k: v for k, v in self.headers.items()
+                       if k.lower() not in ("host", "content-length", "accept-encoding", "connection")}
+            req = urllib.request.Request(url, data=req_body or None, headers=headers, method=method)
+            try:
+                with urllib.request.urlopen(req, timeout=30) as r:
+                    return r.status, r.headers.get("Content-Type", "application/json"), r.read()
+            except urllib.error.HTTPError as e:
+                return e.code, e.headers.get("Content-Type", "application/json"), e.read()
+            except Exception as e:
+                return 502, "application/json", json.dumps({"error": str(e)}).encode()
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+    return Handler
+
+
+def start_server(port: int = 0, config: dict | None = None, mode: str = "replay",
+                 fixtures: Path | str = _FIXTURE_DIR, host: str = "127.0.0.1"):
+    """Start a simulator on a daemon thread. Returns (server, base_url, state);
+    call server.shutdown() to stop it. port=0 picks a free port."""
+    state  = SimState(config, mode, fixtures)
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="upstream-sim").start()
+    return server, f"http://{host}:{server.server_address[1]}", state
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Local upstream API simulator")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--mode", choices=["replay", "record", "strict"], default="replay")
+    ap.add_argument("--fixtures", default=str(_FIXTURE_DIR))
+    ap.add_argument("--config", help="JSON file merged over the defaults (supports per-host overrides)")
+    ap.add_argument("--latency-ms", type=float)
+    ap.add_argument("--jitter-ms", type=float)
+    ap.add_argument("--error-rate", type=float)
+    ap.add_argument("--rate-429", type=float)
+    ap.add_argument("--seed", type=int)
+    args = ap.parse_args()
+
+    cfg = json.loads(Path(args.config).read_text()) if args.config else {}
+    for key in ("latency_ms", "jitter_ms", "error_rate", "rate_429", "seed"):
+        val = getattr(args, key)
+        if val is not None:
+            cfg[key] = val
+    server, base, _ = start_server(args.port, cfg, args.mode, args.fixtures, args.host)
+    print(f"upstream simulator ({args.mode}) on {base}\n"
+          f"  export UPSTREAM_SIM_URL={base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+wordcloud_render.py — Keyword word clouds rendered off the request path.
+========================================================================
+The keyword tabs used to build a WordCloud and a matplotlib figure inline on
+every rerun whose frequencies changed even slightly. Here a cloud is:
+
+    keyed        — by a fingerprint of its frequency vector: the set of top
+                   MAX_WORDS terms, then their weights relative to the top
+                   term. WordCloud only sizes words by relative weight, so a
+                   stored cloud for the same word set whose weights are all
+                   within WEIGHT_TOLERANCE is reused — a filter that nudges
+                   every count a little doesn't trigger a re-render.
+    rendered     — on a small thread pool, straight from the WordCloud canvas
+                   to PNG via PIL (no matplotlib figure), with a random_state
+                   taken from the key so a key always has the same layout.
+    cached       — as {set}-{weights}.png under WORDCLOUD_CACHE_DIR plus a
+                   {set}.json index of the weight vectors rendered for that
+                   word set; shared by every session and kept across restarts.
+                   In-flight renders are shared too.
+
+submit_wordcloud() returns a Future that is already done on a cache hit; the
+app shows a placeholder for pending ones and fills them in at the end of the
+script. Kept free of Streamlit so it can be driven headless.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from lazy_imports import module_available
+
+WORDCLOUD_AVAILABLE = module_available("wordcloud")    # imported by the first render
+
+WORDCLOUD_CACHE_DIR = Path(os.environ.get(
+    "WORDCLOUD_CACHE_DIR", Path(__file__).parent / "data" / "wordcloud_cache"))
+
+WORDCLOUD_WORKERS = 2
+MAX_WORDS         = 60
+WEIGHT_TOLERANCE  = 0.08   # max relative difference per word for a stored cloud to be reused
+MAX_PER_SET       = 16     # weight vectors remembered per word set
+RENDER_VERSION    = 1      # bump when the look changes so old PNGs aren't reused
+
+_BG = "#0d0f1a"
+_SHADES = {True: ("#20c65a", "#1a4a2e"), False: ("#ff3d52", "#4a1a1a")}   # (hi, lo)
+
+_POOL = ThreadPoolExecutor(max_workers=WORDCLOUD_WORKERS, thread_name_prefix="wordcloud")
+_PENDING: dict[str, Future] = {}
+_PENDING_LOCK = threading.Lock()
+_INDEX_LOCK   = threading.Lock()     # read-modify-write of the {set}.json indexes
+
+
+def normalise(freqs) -> dict[str, float]:
+    """Top MAX_WORDS terms → weight relative to the top term (3 decimals)."""
+    items = sorted(((str(w), float(c)) for w, c in dict(freqs).items() if c and c > 0),
+                   key=lambda wc: (-wc[1], wc[0]))[:MAX_WORDS]
+    if not items:
+        return {}
+    top = items[0][1]
+    return {w: round(c / top, 3) for w, c in items}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def set_key(weights: dict[str, float], positive: bool) -> str:
+    return _digest(f"{RENDER_VERSION}|{int(bool(positive))}|" + "\n".join(sorted(weights)))
+
+
+def vector_key(weights: dict[str, float]) -> str:
+    return _digest(json.dumps(weights, sort_keys=True))
+
+
+def _close(a: dict[str, float], b: dict[str, float]) -> bool:
+    return a.keys() == b.keys() and all(
+        abs(a[w] - b[w]) <= WEIGHT_TOLERANCE * max(a[w], b[w]) for w in a)
+
+
+def _colour_fn(positive: bool):
+    hi, lo = (tuple(int(h[i:i + 2], 16) for i in (1, 3, 5)) for h in _SHADES[positive])
+
+    def colour(word, font_size, position, orientation, random_state=None, **kw):
+        # Shade from bright (hi) to dim (lo) based on relative font size
+        t = min(font_size / 120, 1.0)
+        return "rgb({},{},{})".format(*(int(l + t * (h - l)) for h, l in zip(hi, lo)))
+    return colour
+
+
+def render_png(weights: dict[str, float], positive: bool, seed: int = 0) -> bytes:
+    """PNG bytes straight from the WordCloud canvas (1040×494, as the old 130 dpi figure)."""
+    if not weights:
+        return b""
+    from wordcloud import WordCloud
+    wc = WordCloud(
+        width=800, height=380, scale=1.3,
+        background_color=_BG,
+        max_words=MAX_WORDS,
+        font_path=None,           # uses default font
+        collocations=False,
+        prefer_horizontal=0.85,
+        min_font_size=10,
+        max_font_size=120,
+        color_func=_colour_fn(positive),
+        margin=6,
+        random_state=seed,
+    ).generate_from_frequencies(weights)
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="PNG", compress_level=6)
+    return buf.getvalue()
+
+
+def _index_path(skey: str) -> Path:
+    return WORDCLOUD_CACHE_DIR / f"{skey}.json"
+
+
+def _load_index(skey: str) -> dict[str, dict[str, float]]:
+    try:
+        return json.loads(_index_path(skey).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _lookup(weights: dict[str, float], skey: str) -> bytes | None:
+    """PNG of a stored cloud with the same word set and close-enough weights."""
+    for vkey, stored in _load_index(skey).items():
+        if _close(weights, stored):
+            try:
+                return (WORDCLOUD_CACHE_DIR / f"{skey}-{vkey}.png").read_bytes()
+            except OSError:
+                continue
+    return None
+
+
+def _render_to_cache(key: str, weights: dict[str, float], positive: bool) -> bytes:
+    skey, vkey = key.split("-")
+    try:
+        png = render_png(weights, positive, seed=int(vkey[:8], 16))
+        if png:
+            WORDCLOUD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _write_atomic(WORDCLOUD_CACHE_DIR / f"{key}.png", png)
+            with _INDEX_LOCK:
+                index = _load_index(skey)
+                index[vkey] = weights
+                for old in list(index)[:-MAX_PER_SET]:
+                    index.pop(old)
+                    (WORDCLOUD_CACHE_DIR / f"{skey}-{old}.png").unlink(missing_ok=True)
+                _write_atomic(_index_path(skey), json.dumps(index).encode("utf-8"))
+        return png
+    finally:
+        with _PENDING_LOCK:
+            _PENDING.pop(key, None)
+
+
+def submit_wordcloud(freqs, positive: bool) -> Future:
+    """Future of the cloud's PNG bytes (b"" for no words) — done at once on a cache hit."""
+    weights = normalise(freqs)
+    skey    = set_key(weights, positive)
+    png     = _lookup(weights, skey) if weights else b""
+    if png is not None or not WORDCLOUD_AVAILABLE:
+        done: Future = Future()
+        done.set_result(png or b"")
+        return done
+    key = f"{skey}-{vector_key(weights)}"
+    with _PENDING_LOCK:
+        fut = _PENDING.get(key)
+        if fut is None:
+            fut = _PENDING[key] = _POOL.submit(_render_to_cache, key, weights, positive)
+    return fut
@@ -13,10 +13,11 @@ import json as _json
 import html as _html
 from pathlib import Path
 from datetime import datetime
-from collections import Counter
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
+from keyword_engine import KeywordEngine
+import upstream_sim
 import reportlab
 try:
     import markdown as _md_lib
@@ -51,6 +52,8 @@ try:
 except ImportError:
     TWEEPY_AVAILABLE = False
 
+upstream_sim.install_from_env()   # no-op unless UPSTREAM_SIM_URL is set — see upstream_sim.py
+
 # ─────────────────────────────────────────────────────────────
 # PAGE CONFIG
 # ─────────────────────────────────────────────────────────────
@@ -346,17 +349,14 @@ STOPWORDS = {
     "got","get","re","ll","ve","m","t","s","d","ur","u","r","w",
 }
 
+@st.cache_resource(show_spinner=False)
+def _keyword_engine() -> KeywordEngine:
+    # Strip URLs and mentions before tokenizing
+    return KeywordEngine(STOPWORDS, strip_pattern=r"https?://\S+|@\w+|#")
+
+
 def extract_keywords(texts: list[str], top_n: int = 30) -> list[tuple[str, int]]:
-    words_all, bigrams_all = [], []
-    for text in texts:
-        # Strip URLs and mentions first
-        clean = re.sub(r"https?://\S+|@\w+|#", " ", text)
-        tokens = re.findall(r"[a-z]{3,}", clean.lower())
-        tokens = [t for t in tokens if t not in STOPWORDS]
-        words_all.extend(tokens)
-        bigrams_all.extend(f"{tokens[i]} {tokens[i+1]}" for i in range(len(tokens)-1))
-    counter = Counter(words_all) + Counter(bigrams_all)
-    return counter.most_common(top_n)
+    return _keyword_engine().top_terms(texts, top_n)
 
 
 @st.cache_data(show_spinner=False)